@@ -3,7 +3,7 @@
 Extension ComfyUI pour les palettes de pixel art
 """
 
-from .nodes import GimpPaletteLoaderNode, PaletteFormatterNode, PixelPaletteExtractorNode, CreateColorFromRGBNode, ColorFormatterNode, ColorPreviewNode, MixColorsNode
+from .nodes import GimpPaletteLoaderNode, PaletteFormatterNode, PixelPaletteExtractorNode, CreateColorFromRGBNode, ColorFormatterNode, ColorPreviewNode, MixColorsNode, ResultCacheStatsNode, IndexedPaletteLoaderNode, ProfilingReportNode, SavePaletteNode, PaletteDedupeNode, PaletteSortNode, PaletteReduceNode, PaletteLibrarySearchNode, PaletteRankNode, PixelGridDownscaleNode, SpriteSheetSliceNode, RetroTilePalettesNode, PaletteSwapNode, PaletteAnimationNode, PaletteMapNode, ColorVisionSimulationNode, PaletteContrastNode, OffPaletteCheckNode, PaletteLutExportNode, ColorLutApplyNode
 #  from . import PixelPaletteExtractor
 
 # Configuration ComfyUI
@@ -15,6 +15,26 @@ NODE_CLASS_MAPPINGS = {
     "ColorFormatterNode":     ColorFormatterNode,
     "ColorPreviewNode":       ColorPreviewNode,
     "MixColorsNode":          MixColorsNode,
+    "ResultCacheStatsNode":   ResultCacheStatsNode,
+    "IndexedPaletteLoader":   IndexedPaletteLoaderNode,
+    "ProfilingReportNode":    ProfilingReportNode,
+    "SavePalette":            SavePaletteNode,
+    "PaletteDedupe":          PaletteDedupeNode,
+    "PaletteSort":            PaletteSortNode,
+    "PaletteReduce":          PaletteReduceNode,
+    "PaletteLibrarySearch":   PaletteLibrarySearchNode,
+    "PaletteRank":            PaletteRankNode,
+    "PixelGridDownscale":     PixelGridDownscaleNode,
+    "SpriteSheetSlice":       SpriteSheetSliceNode,
+    "RetroTilePalettes":      RetroTilePalettesNode,
+    "PaletteSwap":            PaletteSwapNode,
+    "PaletteAnimation":       PaletteAnimationNode,
+    "PaletteMap":             PaletteMapNode,
+    "ColorVisionSimulation":  ColorVisionSimulationNode,
+    "PaletteContrast":        PaletteContrastNode,
+    "OffPaletteCheck":        OffPaletteCheckNode,
+    "PaletteLutExport":       PaletteLutExportNode,
+    "ColorLutApply":          ColorLutApplyNode,
 }
 
 NODE_DISPLAY_NAME_MAPPINGS = {
@@ -25,6 +45,26 @@ NODE_DISPLAY_NAME_MAPPINGS = {
     "ColorFormatterNode":     "Color to formatted string",
     "ColorPreviewNode":       "Color to image",
     "MixColorsNode":          "Mix colors",
+    "ResultCacheStatsNode":   "Result cache stats",
+    "IndexedPaletteLoader":   "Indexed Image Palette Loader",
+    "ProfilingReportNode":    "Profiling report",
+    "SavePalette":            "Save Palette",
+    "PaletteDedupe":          "Palette Dedupe",
+    "PaletteSort":            "Palette Sort",
+    "PaletteReduce":          "Palette Reduce",
+    "PaletteLibrarySearch":   "Palette Library Search",
+    "PaletteRank":            "Rank Palettes For Image",
+    "PixelGridDownscale":     "Pixel Grid Downscale",
+    "SpriteSheetSlice":       "Sprite Sheet Slice",
+    "RetroTilePalettes":      "Retro Tile Palettes",
+    "PaletteSwap":            "Palette Swap",
+    "PaletteAnimation":       "Palette Animation",
+    "PaletteMap":             "Palette Map",
+    "ColorVisionSimulation":  "Color Vision Simulation",
+    "PaletteContrast":        "Palette Contrast Audit",
+    "OffPaletteCheck":        "Off-Palette Pixel Check",
+    "PaletteLutExport":       "Export Palette 3D LUT",
+    "ColorLutApply":          "Apply 3D LUT",
 }
 
 # Métadonnées de l'extension
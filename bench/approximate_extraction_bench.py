@@ -0,0 +1,74 @@
+# bench/approximate_extraction_bench.py
+"""
+Compromis latence / précision de l'extraction approximative de palette
+
+Compare l'extraction exacte (quantification de toute l'image) à l'extraction sur
+échantillon stratifié pour plusieurs tailles d'échantillon. La précision est mesurée
+par l'erreur moyenne de la palette obtenue sur l'image complète.
+
+    python bench/approximate_extraction_bench.py [largeur] [hauteur]   (défaut: 3840 2160)
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from PIL import Image
+from lib.pixel_array    import to_uint8
+from lib.pixel_sampling import stratified_sample, estimate_palette_error
+
+SAMPLE_SIZES = (4096, 16384, 65536, 262144)
+
+
+def synthetic_render(width, height, seed=0):
+    """Rendu synthétique: dégradés doux, aplats et bruit, en flottants [0,1]"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    image = np.stack([x / width, y / height, 0.5 + 0.5 * np.sin(x / 97.0) * np.cos(y / 61.0)], axis=-1)
+    blocks = rng.random((height // 64 + 1, width // 64 + 1, 3), dtype=np.float32)
+    image = 0.6 * image + 0.4 * np.repeat(np.repeat(blocks, 64, axis=0), 64, axis=1)[:height, :width]
+    image += rng.normal(0, 0.01, image.shape).astype(np.float32)
+    return np.clip(image, 0, 1)
+
+
+def quantize_palette(pixels_uint8, colors=32):
+    """Palette adaptative PIL (même méthode que le node), sur une image ou un échantillon"""
+    if pixels_uint8.ndim == 2:
+        pixels_uint8 = pixels_uint8[None, ...]
+    quantized = Image.fromarray(pixels_uint8, 'RGB').convert('P', palette=Image.ADAPTIVE, colors=colors)
+    used = np.unique(np.array(quantized))
+    return np.array(quantized.getpalette()[:3 * 256], dtype=np.uint8).reshape(-1, 3)[used]
+
+
+def main():
+    width  = int(sys.argv[1]) if len(sys.argv) > 1 else 3840
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 2160
+    image  = synthetic_render(width, height)
+
+    # Référence pour mesurer la précision: grand échantillon indépendant
+    reference = to_uint8(stratified_sample(image, 1 << 20, seed=99))
+
+    print(f"image {width}x{height} ({width * height} pixels), palette de 32 couleurs")
+    print(f"{'mode':>18} {'latence (s)':>12} {'erreur réelle':>14} {'erreur estimée':>20}")
+
+    start = time.perf_counter()
+    exact = quantize_palette(to_uint8(image))
+    exact_time = time.perf_counter() - start
+    exact_error = estimate_palette_error(reference, exact)['mean_error']
+    print(f"{'exact':>18} {exact_time:>12.3f} {exact_error:>14.2f} {'-':>20}")
+
+    for sample_size in SAMPLE_SIZES:
+        start = time.perf_counter()
+        sample = to_uint8(stratified_sample(image, sample_size))
+        palette = quantize_palette(sample)
+        elapsed = time.perf_counter() - start
+
+        estimate = estimate_palette_error(sample, palette)
+        real_error = estimate_palette_error(reference, palette)['mean_error']
+        estimated = f"{estimate['mean_error']:.2f} ± {estimate['error_bound']:.2f}"
+        print(f"{'approx ' + str(sample_size):>18} {elapsed:>12.3f} {real_error:>14.2f} {estimated:>20}")
+
+
+if __name__ == "__main__":
+    main()
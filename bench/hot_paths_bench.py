@@ -0,0 +1,413 @@
+# bench/hot_paths_bench.py
+"""
+Suite de benchmarks des chemins critiques, avec résultats JSON et détection de régression
+
+Chaque cas est mesuré à plusieurs tailles sur des données synthétiques déterministes
+(bench/synthetic_data.py). Les résultats sont écrits en JSON pour comparer deux révisions;
+la comparaison ne demande aucun accès réseau.
+
+    python bench/hot_paths_bench.py [--quick] [--only parse,mix] [--output results.json]
+    python bench/hot_paths_bench.py --baseline old.json [--threshold 1.25]   # mesure + comparaison
+    python bench/hot_paths_bench.py --compare old.json new.json              # comparaison seule
+
+Code de sortie 1 si un cas est plus lent que la référence au-delà du seuil.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(__file__))
+import numpy as np
+import synthetic_data as data
+
+# Temps minimal de mesure par cas et nombre de répétitions maximal
+MIN_TIME_S  = 0.2
+MAX_REPEATS = 20
+# En dessous de cette durée, les écarts relèvent du bruit et ne sont pas comparés
+MIN_COMPARED_S = 0.0005
+
+
+def load_extractor_node():
+    """Importe le node d'extraction comme le fait ComfyUI (paquet, folder_paths factice)"""
+    sys.modules.setdefault("folder_paths", types.SimpleNamespace(
+        get_input_directory=lambda: ".", get_annotated_filepath=lambda name: name))
+    if "pixel_palette_art" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "pixel_palette_art", os.path.join(ROOT, "__init__.py"), submodule_search_locations=[ROOT])
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["pixel_palette_art"] = module
+        spec.loader.exec_module(module)
+    return sys.modules["pixel_palette_art"].NODE_CLASS_MAPPINGS["PixelPaletteExtractor"]()
+
+
+# === Cas mesurés ===
+# Chaque cas: (nom, tailles complètes, tailles --quick, préparation(taille) -> appel à mesurer)
+
+def setup_parse_gimp(lines):
+    from lib.pixel_palette import PixelPalette
+    text = data.gimp_palette_text(lines)
+    return lambda: PixelPalette(text, "synthetic.gpl")
+
+
+def setup_parse_hex(lines):
+    from lib.pixel_palette import PixelPalette
+    text = data.hex_palette_text(lines)
+    return lambda: PixelPalette(text, "synthetic.txt")
+
+
+def setup_find_closest(palette_size):
+    palette = data.random_palette(palette_size)
+    targets = data.random_colors(100, seed=1)
+    return lambda: [palette.find_closest_color(target) for target in targets]
+
+
+def setup_unique_colors(count):
+    palette = data.random_palette(count, duplicate_ratio=0.5)
+    return palette.get_unique_colors
+
+
+def setup_sort_by_hue(count):
+    palette  = data.random_palette(count)
+    original = list(palette.colors)
+
+    def run():
+        palette.colors = list(original)  # le tri est en place: on repart de l'ordre initial
+        palette.sort_by_hue()
+    return run
+
+
+def setup_sort_by_brightness(count):
+    palette  = data.random_palette(count)
+    original = list(palette.colors)
+
+    def run():
+        palette.colors = list(original)  # le tri est en place: on repart de l'ordre initial
+        palette.sort_by_brightness()
+    return run
+
+
+def setup_sort_by_hilbert(count):
+    palette  = data.random_palette(count)
+    original = list(palette.colors)
+
+    def run():
+        palette.colors = list(original)  # le tri est en place: on repart de l'ordre initial
+        palette.sort_by("hilbert")
+    return run
+
+
+def setup_reduce_palette(count):
+    palette = data.random_palette(count)
+    return lambda: palette.reduce(16)
+
+
+def setup_library_search(count):
+    from lib.palette_library import PaletteLibrary
+    library = PaletteLibrary.from_palettes([data.random_palette(32, seed=i) for i in range(count)])
+    query = data.random_rgb(16, seed=count)
+    return lambda: library.search(query, k=10)
+
+
+def setup_rank_palettes(count):
+    from lib.palette_library import PaletteLibrary
+    from lib.palette_ranking import ranking_sample, rank_palettes
+    library = PaletteLibrary.from_palettes([data.random_palette(32, seed=i) for i in range(count)])
+    sample = ranking_sample(np.asarray(data.pixel_art_image(256, 256, colors=48).convert("RGB")))
+    return lambda: rank_palettes(library, sample, keep=10)
+
+
+def setup_pixel_grid(size):
+    from lib.pixel_grid import detect_grid, block_mode
+    image = np.asarray(data.pixel_art_image(size, size, colors=32, block=6).convert("RGB"))
+    return lambda: block_mode(image, detect_grid(image))
+
+
+def setup_sprite_sheet(size):
+    from lib.sprite_sheet import tile_view, tile_palettes, dedupe_tiles
+    image = np.asarray(data.pixel_art_image(size, size, colors=16, block=8).convert("RGB"))
+    def run():
+        tiles = tile_view(image, 16, 16).reshape(-1, 16, 16, 3)
+        return dedupe_tiles(tiles), tile_palettes(tiles)
+    return run
+
+
+def setup_tile_constraints(size):
+    from lib.tile_constraints import solve_tile_palettes
+    palette = data.random_palette(54)
+    image = np.asarray(data.pixel_art_image(size, size, colors=24, block=4).convert("RGB"))
+    indices = palette.map_indices(image, metric="lab")
+    return lambda: solve_tile_palettes(indices, palette.to_array(), 16, 16, colors=4, palettes=4,
+                                       shared="most_frequent")
+
+
+def setup_palette_assignment(count):
+    from lib.palette_assignment import assign_palettes
+    source, target = data.random_rgb(count, seed=1), data.random_rgb(count, seed=2)
+    return lambda: assign_palettes(source, target)
+
+
+def setup_palette_animation(size):
+    from lib.palette_animation import palette_stack, render_frames
+    palette = data.random_rgb(64)
+    indices = np.random.default_rng(0).integers(0, 64, size=(size, size))
+    stack = palette_stack(palette, 32, [(8, 23, 1.0), (40, 47, -0.5)], palette[::-1]).astype(np.float32) / 255.0
+    return lambda: render_frames(indices, stack)
+
+
+def setup_incremental_remap(size):
+    from lib.lut         import build_index_lut
+    from lib.frame_remap import IncrementalRemapper
+    palette = data.random_rgb(32)
+    lut = build_index_lut(palette, "lab", 6)
+    background = np.random.default_rng(0).integers(0, 256, size=(size, size, 3), dtype=np.uint8)
+    frames = []
+    for f in range(30):
+        frame = background.copy()
+        frame[f * size // 64:f * size // 64 + size // 8, f * size // 48:f * size // 48 + size // 8] = (255, 0, 0)
+        frames.append(frame)
+
+    def run():
+        remapper = IncrementalRemapper(palette, lut, 6, "bayer4", 32.0, 16)
+        for frame in frames:
+            remapper.remap(frame)
+    return run
+
+
+def setup_cvd_image(size):
+    from lib.lut          import lut_offsets
+    from lib.color_vision import build_cvd_lut
+    lut = build_cvd_lut("deutan", 1.0, 6)
+    pixels = np.random.default_rng(0).integers(0, 256, size=(size, size, 3), dtype=np.uint8)
+    return lambda: lut[lut_offsets(pixels, 6)]
+
+
+def setup_cvd_pairs(count):
+    from lib.color_vision import confusable_pairs
+    palette = data.random_rgb(count)
+    return lambda: confusable_pairs(palette, "deutan", 1.0, 5.0)
+
+
+def setup_palette_contrast(count):
+    from lib.palette_contrast import analyze_pairs
+    palette = data.random_rgb(count)
+    return lambda: analyze_pairs(palette, 4.5, 5.0)
+
+
+def setup_off_palette_check(size):
+    from lib.palette_check import check_pixels
+    palette = data.random_rgb(64)
+    pixels = palette[np.random.default_rng(0).integers(0, 64, size=(size, size))]
+    pixels[::97, ::89] = (1, 2, 3)
+    return lambda: check_pixels(pixels, palette)
+
+
+def setup_palette_lut(size):
+    from lib.color_lut import palette_lut, cube_text
+    palette = data.random_rgb(64)
+    return lambda: cube_text(palette_lut(palette, size, "lab"), size)
+
+
+def setup_apply_color_lut(height):
+    # Image 16:9 de hauteur height (2160: 4K UHD), LUT 33³ non linéaire
+    from lib.color_lut import ColorLut, lattice_colors, apply_color_lut
+    lut = ColorLut(((lattice_colors(33) / 255.0) ** 0.8).astype(np.float32), 33)
+    image = np.random.default_rng(0).random((height, height * 16 // 9, 3), dtype=np.float32)
+    return lambda: apply_color_lut(image, lut, "tetrahedral")
+
+
+def setup_format_rgb(count):
+    palette = data.random_palette(count)
+    return lambda: palette.to_formatted_string("rgb")
+
+
+def setup_format_hex(count):
+    palette = data.random_palette(count)
+    return lambda: palette.to_formatted_string("hex")
+
+
+def setup_extract_unique_colors(side):
+    node  = load_extractor_node()
+    image = data.pixel_art_image(side, side)
+    return lambda: node.extract_unique_colors(image)
+
+
+def setup_create_palette_image(count):
+    node   = load_extractor_node()
+    colors = data.extracted_colors(count)
+    return lambda: node.create_palette_image(colors, 16, 32, False, 12)
+
+
+def setup_create_palette_image_indices(count):
+    node   = load_extractor_node()
+    colors = data.extracted_colors(count)
+    return lambda: node.create_palette_image(colors, 16, 32, True, 12)
+
+
+def setup_mix(color_space):
+    def setup(count):
+        pairs = list(zip(data.random_colors(count), data.random_colors(count, seed=1)))
+        for color, _ in pairs:
+            color.color_space = color_space
+        return lambda: [a.mix_with(b, 0.3) for a, b in pairs]
+    return setup
+
+
+CASES = [
+    ("parse_gimp",                    (10, 1000, 100_000, 1_000_000), (10, 1000, 10_000), setup_parse_gimp),
+    ("parse_hex",                     (10, 1000, 100_000, 1_000_000), (10, 1000, 10_000), setup_parse_hex),
+    ("find_closest_color",            (16, 256, 4096),                (16, 256),          setup_find_closest),
+    ("get_unique_colors",             (256, 10_000, 100_000),         (256, 10_000),      setup_unique_colors),
+    ("sort_by_hue",                   (256, 10_000, 100_000),         (256, 10_000),      setup_sort_by_hue),
+    ("sort_by_brightness",            (256, 10_000, 100_000),         (256, 10_000),      setup_sort_by_brightness),
+    ("sort_by_hilbert",               (256, 10_000, 100_000),         (256, 10_000),      setup_sort_by_hilbert),
+    ("reduce_palette_to_16",          (256, 4096, 20_000),            (256, 4096),        setup_reduce_palette),
+    ("library_search_chamfer",        (100, 1000, 10_000),            (100, 1000),        setup_library_search),
+    ("rank_palettes_for_image",       (100, 1000, 5000),              (100, 1000),        setup_rank_palettes),
+    ("pixel_grid_downscale",          (256, 1024, 2048),              (256, 1024),        setup_pixel_grid),
+    ("sprite_sheet_slice_16px",       (256, 1024, 2048),              (256, 1024),        setup_sprite_sheet),
+    ("retro_tile_palettes_nes",       (256, 1024),                    (256,),             setup_tile_constraints),
+    ("palette_assignment",            (16, 64, 256),                  (16, 64, 256),      setup_palette_assignment),
+    ("palette_animation_32_frames",   (128, 256, 512),                (128, 256),         setup_palette_animation),
+    ("incremental_remap_30_frames",   (128, 512, 1024),               (128, 512),         setup_incremental_remap),
+    ("cvd_simulate_image",            (256, 1024, 2048),              (256, 1024),        setup_cvd_image),
+    ("cvd_confusable_pairs",          (16, 64, 256),                  (16, 64, 256),      setup_cvd_pairs),
+    ("palette_contrast_audit",        (256, 1024, 4096),              (256, 1024),        setup_palette_contrast),
+    ("off_palette_check",             (256, 1024, 4096),              (256, 1024),        setup_off_palette_check),
+    ("palette_lut_cube",              (17, 33, 65),                   (17, 33),           setup_palette_lut),
+    ("apply_color_lut_tetrahedral",   (540, 1080, 2160),              (270, 540),         setup_apply_color_lut),
+    ("to_formatted_string_rgb",       (256, 10_000, 100_000),         (256, 10_000),      setup_format_rgb),
+    ("to_formatted_string_hex",       (256, 10_000, 100_000),         (256, 10_000),      setup_format_hex),
+    ("extract_unique_colors",         (64, 512, 2048),                (64, 512),          setup_extract_unique_colors),
+    ("create_palette_image",          (16, 256),                      (16, 256),          setup_create_palette_image),
+    ("create_palette_image_indices",  (16, 256),                      (16, 256),          setup_create_palette_image_indices),
+    ("mix_rgb",                       (1000, 10_000),                 (1000,),            setup_mix("rgb")),
+    ("mix_hsv",                       (1000, 10_000),                 (1000,),            setup_mix("hsv")),
+]
+
+
+# === Mesure ===
+
+def time_call(fn):
+    """Répète fn jusqu'à MIN_TIME_S (au moins une fois); retourne les durées en secondes"""
+    durations = []
+    started = time.perf_counter()
+    while len(durations) < MAX_REPEATS:
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+        if time.perf_counter() - started >= MIN_TIME_S:
+            break
+    return durations
+
+
+def run_suite(quick=False, only=None):
+    results = {}
+    for name, sizes, quick_sizes, setup in CASES:
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        for size in (quick_sizes if quick else sizes):
+            fn = setup(size)
+            fn()  # échauffement: imports différés, caches, tables
+            durations = time_call(fn)
+            key = f"{name}[{size}]"
+            results[key] = {
+                "case":     name,
+                "size":     size,
+                "median_s": statistics.median(durations),
+                "min_s":    min(durations),
+                "repeats":  len(durations),
+            }
+            print(f"{key:<42}{results[key]['median_s'] * 1000:>12.3f} ms  (x{len(durations)})")
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment():
+    return {
+        "revision": git_revision(),
+        "python":   platform.python_version(),
+        "numpy":    np.__version__,
+        "machine":  platform.machine(),
+        "system":   platform.system(),
+        "cpus":     os.cpu_count(),
+        "date":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+# === Comparaison ===
+
+def compare(baseline, current, threshold):
+    """Compare deux jeux de résultats; retourne la liste des cas en régression"""
+    regressions = []
+    print(f"{'cas':<42}{'référence':>12}{'actuel':>12}{'ratio':>8}")
+    for key, result in current["results"].items():
+        reference = baseline["results"].get(key)
+        if reference is None:
+            continue
+        old, new = reference["median_s"], result["median_s"]
+        ratio = new / old if old > 0 else float("inf")
+        flag = ""
+        if max(old, new) >= MIN_COMPARED_S and ratio > threshold:
+            regressions.append(key)
+            flag = "  RÉGRESSION"
+        print(f"{key:<42}{old * 1000:>10.3f}ms{new * 1000:>10.3f}ms{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true", help="petites tailles uniquement")
+    parser.add_argument("--only", default="", help="préfixes de cas séparés par des virgules")
+    parser.add_argument("--output", default="", help="fichier JSON des résultats")
+    parser.add_argument("--baseline", default="", help="résultats de référence à comparer")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare deux fichiers de résultats sans rien mesurer")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="ratio actuel / référence au-delà duquel un cas est en régression")
+    args = parser.parse_args()
+
+    if args.compare:
+        current  = load_results(args.compare[1])
+        baseline = load_results(args.compare[0])
+    else:
+        only = [prefix.strip() for prefix in args.only.split(",") if prefix.strip()]
+        current = {"environment": environment(), "quick": args.quick,
+                   "results": run_suite(args.quick, only)}
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                json.dump(current, f, indent=2)
+            print(f"résultats écrits dans {args.output}")
+        if not args.baseline:
+            return 0
+        baseline = load_results(args.baseline)
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} régression(s) au-delà de x{args.threshold}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
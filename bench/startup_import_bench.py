@@ -0,0 +1,96 @@
+# bench/startup_import_bench.py
+"""
+Temps d'import de l'extension au démarrage de ComfyUI, mesuré avec python -X importtime
+
+L'extension est importée dans un interpréteur neuf (comme ComfyUI au chargement des
+custom nodes), avec un module folder_paths factice. On rapporte le temps cumulé de
+l'extension et les dépendances lourdes (numpy, torch, PIL) chargées à l'import:
+elles ne doivent l'être qu'à la première exécution d'un node.
+
+    python bench/startup_import_bench.py [--max-ms 50] [--runs 5]
+
+Code de sortie 1 si le temps médian dépasse --max-ms ou si une dépendance lourde est chargée.
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PACKAGE_NAME = "pixel_palette_art"
+HEAVY_MODULES = ("numpy", "torch", "PIL")
+
+# Script exécuté dans le sous-process: importe l'extension comme le fait ComfyUI
+IMPORT_SCRIPT = f"""
+import importlib.util, sys, types
+sys.modules["folder_paths"] = types.SimpleNamespace(
+    get_input_directory=lambda: ".", get_annotated_filepath=lambda name: name)
+spec = importlib.util.spec_from_file_location(
+    {PACKAGE_NAME!r}, {os.path.join(ROOT, "__init__.py")!r}, submodule_search_locations=[{ROOT!r}])
+module = importlib.util.module_from_spec(spec)
+sys.modules[{PACKAGE_NAME!r}] = module
+spec.loader.exec_module(module)
+assert module.NODE_CLASS_MAPPINGS
+print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))
+"""
+
+# Ligne de -X importtime: "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_import():
+    """Importe l'extension dans un interpréteur neuf; retourne (ms extension, ms total, modules lourds)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_SCRIPT],
+        capture_output=True, text=True, check=True,
+    )
+    extension_us = 0
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, name = int(match.group(1)), match.group(4)
+        total_us += self_us
+        if name == PACKAGE_NAME or name.startswith(PACKAGE_NAME + "."):
+            extension_us += self_us
+        # les imports de numpy/torch/PIL déclenchés par l'extension comptent aussi
+        elif name.split(".")[0] in HEAVY_MODULES:
+            extension_us += self_us
+    heavy = [name for name in result.stdout.strip().split(",") if name]
+    return extension_us / 1000.0, total_us / 1000.0, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-ms", type=float, default=50.0,
+                        help="temps médian d'import maximal de l'extension (ms)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = []
+    heavy = []
+    for _ in range(args.runs):
+        extension_ms, total_ms, heavy = measure_import()
+        samples.append(extension_ms)
+
+    median_ms = statistics.median(samples)
+    print(f"{'import extension (médiane)':<30}{median_ms:>10.2f} ms")
+    print(f"{'min / max':<30}{min(samples):>10.2f} / {max(samples):.2f} ms")
+    print(f"{'dernier import complet':<30}{total_ms:>10.2f} ms")
+    print(f"{'dépendances lourdes chargées':<30}{', '.join(heavy) or 'aucune':>10}")
+
+    failed = False
+    if median_ms > args.max_ms:
+        print(f"RÉGRESSION: {median_ms:.2f} ms > {args.max_ms:.2f} ms")
+        failed = True
+    if heavy:
+        print(f"RÉGRESSION: import de {', '.join(heavy)} au démarrage")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# bench/synthetic_data.py
+"""
+Générateurs de données synthétiques pour les benchmarks
+
+Toutes les fonctions sont déterministes (graine fixe): deux révisions mesurées
+avec les mêmes paramètres travaillent sur exactement les mêmes données.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from PIL import Image
+from lib.pixel_palette import PixelPalette
+from lib.pixel_color   import PixelColor
+
+
+def random_rgb(count, seed=0):
+    """Tableau [count, 3] de couleurs uint8 aléatoires"""
+    return np.random.default_rng(seed).integers(0, 256, size=(count, 3), dtype=np.uint8)
+
+
+def gimp_palette_text(lines, seed=0, with_names=True):
+    """Contenu d'un fichier .gpl de `lines` couleurs (en-tête et commentaires compris)"""
+    colors = random_rgb(lines, seed)
+    header = ["GIMP Palette", "Name: Synthetic", "Columns: 16", "#"]
+    if with_names:
+        body = [f"{r:3d} {g:3d} {b:3d}\tcolor_{i}" for i, (r, g, b) in enumerate(colors.tolist())]
+    else:
+        body = [f"{r:3d} {g:3d} {b:3d}" for r, g, b in colors.tolist()]
+    return "\n".join(header + body) + "\n"
+
+
+def hex_palette_text(lines, seed=0):
+    """Contenu d'une palette au format générique hexadécimal (RRGGBB par ligne)"""
+    # Sans '#': dans le format générique, une ligne commençant par '#' est un commentaire
+    colors = random_rgb(lines, seed)
+    return "\n".join(f"{r:02x}{g:02x}{b:02x}" for r, g, b in colors.tolist()) + "\n"
+
+
+def random_palette(count, seed=0, duplicate_ratio=0.0):
+    """PixelPalette de `count` couleurs, dont une part `duplicate_ratio` de doublons"""
+    rng = np.random.default_rng(seed)
+    distinct = max(1, int(round(count * (1.0 - duplicate_ratio))))
+    colors = random_rgb(distinct, seed)
+    if count > distinct:
+        colors = np.concatenate([colors, colors[rng.integers(0, distinct, count - distinct)]])
+        colors = colors[rng.permutation(count)]
+
+    palette = PixelPalette()
+    palette.format_type = "generic"
+    palette.colors = [PixelColor(r, g, b, f"color_{i}") for i, (r, g, b) in enumerate(colors.tolist())]
+    return palette
+
+
+def random_colors(count, seed=0):
+    """Liste de PixelColor (cibles de find_closest_color, couples à mélanger)"""
+    return [PixelColor(r, g, b) for r, g, b in random_rgb(count, seed).tolist()]
+
+
+def pixel_art_image(width, height, colors=32, block=4, seed=0):
+    """
+    Image PIL de pixel art: aplats de `block` pixels tirés dans une palette de `colors` couleurs
+
+    Le nombre de couleurs distinctes reste borné, comme pour une vraie image indexée.
+    """
+    rng = np.random.default_rng(seed)
+    palette = random_rgb(colors, seed)
+    cells = rng.integers(0, colors, size=(height // block + 1, width // block + 1))
+    indices = np.repeat(np.repeat(cells, block, axis=0), block, axis=1)[:height, :width]
+    return Image.fromarray(palette[indices], 'RGB')
+
+
+def extracted_colors(count, seed=0):
+    """Couleurs au format de PixelPaletteExtractorNode.extract_unique_colors: (r, g, b, index)"""
+    return [(r, g, b, i) for i, (r, g, b) in enumerate(random_rgb(count, seed).tolist())]
@@ -0,0 +1,63 @@
+# bench/worker_pool_scaling_bench.py
+"""
+Benchmark de montée en charge du pool de workers (1 à N cœurs)
+
+    python bench/worker_pool_scaling_bench.py [max_workers] [batch] [taille]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.parallel    import WorkerPool, BatchScheduler
+from lib.pixel_array import to_uint8, pack_rgb
+
+
+def extract_frame(frame):
+    """Charge de travail représentative: conversion uint8 + couleurs uniques"""
+    return np.unique(pack_rgb(to_uint8(frame)))
+
+
+def extract_tiled(scheduler, frame):
+    """Même travail découpé en bandes de lignes"""
+    parts = scheduler.map_tiles(extract_frame, frame)
+    return np.unique(np.concatenate(parts))
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    batch       = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    size        = int(sys.argv[3]) if len(sys.argv) > 3 else 1024
+
+    rng    = np.random.default_rng(0)
+    frames = rng.random((batch, size, size, 3), dtype=np.float32)
+    pool   = WorkerPool(max_workers=max_workers)
+
+    print(f"batch={batch} taille={size}x{size} cœurs={os.cpu_count()}")
+    print(f"{'workers':>8} {'batch (s)':>10} {'speedup':>8} {'tuiles (s)':>11} {'speedup':>8}")
+
+    base_batch = base_tiles = None
+    for workers in range(1, max_workers + 1):
+        scheduler  = BatchScheduler(workers=workers, pool=pool)
+        t_batch    = timed(lambda: scheduler.map_batch(extract_frame, frames))
+        t_tiles    = timed(lambda: extract_tiled(scheduler, frames[0]))
+        base_batch = base_batch or t_batch
+        base_tiles = base_tiles or t_tiles
+        print(f"{workers:>8} {t_batch:>10.4f} {base_batch / t_batch:>8.2f} "
+              f"{t_tiles:>11.4f} {base_tiles / t_tiles:>8.2f}")
+
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
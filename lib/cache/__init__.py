@@ -0,0 +1,9 @@
+# lib/cache/__init__.py
+"""
+Cache de résultats partagé par les nodes, indexé sur le contenu des images
+"""
+
+from .fingerprint  import fingerprint
+from .result_cache import ResultCache, get_result_cache, make_key, estimate_nbytes
+
+__all__ = ['fingerprint', 'ResultCache', 'get_result_cache', 'make_key', 'estimate_nbytes']
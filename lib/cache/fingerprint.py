@@ -0,0 +1,29 @@
+# lib/cache/fingerprint.py
+from __future__ import annotations
+import hashlib
+
+from ..lazy_import import lazy_import
+from ..pixel_array import to_uint8
+
+np = lazy_import("numpy")
+
+
+def _as_numpy(image) -> np.ndarray:
+    """Accepte un tensor torch (sans importer torch) ou tout objet array-like"""
+    if hasattr(image, "cpu") and hasattr(image, "numpy"):
+        image = image.detach().cpu().numpy() if hasattr(image, "detach") else image.cpu().numpy()
+    return np.asarray(image)
+
+
+def fingerprint(image) -> str:
+    """
+    Empreinte du contenu d'une image: hash complet du buffer uint8
+
+    Toujours recalculée: c'est la clé de correction du cache de résultats, une image
+    modifiée en place ou un buffer réutilisé doit changer d'empreinte.
+    """
+    pixels = np.ascontiguousarray(to_uint8(_as_numpy(image)))
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{pixels.shape}".encode())
+    digest.update(memoryview(pixels).cast("B"))
+    return digest.hexdigest()
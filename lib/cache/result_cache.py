@@ -0,0 +1,129 @@
+# lib/cache/result_cache.py
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Budget mémoire du cache partagé, en Mo
+CACHE_MB_ENV_VAR  = "PIXEL_PALETTE_CACHE_MB"
+DEFAULT_BUDGET_MB = 512
+
+
+def make_key(node_name: str, content_fingerprint: str, **params) -> tuple:
+    """Clé de cache: node + empreinte du contenu + paramètres (triés)"""
+    return (node_name, content_fingerprint) + tuple(sorted(params.items()))
+
+
+def estimate_nbytes(value: Any) -> int:
+    """Estime la taille d'un résultat (arrays NumPy, tensors torch, tuples, listes)"""
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return int(value.element_size() * value.nelement())
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Cache LRU borné en octets, partagé par tout le process
+    Les entrées les plus anciennes sont évincées quand le budget est dépassé
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None) -> bool:
+        """Ajoute un résultat; refusé s'il dépasse à lui seul le budget"""
+        size = estimate_nbytes(value) if nbytes is None else int(nbytes)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes_held -= previous[1]
+            self._entries[key] = (value, size)
+            self.bytes_held += size
+
+            while self.bytes_held > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes_held -= evicted_size
+                self.evictions += 1
+        return True
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Retourne le résultat en cache ou le calcule puis le mémorise"""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes_held = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits":       self.hits,
+                "misses":     self.misses,
+                "entries":    len(self._entries),
+                "bytes_held": self.bytes_held,
+                "max_bytes":  self.max_bytes,
+                "evictions":  self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __str__(self):
+        return (f"ResultCache({len(self._entries)} entrées, "
+                f"{self.bytes_held}/{self.max_bytes} octets, hits: {self.hits}, misses: {self.misses})")
+
+    def __repr__(self):
+        return self.__str__()
+
+
+_shared_cache: Optional[ResultCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Retourne le cache partagé du process (budget: PIXEL_PALETTE_CACHE_MB)"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                try:
+                    budget_mb = float(os.environ.get(CACHE_MB_ENV_VAR, DEFAULT_BUDGET_MB))
+                except ValueError:
+                    budget_mb = DEFAULT_BUDGET_MB
+                _shared_cache = ResultCache(int(budget_mb * 1024 * 1024))
+    return _shared_cache
@@ -1,6 +1,7 @@
 # lib/color/__init__.py
 
-from .color_spaces import *  # exécute les registers
-from .color_space_registry import *  # exécute les registers
-from .color_space_context  import *  # exécute les registers
+# Les espaces colorimétriques (lib/color/color_spaces) ne sont plus importés ici:
+# ils s'enregistrent au premier usage via ColorSpaceRegistry.load_builtin_spaces()
+from .color_space_registry import *
+from .color_space_context  import *
 
@@ -0,0 +1,93 @@
+# lib/color/color_math.py
+"""
+Conversions colorimétriques vectorisées (NumPy)
+Les entrées RGB sont des tableaux [..., 3] en uint8 (0-255) ou en flottants (0-255)
+"""
+from __future__ import annotations
+from ..lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+# Blanc de référence D65
+_WHITE_D65 = (0.95047, 1.0, 1.08883)
+
+# sRGB linéaire -> XYZ (D65)
+_RGB_TO_XYZ = (
+    (0.4124564, 0.3575761, 0.1804375),
+    (0.2126729, 0.7151522, 0.0721750),
+    (0.0193339, 0.1191920, 0.9503041),
+)
+
+
+def srgb_to_linear(rgb) -> np.ndarray:
+    """sRGB 0-255 -> RGB linéaire 0-1"""
+    c = np.asarray(rgb, dtype=np.float64) / 255.0
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(linear) -> np.ndarray:
+    """RGB linéaire 0-1 -> sRGB 0-255 (flottant, non arrondi)"""
+    c = np.clip(np.asarray(linear, dtype=np.float64), 0.0, 1.0)
+    return np.where(c <= 0.0031308, c * 12.92, 1.055 * c ** (1 / 2.4) - 0.055) * 255.0
+
+
+def rgb_to_xyz(rgb) -> np.ndarray:
+    """sRGB 0-255 -> XYZ (D65)"""
+    return srgb_to_linear(rgb) @ np.asarray(_RGB_TO_XYZ).T
+
+
+def rgb_to_lab(rgb) -> np.ndarray:
+    """sRGB 0-255 -> CIE L*a*b* (D65)"""
+    xyz = rgb_to_xyz(rgb) / np.asarray(_WHITE_D65)
+    epsilon, kappa = 216 / 24389, 24389 / 27
+    f = np.where(xyz > epsilon, np.cbrt(xyz), (kappa * xyz + 16) / 116)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def lab_to_rgb(lab) -> np.ndarray:
+    """CIE L*a*b* (D65) -> sRGB 0-255 (flottant, hors gamut ramené dans [0, 255])"""
+    lab = np.asarray(lab, dtype=np.float64)
+    fy = (lab[..., 0] + 16) / 116
+    f = np.stack([fy + lab[..., 1] / 500, fy, fy - lab[..., 2] / 200], axis=-1)
+    epsilon, kappa = 216 / 24389, 24389 / 27
+    xyz = np.where(f ** 3 > epsilon, f ** 3, (116 * f - 16) / kappa) * np.asarray(_WHITE_D65)
+    return linear_to_srgb(xyz @ np.linalg.inv(np.asarray(_RGB_TO_XYZ)).T)
+
+
+def delta_e76(lab_a, lab_b) -> np.ndarray:
+    """Distance ΔE 1976 (euclidienne dans Lab), avec broadcast"""
+    diff = np.asarray(lab_a, dtype=np.float64) - np.asarray(lab_b, dtype=np.float64)
+    return np.sqrt(np.sum(diff * diff, axis=-1))
+
+
+# RGB linéaire -> LMS, puis LMS^(1/3) -> OKLab (Björn Ottosson, 2020)
+_RGB_TO_LMS = (
+    (0.4122214708, 0.5363325363, 0.0514459929),
+    (0.2119034982, 0.6806995451, 0.1073969566),
+    (0.0883024619, 0.2817188376, 0.6299787005),
+)
+_LMS_TO_OKLAB = (
+    (0.2104542553,  0.7936177850, -0.0040720468),
+    (1.9779984951, -2.4285922050,  0.4505937099),
+    (0.0259040371,  0.7827717662, -0.8086757660),
+)
+
+
+def rgb_to_oklab(rgb) -> np.ndarray:
+    """sRGB 0-255 -> OKLab (L dans [0, 1])"""
+    lms = srgb_to_linear(rgb) @ np.asarray(_RGB_TO_LMS).T
+    return np.cbrt(lms) @ np.asarray(_LMS_TO_OKLAB).T
+
+
+def oklab_to_oklch(oklab) -> np.ndarray:
+    """OKLab -> OKLCH: luminance, chroma, teinte en degrés [0, 360)"""
+    oklab = np.asarray(oklab, dtype=np.float64)
+    lch = np.empty_like(oklab)
+    lch[..., 0] = oklab[..., 0]
+    lch[..., 1] = np.hypot(oklab[..., 1], oklab[..., 2])
+    lch[..., 2] = np.degrees(np.arctan2(oklab[..., 2], oklab[..., 1])) % 360.0
+    return lch
@@ -4,6 +4,7 @@ class ColorSpaceRegistry:
     """Registry pour gérer les différents espaces colorimétriques."""
 
     _spaces = {}
+    _builtin_loaded = False
 
     @classmethod
     def register(cls, name, exporter_class=None, mixer_class=None):
@@ -22,6 +23,13 @@ class ColorSpaceRegistry:
         #
         #  print(cls._spaces)
 
+    @classmethod
+    def load_builtin_spaces(cls):
+        """Importe les espaces fournis (rgb, hsv...), qui s'enregistrent à l'import de leur module."""
+        if not cls._builtin_loaded:
+            from . import color_spaces  # noqa: F401
+            cls._builtin_loaded = True
+
     @classmethod
     def reset(cls):
         """Réinitialise complètement le registre."""
@@ -1,4 +1,7 @@
 from ...color_space_registry import ColorSpaceRegistry
+from ....lazy_import import lazy_import
+
+np = lazy_import("numpy")
 
 class RGBMixer:
     def mix_with(color_a, a, ratio):
@@ -8,6 +11,22 @@ class RGBMixer:
 
         return r, g, b
 
+    def mix_arrays(rgb_a, rgb_b, ratios):
+        """
+        Version vectorisée de mix_with: couleurs [N, 3] et ratios [F] -> [F, N, 3] uint8
+        (mêmes arrondis: round et np.round arrondissent tous deux au pair)
+
+        Les couleurs [..., N, 3] et les ratios [..., N] (ou [F, 1]) sont diffusés
+        ensemble: une couleur source par image, par exemple couleurs [F, N, 3] et ratios[:, None].
+        """
+        a = np.asarray(rgb_a, dtype=np.float64)
+        b = np.asarray(rgb_b, dtype=np.float64)
+        ratios = np.asarray(ratios, dtype=np.float64)
+        if ratios.ndim == 1:
+            ratios = ratios[:, None]
+        ratios = ratios[..., None]
+        return np.round(a * (1 - ratios) + b * ratios).astype(np.uint8)
+
     # TODO: extract private method mix_channel ?
 
 ColorSpaceRegistry.register('rgb', mixer_class = RGBMixer)
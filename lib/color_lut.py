@@ -0,0 +1,300 @@
+# lib/color_lut.py
+"""
+LUT 3D couleur (RGB -> RGB) au format .cube (Adobe/Resolve) et Hald CLUT (image PNG)
+
+Une projection sur une palette (plus proche couleur, sans tramage) est cuite sur une
+grille size³: tous les points de la grille sont évalués d'un coup contre la palette
+(produit matriciel par blocs, voir lut_builder.nearest_indices), puis écrits dans un
+format que les moteurs de jeu et logiciels de compositing appliquent sur GPU.
+
+Ordre des points (les deux formats): rouge le plus rapide, puis vert, puis bleu.
+Une Hald CLUT de niveau L est une grille de L² points par axe rangée dans une image
+carrée de L³ x L³ pixels.
+
+Application: les fichiers .cube (jusqu'à 65³ lignes de texte) sont analysés d'un bloc
+par NumPy et gardés en cache par chemin, taille et date de modification. Les images
+sont traitées par tranches de lignes (mémoire bornée même en 4K): interpolation
+trilinéaire (8 sommets) ou tétraédrique (4 sommets, celle des moteurs de rendu).
+"""
+from __future__ import annotations
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Tuple, Union
+
+from .lazy_import      import lazy_import
+from .lut.lut_builder  import METRICS, to_metric_space, nearest_indices
+
+np    = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+LUT_FORMATS = ("cube", "hald")
+LUT_EXTENSIONS = (".cube", ".png")
+INTERPOLATIONS = ("trilinear", "tetrahedral", "nearest")
+
+# Tailles usuelles des .cube et niveaux de Hald CLUT (niveau 8: 64³ points, image 512x512)
+CUBE_SIZES  = (17, 33, 65)
+HALD_LEVELS = tuple(range(2, 13))
+
+
+def lattice_colors(size: int) -> np.ndarray:
+    """Points [size³, 3] (0-255, flottants) d'une grille size³, rouge le plus rapide"""
+    if size < 2:
+        raise ValueError(f"Taille de grille invalide: {size}")
+    axis = np.arange(size, dtype=np.float64) * (255.0 / (size - 1))
+    blue, green, red = np.meshgrid(axis, axis, axis, indexing="ij")
+    return np.stack([red.ravel(), green.ravel(), blue.ravel()], axis=1)
+
+
+def palette_lut(palette_rgb, size: int, metric: str = "lab") -> np.ndarray:
+    """Table [size³, 3] uint8: couleur de palette la plus proche de chaque point de la grille"""
+    if metric not in METRICS:
+        raise ValueError(f"Métrique inconnue: {metric}. Disponibles: {list(METRICS)}")
+    palette = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+    if len(palette) == 0:
+        raise ValueError("Palette vide")
+    indices = nearest_indices(to_metric_space(lattice_colors(size), metric), to_metric_space(palette, metric))
+    return palette[indices]
+
+
+def hald_size(level: int) -> int:
+    """Points par axe d'une Hald CLUT de niveau level"""
+    if level not in HALD_LEVELS:
+        raise ValueError(f"Niveau de Hald CLUT invalide: {level}. Disponibles: {list(HALD_LEVELS)}")
+    return level * level
+
+
+def hald_image(table, level: int) -> np.ndarray:
+    """Image [L³, L³, 3] d'une table [(L²)³, 3] rangée rouge le plus rapide"""
+    table = np.asarray(table)
+    side = level ** 3
+    if len(table) != side * side:
+        raise ValueError(f"Table de {len(table)} points, attendu {side * side} (niveau {level})")
+    return table.reshape(side, side, 3)
+
+
+def cube_text(table, size: int, title: str = "") -> str:
+    """Contenu d'un fichier .cube (valeurs 0-1, 6 décimales) d'une table [size³, 3] uint8"""
+    table = np.asarray(table, dtype=np.uint8).reshape(-1, 3)
+    if len(table) != size ** 3:
+        raise ValueError(f"Table de {len(table)} points, attendu {size ** 3} (taille {size})")
+    # 256 valeurs possibles par canal: formatées une fois, puis assemblées
+    levels = np.array([f"{v / 255.0:.6f}" for v in range(256)])
+    header = [f'TITLE "{title}"'] if title else []
+    header += [f"LUT_3D_SIZE {size}", "DOMAIN_MIN 0.0 0.0 0.0", "DOMAIN_MAX 1.0 1.0 1.0"]
+    rows = map(" ".join, levels[table].tolist())
+    return "\n".join(header) + "\n" + "\n".join(rows) + "\n"
+
+
+def save_color_lut(table, path: Union[str, Path], format_type: str = "cube", size: int = 33,
+                   title: str = "") -> Path:
+    """
+    Enregistre une table [size³, 3] uint8 en .cube ou en Hald CLUT PNG (size = niveau²)
+
+    Le fichier est écrit à côté puis renommé: pas de fichier partiel en cas d'erreur.
+    """
+    if format_type not in LUT_FORMATS:
+        raise ValueError(f"Format de LUT inconnu: {format_type}. Disponibles: {list(LUT_FORMATS)}")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        if format_type == "cube":
+            tmp_path.write_text(cube_text(table, size, title), encoding="utf-8")
+        else:
+            level = int(round(size ** 0.5))
+            if level * level != size:
+                raise ValueError(f"Taille {size} impossible en Hald CLUT (carré d'un niveau attendu)")
+            Image.fromarray(np.ascontiguousarray(hald_image(table, level))).save(tmp_path, format="PNG")
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+@dataclass(frozen=True)
+class ColorLut:
+    """LUT 3D chargée: table [size³, 3] float32 (0-1, rouge le plus rapide) et domaine d'entrée"""
+    table: np.ndarray
+    size: int
+    domain_min: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    domain_max: Tuple[float, float, float] = (1.0, 1.0, 1.0)
+    title: str = ""
+
+
+def parse_cube(text: str) -> ColorLut:
+    """
+    Analyse le contenu d'un fichier .cube 3D
+
+    Les mots-clés (TITLE, LUT_3D_SIZE, DOMAIN_MIN/MAX) et commentaires sont lus ligne à
+    ligne; les lignes de valeurs sont rassemblées et converties d'un seul appel.
+    """
+    size, title = 0, ""
+    domain_min, domain_max = (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)
+    lines = text.splitlines()
+    start = len(lines)
+    for number, line in enumerate(lines):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        keyword = line.split(None, 1)[0].upper()
+        if keyword[0].isdigit() or keyword[0] in "-+.":
+            start = number
+            break
+        if keyword == "TITLE":
+            title = line[5:].strip().strip('"')
+        elif keyword == "LUT_3D_SIZE":
+            size = int(line.split()[1])
+        elif keyword == "LUT_1D_SIZE":
+            raise ValueError("LUT 1D non supportée (LUT_3D_SIZE attendu)")
+        elif keyword == "DOMAIN_MIN":
+            domain_min = tuple(float(v) for v in line.split()[1:4])
+        elif keyword == "DOMAIN_MAX":
+            domain_max = tuple(float(v) for v in line.split()[1:4])
+    if size < 2:
+        raise ValueError("LUT_3D_SIZE absent ou invalide")
+    if any(high <= low for low, high in zip(domain_min, domain_max)):
+        raise ValueError(f"Domaine invalide: {domain_min} -> {domain_max}")
+
+    data = "\n".join(line.split("#", 1)[0] for line in lines[start:])
+    try:
+        values = np.array(data.split(), dtype=np.float32)
+    except ValueError as e:
+        raise ValueError(f"Valeur non numérique dans la table: {e}") from None
+    if values.size != size ** 3 * 3:
+        raise ValueError(f"{values.size // 3} points lus, attendu {size ** 3} (taille {size})")
+    return ColorLut(values.reshape(-1, 3), size, domain_min, domain_max, title)
+
+
+def read_hald(path: Union[str, Path]) -> ColorLut:
+    """Lit une Hald CLUT (image carrée de L³ x L³ pixels) en table [(L²)³, 3] 0-1"""
+    with Image.open(path) as image:
+        pixels = np.asarray(image.convert("RGB"))
+    side = pixels.shape[1]
+    level = int(round(side ** (1.0 / 3.0)))
+    if pixels.shape[0] != side or level ** 3 != side or level * level < 2:
+        raise ValueError(f"Image {pixels.shape[1]}x{pixels.shape[0]}: pas une Hald CLUT (côté L³ attendu)")
+    table = pixels.reshape(-1, 3).astype(np.float32) / 255.0
+    return ColorLut(table, level * level, title=Path(path).stem)
+
+
+_cache: "OrderedDict[tuple, ColorLut]" = OrderedDict()
+_cache_lock = threading.Lock()
+_CACHE_SIZE = 8
+
+
+def load_color_lut(path: Union[str, Path]) -> ColorLut:
+    """
+    Charge une LUT .cube ou Hald CLUT PNG
+
+    Mise en cache par (chemin, taille, date de modification): un fichier modifié est relu.
+    """
+    path = os.path.abspath(os.fspath(path))
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".cube":
+        with open(path, encoding="utf-8", errors="replace") as file:
+            lut = parse_cube(file.read())
+    elif extension == ".png":
+        lut = read_hald(path)
+    else:
+        raise ValueError(f"Format de LUT non supporté: {extension}. Extensions: {list(LUT_EXTENSIONS)}")
+
+    with _cache_lock:
+        _cache[key] = lut
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return lut
+
+
+# Pixels traités par tranche: une dizaine de tableaux temporaires [n, 3] float32 (~20 Mo)
+_CHUNK_PIXELS = 1 << 17
+
+
+def _lattice_coordinates(values, lut: ColorLut):
+    """Coordonnées [n, 3] dans la grille (0 à size-1) des valeurs d'entrée, bornées au domaine"""
+    low = np.asarray(lut.domain_min, dtype=np.float32)
+    scale = (lut.size - 1) / (np.asarray(lut.domain_max, dtype=np.float32) - low)
+    coordinates = (values - low) * scale
+    return np.clip(coordinates, 0.0, lut.size - 1, out=coordinates)
+
+
+def _interpolate(values, lut: ColorLut, interpolation: str) -> np.ndarray:
+    """Valeurs [n, 3] (unités du domaine) transformées par la LUT: [n, 3] float32"""
+    size = lut.size
+    # np.take sur l'axe 0: plusieurs fois plus rapide que l'indexation avancée table[index]
+    take = partial(np.take, lut.table, axis=0)
+    coordinates = _lattice_coordinates(values, lut)
+    # Pas dans la table aplatie (rouge le plus rapide) le long de r, g, b
+    strides = np.array([1, size, size * size], dtype=np.int32)
+
+    if interpolation == "nearest":
+        index = (np.rint(coordinates).astype(np.int32) * strides).sum(axis=1)
+        return take(index)
+
+    corner = np.minimum(coordinates.astype(np.int32), size - 2)
+    fraction = coordinates - corner
+    base = (corner * strides).sum(axis=1)
+
+    if interpolation == "trilinear":
+        fr, fg, fb = (fraction[:, k:k + 1] for k in range(3))
+        step_r, step_g, step_b = (int(s) for s in strides)
+        # Interpolations successives le long de r (4 arêtes), g (2), puis b
+        edges = []
+        for offset in (0, step_g, step_b, step_b + step_g):
+            low = take(base + offset)
+            edges.append(low + (take(base + offset + step_r) - low) * fr)
+        c0 = edges[0] + (edges[1] - edges[0]) * fg
+        c1 = edges[2] + (edges[3] - edges[2]) * fg
+        return c0 + (c1 - c0) * fb
+
+    # Tétraédrique: avec f1 >= f2 >= f3 les fractions triées, le chemin c000 -> c(axe de f1)
+    # -> c111 - c(axe de f3) -> c111 délimite le tétraèdre contenant le point
+    fr, fg, fb = fraction[:, 0], fraction[:, 1], fraction[:, 2]
+    f1 = np.maximum(np.maximum(fr, fg), fb)
+    f3 = np.minimum(np.minimum(fr, fg), fb)
+    f2 = fr + fg + fb - f1 - f3
+    step_r, step_g, step_b = (int(s) for s in strides)
+    far = base + (step_r + step_g + step_b)
+    v1 = base + np.where(fr == f1, step_r, np.where(fg == f1, step_g, step_b))
+    v2 = far - np.where(fr == f3, step_r, np.where(fg == f3, step_g, step_b))
+    f1, f2, f3 = f1[:, None], f2[:, None], f3[:, None]
+    return (take(base) * (1.0 - f1) + take(v1) * (f1 - f2)
+            + take(v2) * (f2 - f3) + take(far) * f3)
+
+
+def apply_color_lut(pixels, lut: ColorLut, interpolation: str = "tetrahedral",
+                    chunk_pixels: int = _CHUNK_PIXELS) -> np.ndarray:
+    """
+    Applique une LUT 3D à une image [..., H, W, 3] (uint8 ou flottants 0-1)
+
+    Retourne des flottants float32 0-1 de même forme. Les lignes d'image sont traitées
+    par tranches d'environ chunk_pixels pixels: la mémoire temporaire ne dépend pas de
+    la taille de l'image.
+    """
+    if interpolation not in INTERPOLATIONS:
+        raise ValueError(f"Interpolation inconnue: {interpolation}. Disponibles: {list(INTERPOLATIONS)}")
+    pixels = np.asarray(pixels)[..., :3]
+    if pixels.ndim < 2 or pixels.shape[-1] != 3:
+        raise ValueError(f"Image RGB attendue, forme reçue: {pixels.shape}")
+    scale = np.float32(1.0 / 255.0) if pixels.dtype == np.uint8 else np.float32(1.0)
+
+    width = pixels.shape[-2] if pixels.ndim >= 3 else 1
+    rows = pixels.reshape(-1, width, 3)
+    output = np.empty(rows.shape, dtype=np.float32)
+    rows_per_chunk = max(1, chunk_pixels // max(1, width))
+    for start in range(0, len(rows), rows_per_chunk):
+        chunk = rows[start:start + rows_per_chunk].reshape(-1, 3).astype(np.float32) * scale
+        result = _interpolate(chunk, lut, interpolation)
+        output[start:start + rows_per_chunk] = result.reshape(-1, width, 3)
+    return np.clip(output, 0.0, 1.0, out=output).reshape(pixels.shape)
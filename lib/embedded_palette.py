@@ -0,0 +1,190 @@
+# lib/embedded_palette.py
+"""
+Lecture de la palette embarquée d'images indexées (PNG, GIF, BMP)
+Seuls les en-têtes et la table de couleurs sont lus: les pixels ne sont jamais décodés
+"""
+import os
+import struct
+from pathlib import Path
+from typing  import BinaryIO, List, Optional, Tuple
+
+from .pixel_palette import PixelPalette
+from .parallel      import BatchScheduler
+
+SUPPORTED_EXTENSIONS = ('.png', '.gif', '.bmp')
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+Colors = List[Tuple[int, int, int]]
+
+
+def read_embedded_palette(file_path) -> PixelPalette:
+    """
+    Lit la palette d'une image indexée et retourne un PixelPalette
+
+    Les couleurs gardent l'ordre des index du fichier; l'index transparent
+    éventuel est disponible dans metadata['transparent_index'].
+    """
+    path = Path(file_path)
+    with open(path, 'rb') as f:
+        header = f.read(8)
+        f.seek(0)
+        if header.startswith(_PNG_SIGNATURE):
+            format_type, (colors, transparent) = "png", _read_png(f)
+        elif header[:6] in (b'GIF87a', b'GIF89a'):
+            format_type, (colors, transparent) = "gif", _read_gif(f)
+        elif header[:2] == b'BM':
+            format_type, (colors, transparent) = "bmp", _read_bmp(f)
+        else:
+            raise ValueError(f"Format d'image non supporté: {path.name}")
+
+    palette = PixelPalette(source_filename=path.name)
+    palette.format_type = format_type
+    palette.metadata['format'] = f"{format_type.upper()} embedded palette"
+    palette.metadata['name'] = path.stem
+    if transparent is not None:
+        palette.metadata['transparent_index'] = transparent
+    for r, g, b in colors:
+        palette.add_color(r, g, b)
+    return palette
+
+
+def read_embedded_palettes(file_paths, workers: int = 0) -> List[Optional[PixelPalette]]:
+    """Lit les palettes de plusieurs fichiers en parallèle (None pour un fichier illisible)"""
+    def read_or_none(file_path):
+        try:
+            return read_embedded_palette(file_path)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    return BatchScheduler(workers=workers).map(read_or_none, list(file_paths))
+
+
+def list_indexed_images(directory) -> List[str]:
+    """Fichiers d'images supportés d'un dossier (sans les ouvrir), triés par nom"""
+    try:
+        return sorted(f for f in os.listdir(directory)
+                      if f.lower().endswith(SUPPORTED_EXTENSIONS)
+                      and os.path.isfile(os.path.join(directory, f)))
+    except OSError:
+        return []
+
+
+# === PNG ===
+
+def _read_png(f: BinaryIO):
+    """Parcourt les chunks jusqu'à IDAT: IHDR, PLTE et tRNS seulement"""
+    f.seek(len(_PNG_SIGNATURE))
+    color_type = None
+    colors: Colors = []
+    transparent = None
+
+    while True:
+        chunk_header = f.read(8)
+        if len(chunk_header) < 8:
+            break
+        length, chunk_type = struct.unpack('>I4s', chunk_header)
+
+        if chunk_type == b'IHDR':
+            color_type = f.read(length)[9]
+        elif chunk_type == b'PLTE':
+            data = f.read(length)
+            colors = [tuple(data[i:i + 3]) for i in range(0, length - length % 3, 3)]
+        elif chunk_type == b'tRNS' and color_type == 3:
+            alphas = f.read(length)
+            transparent = next((i for i, a in enumerate(alphas) if a == 0), None)
+        elif chunk_type in (b'IDAT', b'IEND'):
+            break
+        else:
+            f.seek(length, os.SEEK_CUR)
+        f.seek(4, os.SEEK_CUR)  # CRC
+
+    if not colors:
+        raise ValueError("PNG sans palette (PLTE absent)")
+    return colors, transparent
+
+
+# === GIF ===
+
+def _read_color_table(f: BinaryIO, size: int) -> Colors:
+    data = f.read(3 * size)
+    return [tuple(data[i:i + 3]) for i in range(0, len(data) - len(data) % 3, 3)]
+
+
+def _skip_sub_blocks(f: BinaryIO) -> None:
+    while True:
+        size = f.read(1)
+        if not size or size[0] == 0:
+            return
+        f.seek(size[0], os.SEEK_CUR)
+
+
+def _read_gif(f: BinaryIO):
+    """Table globale, sinon table locale de la première image; transparence via l'extension GCE"""
+    f.seek(6)
+    _, _, packed, _, _ = struct.unpack('<HHBBB', f.read(7))
+    colors: Colors = []
+    transparent = None
+
+    if packed & 0x80:
+        colors = _read_color_table(f, 2 ** ((packed & 0x07) + 1))
+
+    while True:
+        introducer = f.read(1)
+        if not introducer or introducer == b';':
+            break
+
+        if introducer == b'!':
+            label = f.read(1)
+            if label == b'\xf9':
+                block = f.read(f.read(1)[0])
+                if len(block) >= 4 and block[0] & 0x01:
+                    transparent = block[3]
+            _skip_sub_blocks(f)
+
+        elif introducer == b',':
+            _, _, _, _, local_packed = struct.unpack('<HHHHB', f.read(9))
+            if not colors and local_packed & 0x80:
+                colors = _read_color_table(f, 2 ** ((local_packed & 0x07) + 1))
+            break
+
+        else:
+            break
+
+    if not colors:
+        raise ValueError("GIF sans table de couleurs")
+    return colors, transparent
+
+
+# === BMP ===
+
+def _read_bmp(f: BinaryIO):
+    """Table de couleurs qui suit l'en-tête DIB (images 1, 4 ou 8 bits)"""
+    f.seek(14)
+    header_size = struct.unpack('<I', f.read(4))[0]
+
+    if header_size == 12:
+        # BITMAPCOREHEADER: entrées BGR sur 3 octets
+        _, _, _, bit_count = struct.unpack('<HHHH', f.read(8))
+        entry_size, count, extra = 3, 0, 0
+    else:
+        dib = f.read(header_size - 4)
+        bit_count   = struct.unpack('<H', dib[10:12])[0]
+        compression = struct.unpack('<I', dib[12:16])[0]
+        count       = struct.unpack('<I', dib[28:32])[0] if len(dib) >= 32 else 0
+        entry_size  = 4
+        # Masques BI_BITFIELDS / BI_ALPHABITFIELDS après un BITMAPINFOHEADER de 40 octets
+        extra = {3: 12, 6: 16}.get(compression, 0) if header_size == 40 else 0
+
+    if bit_count > 8:
+        raise ValueError(f"BMP non indexé ({bit_count} bits)")
+
+    count = count or 2 ** bit_count
+    f.seek(14 + header_size + extra)
+    data = f.read(entry_size * count)
+    colors = [(data[i + 2], data[i + 1], data[i])
+              for i in range(0, len(data) - len(data) % entry_size, entry_size)]
+
+    if not colors:
+        raise ValueError("BMP sans table de couleurs")
+    return colors, None
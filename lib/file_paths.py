@@ -0,0 +1,26 @@
+# lib/file_paths.py
+"""
+Chemins fournis par l'utilisateur (widgets des nodes), toujours résolus sous un dossier
+racine (entrée ou sortie de ComfyUI): les chemins absolus ou remontant avec ".." qui
+en sortent sont refusés
+"""
+from __future__ import annotations
+import os
+
+
+def resolve_inside(root: str, relative: str) -> str:
+    """Chemin relative résolu sous root; ValueError s'il sort de root"""
+    root = os.path.normpath(root)
+    path = os.path.normpath(os.path.join(root, relative.strip()))
+    if os.path.commonpath([path, root]) != root:
+        raise ValueError(f"Chemin hors du dossier {root}: {relative}")
+    return path
+
+
+def next_numbered_path(root: str, prefix: str, extension: str) -> str:
+    """Premier nom libre <root>/<prefix>_00001<extension> (le préfixe peut contenir des sous-dossiers)"""
+    base = resolve_inside(root, prefix)
+    counter = 1
+    while os.path.exists(f"{base}_{counter:05d}{extension}"):
+        counter += 1
+    return f"{base}_{counter:05d}{extension}"
@@ -0,0 +1,181 @@
+# lib/frame_remap.py
+"""
+Projection de séquences d'images (vidéo, animation) sur une palette, avec tramage
+ordonné (Bayer) et mode incrémental
+
+Chaque image est comparée à l'image de référence précédente (couleurs empaquetées en
+uint32, ou écart maximal par canal avec une tolérance), par blocs: seuls les blocs
+modifiés sont recalculés, les autres reprennent les index de l'image précédente. Les
+couleurs de la palette gardent leur index exact (voir palette_assignment.remap_indices),
+les autres passent par la LUT: une image déjà verrouillée sur la palette est inchangée,
+même si deux couleurs de la palette partagent une case de la LUT.
+Le tramage ordonné ne dépend que de la couleur et de la position du pixel: le résultat
+incrémental est identique au calcul complet (tolérance 0). Avec une tolérance, les
+petites variations (bruit vidéo) ne changent plus le tramage d'une image à l'autre, ce
+qui supprime le scintillement; la référence d'un bloc réutilisé n'est pas mise à jour,
+une dérive lente finit donc par être recalculée.
+
+La diffusion d'erreur (Floyd-Steinberg...) propage l'erreur sur toute l'image et ne se
+prête pas au calcul par blocs: seul le tramage ordonné est proposé.
+"""
+from __future__ import annotations
+import time
+from typing import Dict, Optional
+
+from .lazy_import        import lazy_import
+from .pixel_array        import pack_rgb
+from .palette_assignment import remap_indices
+
+np = lazy_import("numpy")
+
+# Tramages ordonnés: taille de la matrice de Bayer
+DITHER_MODES = {"none": 0, "bayer2": 2, "bayer4": 4, "bayer8": 8}
+
+DEFAULT_BLOCK = 8
+
+# Au-delà de cette part de blocs modifiés, l'image est recalculée en entier (moins d'indexations)
+_FULL_FRAME_RATIO = 0.5
+
+# Calculs complets chronométrés pour estimer le coût sans mode incrémental
+_CALIBRATION_RUNS = 3
+
+
+def bayer_matrix(size: int) -> np.ndarray:
+    """Matrice de Bayer size x size (puissance de 2), seuils dans [0, 1[ centrés sur les cases"""
+    matrix = np.zeros((1, 1), dtype=np.int64)
+    while len(matrix) < size:
+        matrix = np.block([[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]])
+    return (matrix + 0.5) / matrix.size
+
+
+def map_pixels(pixels, palette_rgb, lut, bits: int, dither: str = "none", strength: float = 32.0,
+               rows=None, cols=None) -> np.ndarray:
+    """
+    Index de palette de pixels [..., 3] uint8: exact pour les couleurs de palette_rgb,
+    via la LUT RGB -> index (bits bits par canal) pour les autres
+
+    Tramage ordonné: chaque pixel est décalé de (seuil - 0,5) * strength selon sa position
+    (rows, cols: coordonnées diffusables sur pixels[..., 0], par défaut la grille de l'image).
+    """
+    if dither not in DITHER_MODES:
+        raise ValueError(f"Tramage inconnu: {dither}. Disponibles: {list(DITHER_MODES)}")
+    pixels = np.asarray(pixels)[..., :3]
+    size = DITHER_MODES[dither]
+    if size and strength > 0:
+        if rows is None:
+            rows, cols = np.ogrid[:pixels.shape[-3], :pixels.shape[-2]]
+        offset = (bayer_matrix(size)[rows % size, cols % size] - 0.5) * strength
+        pixels = np.clip(pixels + offset[..., None], 0, 255).astype(np.uint8)
+    return remap_indices(pixels, palette_rgb, lut, bits)
+
+
+class IncrementalRemapper:
+    """
+    Projection image par image d'une séquence sur une palette, en ne recalculant que
+    les blocs modifiés depuis l'image précédente
+
+    Statistiques (stats): images, pixels, pixels recalculés et temps passé; report()
+    y ajoute l'accélération par rapport au calcul complet de chaque image.
+    """
+
+    def __init__(self, palette_rgb, lut, bits: int = 6, dither: str = "none", strength: float = 32.0,
+                 block: int = DEFAULT_BLOCK, tolerance: int = 0):
+        if dither not in DITHER_MODES:
+            raise ValueError(f"Tramage inconnu: {dither}. Disponibles: {list(DITHER_MODES)}")
+        self.palette = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+        self.lut = np.asarray(lut)
+        self.bits = bits
+        self.dither = dither
+        self.strength = strength
+        self.block = max(1, int(block))
+        self.tolerance = max(0, int(tolerance))
+        self.reference: Optional[np.ndarray] = None
+        self.indices: Optional[np.ndarray] = None
+        self.stats = {"frames": 0, "pixels": 0, "recomputed": 0, "seconds": 0.0}
+        # Temps d'un calcul complet par pixel, mesuré une fois (premier report())
+        self._full_per_pixel: Optional[float] = None
+
+    def reset(self) -> None:
+        """Oublie l'image précédente: la suivante sera recalculée en entier"""
+        self.reference, self.indices = None, None
+
+    def remap(self, frame) -> np.ndarray:
+        """Index de palette [H, W] de l'image [H, W, 3] uint8 (copie: modifiable par l'appelant)"""
+        frame = np.asarray(frame)[..., :3]
+        height, width = frame.shape[:2]
+        start = time.perf_counter()
+
+        changed = self._changed_blocks(frame)
+        if changed is None or changed.mean() > _FULL_FRAME_RATIO:
+            self.indices = map_pixels(frame, self.palette, self.lut, self.bits, self.dither, self.strength)
+            self.reference = frame.copy()
+            recomputed = height * width
+        else:
+            recomputed = self._remap_blocks(frame, np.flatnonzero(changed.ravel()), changed.shape[1])
+
+        self.stats["frames"] += 1
+        self.stats["pixels"] += height * width
+        self.stats["recomputed"] += recomputed
+        self.stats["seconds"] += time.perf_counter() - start
+        return self.indices.copy()
+
+    def _changed_blocks(self, frame) -> Optional[np.ndarray]:
+        """Blocs [lignes, colonnes] modifiés par rapport à la référence (None: pas de référence)"""
+        if self.reference is None or self.reference.shape != frame.shape:
+            return None
+        if self.tolerance == 0:
+            changed = pack_rgb(frame) != pack_rgb(self.reference)
+        else:
+            # |a - b| en uint8 sans conversion, puis OU des canaux (max sur l'axe des canaux: 10x plus lent)
+            diff = np.maximum(frame, self.reference)
+            diff -= np.minimum(frame, self.reference)
+            over = diff > self.tolerance
+            changed = over[..., 0] | over[..., 1] | over[..., 2]
+        height, width = changed.shape
+        block = self.block
+        rows, cols = -(-height // block), -(-width // block)
+        padded = np.zeros((rows * block, cols * block), dtype=bool)
+        padded[:height, :width] = changed
+        return padded.reshape(rows, block, cols, block).any(axis=(1, 3))
+
+    def _remap_blocks(self, frame, blocks, columns: int) -> int:
+        """Recalcule les blocs donnés (numéros à plat) et met à jour la référence; pixels recalculés"""
+        if len(blocks) == 0:
+            return 0
+        height, width = frame.shape[:2]
+        offsets = np.arange(self.block)
+        # Coordonnées [K, bloc] ramenées dans l'image (les blocs du bord se recouvrent, sans effet)
+        rows = np.minimum((blocks // columns)[:, None] * self.block + offsets, height - 1)[:, :, None]
+        cols = np.minimum((blocks % columns)[:, None] * self.block + offsets, width - 1)[:, None, :]
+        pixels = frame[rows, cols]
+        self.indices[rows, cols] = map_pixels(pixels, self.palette, self.lut, self.bits, self.dither,
+                                              self.strength, rows, cols)
+        self.reference[rows, cols] = pixels
+        # Pixels réellement couverts (blocs du bord tronqués)
+        return int(((rows[:, -1, 0] - rows[:, 0, 0] + 1) * (cols[:, 0, -1] - cols[:, 0, 0] + 1)).sum())
+
+    def report(self) -> Dict[str, float]:
+        """
+        Résumé de la séquence: part recalculée, temps d'un calcul complet de chaque image
+        (full_seconds, estimé au premier appel par le meilleur de quelques calculs complets
+        chronométrés de la dernière image: LUT et mémoire déjà chaudes) et accélération
+        obtenue (speedup)
+        """
+        stats = dict(self.stats)
+        stats["recomputed_ratio"] = stats["recomputed"] / max(1, stats["pixels"])
+        stats["full_seconds"], stats["speedup"] = stats["seconds"], 1.0
+        if self._full_per_pixel is None and self.reference is not None:
+            self._full_per_pixel = self._calibrate()
+        if self._full_per_pixel is not None and stats["seconds"] > 0:
+            stats["full_seconds"] = self._full_per_pixel * stats["pixels"]
+            stats["speedup"] = stats["full_seconds"] / stats["seconds"]
+        return stats
+
+    def _calibrate(self) -> float:
+        """Temps par pixel du calcul complet de la dernière image (meilleur de quelques essais)"""
+        timings = []
+        for _ in range(_CALIBRATION_RUNS):
+            start = time.perf_counter()
+            map_pixels(self.reference, self.palette, self.lut, self.bits, self.dither, self.strength)
+            timings.append(time.perf_counter() - start)
+        return min(timings) / self.reference[..., 0].size
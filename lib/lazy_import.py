@@ -0,0 +1,43 @@
+# lib/lazy_import.py
+"""
+Import différé des dépendances lourdes (numpy, torch, PIL)
+
+ComfyUI importe toutes les extensions au démarrage pour construire NODE_CLASS_MAPPINGS:
+les modules du projet ne chargent leurs dépendances qu'à la première exécution.
+
+    np = lazy_import("numpy")   # rien n'est importé ici
+    np.zeros(3)                 # import de numpy au premier accès
+"""
+import importlib
+
+
+class LazyModule:
+    """Proxy d'un module, importé au premier accès à un attribut"""
+
+    def __init__(self, name: str):
+        self._lazy_name = name
+        self._lazy_module = None
+
+    def _load(self):
+        if self._lazy_module is None:
+            self._lazy_module = importlib.import_module(self._lazy_name)
+        return self._lazy_module
+
+    def __getattr__(self, attr):
+        value = getattr(self._load(), attr)
+        # Les accès suivants ne repassent plus par __getattr__
+        self.__dict__[attr] = value
+        return value
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._lazy_module is not None
+
+    def __repr__(self):
+        state = "chargé" if self.is_loaded else "différé"
+        return f"LazyModule('{self._lazy_name}', {state})"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Retourne un proxy du module `name` sans l'importer"""
+    return LazyModule(name)
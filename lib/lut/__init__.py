@@ -0,0 +1,12 @@
+# lib/lut/__init__.py
+"""
+Tables de correspondance (LUT) précalculées: RGB -> index de palette, RGB -> Lab
+Stockées sur disque et ouvertes en np.memmap pour être partagées entre process
+"""
+
+from .lut_builder import (METRICS, to_metric_space, nearest_indices, grid_colors,
+                          lut_offsets, build_index_lut, build_lab_table)
+from .lut_store   import LutStore, get_lut_store, palette_hash
+
+__all__ = ['METRICS', 'to_metric_space', 'nearest_indices', 'grid_colors', 'lut_offsets',
+           'build_index_lut', 'build_lab_table', 'LutStore', 'get_lut_store', 'palette_hash']
@@ -0,0 +1,89 @@
+# lib/lut/lut_builder.py
+from __future__ import annotations
+from ..lazy_import import lazy_import
+from ..color.color_math import rgb_to_lab
+
+np = lazy_import("numpy")
+
+# Métriques disponibles: espace dans lequel la distance euclidienne est calculée
+METRICS = ("rgb", "lab")
+
+# Nombre de points de grille générés par bloc lors de la construction
+_CHUNK_POINTS = 1 << 16
+# Taille visée (en éléments) d'un bloc de distances: reste dans le cache CPU
+_BLOCK_ELEMENTS = 1 << 20
+
+
+def to_metric_space(rgb, metric: str = "rgb") -> np.ndarray:
+    """Projette des couleurs sRGB 0-255 dans l'espace de la métrique"""
+    if metric == "rgb":
+        return np.asarray(rgb, dtype=np.float32)
+    if metric == "lab":
+        return rgb_to_lab(rgb).astype(np.float32)
+    raise ValueError(f"Métrique inconnue: {metric}. Disponibles: {list(METRICS)}")
+
+
+def nearest_indices(points, palette_points, chunk: int = 0) -> np.ndarray:
+    """
+    Index du plus proche voisin dans palette_points pour chaque point
+
+    Distance euclidienne au carré via ||x||² - 2 x·p + ||p||² (produit matriciel),
+    évaluée par blocs de chunk points (par défaut ~1M distances par bloc).
+    """
+    points  = np.asarray(points, dtype=np.float32).reshape(-1, 3)
+    palette = np.asarray(palette_points, dtype=np.float32).reshape(-1, 3)
+    if len(palette) == 0:
+        raise ValueError("Palette vide")
+
+    chunk = chunk or max(1024, _BLOCK_ELEMENTS // len(palette))
+    dtype = np.uint8 if len(palette) <= 256 else np.uint16
+    result = np.empty(len(points), dtype=dtype)
+    palette_sq = np.sum(palette * palette, axis=1)
+
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk]
+        dist = palette_sq[None, :] - 2.0 * (block @ palette.T)
+        result[start:start + chunk] = np.argmin(dist, axis=1)
+
+    return result
+
+
+def grid_colors(bits: int, start: int = 0, stop: int = None) -> np.ndarray:
+    """
+    Couleurs représentatives (centre de chaque case) d'une grille RGB à `bits` bits par canal
+    Ordre: index = (r << 2*bits) | (g << bits) | b ; start/stop permettent de n'en générer qu'une tranche
+    """
+    if not 1 <= bits <= 8:
+        raise ValueError(f"bits doit être entre 1 et 8: {bits}")
+    shift = 8 - bits
+    mask  = (1 << bits) - 1
+    stop  = (1 << (3 * bits)) if stop is None else stop
+    index = np.arange(start, stop, dtype=np.uint32)
+    cells = np.stack([index >> (2 * bits), (index >> bits) & mask, index & mask], axis=1)
+    return cells.astype(np.float32) * (1 << shift) + ((1 << shift) - 1) / 2.0
+
+
+def lut_offsets(pixels, bits: int) -> np.ndarray:
+    """Position dans une LUT à `bits` bits de chaque pixel uint8 [..., 3]"""
+    pixels = np.asarray(pixels)
+    shift = 8 - bits
+    r = (pixels[..., 0] >> shift).astype(np.uint32)
+    g = (pixels[..., 1] >> shift).astype(np.uint32)
+    b = (pixels[..., 2] >> shift).astype(np.uint32)
+    return (r << (2 * bits)) | (g << bits) | b
+
+
+def build_index_lut(palette_rgb, metric: str = "rgb", bits: int = 6) -> np.ndarray:
+    """Table RGB -> index de la couleur la plus proche (uint8, ou uint16 au-delà de 256 couleurs)"""
+    palette_points = to_metric_space(palette_rgb, metric)
+    total = 1 << (3 * bits)
+    parts = []
+    for start in range(0, total, _CHUNK_POINTS):
+        grid = grid_colors(bits, start, min(total, start + _CHUNK_POINTS))
+        parts.append(nearest_indices(to_metric_space(grid, metric), palette_points))
+    return np.concatenate(parts)
+
+
+def build_lab_table(bits: int = 6) -> np.ndarray:
+    """Table RGB -> Lab (float32, [2^(3*bits), 3])"""
+    return rgb_to_lab(grid_colors(bits)).astype(np.float32)
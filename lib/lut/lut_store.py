@@ -0,0 +1,186 @@
+# lib/lut/lut_store.py
+from __future__ import annotations
+import os
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing  import Callable, Dict, List, Optional, Tuple
+
+from ..lazy_import import lazy_import
+from .lut_builder import METRICS, build_index_lut, build_lab_table
+
+np = lazy_import("numpy")
+
+# Répertoire des LUT (partagé entre les workers d'une même machine)
+LUT_DIR_ENV_VAR = "PIXEL_PALETTE_LUT_DIR"
+# Taille maximale du répertoire, en Mo
+LUT_MB_ENV_VAR  = "PIXEL_PALETTE_LUT_MB"
+DEFAULT_LUT_MB  = 1024
+
+
+def default_lut_dir() -> Path:
+    env_dir = os.environ.get(LUT_DIR_ENV_VAR, "").strip()
+    if env_dir:
+        return Path(env_dir)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "pixel_palette_art" / "luts"
+
+
+def palette_hash(palette_rgb) -> str:
+    """Hash du contenu d'une palette (l'ordre des couleurs compte: il fixe les index)"""
+    colors = np.ascontiguousarray(np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3))
+    return hashlib.blake2b(colors.tobytes(), digest_size=12).hexdigest()
+
+
+class LutStore:
+    """
+    Stockage disque des LUT au format .npy, ouvertes en np.memmap
+
+    Chaque fichier est écrit dans un fichier temporaire puis renommé (écriture atomique):
+    les autres process ne voient jamais de fichier partiel et partagent le page cache.
+    Au-delà de max_bytes, les fichiers les moins récemment utilisés sont supprimés.
+    """
+
+    def __init__(self, directory=None, max_bytes: Optional[int] = None):
+        self.directory = Path(directory) if directory is not None else default_lut_dir()
+        if max_bytes is None:
+            try:
+                max_bytes = int(float(os.environ.get(LUT_MB_ENV_VAR, DEFAULT_LUT_MB)) * 1024 * 1024)
+            except ValueError:
+                max_bytes = DEFAULT_LUT_MB * 1024 * 1024
+        self.max_bytes = int(max_bytes)
+        self._opened: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    # === Tables ===
+
+    def index_lut(self, palette_rgb, metric: str = "rgb", bits: int = 6) -> np.ndarray:
+        """Table RGB -> index, clé: hash de la palette + métrique + résolution"""
+        if metric not in METRICS:
+            raise ValueError(f"Métrique inconnue: {metric}. Disponibles: {list(METRICS)}")
+        name = f"index_{palette_hash(palette_rgb)}_{metric}_{bits}"
+        return self.get_or_build(name, lambda: build_index_lut(palette_rgb, metric, bits))
+
+    def lab_table(self, bits: int = 6) -> np.ndarray:
+        """Table RGB -> Lab, indépendante de la palette"""
+        return self.get_or_build(f"lab_{bits}", lambda: build_lab_table(bits))
+
+    # === Stockage ===
+
+    def path_for(self, name: str) -> Path:
+        return self.directory / f"{name}.npy"
+
+    def get_or_build(self, name: str, build: Callable[[], np.ndarray]) -> np.ndarray:
+        """Ouvre la table en memmap, en la construisant d'abord si elle n'existe pas"""
+        with self._lock:
+            if name in self._opened:
+                return self._opened[name]
+
+        path = self.path_for(name)
+        table = self._open(path)
+        if table is None:
+            self._write_atomic(path, build())
+            self.evict(keep=path)
+            table = self._open(path)
+
+        with self._lock:
+            self._opened[name] = table
+        return table
+
+    def _open(self, path: Path) -> Optional[np.ndarray]:
+        if not path.exists():
+            return None
+        try:
+            table = np.load(path, mmap_mode="r")
+            os.utime(path)  # date d'accès pour l'éviction LRU
+            return table
+        except (ValueError, OSError):
+            # Fichier illisible: on le supprime pour le reconstruire
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+
+    def _write_atomic(self, path: Path, table: np.ndarray) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{path.stem}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(table))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _table_stats(self) -> List[Tuple[float, int, Path]]:
+        """(date de modification, taille, chemin) des tables, sans celles supprimées entre-temps"""
+        if not self.directory.exists():
+            return []
+        stats = []
+        for path in self.directory.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats.append((stat.st_mtime, stat.st_size, path))
+        return stats
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self._table_stats())
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """Supprime les tables les moins récemment utilisées au-delà de max_bytes"""
+        files = sorted(self._table_stats(), key=lambda entry: entry[0])
+        total = sum(size for _, size, _ in files)
+        removed = 0
+
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == keep:
+                continue
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            with self._lock:
+                self._opened.pop(path.stem, None)
+
+        return removed
+
+    def clear(self) -> None:
+        """Supprime toutes les tables du répertoire"""
+        with self._lock:
+            self._opened.clear()
+        if self.directory.exists():
+            for path in self.directory.glob("*.npy"):
+                path.unlink()
+
+    def __str__(self):
+        return f"LutStore('{self.directory}', max: {self.max_bytes} octets)"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+_shared_store: Optional[LutStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_lut_store() -> LutStore:
+    """Retourne le LutStore du process (répertoire: PIXEL_PALETTE_LUT_DIR)"""
+    global _shared_store
+    if _shared_store is None:
+        with _shared_lock:
+            if _shared_store is None:
+                _shared_store = LutStore()
+    return _shared_store
@@ -0,0 +1,111 @@
+# lib/palette_animation.py
+"""
+Animation par palette: cycles de couleurs (color cycling) et fondus de palette
+
+Une image indexée est animée sans rien recalculer par pixel: on construit une pile de
+palettes [F, N, 3] (une palette par image, N couleurs), puis toutes les images sont
+produites par une seule indexation diffusée pile[f, index[y, x]]. La mémoire utilisée
+est celle de la sortie, plus la pile de palettes (négligeable).
+"""
+from __future__ import annotations
+import re
+from typing import List, Sequence, Tuple
+
+from .lazy_import                 import lazy_import
+from .pixel_color                 import PixelColor
+from .color.color_space_registry  import ColorSpaceRegistry
+
+np = lazy_import("numpy")
+
+# Plage de cycle: "début-fin" ou "début-fin:vitesse" (index inclus, vitesse en pas par image)
+_CYCLE_PATTERN = re.compile(r"^\s*(\d+)\s*-\s*(\d+)\s*(?::\s*([-+]?\d*\.?\d+)\s*)?$")
+
+
+def parse_cycles(text: str) -> List[Tuple[int, int, float]]:
+    """
+    Plages de cycle d'un texte "4-7, 10-15:-0.5" (séparées par virgules, points-virgules
+    ou retours à la ligne): (début, fin, vitesse). Vitesse 1 par défaut, négative: sens inverse.
+    """
+    cycles = []
+    for item in re.split(r"[,;\n]", text or ""):
+        if not item.strip() or item.strip().startswith("#"):
+            continue
+        match = _CYCLE_PATTERN.match(item)
+        if not match:
+            raise ValueError(f"Plage de cycle invalide: '{item.strip()}' (attendu: début-fin[:vitesse])")
+        start, end = int(match.group(1)), int(match.group(2))
+        if end < start:
+            raise ValueError(f"Plage de cycle inversée: {start}-{end}")
+        cycles.append((start, end, float(match.group(3)) if match.group(3) else 1.0))
+    return cycles
+
+
+def cycle_indices(n_colors: int, frames: int, cycles: Sequence[Tuple[int, int, float]]) -> np.ndarray:
+    """
+    Table [F, N]: index de la couleur d'origine affichée à chaque index, image par image
+
+    Dans une plage de L couleurs décalée de k pas, l'index i montre la couleur
+    début + (i - début - k) mod L: les couleurs avancent vers les index croissants.
+    """
+    table = np.tile(np.arange(n_colors), (frames, 1))
+    for start, end, speed in cycles:
+        if end >= n_colors:
+            raise ValueError(f"Plage {start}-{end} hors de la palette ({n_colors} couleurs)")
+        length = end - start + 1
+        shifts = np.fix(np.arange(frames) * speed).astype(np.int64)
+        offsets = np.arange(length)[None, :] - shifts[:, None]
+        table[:, start:end + 1] = table[:, start:end + 1][np.arange(frames)[:, None], offsets % length]
+    return table
+
+
+def mix_stack(source_rgb, target_rgb, ratios, color_space: str = "rgb") -> np.ndarray:
+    """
+    Couleurs [F, N, 3] uint8 mélangées de source ([N, 3], ou [F, N, 3]: une palette par
+    image) vers target [N, 3] pour chaque ratio [F], par le mixer enregistré de color_space
+    (mix_arrays s'il est vectorisé, en un seul appel, sinon mix_with couleur par couleur)
+    """
+    ColorSpaceRegistry.load_builtin_spaces()
+    mixer = ColorSpaceRegistry.get_mixer_class(color_space)
+    source = np.asarray(source_rgb, dtype=np.uint8)
+    source = source if source.ndim == 3 else source.reshape(-1, 3)
+    target = np.asarray(target_rgb, dtype=np.uint8).reshape(-1, 3)
+    ratios = np.asarray(ratios, dtype=np.float64).reshape(-1)
+    if hasattr(mixer, "mix_arrays"):
+        mixed = mixer.mix_arrays(source, target, ratios[:, None])
+        return np.asarray(mixed, dtype=np.uint8).reshape(len(ratios), -1, 3)
+
+    sources = source if source.ndim == 3 else [source] * len(ratios)
+    colors_b = [PixelColor(r, g, b) for r, g, b in target.tolist()]
+    return np.array([[mixer.mix_with(PixelColor(*a), b, ratio) for a, b in zip(frame.tolist(), colors_b)]
+                     for frame, ratio in zip(sources, ratios.tolist())],
+                    dtype=np.uint8).reshape(len(ratios), len(target), 3)
+
+
+def palette_stack(palette_rgb, frames: int, cycles: Sequence[Tuple[int, int, float]] = (),
+                  target_rgb=None, color_space: str = "rgb") -> np.ndarray:
+    """
+    Pile de palettes [F, N, 3] uint8: cycles appliqués à palette_rgb, puis fondu linéaire
+    (première image: palette d'origine, dernière: target_rgb, même index)
+    """
+    palette = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+    frames = max(1, int(frames))
+    stack = palette[cycle_indices(len(palette), frames, cycles)]
+    if target_rgb is None:
+        return stack
+    target = np.asarray(target_rgb, dtype=np.uint8).reshape(-1, 3)
+    if len(target) != len(palette):
+        raise ValueError(f"Palettes de tailles différentes: {len(palette)} et {len(target)}")
+    ratios = np.arange(frames) / max(1, frames - 1)
+    # Fondu: chaque image mélange sa propre palette (déjà cyclée) vers la cible, en un appel
+    return mix_stack(stack, target, ratios, color_space)
+
+
+def render_frames(indices, stack) -> np.ndarray:
+    """
+    Images [F, H, W, C] d'une image indexée indices [H, W] et d'une pile [F, N, C]
+    (une seule indexation; les tableaux d'index diffusés ne sont pas matérialisés)
+    """
+    indices = np.asarray(indices)
+    stack = np.asarray(stack)
+    return stack[np.arange(len(stack)).reshape((-1,) + (1,) * indices.ndim), indices[None]]
+
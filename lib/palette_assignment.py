@@ -0,0 +1,142 @@
+# lib/palette_assignment.py
+"""
+Correspondance optimale entre deux palettes (échange de palette, "palette swap")
+
+Chaque couleur de la palette source reçoit une couleur distincte de la palette cible,
+en minimisant la somme des ΔE76: problème d'affectation linéaire, résolu par plus courts
+chemins augmentants (Jonker-Volgenant, variante de Crouse 2016) avec potentiels duaux.
+La boucle sur les lignes reste en Python, chaque étape de Dijkstra est vectorisée sur
+toutes les colonnes: O(n³) opérations pour O(n²) appels NumPy, 256x256 en bien moins
+d'une seconde.
+
+La correspondance devient une table d'index (source -> cible) appliquée aux pixels:
+correspondance exacte des couleurs de la palette source (recherche dichotomique sur les
+couleurs empaquetées), LUT RGB -> index pour les autres.
+"""
+from __future__ import annotations
+from typing import Dict, Tuple
+
+from .lazy_import       import lazy_import
+from .pixel_array       import pack_rgb
+from .color.color_math  import rgb_to_lab
+
+np = lazy_import("numpy")
+
+
+def delta_e_matrix(source_rgb, target_rgb) -> np.ndarray:
+    """Matrice [N, M] des ΔE76 entre deux listes de couleurs RGB uint8"""
+    source = rgb_to_lab(np.asarray(source_rgb, dtype=np.uint8).reshape(-1, 3))
+    target = rgb_to_lab(np.asarray(target_rgb, dtype=np.uint8).reshape(-1, 3))
+    diff = source[:, None, :] - target[None, :, :]
+    return np.sqrt((diff * diff).sum(axis=-1))
+
+
+def linear_assignment(cost) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Affectation de coût total minimal d'une matrice [N, M] (comme scipy linear_sum_assignment)
+
+    Retourne (lignes, colonnes): si N <= M chaque ligne reçoit une colonne distincte,
+    sinon chaque colonne reçoit une ligne distincte. Lignes triées par ordre croissant.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim != 2:
+        raise ValueError(f"Matrice de coût attendue, forme reçue: {cost.shape}")
+    if not np.isfinite(cost).all():
+        raise ValueError("La matrice de coût contient des valeurs non finies")
+    if cost.shape[0] > cost.shape[1]:
+        columns, rows = linear_assignment(cost.T)
+        order = np.argsort(rows)
+        return rows[order], columns[order]
+
+    n_rows, n_cols = cost.shape
+    u = np.zeros(n_rows)
+    v = np.zeros(n_cols)
+    col_for_row = np.full(n_rows, -1, dtype=np.int64)
+    row_for_col = np.full(n_cols, -1, dtype=np.int64)
+
+    for current in range(n_rows):
+        # Dijkstra sur les coûts réduits depuis la ligne current, jusqu'à une colonne libre
+        shortest = np.full(n_cols, np.inf)
+        path = np.full(n_cols, -1, dtype=np.int64)
+        visited_cols = np.zeros(n_cols, dtype=bool)
+        visited_rows = [current]
+        row, reach, sink = current, 0.0, -1
+        while sink < 0:
+            reduced = reach + cost[row] - u[row] - v
+            better = ~visited_cols & (reduced < shortest)
+            path[better] = row
+            shortest[better] = reduced[better]
+
+            candidates = np.where(visited_cols, np.inf, shortest)
+            column = int(np.argmin(candidates))
+            reach = candidates[column]
+            if row_for_col[column] >= 0:
+                # À égalité, une colonne libre termine le chemin plus tôt
+                free = np.flatnonzero((candidates == reach) & (row_for_col < 0))
+                if len(free):
+                    column = int(free[0])
+            visited_cols[column] = True
+            if row_for_col[column] < 0:
+                sink = column
+            else:
+                row = int(row_for_col[column])
+                visited_rows.append(row)
+
+        # Potentiels duaux: les coûts réduits restent positifs, nuls sur l'affectation
+        u[current] += reach
+        others = np.asarray(visited_rows[1:], dtype=np.int64)
+        u[others] += reach - shortest[col_for_row[others]]
+        v[visited_cols] -= reach - shortest[visited_cols]
+
+        # Augmentation le long du chemin
+        column = sink
+        while True:
+            row = int(path[column])
+            row_for_col[column] = row
+            col_for_row[row], column = column, col_for_row[row]
+            if row == current:
+                break
+
+    return np.arange(n_rows), col_for_row
+
+
+def assign_palettes(source_rgb, target_rgb) -> Dict[str, np.ndarray]:
+    """
+    Correspondance source -> cible minimisant la somme des ΔE76
+
+    Palettes de même taille: bijection. Source plus petite: couleurs cibles distinctes,
+    certaines cibles inutilisées. Source plus grande: chaque cible sert au moins une
+    source, les sources restantes prennent leur cible la plus proche.
+
+    Retourne mapping [N] (index cible de chaque couleur source), distances [N] (ΔE76)
+    et total (somme des distances).
+    """
+    cost = delta_e_matrix(source_rgb, target_rgb)
+    n_source, n_target = cost.shape
+    if n_source == 0 or n_target == 0:
+        raise ValueError("Palette vide")
+    rows, columns = linear_assignment(cost)
+    mapping = np.argmin(cost, axis=1)
+    mapping[rows] = columns
+    distances = cost[np.arange(n_source), mapping]
+    return {"mapping": mapping, "distances": distances, "total": float(distances.sum())}
+
+
+def remap_indices(pixels, source_rgb, fallback_lut=None, bits: int = 6) -> np.ndarray:
+    """
+    Index dans la palette source de chaque pixel [..., 3] uint8: exact pour les couleurs
+    de la palette (première occurrence en cas de doublon), via fallback_lut (LUT RGB ->
+    index sur bits bits, voir PixelPalette.index_lut) pour les autres, -1 sans LUT
+    """
+    from .lut import lut_offsets
+    packed = pack_rgb(pixels)
+    palette_packed = pack_rgb(np.asarray(source_rgb, dtype=np.uint8).reshape(-1, 3))
+    order = np.argsort(palette_packed, kind="stable")
+    sorted_packed = palette_packed[order]
+    position = np.minimum(np.searchsorted(sorted_packed, packed), len(order) - 1)
+    exact = sorted_packed[position] == packed
+    indices = np.where(exact, order[position], -1)
+    if fallback_lut is not None and not exact.all():
+        missing = ~exact
+        indices[missing] = np.asarray(fallback_lut)[lut_offsets(np.asarray(pixels)[missing], bits)]
+    return indices
@@ -0,0 +1,84 @@
+# lib/palette_check.py
+"""
+Contrôle des images verrouillées sur une palette: pixels hors palette, leur nombre par
+couleur et par image, et la couleur de la palette la plus proche de chacune
+
+Les pixels et la palette sont empaquetés en uint32; l'appartenance est testée par une
+table de bits sur les 2^24 couleurs (une indexation par pixel, table de 16 Mo dont seules
+les pages touchées sont allouées) ou, pour peu de pixels, par recherche dichotomique dans
+la palette triée. Les couleurs fautives sont dédoublonnées avant la recherche du plus
+proche voisin: son coût ne dépend pas de la taille de l'image.
+"""
+from __future__ import annotations
+from typing import Dict, Optional
+
+from .lazy_import      import lazy_import
+from .pixel_array      import pack_rgb, unpack_rgb
+from .lut.lut_builder  import METRICS, to_metric_space, nearest_indices
+
+np = lazy_import("numpy")
+
+MEMBERSHIP_METHODS = ("auto", "bitmap", "searchsorted")
+
+# En dessous de ce nombre de pixels, "auto" choisit la recherche dichotomique
+_BITMAP_MIN_PIXELS = 1 << 16
+
+
+def palette_membership(packed, palette_rgb, method: str = "auto") -> np.ndarray:
+    """Masque booléen [...]: couleur empaquetée (uint32 0x00RRGGBB) présente dans la palette"""
+    if method not in MEMBERSHIP_METHODS:
+        raise ValueError(f"Méthode inconnue: {method}. Disponibles: {list(MEMBERSHIP_METHODS)}")
+    packed = np.asarray(packed, dtype=np.uint32)
+    palette = pack_rgb(np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3))
+    if len(palette) == 0:
+        return np.zeros(packed.shape, dtype=bool)
+    if method == "auto":
+        method = "bitmap" if packed.size >= _BITMAP_MIN_PIXELS else "searchsorted"
+
+    if method == "bitmap":
+        bitmap = np.zeros(1 << 24, dtype=bool)
+        bitmap[palette] = True
+        return bitmap[packed]
+    palette = np.unique(palette)
+    position = np.minimum(np.searchsorted(palette, packed), len(palette) - 1)
+    return palette[position] == packed
+
+
+def check_pixels(pixels, palette_rgb, method: str = "auto", suggest: bool = True,
+                 metric: str = "lab", limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Pixels hors palette d'une image [H, W, 3] ou d'un batch [B, H, W, 3] uint8
+
+    Retourne un dictionnaire:
+        off_palette:  masque [..., H, W] des pixels hors palette
+        per_frame:    [B] nombre de pixels hors palette par image (batch seulement)
+        colors:       [K, 3] couleurs hors palette, de la plus fréquente à la moins fréquente
+        counts:       [K] nombre de pixels de chacune
+        nearest:      [L] index de la couleur de palette la plus proche (suggest)
+        distance:     [L] distance à cette couleur (ΔE76 ou RGB selon metric)
+
+    Les suggestions ne portent que sur les limit couleurs les plus fréquentes (L = min(limit, K),
+    toutes si limit vaut None): une image bruitée compte des millions de couleurs fautives.
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Métrique inconnue: {metric}. Disponibles: {list(METRICS)}")
+    pixels = np.asarray(pixels)[..., :3]
+    palette = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+    packed = pack_rgb(pixels)
+    off_palette = ~palette_membership(packed, palette, method)
+
+    unique, counts = np.unique(packed[off_palette], return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    colors = unpack_rgb(unique[order])
+    result = {"off_palette": off_palette, "colors": colors, "counts": counts[order]}
+    if pixels.ndim == 4:
+        result["per_frame"] = off_palette.reshape(len(pixels), -1).sum(axis=1)
+
+    suggested = colors if limit is None else colors[:max(0, limit)]
+    if suggest and len(suggested) and len(palette):
+        points = to_metric_space(suggested, metric)
+        palette_points = to_metric_space(palette, metric)
+        nearest = nearest_indices(points, palette_points).astype(np.int64)
+        result["nearest"] = nearest
+        result["distance"] = np.sqrt(((points - palette_points[nearest]) ** 2).sum(axis=1))
+    return result
@@ -0,0 +1,164 @@
+# lib/palette_contrast.py
+"""
+Audit de lisibilité d'une palette: contraste WCAG et ΔE76 de toutes les paires de couleurs
+
+Les matrices N x N ne sont jamais construites en entier: elles sont parcourues par blocs
+de lignes d'au plus _BLOCK_ELEMENTS paires, et chaque bloc met à jour en une passe
+    - le plus proche voisin (ΔE76) et le meilleur contraste de chaque couleur
+    - le nombre de paires en dessous des seuils et les pires paires (au plus limit)
+    - la carte de chaleur, réduite à heatmap_size² cases au plus (pire valeur de chaque case)
+Les ΔE d'un bloc viennent d'un produit matriciel (||x||² - 2 x·y + ||y||²) en Lab.
+"""
+from __future__ import annotations
+from typing import Dict, Optional, Tuple
+
+from .lazy_import       import lazy_import
+from .color.color_math  import srgb_to_linear, rgb_to_lab
+
+np = lazy_import("numpy")
+
+HEATMAP_METRICS = ("delta_e", "contrast")
+
+# Contraste minimal WCAG 2 (niveau AA) pour du texte de taille normale
+WCAG_AA = 4.5
+
+# Nombre de paires évaluées par bloc
+_BLOCK_ELEMENTS = 1 << 22
+
+# Coefficients de luminance relative (WCAG, sRGB linéaire)
+_LUMINANCE_WEIGHTS = (0.2126, 0.7152, 0.0722)
+
+
+def relative_luminance(rgb) -> np.ndarray:
+    """Luminance relative WCAG [...] de couleurs sRGB [..., 3] (0-255)"""
+    return srgb_to_linear(np.asarray(rgb)[..., :3]) @ np.asarray(_LUMINANCE_WEIGHTS)
+
+
+def contrast_matrix(source_rgb, target_rgb) -> np.ndarray:
+    """Matrice [N, M] des rapports de contraste WCAG (1 à 21) entre deux listes de couleurs"""
+    source = relative_luminance(np.asarray(source_rgb, dtype=np.uint8).reshape(-1, 3))
+    target = relative_luminance(np.asarray(target_rgb, dtype=np.uint8).reshape(-1, 3))
+    return _contrast(source[:, None], target[None, :])
+
+
+def _contrast(luminance_a, luminance_b):
+    return (np.maximum(luminance_a, luminance_b) + 0.05) / (np.minimum(luminance_a, luminance_b) + 0.05)
+
+
+def _merge_worst(kept: Tuple[np.ndarray, ...], candidates: Tuple[np.ndarray, ...], limit: int):
+    """Garde les limit paires de plus petite valeur: (i, j, valeur) déjà retenues + nouvelles"""
+    first, second, values = (np.concatenate([a, b]) for a, b in zip(kept, candidates))
+    if len(values) > limit:
+        keep = np.argpartition(values, limit - 1)[:limit]
+        first, second, values = first[keep], second[keep], values[keep]
+    return first, second, values
+
+
+def analyze_pairs(palette_rgb, min_contrast: float = WCAG_AA, min_delta_e: float = 5.0,
+                  limit: int = 50, heatmap: Optional[str] = "delta_e",
+                  heatmap_size: int = 512) -> Dict[str, np.ndarray]:
+    """
+    Contraste WCAG et ΔE76 de toutes les paires (i < j) d'une palette [N, 3], par blocs
+
+    Retourne un dictionnaire:
+        nearest, nearest_delta_e:       [N] plus proche autre couleur (ΔE76) et sa distance
+        best_partner, best_contrast:    [N] couleur de meilleur contraste et ce contraste
+        close_count, low_contrast_count: paires sous min_delta_e / sous min_contrast
+        close_pairs, close_delta_e:     au plus limit paires [K, 2] de plus petit ΔE76 sous
+                                        le seuil, triées
+        low_contrast_pairs, low_contrast: idem pour le contraste
+        heatmap:                        [G, G] pire valeur (ΔE76 ou contraste) des paires de
+                                        chaque case, G = min(N, heatmap_size); NaN sur les
+                                        cases sans paire (diagonale d'une palette non réduite)
+    """
+    if heatmap is not None and heatmap not in HEATMAP_METRICS:
+        raise ValueError(f"Métrique inconnue: {heatmap}. Disponibles: {list(HEATMAP_METRICS)}")
+    palette = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+    n = len(palette)
+    if n < 2:
+        raise ValueError("Il faut au moins deux couleurs")
+    lab = rgb_to_lab(palette).astype(np.float32)
+    lab_sq = np.einsum("ij,ij->i", lab, lab)
+    luminance = relative_luminance(palette).astype(np.float32)
+
+    nearest = np.empty(n, dtype=np.int64)
+    nearest_delta_e = np.empty(n, dtype=np.float32)
+    best_partner = np.empty(n, dtype=np.int64)
+    best_contrast = np.empty(n, dtype=np.float32)
+    counts = {"close": 0, "low_contrast": 0}
+    empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+    worst = {"close": empty, "low_contrast": empty}
+
+    grid = min(n, max(1, int(heatmap_size)))
+    heat = np.full((grid, grid), np.inf, dtype=np.float32) if heatmap else None
+    column_bins = np.arange(n) * grid // n
+    bin_starts = np.flatnonzero(np.diff(column_bins, prepend=-1))
+
+    rows_per_block = max(1, _BLOCK_ELEMENTS // n)
+    columns = np.arange(n)
+    for start in range(0, n, rows_per_block):
+        stop = min(n, start + rows_per_block)
+        rows = np.arange(start, stop)
+        block = lab[start:stop]
+        squared = lab_sq[start:stop, None] - 2.0 * (block @ lab.T) + lab_sq[None, :]
+        delta_e = np.sqrt(np.maximum(squared, 0.0))
+        contrast = _contrast(luminance[start:stop, None], luminance[None, :])
+
+        # Une couleur n'est pas sa propre voisine
+        self_pairs = (np.arange(stop - start), rows)
+        delta_e[self_pairs] = np.inf
+        nearest[start:stop] = np.argmin(delta_e, axis=1)
+        nearest_delta_e[start:stop] = delta_e[self_pairs[0], nearest[start:stop]]
+        contrast[self_pairs] = 0.0
+        best_partner[start:stop] = np.argmax(contrast, axis=1)
+        best_contrast[start:stop] = contrast[self_pairs[0], best_partner[start:stop]]
+        contrast[self_pairs] = np.inf
+
+        # Paires i < j sous les seuils
+        upper = columns[None, :] > rows[:, None]
+        for name, values, threshold in (("close", delta_e, min_delta_e), ("low_contrast", contrast, min_contrast)):
+            local, other = np.nonzero(upper & (values < threshold))
+            counts[name] += len(local)
+            if limit > 0 and len(local):
+                candidates = (local + start, other, values[local, other].astype(np.float32))
+                worst[name] = _merge_worst(worst[name], candidates, limit)
+
+        if heat is not None:
+            values = delta_e if heatmap == "delta_e" else contrast
+            reduced = np.minimum.reduceat(values, bin_starts, axis=1)
+            np.minimum.at(heat, column_bins[start:stop], reduced)
+
+    result = {
+        "nearest": nearest, "nearest_delta_e": nearest_delta_e,
+        "best_partner": best_partner, "best_contrast": best_contrast,
+        "close_count": counts["close"], "low_contrast_count": counts["low_contrast"],
+    }
+    for name, values_key in (("close", "close_delta_e"), ("low_contrast", "low_contrast")):
+        first, second, values = worst[name]
+        order = np.lexsort((second, first, values))
+        result[f"{name}_pairs"] = np.stack([first[order], second[order]], axis=1)
+        result[values_key] = values[order]
+    if heat is not None:
+        heat[np.isinf(heat)] = np.nan
+    result["heatmap"] = heat
+    return result
+
+
+def heatmap_image(heat, metric: str = "delta_e", threshold: float = 5.0, cell: int = 1) -> np.ndarray:
+    """
+    Image [G * cell, G * cell, 3] uint8 d'une carte de chaleur: rouge sous le seuil, jaune au
+    seuil, vert à 4 fois le seuil (contraste: de 1 au seuil, puis jusqu'à 21), noir sans paire
+    """
+    heat = np.asarray(heat, dtype=np.float64)
+    if metric == "contrast":
+        stops = (1.0, threshold, max(threshold, 21.0))
+    else:
+        stops = (0.0, threshold, 4.0 * threshold)
+    colors = np.array([(160, 0, 0), (255, 200, 0), (0, 160, 80)], dtype=np.float64)
+    filled = np.nan_to_num(heat, nan=stops[0])
+    image = np.stack([np.interp(filled, stops, colors[:, c]) for c in range(3)], axis=-1)
+    image[np.isnan(heat)] = 0.0
+    image = np.rint(image).astype(np.uint8)
+    if cell > 1:
+        image = image.repeat(cell, axis=0).repeat(cell, axis=1)
+    return image
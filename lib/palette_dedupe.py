@@ -0,0 +1,212 @@
+# lib/palette_dedupe.py
+"""
+Dédoublonnage de palettes: doublons exacts (couleurs empaquetées en uint32)
+et fusion des quasi-doublons à une tolérance près (ΔE76 ou distance RGB)
+
+Les voisins sont cherchés par hachage sur une grille de cases de la taille de la
+tolérance: seules les 27 cases voisines sont comparées, d'où un coût quasi linéaire.
+"""
+from __future__ import annotations
+from typing import List, Tuple
+
+from .lazy_import      import lazy_import
+from .pixel_array      import pack_rgb
+from .lut.lut_builder  import to_metric_space
+
+np = lazy_import("numpy")
+
+DEDUPE_MODES    = ("first", "count")
+REPRESENTATIVES = ("first", "most_frequent", "mean")
+NAME_MODES      = ("representative", "first_named", "join")
+
+# Nombre de couleurs traitées par lot lors de la recherche de voisins
+_PAIR_CHUNK = 1 << 15
+
+
+def unique_colors(palette_rgb, mode: str = "first", weights=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Index de la première occurrence de chaque couleur distincte et nombre d'occurrences
+
+    mode "first": ordre de première apparition; mode "count": du plus fréquent au moins
+    fréquent (à égalité, ordre de première apparition). weights: occurrences de chaque
+    entrée (ex: nombre de pixels), 1 par défaut.
+    """
+    if mode not in DEDUPE_MODES:
+        raise ValueError(f"Mode inconnu: {mode}. Disponibles: {list(DEDUPE_MODES)}")
+    packed = pack_rgb(np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3))
+    _, first, inverse, counts = np.unique(packed, return_index=True, return_inverse=True,
+                                          return_counts=True)
+    if weights is not None:
+        counts = np.bincount(inverse.ravel(), weights=weights, minlength=len(first)).astype(np.int64)
+
+    order = np.argsort(first, kind="stable")
+    if mode == "count":
+        order = order[np.argsort(-counts[order], kind="stable")]
+    return first[order], counts[order]
+
+
+def near_pairs(points, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Couples (i, j) de points distincts à distance <= radius, par hachage sur une grille
+
+    Chaque point est rangé dans une case de côté radius; deux points proches sont
+    forcément dans des cases voisines (27 cases en 3D). Les couples sont retournés avec
+    i < j quand ils sont dans la même case, dans un ordre quelconque sinon.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    if n < 2 or radius <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    cells = np.floor(points / radius).astype(np.int64)
+    cells -= cells.min(axis=0) - 1          # marge d'une case de chaque côté
+    dims = cells.max(axis=0) + 2
+    keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    # Case elle-même + 13 cases "en avant": chaque couple de cases voisines n'est vu qu'une fois
+    offsets = [(dx * dims[1] + dy) * dims[2] + dz
+               for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)
+               if (dx, dy, dz) >= (0, 0, 0)]
+    radius2 = radius * radius
+    found_i, found_j = [], []
+
+    for start in range(0, n, _PAIR_CHUNK):
+        rows = np.arange(start, min(n, start + _PAIR_CHUNK))
+        for offset in offsets:
+            target = keys[rows] + offset
+            lo = np.searchsorted(sorted_keys, target, side="left")
+            hi = np.searchsorted(sorted_keys, target, side="right")
+            counts = hi - lo
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # Développe chaque intervalle [lo, hi) en liste de candidats
+            i = np.repeat(rows, counts)
+            position = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = order[np.repeat(lo, counts) + position]
+            if offset == 0:
+                keep = i < j
+                i, j = i[keep], j[keep]
+            diff = points[i] - points[j]
+            close = np.einsum("ij,ij->i", diff, diff) <= radius2
+            found_i.append(i[close])
+            found_j.append(j[close])
+
+    if not found_i:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(found_i), np.concatenate(found_j)
+
+
+def cluster_near(points, radius: float, priority=None) -> np.ndarray:
+    """
+    Regroupe les points autour de représentants distants de plus de radius
+
+    Les points sont visités par priorité décroissante (ordre d'entrée par défaut): un point
+    non encore rattaché devient représentant et absorbe ses voisins libres. Chaque membre
+    est donc à moins de radius de son représentant (pas d'effet de chaîne le long d'un dégradé).
+    Retourne, pour chaque point, l'index de son représentant.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    leader = np.arange(n)
+    i, j = near_pairs(points, radius)
+    if len(i) == 0:
+        return leader
+
+    # Graphe de voisinage au format CSR (dans les deux sens)
+    src = np.concatenate([i, j])
+    dst = np.concatenate([j, i])
+    by_src = np.argsort(src, kind="stable")
+    neighbors = dst[by_src]
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))])
+
+    visit = np.arange(n) if priority is None else np.argsort(-np.asarray(priority), kind="stable")
+    # Les points isolés restent leur propre représentant: on ne visite que les autres
+    visit = visit[indptr[visit + 1] > indptr[visit]]
+
+    assigned = np.zeros(n, dtype=bool)
+    for point in visit.tolist():
+        if assigned[point]:
+            continue
+        assigned[point] = True
+        free = neighbors[indptr[point]:indptr[point + 1]]
+        free = free[~assigned[free]]
+        assigned[free] = True
+        leader[free] = point
+    return leader
+
+
+def merge_near_duplicates(palette_rgb, tolerance: float, metric: str = "lab",
+                          representative: str = "first", counts=None) -> dict:
+    """
+    Fusionne les couleurs distantes d'au plus tolerance (ΔE76 en "lab", distance en "rgb")
+
+    Args:
+        palette_rgb: couleurs [N, 3] uint8, dans l'ordre de la palette
+        representative: "first" (première couleur du groupe), "most_frequent"
+            (selon counts) ou "mean" (moyenne pondérée par counts)
+        counts: nombre d'occurrences de chaque couleur (1 par défaut)
+
+    Retourne un dict: keep (index du représentant de chaque groupe, ordre de la palette),
+    colors [G, 3] uint8, groups (numéro de groupe de chaque couleur), group_counts.
+    """
+    if representative not in REPRESENTATIVES:
+        raise ValueError(f"Représentant inconnu: {representative}. Disponibles: {list(REPRESENTATIVES)}")
+    rgb = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+    n = len(rgb)
+    counts = np.ones(n, dtype=np.int64) if counts is None else np.asarray(counts, dtype=np.int64)
+
+    # Doublons exacts d'abord: la recherche de voisins ne porte que sur les couleurs distinctes
+    _, first_by_value, inverse_by_value = np.unique(pack_rgb(rgb), return_index=True, return_inverse=True)
+    by_first = np.argsort(first_by_value, kind="stable")
+    first = first_by_value[by_first]
+    rank_of_value = np.empty(len(first), dtype=np.int64)
+    rank_of_value[by_first] = np.arange(len(first))
+    inverse = rank_of_value[inverse_by_value.ravel()]
+    unique_counts = np.bincount(inverse, weights=counts, minlength=len(first)).astype(np.int64)
+
+    priority = unique_counts if representative == "most_frequent" else None
+    leader = cluster_near(to_metric_space(rgb[first], metric), tolerance, priority)
+
+    # Groupes numérotés dans l'ordre de la palette (première occurrence d'un membre)
+    leaders, group_of_unique = np.unique(leader, return_inverse=True)
+    group_first = np.full(len(leaders), n, dtype=np.int64)
+    np.minimum.at(group_first, group_of_unique, first)
+    rank = np.empty(len(leaders), dtype=np.int64)
+    rank[np.argsort(group_first, kind="stable")] = np.arange(len(leaders))
+    groups = rank[group_of_unique][inverse]
+
+    group_counts = np.bincount(groups, weights=counts, minlength=len(leaders)).astype(np.int64)
+    keep = np.empty(len(leaders), dtype=np.int64)
+    keep[rank] = first[leaders]
+    colors = rgb[keep]
+
+    if representative == "mean":
+        sums = np.zeros((len(leaders), 3), dtype=np.float64)
+        np.add.at(sums, groups, rgb.astype(np.float64) * counts[:, None])
+        colors = np.clip(np.round(sums / np.maximum(group_counts, 1)[:, None]), 0, 255).astype(np.uint8)
+
+    return {"keep": keep, "colors": colors, "groups": groups, "group_counts": group_counts}
+
+
+def merge_names(names: List[str], groups, keep, mode: str = "representative") -> List[str]:
+    """
+    Nom de chaque groupe fusionné
+
+    "representative": nom de la couleur gardée; "first_named": premier nom non vide
+    du groupe; "join": noms distincts du groupe séparés par " / ".
+    """
+    if mode not in NAME_MODES:
+        raise ValueError(f"Mode de nommage inconnu: {mode}. Disponibles: {list(NAME_MODES)}")
+    if mode == "representative":
+        return [names[k] for k in np.asarray(keep).tolist()]
+
+    merged: List[List[str]] = [[] for _ in range(len(keep))]
+    for name, group in zip(names, np.asarray(groups).tolist()):
+        if name and name not in merged[group]:
+            merged[group].append(name)
+    if mode == "first_named":
+        return [parts[0] if parts else "" for parts in merged]
+    return [" / ".join(parts) for parts in merged]
@@ -0,0 +1,324 @@
+# lib/palette_export.py
+"""
+Export de palettes en flux: GPL, hex, rgb, raw, variables CSS, JSON, ACT et ASE
+
+Les couleurs sont formatées par lots à partir de tables précalculées (256 entrées
+par canal) puis écrites directement dans un fichier ou un buffer, sans construire
+la liste complète des lignes en mémoire.
+"""
+from __future__ import annotations
+import io
+import re
+import json
+import struct
+from pathlib import Path
+from typing  import Iterator, Optional, Union
+
+from .lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+EXPORT_FORMATS = ("gpl", "hex", "rgb", "raw", "css", "json", "act", "ase")
+BINARY_FORMATS = ("act", "ase")
+TEXT_FORMATS   = tuple(f for f in EXPORT_FORMATS if f not in BINARY_FORMATS)
+
+# Extension de fichier -> format (save_palette)
+FORMAT_EXTENSIONS = {
+    ".gpl":  "gpl",
+    ".hex":  "hex",
+    ".txt":  "rgb",
+    ".pal":  "raw",
+    ".css":  "css",
+    ".json": "json",
+    ".act":  "act",
+    ".ase":  "ase",
+}
+
+# Nombre de couleurs formatées par écriture
+BATCH_SIZE = 4096
+
+_hex_table = None
+_dec3_table = None
+_DEC = [str(i) for i in range(256)]
+
+
+def hex_table() -> np.ndarray:
+    """Table [256, 2] des codes ASCII de "00".."ff" (construite au premier appel)"""
+    global _hex_table
+    if _hex_table is None:
+        _hex_table = np.frombuffer("".join(f"{i:02x}" for i in range(256)).encode("ascii"),
+                                   dtype=np.uint8).reshape(256, 2)
+    return _hex_table
+
+
+def dec3_table() -> np.ndarray:
+    """Table [256, 3] des codes ASCII de "  0".."255" (alignés à droite, format GIMP)"""
+    global _dec3_table
+    if _dec3_table is None:
+        _dec3_table = np.frombuffer("".join(f"{i:3d}" for i in range(256)).encode("ascii"),
+                                    dtype=np.uint8).reshape(256, 3)
+    return _dec3_table
+
+
+def rgb_array(colors) -> np.ndarray:
+    """Tableau [N, 3] uint8 d'une liste de PixelColor (sans tuples intermédiaires)"""
+    if not len(colors):
+        return np.empty((0, 3), dtype=np.uint8)
+    # Une liste par canal: plus rapide qu'une liste de tuples pour NumPy
+    channels = [[c.r for c in colors], [c.g for c in colors], [c.b for c in colors]]
+    return np.ascontiguousarray(np.array(channels, dtype=np.uint8).T)
+
+
+def hex_codes(colors) -> list:
+    """Codes "#rrggbb" d'un tableau [N, 3] uint8, formatés en une passe vectorisée"""
+    colors = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
+    table = hex_table()
+    out = np.empty((len(colors), 7), dtype=np.uint8)
+    out[:, 0] = ord("#")
+    out[:, 1:3] = table[colors[:, 0]]
+    out[:, 3:5] = table[colors[:, 1]]
+    out[:, 5:7] = table[colors[:, 2]]
+    text = out.tobytes().decode("ascii")
+    return [text[i:i + 7] for i in range(0, len(text), 7)]
+
+
+def _fixed_width_lines(colors, newline: str, gimp: bool) -> str:
+    """Lignes sans nom de largeur fixe ("#rrggbb" ou "rrr ggg bbb"), construites en octets"""
+    if gimp:
+        table = dec3_table()
+        cells = [table[colors[:, c]] for c in range(3)]
+        parts = [cells[0], _column(len(colors), " "), cells[1], _column(len(colors), " "), cells[2]]
+    else:
+        table = hex_table()
+        parts = [_column(len(colors), "#")] + [table[colors[:, c]] for c in range(3)]
+    parts.append(np.frombuffer(newline.encode("utf-8"), dtype=np.uint8)[None, :].repeat(len(colors), axis=0))
+    return np.concatenate(parts, axis=1).tobytes().decode("utf-8")
+
+
+def _column(count: int, char: str) -> np.ndarray:
+    return np.full((count, 1), ord(char), dtype=np.uint8)
+
+
+def css_name(name: str, index: int, prefix: str = "color") -> str:
+    """Nom de variable CSS: nom de la couleur en minuscules, tirets à la place des espaces"""
+    slug = re.sub(r"[^a-z0-9_-]+", "-", name.strip().lower()).strip("-") if name else ""
+    return f"{prefix}-{slug}" if slug else f"{prefix}-{index}"
+
+
+class PaletteExporter:
+    """
+    Écrit une palette dans un format donné, par lots de BATCH_SIZE couleurs
+
+    Les formats texte reprennent ceux de PixelPalette.to_formatted_string (hex, rgb, raw)
+    et to_gimp_format (gpl); l'en-tête de commentaires est optionnel.
+    """
+
+    def __init__(self, palette, format_type: str = "gpl", include_header: bool = True,
+                 include_names: bool = True, newline: str = "\n", css_prefix: str = "color",
+                 batch_size: int = BATCH_SIZE):
+        if format_type not in EXPORT_FORMATS:
+            raise ValueError(f"Format d'export inconnu: {format_type}. Disponibles: {list(EXPORT_FORMATS)}")
+        self.palette        = palette
+        self.format_type    = format_type
+        self.include_header = include_header
+        self.include_names  = include_names
+        self.newline        = newline
+        self.css_prefix     = css_prefix
+        self.batch_size     = max(1, int(batch_size))
+
+    @property
+    def is_binary(self) -> bool:
+        return self.format_type in BINARY_FORMATS
+
+    # === Sorties ===
+
+    def chunks(self) -> Iterator[bytes]:
+        """Morceaux successifs du fichier exporté"""
+        if self.is_binary:
+            yield from getattr(self, f"_{self.format_type}_chunks")()
+            return
+        for text in getattr(self, f"_{self.format_type}_chunks")():
+            if text:
+                yield text.encode("utf-8")
+
+    def write(self, fp) -> int:
+        """Écrit dans un fichier ouvert (binaire, ou texte pour les formats texte); retourne les octets écrits"""
+        text_mode = isinstance(fp, io.TextIOBase)
+        if text_mode and self.is_binary:
+            raise ValueError(f"Le format {self.format_type} est binaire: ouvrir le fichier en mode 'wb'")
+        written = 0
+        for chunk in self.chunks():
+            fp.write(chunk.decode("utf-8") if text_mode else chunk)
+            written += len(chunk)
+        return written
+
+    def to_bytes(self) -> bytes:
+        buffer = io.BytesIO()
+        self.write(buffer)
+        return buffer.getvalue()
+
+    # === Lots de couleurs ===
+
+    def _color_batches(self):
+        colors = self.palette.colors
+        for start in range(0, len(colors), self.batch_size):
+            yield colors[start:start + self.batch_size]
+
+    def _batches(self):
+        """(début, tableau [n, 3] uint8, noms) par lot de batch_size couleurs"""
+        for index, batch in enumerate(self._color_batches()):
+            start = index * self.batch_size
+            rgb = rgb_array(batch)
+            names = [c.name for c in batch] if self.include_names else None
+            yield start, rgb, names
+
+    def _header_lines(self):
+        if not self.include_header:
+            return ""
+        palette = self.palette
+        lines = [f"# Palette: {palette.name}", f"# Couleurs: {palette.color_count}",
+                 f"# Format: {palette.format_type}"]
+        if palette.source_filename:
+            lines.append(f"# Source: {palette.source_filename}")
+        lines.append("#")
+        return "".join(line + self.newline for line in lines)
+
+    # === Formats texte ===
+
+    def _gpl_chunks(self):
+        metadata = self.palette.metadata
+        header = ["GIMP Palette"]
+        if "name" in metadata:
+            header.append(f"Name: {metadata['name']}")
+        if "columns" in metadata:
+            header.append(f"Columns: {metadata['columns']}")
+        header.append("#")
+        yield "".join(line + self.newline for line in header)
+
+        dec3 = [f"{i:3d}" for i in range(256)]
+        for _, rgb, names in self._batches():
+            if not names or not any(names):
+                yield _fixed_width_lines(rgb, self.newline, gimp=True)
+                continue
+            nl = self.newline
+            yield "".join([f"{dec3[r]} {dec3[g]} {dec3[b]}\t{name}{nl}" if name else
+                           f"{dec3[r]} {dec3[g]} {dec3[b]}{nl}"
+                           for (r, g, b), name in zip(rgb.tolist(), names)])
+
+    def _hex_chunks(self):
+        yield self._header_lines()
+        for _, rgb, names in self._batches():
+            if not names or not any(names):
+                yield _fixed_width_lines(rgb, self.newline, gimp=False)
+                continue
+            nl = self.newline
+            yield "".join([f"{code} # {name}{nl}" if name else f"{code}{nl}"
+                           for code, name in zip(hex_codes(rgb), names)])
+
+    # rgb et raw sont de largeur variable: formatage direct depuis les attributs, par lots
+    def _rgb_chunks(self):
+        yield self._header_lines()
+        nl = self.newline
+        for batch in self._color_batches():
+            if self.include_names:
+                yield "".join([f"rgb({c.r}, {c.g}, {c.b}) # {c.name}{nl}" if c.name else
+                               f"rgb({c.r}, {c.g}, {c.b}){nl}" for c in batch])
+            else:
+                yield "".join([f"rgb({c.r}, {c.g}, {c.b}){nl}" for c in batch])
+
+    def _raw_chunks(self):
+        yield self._header_lines()
+        nl = self.newline
+        for batch in self._color_batches():
+            if self.include_names:
+                yield "".join([f"{c.r} {c.g} {c.b} {c.name}{nl}" if c.name else
+                               f"{c.r} {c.g} {c.b}{nl}" for c in batch])
+            else:
+                yield "".join([f"{c.r} {c.g} {c.b}{nl}" for c in batch])
+
+    def _css_chunks(self):
+        if self.include_header:
+            yield f"/* Palette: {self.palette.name} ({self.palette.color_count} couleurs) */{self.newline}"
+        yield ":root {" + self.newline
+        for start, rgb, names in self._batches():
+            names = names or [""] * len(rgb)
+            yield "".join(
+                f"  --{css_name(name, start + i, self.css_prefix)}: {code};{self.newline}"
+                for i, (code, name) in enumerate(zip(hex_codes(rgb), names))
+            )
+        yield "}" + self.newline
+
+    def _json_chunks(self):
+        yield '{"name": ' + json.dumps(self.palette.name, ensure_ascii=False)
+        yield ', "count": ' + str(self.palette.color_count) + ', "colors": ['
+        for start, rgb, names in self._batches():
+            names = names or [""] * len(rgb)
+            entries = ",".join(
+                f'{self.newline}  {{"hex": "{code}", "rgb": [{_DEC[r]}, {_DEC[g]}, {_DEC[b]}], '
+                f'"name": {json.dumps(name, ensure_ascii=False)}}}'
+                for code, (r, g, b), name in zip(hex_codes(rgb), rgb.tolist(), names)
+            )
+            yield ("," if start else "") + entries
+        yield self.newline + "]}" + self.newline
+
+    # === Formats binaires ===
+
+    def _act_chunks(self):
+        """Adobe Color Table: 256 x RGB, puis nombre de couleurs et index transparent (aucun)"""
+        count = self.palette.color_count
+        if count > 256:
+            raise ValueError(f"Le format ACT est limité à 256 couleurs ({count} dans la palette)")
+        table = np.zeros((256, 3), dtype=np.uint8)
+        if count:
+            table[:count] = self.palette.to_array()
+        yield table.tobytes()
+        yield struct.pack(">HH", count, 0xFFFF)
+
+    def _ase_chunks(self):
+        """Adobe Swatch Exchange 1.0: un bloc couleur RGB (float32 big-endian) par entrée"""
+        yield b"ASEF" + struct.pack(">HHI", 1, 0, self.palette.color_count)
+        for start, rgb, names in self._batches():
+            names = names or [""] * len(rgb)
+            values = (rgb.astype(">f4") / np.float32(255.0)).astype(">f4")
+            blocks = []
+            for i, (name, value) in enumerate(zip(names, values)):
+                label = (name or f"Color {start + i}").encode("utf-16-be") + b"\x00\x00"
+                body = struct.pack(">H", len(label) // 2) + label + b"RGB " + value.tobytes() + struct.pack(">H", 2)
+                blocks.append(struct.pack(">HI", 0x0001, len(body)) + body)
+            yield b"".join(blocks)
+
+
+def export_palette(palette, fp, format_type: str = "gpl", **options) -> int:
+    """Écrit la palette dans un fichier ouvert; retourne le nombre d'octets écrits"""
+    return PaletteExporter(palette, format_type, **options).write(fp)
+
+
+def export_to_bytes(palette, format_type: str = "gpl", **options) -> bytes:
+    """Palette exportée dans un buffer mémoire"""
+    return PaletteExporter(palette, format_type, **options).to_bytes()
+
+
+def format_for_path(path: Union[str, Path], default: str = "gpl") -> str:
+    """Format d'export déduit de l'extension du fichier"""
+    return FORMAT_EXTENSIONS.get(Path(path).suffix.lower(), default)
+
+
+def save_palette(palette, path: Union[str, Path], format_type: Optional[str] = None, **options) -> Path:
+    """
+    Enregistre la palette sur disque (format déduit de l'extension si non précisé)
+
+    Le fichier est écrit à côté puis renommé: pas de fichier partiel en cas d'erreur.
+    """
+    path = Path(path)
+    format_type = format_type or format_for_path(path)
+    exporter = PaletteExporter(palette, format_type, **options)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            exporter.write(f)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
@@ -0,0 +1,376 @@
+# lib/palette_library.py
+"""
+Bibliothèque de palettes indexée pour la recherche par similarité
+
+Toutes les couleurs de la bibliothèque sont rangées dans un seul tableau Lab (les palettes
+sont des tranches consécutives, repérées par offsets): une requête calcule les distances
+vers toutes les couleurs en quelques produits matriciels, puis réduit par palette
+(np.minimum.reduceat). Chaque palette a aussi une signature compacte: les histogrammes
+cumulés de ses couleurs sur chaque axe L, a, b (EMD approchée).
+"""
+from __future__ import annotations
+import os
+import hashlib
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .lazy_import      import lazy_import
+from .color.color_math import rgb_to_lab
+from .parallel         import BatchScheduler
+from .pixel_palette    import PixelPalette
+from .pixel_color      import PixelColor
+from .pixel_sampling   import stratified_sample
+from .palette_dedupe   import unique_colors
+from .palette_reduce   import reduce_palette
+
+np = lazy_import("numpy")
+
+LIBRARY_EXTENSIONS = ('.gpl', '.pal', '.hex', '.txt')
+SIMILARITY_METRICS = ("chamfer", "hausdorff", "emd")
+
+# Histogrammes par axe: bornes de L, a et b, nombre de cases
+SIGNATURE_BINS   = 32
+SIGNATURE_RANGES = ((0.0, 100.0), (-128.0, 128.0), (-128.0, 128.0))
+
+# Version du format de l'index sur disque (à incrémenter si les signatures changent)
+INDEX_VERSION = 1
+
+# Nombre de distances (requête x couleurs) évaluées par bloc
+_BLOCK_ELEMENTS = 1 << 22
+
+
+def lab_signature(lab, weights=None) -> np.ndarray:
+    """Histogrammes cumulés normalisés des couleurs Lab [N, 3] sur chaque axe, [3, SIGNATURE_BINS]"""
+    lab = np.asarray(lab, dtype=np.float64).reshape(-1, 3)
+    weights = np.ones(len(lab)) if weights is None else np.asarray(weights, dtype=np.float64)
+    total = max(float(weights.sum()), 1e-12)
+    signature = np.empty((3, SIGNATURE_BINS), dtype=np.float32)
+    for axis, (low, high) in enumerate(SIGNATURE_RANGES):
+        histogram, _ = np.histogram(np.clip(lab[:, axis], low, high), SIGNATURE_BINS, (low, high), weights=weights)
+        signature[axis] = np.cumsum(histogram) / total
+    return signature
+
+
+def _bin_widths() -> np.ndarray:
+    return np.array([(high - low) / SIGNATURE_BINS for low, high in SIGNATURE_RANGES], dtype=np.float32)
+
+
+def _read_palette(path: str) -> Tuple[str, Optional[PixelPalette]]:
+    try:
+        return path, PixelPalette.from_file(path)
+    except Exception:
+        return path, None
+
+
+class PaletteLibrary:
+    """
+    Index de recherche sur un ensemble de palettes (requêtes vectorisées sur toute la bibliothèque)
+
+    Les palettes vides sont ignorées au chargement. L'index se sauvegarde en .npz
+    (save / load) et se recharge sans relire ni reparser les fichiers.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.paths: List[str] = []
+        self.sources: List[str] = []                 # fichiers lus (palettes vides comprises)
+        self.stamps: List[Tuple[int, int]] = []      # (taille, mtime_ns) de chaque source
+        self.rgb = np.empty((0, 3), dtype=np.uint8)
+        self.color_names: List[str] = []
+        self.lab = np.empty((0, 3), dtype=np.float32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.signatures = np.empty((0, 3, SIGNATURE_BINS), dtype=np.float32)
+
+    # === Construction ===
+
+    @classmethod
+    def from_palettes(cls, palettes: Sequence[PixelPalette], paths: Optional[Sequence[str]] = None) -> PaletteLibrary:
+        """Index construit à partir de palettes déjà chargées"""
+        library = cls()
+        library._build(list(palettes), list(paths) if paths is not None else [p.source_filename for p in palettes])
+        return library
+
+    @classmethod
+    def from_directory(cls, directory, recursive: bool = True, index_path=None,
+                       workers: int = 0) -> PaletteLibrary:
+        """
+        Charge toutes les palettes d'un répertoire (parsers de PixelPalette)
+
+        Avec index_path, l'index sauvegardé est réutilisé tant que les fichiers n'ont pas
+        changé (mêmes chemins, tailles et dates); sinon il est reconstruit et sauvegardé.
+        """
+        files = library_files(directory, recursive)
+        stamps = [_stamp(path) for path in files]
+        if index_path is not None and os.path.exists(index_path):
+            try:
+                cached = cls.load(index_path)
+                if cached.sources == files and cached.stamps == stamps:
+                    return cached
+            except (OSError, ValueError, KeyError):
+                pass
+
+        loaded = BatchScheduler(workers=workers).map(_read_palette, files)
+        palettes = [(path, palette) for path, palette in loaded if palette is not None]
+        library = cls()
+        library._build([palette for _, palette in palettes], [path for path, _ in palettes])
+        library.sources, library.stamps = files, stamps
+        if index_path is not None:
+            library.save(index_path)
+        return library
+
+    def _build(self, palettes: List[PixelPalette], paths: List[str]) -> None:
+        kept = [(palette, path) for palette, path in zip(palettes, paths) if not palette.is_empty]
+        self.names = [palette.name for palette, _ in kept]
+        self.paths = [str(path) for _, path in kept]
+        self.sources = list(self.paths)
+        self.stamps = [_stamp(path) for path in self.paths]
+        sizes = [palette.color_count for palette, _ in kept]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        self.rgb = (np.concatenate([palette.to_array() for palette, _ in kept])
+                    if kept else np.empty((0, 3), dtype=np.uint8))
+        self.color_names = [color.name for palette, _ in kept for color in palette.colors]
+        self._index()
+
+    def _index(self) -> None:
+        """Lab et signatures, recalculés à partir des couleurs"""
+        lab = rgb_to_lab(self.rgb)
+        self.lab = lab.astype(np.float32)
+        self.signatures = np.stack([lab_signature(lab[start:stop])
+                                    for start, stop in zip(self.offsets[:-1], self.offsets[1:])]) \
+            if len(self) else np.empty((0, 3, SIGNATURE_BINS), dtype=np.float32)
+
+    @classmethod
+    def concatenate(cls, libraries: Sequence[PaletteLibrary]) -> PaletteLibrary:
+        """Bibliothèque formée des palettes de chaque bibliothèque, dans l'ordre"""
+        library = cls()
+        for part in libraries:
+            library.names += part.names
+            library.paths += part.paths
+            library.sources += part.sources
+            library.stamps += part.stamps
+            library.color_names += part.color_names
+        parts = [part for part in libraries if len(part)]
+        if parts:
+            library.rgb = np.concatenate([part.rgb for part in parts])
+            library.lab = np.concatenate([part.lab for part in parts])
+            library.signatures = np.concatenate([part.signatures for part in parts])
+            sizes = np.concatenate([np.diff(part.offsets) for part in parts])
+            library.offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        return library
+
+    # === Persistance ===
+
+    def save(self, path) -> Path:
+        """Sauvegarde l'index en .npz (écriture atomique)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, version=np.array(INDEX_VERSION), names=np.array(self.names, dtype=str),
+                     paths=np.array(self.paths, dtype=str), sources=np.array(self.sources, dtype=str), stamps=np.array(self.stamps, dtype=np.int64).reshape(-1, 2),
+                     rgb=self.rgb, color_names=np.array(self.color_names, dtype=str), offsets=self.offsets,
+                     lab=self.lab, signatures=self.signatures)
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path) -> PaletteLibrary:
+        """Recharge un index sauvegardé par save (ValueError si le format a changé)"""
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["version"]) != INDEX_VERSION:
+                raise ValueError(f"Version d'index incompatible: {int(data['version'])}")
+            library = cls()
+            library.names = data["names"].tolist()
+            library.paths = data["paths"].tolist()
+            library.sources = data["sources"].tolist()
+            library.stamps = [tuple(stamp) for stamp in data["stamps"].tolist()]
+            library.rgb = data["rgb"]
+            library.color_names = data["color_names"].tolist()
+            library.offsets = data["offsets"]
+            library.lab = data["lab"]
+            library.signatures = data["signatures"]
+        return library
+
+    # === Requêtes ===
+
+    def search(self, palette_rgb, k: int = 10, metric: str = "chamfer", weights=None) -> List[Tuple[int, float]]:
+        """
+        Les k palettes les plus proches de palette_rgb [Q, 3], (index, distance) croissantes
+
+        Args:
+            metric: "chamfer" (moyenne des distances au plus proche voisin, dans les deux
+                sens), "hausdorff" (pire des deux écarts) ou "emd" (somme des EMD 1D sur
+                L, a et b, calculée sur les signatures)
+            weights: poids de chaque couleur de la requête (ex: pixels d'une image)
+        """
+        return self._top_k(self.distances(palette_rgb, metric, weights), k)
+
+    def distances(self, palette_rgb, metric: str = "chamfer", weights=None) -> np.ndarray:
+        """Distance (ΔE76 pour chamfer / hausdorff) entre palette_rgb et chaque palette, [P]"""
+        if metric not in SIMILARITY_METRICS:
+            raise ValueError(f"Métrique inconnue: {metric}. Disponibles: {list(SIMILARITY_METRICS)}")
+        query = rgb_to_lab(np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3))
+        if len(query) == 0:
+            raise ValueError("Palette de requête vide")
+        weights = np.ones(len(query)) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        if metric == "emd":
+            difference = np.abs(self.signatures - lab_signature(query, weights)[None])
+            return np.einsum("paj,a->p", difference, _bin_widths())
+
+        forward, backward_sum, backward_max = self._nearest_by_palette(query)
+        forward_weights = weights / max(float(weights.sum()), 1e-12)
+        if metric == "chamfer":
+            sizes = np.diff(self.offsets)
+            return (forward_weights @ forward + backward_sum / sizes) / 2.0
+        return np.maximum(forward.max(axis=0), backward_max)
+
+    def contains(self, colors_rgb, tolerance: float = 2.3, k: int = 0) -> List[Tuple[int, float]]:
+        """
+        Palettes qui contiennent chacune des couleurs [C, 3] à tolerance près (ΔE76)
+
+        Retourne (index, écart) triés par écart croissant, où l'écart est la plus grande
+        des distances entre une couleur demandée et sa plus proche voisine dans la palette.
+        k > 0 limite le nombre de résultats.
+        """
+        query = rgb_to_lab(np.asarray(colors_rgb, dtype=np.uint8).reshape(-1, 3))
+        forward, _, _ = self._nearest_by_palette(query)
+        worst = forward.max(axis=0)
+        matches = np.flatnonzero(worst <= tolerance)
+        order = matches[np.argsort(worst[matches], kind="stable")]
+        if k > 0:
+            order = order[:k]
+        return [(int(i), float(worst[i])) for i in order]
+
+    def nearest_distances(self, colors_rgb, metric: str = "lab") -> np.ndarray:
+        """
+        Distance de chaque couleur [Q, 3] à la plus proche couleur de chaque palette, [Q, P]
+        (ΔE76 en "lab", distance euclidienne 0-255 en "rgb")
+        """
+        colors = np.asarray(colors_rgb, dtype=np.uint8).reshape(-1, 3)
+        if metric == "rgb":
+            return self._nearest_by_palette(colors, self.rgb.astype(np.float32))[0]
+        return self._nearest_by_palette(rgb_to_lab(colors))[0]
+
+    def _nearest_by_palette(self, query_points, points=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Pour chaque palette: distance de chaque couleur de la requête à sa plus proche
+        voisine [Q, P], puis somme et maximum des distances de ses couleurs à la requête [P]
+        points: couleurs de la bibliothèque dans l'espace de la requête (Lab par défaut)
+        """
+        n_palettes = len(self)
+        library_points = self.lab if points is None else points
+        query = np.asarray(query_points, dtype=np.float32).reshape(-1, 3)
+        forward = np.empty((len(query), n_palettes), dtype=np.float32)
+        backward_sum = np.empty(n_palettes, dtype=np.float64)
+        backward_max = np.empty(n_palettes, dtype=np.float32)
+        query_sq = np.einsum("ij,ij->i", query, query)
+
+        # Blocs de palettes entières (reduceat a besoin de tranches complètes)
+        block_colors = max(1, _BLOCK_ELEMENTS // len(query))
+        first = 0
+        while first < n_palettes:
+            last = int(np.searchsorted(self.offsets, self.offsets[first] + block_colors, side="right")) - 1
+            last = min(max(last, first + 1), n_palettes)
+            start, stop = int(self.offsets[first]), int(self.offsets[last])
+            points = library_points[start:stop]
+            squared = query_sq[:, None] - 2.0 * (query @ points.T) + np.einsum("ij,ij->i", points, points)[None, :]
+            distance = np.sqrt(np.maximum(squared, 0.0))
+            local = self.offsets[first:last] - start
+            forward[:, first:last] = np.minimum.reduceat(distance, local, axis=1)
+            nearest = distance.min(axis=0)
+            backward_sum[first:last] = np.add.reduceat(nearest.astype(np.float64), local)
+            backward_max[first:last] = np.maximum.reduceat(nearest, local)
+            first = last
+        return forward, backward_sum, backward_max
+
+    @staticmethod
+    def _top_k(scores, k: int) -> List[Tuple[int, float]]:
+        k = min(k, len(scores)) if k > 0 else len(scores)
+        if k == 0:
+            return []
+        candidates = np.argpartition(scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        order = candidates[np.lexsort((candidates, scores[candidates]))]
+        return [(int(i), float(scores[i])) for i in order]
+
+    # === Accès ===
+
+    def subset(self, indices) -> PaletteLibrary:
+        """Bibliothèque restreinte aux palettes indices (dans cet ordre), sans recalcul"""
+        indices = np.asarray(indices, dtype=np.int64)
+        starts, stops = self.offsets[indices], self.offsets[indices + 1]
+        offsets = np.concatenate([[0], np.cumsum(stops - starts)]).astype(np.int64)
+        colors = np.repeat(starts - offsets[:-1], stops - starts) + np.arange(offsets[-1])
+        library = PaletteLibrary()
+        library.names = [self.names[i] for i in indices.tolist()]
+        library.paths = [self.paths[i] for i in indices.tolist()]
+        library.sources, library.stamps = list(library.paths), []
+        library.offsets = offsets
+        library.rgb = self.rgb[colors]
+        library.color_names = [self.color_names[i] for i in colors.tolist()]
+        library.lab = self.lab[colors]
+        library.signatures = self.signatures[indices]
+        return library
+
+    def palette(self, index: int) -> PixelPalette:
+        """Palette index de la bibliothèque, reconstruite depuis l'index"""
+        start, stop = int(self.offsets[index]), int(self.offsets[index + 1])
+        palette = PixelPalette(source_filename=os.path.basename(self.paths[index]))
+        palette.format_type = "library"
+        palette.metadata['name'] = self.names[index]
+        palette.metadata['path'] = self.paths[index]
+        palette.colors = [PixelColor(r, g, b, name)
+                          for (r, g, b), name in zip(self.rgb[start:stop].tolist(), self.color_names[start:stop])]
+        return palette
+
+    def describe(self, results: List[Tuple[int, float]]) -> str:
+        """Résultats d'une requête, une ligne par palette"""
+        return "\n".join(f"{rank}. {self.names[i]} ({self.color_count(i)} couleurs): {score:.2f}"
+                         for rank, (i, score) in enumerate(results, 1))
+
+    def color_count(self, index: int) -> int:
+        return int(self.offsets[index + 1] - self.offsets[index])
+
+    def __len__(self):
+        return len(self.names)
+
+    def __str__(self):
+        return f"PaletteLibrary({len(self)} palettes, {len(self.rgb)} couleurs)"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+def image_query(pixels, max_colors: int = 32, sample_size: int = 65536,
+                seed: Optional[int] = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Palette de requête d'une image [H, W, 3] uint8: couleurs d'un échantillon stratifié,
+    réduites à max_colors, avec leur nombre de pixels comme poids
+    """
+    sample = stratified_sample(np.asarray(pixels)[..., :3], sample_size, seed)
+    first, counts = unique_colors(sample)
+    reduced = reduce_palette(sample[first], max_colors, counts)
+    return reduced['colors'], reduced['group_counts']
+
+
+def default_index_path(directory) -> Path:
+    """Emplacement de l'index d'un répertoire, dans le cache utilisateur (XDG_CACHE_HOME)"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.blake2b(str(Path(directory).resolve()).encode("utf-8"), digest_size=8).hexdigest()
+    return Path(cache_home) / "pixel_palette_art" / "libraries" / f"{key}.npz"
+
+
+def library_files(directory, recursive: bool = True) -> List[str]:
+    """Fichiers palette d'un répertoire, triés (LIBRARY_EXTENSIONS)"""
+    directory = Path(directory)
+    pattern = directory.rglob("*") if recursive else directory.glob("*")
+    return sorted(str(path) for path in pattern
+                  if path.is_file() and path.suffix.lower() in LIBRARY_EXTENSIONS)
+
+
+def _stamp(path) -> Tuple[int, int]:
+    try:
+        stat = os.stat(path)
+        return int(stat.st_size), int(stat.st_mtime_ns)
+    except OSError:
+        return 0, 0
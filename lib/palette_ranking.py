@@ -0,0 +1,99 @@
+# lib/palette_ranking.py
+"""
+Classement de palettes candidates selon l'erreur de quantification d'une image
+
+Toutes les palettes sont évaluées sur le même échantillon de pixels, par élimination
+successive (successive halving): chaque tour évalue les palettes restantes sur un
+échantillon deux fois plus grand et écarte la moitié la moins bonne. Seules les meilleures
+sont mesurées sur l'échantillon complet.
+
+Pour chaque palette, la table des plus proches voisins n'est calculée que pour les
+couleurs distinctes de l'échantillon (pondérées par leur nombre de pixels): une image de
+pixel art n'en compte que quelques centaines, bien moins que les cases d'une LUT complète.
+"""
+from __future__ import annotations
+import math
+from typing import List, Optional
+
+from .lazy_import     import lazy_import
+from .pixel_array     import pack_rgb, unpack_rgb
+from .pixel_sampling  import stratified_sample
+
+np = lazy_import("numpy")
+
+RANKING_METRICS = ("delta_e", "psnr")
+
+# Taille de l'échantillon du premier tour
+INITIAL_SAMPLE = 1024
+
+
+def ranking_sample(pixels, sample_size: int = 65536, seed: Optional[int] = 0) -> np.ndarray:
+    """Échantillon stratifié d'une image [H, W, 3] uint8, mélangé: chaque préfixe est représentatif"""
+    sample = stratified_sample(np.asarray(pixels)[..., :3], sample_size, seed).reshape(-1, 3)
+    return sample[np.random.default_rng(seed).permutation(len(sample))]
+
+
+def quantization_scores(library, sample_rgb, metric: str = "delta_e") -> np.ndarray:
+    """
+    Erreur de chaque palette de library sur des pixels [N, 3] (plus proche couleur)
+
+    "delta_e": ΔE76 moyen (plus petit = meilleur); "psnr": PSNR en dB après projection
+    sur la palette en RGB (plus grand = meilleur).
+    """
+    if metric not in RANKING_METRICS:
+        raise ValueError(f"Métrique inconnue: {metric}. Disponibles: {list(RANKING_METRICS)}")
+    packed, counts = np.unique(pack_rgb(np.asarray(sample_rgb, dtype=np.uint8)), return_counts=True)
+    colors = unpack_rgb(packed)
+    weights = counts / counts.sum()
+
+    if metric == "delta_e":
+        return weights @ library.nearest_distances(colors, "lab").astype(np.float64)
+    distance = library.nearest_distances(colors, "rgb").astype(np.float64)
+    mse = (weights @ (distance * distance)) / 3.0
+    with np.errstate(divide="ignore"):
+        return 10.0 * np.log10(255.0 ** 2 / mse)
+
+
+def rank_palettes(library, sample_rgb, metric: str = "delta_e", keep: int = 1,
+                  initial_sample: int = INITIAL_SAMPLE) -> List[dict]:
+    """
+    Classe les palettes de library (PaletteLibrary) sur l'échantillon sample_rgb [N, 3]
+
+    Tant qu'il reste plus de 2 * keep palettes et que l'échantillon n'est pas épuisé,
+    chaque tour évalue les palettes restantes sur un préfixe de l'échantillon (doublé
+    à chaque tour) et garde la meilleure moitié (au moins keep). Si l'échantillon a moins
+    de initial_sample couleurs distinctes, toutes les palettes sont mesurées en un tour.
+
+    Retourne une entrée par palette, de la meilleure à la moins bonne: index (dans
+    library), score et pixels (taille de l'échantillon ayant servi au score). Les palettes
+    écartées suivent les palettes mesurées sur l'échantillon complet.
+    """
+    sample = np.asarray(sample_rgb, dtype=np.uint8).reshape(-1, 3)
+    n = len(library)
+    if n == 0 or len(sample) == 0:
+        return []
+    better_is_lower = metric == "delta_e"
+    keep = max(1, keep)
+
+    alive = np.arange(n)
+    eliminated: List[dict] = []
+    size = min(len(sample), max(1, initial_sample))
+    if len(np.unique(pack_rgb(sample))) <= size:
+        # Peu de couleurs distinctes (pixel art): un seul tour sur tout l'échantillon coûte moins
+        size = len(sample)
+    while True:
+        scores = quantization_scores(library.subset(alive), sample[:size], metric)
+        order = np.argsort(scores if better_is_lower else -scores, kind="stable")
+        if size >= len(sample) or len(alive) <= 2 * keep:
+            if size < len(sample):
+                # Peu de candidates: les dernières sont mesurées sur l'échantillon complet
+                size = len(sample)
+                continue
+            break
+        survivors = max(keep, math.ceil(len(alive) / 2))
+        eliminated = [{"index": int(alive[i]), "score": float(scores[i]), "pixels": size}
+                      for i in order[survivors:]] + eliminated
+        alive = alive[order[:survivors]]
+        size = min(len(sample), size * 2)
+
+    return [{"index": int(alive[i]), "score": float(scores[i]), "pixels": size} for i in order] + eliminated
@@ -0,0 +1,272 @@
+# lib/palette_reduce.py
+"""
+Réduction d'une palette à N couleurs en minimisant la perte perceptuelle (dans Lab)
+
+Fusion agglomérative (critère de Ward, pondéré par les occurrences de chaque couleur)
+pilotée par une file de priorité sur un graphe des plus proches voisins: après chaque
+fusion, seuls les coûts vers les voisins du groupe fusionné sont recalculés, au lieu de
+toutes les paires. Un affinage k-means optionnel part des groupes obtenus.
+"""
+from __future__ import annotations
+import heapq
+from typing import List
+
+from .lazy_import      import lazy_import
+from .color.color_math import rgb_to_lab, lab_to_rgb
+from .lut.lut_builder  import nearest_indices
+from .palette_dedupe   import near_pairs
+
+np = lazy_import("numpy")
+
+REDUCE_REPRESENTATIVES = ("mean", "nearest", "most_frequent")
+
+# Nombre de voisins par couleur dans le graphe initial
+DEFAULT_NEIGHBORS = 8
+
+# Poids minimal: une couleur inutilisée (0 occurrence) fusionne sans coût mais sans division par zéro
+_MIN_WEIGHT = 1e-6
+
+# Lignes de la matrice des distances évaluées à la fois pour le graphe des voisins
+_KNN_CHUNK = 2048
+# Au-delà, le graphe des voisins est construit par hachage sur une grille
+_BRUTE_FORCE_MAX = 1024
+
+
+def knn_graph(points, k: int) -> np.ndarray:
+    """
+    Index des k plus proches voisins de chaque point (lui-même exclu), [N, k]
+
+    Jusqu'à _BRUTE_FORCE_MAX points, toutes les distances sont calculées (par blocs).
+    Au-delà, les candidats sont cherchés par hachage sur une grille (near_pairs) dans un
+    rayon qui contient ~2k points en moyenne; les cases vides du résultat valent -1 et un
+    point sans voisin dans ce rayon reçoit au moins son plus proche voisin exact.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64)
+    if n > _BRUTE_FORCE_MAX:
+        return _knn_by_grid(points, k)
+    return _brute_force_knn(points, k, np.arange(n))
+
+
+def _brute_force_knn(points, k: int, rows) -> np.ndarray:
+    """k plus proches voisins des points d'index rows, par calcul de toutes les distances"""
+    # Distances en float32 comme nearest_indices (centrées pour limiter l'erreur d'arrondi)
+    centered = (points - points.mean(axis=0)).astype(np.float32)
+    squares = np.einsum("ij,ij->i", centered, centered)
+    result = np.empty((len(rows), k), dtype=np.int64)
+    for start in range(0, len(rows), _KNN_CHUNK):
+        block_rows = rows[start:start + _KNN_CHUNK]
+        dist = squares[None, :] - 2.0 * (centered[block_rows] @ centered.T)
+        dist[np.arange(len(block_rows)), block_rows] = np.inf
+        result[start:start + len(block_rows)] = np.argpartition(dist, k - 1, axis=1)[:, :k]
+    return result
+
+
+def _knn_by_grid(points, k: int) -> np.ndarray:
+    n = len(points)
+    volume = float(np.prod(np.maximum(np.ptp(points, axis=0), 1.0)))
+    # Sphère de k/2 points si la boîte englobante était uniformément remplie: les couleurs
+    # n'occupent qu'une partie de la boîte, d'où ~2k voisins en pratique
+    radius = (0.5 * k * volume / (n * 4.18879)) ** (1 / 3)
+
+    i, j = near_pairs(points, radius)
+    src = np.concatenate([i, j])
+    dst = np.concatenate([j, i])
+    diff = points[src] - points[dst]
+    order = np.lexsort((np.einsum("ij,ij->i", diff, diff), src))
+    src, dst = src[order], dst[order]
+    starts = np.concatenate([[0], np.cumsum(np.bincount(src, minlength=n))])[:-1]
+    rank = np.arange(len(src)) - starts[src]
+    keep = rank < k
+
+    result = np.full((n, k), -1, dtype=np.int64)
+    result[src[keep], rank[keep]] = dst[keep]
+
+    lonely = np.flatnonzero(result[:, 0] < 0)
+    if len(lonely):
+        result[lonely, 0] = _brute_force_knn(points, 1, lonely)[:, 0]
+    return result
+
+
+def _ward_costs(weight_a, centroid_a, weights_b, centroids_b) -> np.ndarray:
+    """Augmentation de l'erreur quadratique pondérée si a fusionne avec chaque b"""
+    diff = centroids_b - centroid_a
+    return weight_a * weights_b / (weight_a + weights_b) * np.einsum("ij,ij->i", diff, diff)
+
+
+def agglomerate(points, target: int, weights=None, neighbors: int = DEFAULT_NEIGHBORS) -> np.ndarray:
+    """
+    Fusionne les points deux à deux (coût de Ward le plus faible d'abord) jusqu'à target groupes
+
+    Le graphe des k plus proches voisins est contracté à chaque fusion (les voisins du
+    nouveau groupe sont ceux de ses deux parties), et les coûts périmés restent dans la
+    file: ils sont ignorés grâce à un numéro de version par groupe. Coût ~ O(N k log N).
+    Retourne, pour chaque point, l'index du point qui représente son groupe.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    n = len(points)
+    parent = np.arange(n)
+    if target >= n or n < 2:
+        return parent
+    target = max(1, target)
+
+    weight = np.ones(n) if weights is None else np.maximum(np.asarray(weights, dtype=np.float64), _MIN_WEIGHT)
+    centroid = points.copy()
+    alive = np.ones(n, dtype=bool)
+    version = [0] * n
+
+    graph = knn_graph(points, neighbors)
+    links: List[set] = [set(row) - {-1} for row in graph.tolist()]
+    for i, row in enumerate(graph.tolist()):
+        for j in row:
+            if j >= 0:
+                links[j].add(i)
+
+    # File initiale: une entrée par arête (i < j), coûts calculés en un seul passage
+    src = np.repeat(np.arange(n), [len(s) for s in links])
+    dst = np.fromiter((j for s in links for j in s), dtype=np.int64, count=len(src))
+    edge = src < dst
+    src, dst = src[edge], dst[edge]
+    diff = points[src] - points[dst]
+    costs = weight[src] * weight[dst] / (weight[src] + weight[dst]) * np.einsum("ij,ij->i", diff, diff)
+    heap = [(cost, a, b, 0, 0) for cost, a, b in zip(costs.tolist(), src.tolist(), dst.tolist())]
+    heapq.heapify(heap)
+
+    clusters = n
+    while clusters > target and heap:
+        _, a, b, version_a, version_b = heapq.heappop(heap)
+        if not (alive[a] and alive[b]) or version[a] != version_a or version[b] != version_b:
+            continue
+
+        # b rejoint a
+        total = weight[a] + weight[b]
+        centroid[a] = (centroid[a] * weight[a] + centroid[b] * weight[b]) / total
+        weight[a] = total
+        alive[b] = False
+        parent[b] = a
+        version[a] += 1
+        clusters -= 1
+
+        merged = (links[a] | links[b]) - {a, b}
+        for j in links[b]:
+            if j != a:
+                links[j].discard(b)
+                links[j].add(a)
+        links[b] = set()
+
+        if not merged and clusters > target:
+            # Composante isolée: on la relie au groupe vivant le plus proche
+            others = np.flatnonzero(alive)
+            others = others[others != a]
+            diff = centroid[others] - centroid[a]
+            nearest = int(others[np.argmin(np.einsum("ij,ij->i", diff, diff))])
+            merged = {nearest}
+            links[nearest].add(a)
+        links[a] = merged
+
+        if merged:
+            others = np.fromiter(merged, dtype=np.int64, count=len(merged))
+            costs = _ward_costs(weight[a], centroid[a], weight[others], centroid[others])
+            for cost, j in zip(costs.tolist(), others.tolist()):
+                heapq.heappush(heap, (cost, a, j, version[a], version[j]))
+
+    # Chaque point pointe vers la racine de son groupe
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent = grand
+
+
+def _palette_order(labels, n_groups: int) -> np.ndarray:
+    """Renumérote des groupes dans l'ordre de leur premier membre dans la palette"""
+    first = np.full(n_groups, len(labels), dtype=np.int64)
+    np.minimum.at(first, labels, np.arange(len(labels)))
+    used = first < len(labels)
+    rank = np.full(n_groups, -1, dtype=np.int64)
+    rank[np.flatnonzero(used)[np.argsort(first[used], kind="stable")]] = np.arange(int(used.sum()))
+    return rank[labels]
+
+
+def _centroids(points, groups, weights, n_groups: int) -> np.ndarray:
+    sums = np.zeros((n_groups, 3), dtype=np.float64)
+    np.add.at(sums, groups, points * weights[:, None])
+    totals = np.bincount(groups, weights=weights, minlength=n_groups)
+    return sums / np.maximum(totals, _MIN_WEIGHT)[:, None]
+
+
+def kmeans_refine(points, groups, weights, iterations: int) -> np.ndarray:
+    """
+    Affinage de Lloyd (k-means pondéré) à partir de groupes existants
+    S'arrête dès que plus aucun point ne change de groupe; un groupe vidé disparaît.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    weights = np.maximum(np.asarray(weights, dtype=np.float64), _MIN_WEIGHT)
+    for _ in range(iterations):
+        n_groups = int(groups.max()) + 1
+        assigned = nearest_indices(points, _centroids(points, groups, weights, n_groups)).astype(np.int64)
+        assigned = _palette_order(assigned, n_groups)
+        if np.array_equal(assigned, groups):
+            break
+        groups = assigned
+    return groups
+
+
+def reduce_palette(palette_rgb, target: int, counts=None, refine: int = 0,
+                   representative: str = "mean", neighbors: int = DEFAULT_NEIGHBORS) -> dict:
+    """
+    Réduit une palette à au plus target couleurs
+
+    Args:
+        palette_rgb: couleurs [N, 3] uint8, dans l'ordre de la palette
+        counts: occurrences de chaque couleur (ex: pixels d'une image), 1 par défaut;
+            une couleur très utilisée bouge moins lors des fusions
+        refine: nombre maximal d'itérations k-means après la fusion (0: aucune)
+        representative: "mean" (centre du groupe dans Lab), "nearest" (couleur d'origine
+            la plus proche du centre) ou "most_frequent" (selon counts)
+
+    Retourne un dict: keep (couleur d'origine associée à chaque groupe, pour nom et espace
+    de couleur), colors [G, 3] uint8, groups, group_counts, et l'erreur introduite:
+    mean_error (ΔE76 moyen pondéré par counts) et max_error.
+    """
+    if representative not in REDUCE_REPRESENTATIVES:
+        raise ValueError(f"Représentant inconnu: {representative}. "
+                         f"Disponibles: {list(REDUCE_REPRESENTATIVES)}")
+    rgb = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+    n = len(rgb)
+    weights = np.ones(n) if counts is None else np.asarray(counts, dtype=np.float64)
+    points = rgb_to_lab(rgb)
+
+    roots = agglomerate(points, target, weights, neighbors)
+    groups = _palette_order(roots, n)
+    if refine > 0 and n > 0:
+        groups = kmeans_refine(points, groups, weights, refine)
+    n_groups = int(groups.max()) + 1 if n else 0
+
+    centers = _centroids(points, groups, np.maximum(weights, _MIN_WEIGHT), n_groups)
+    distance = np.sqrt(np.einsum("ij,ij->i", points - centers[groups], points - centers[groups]))
+
+    # Membre retenu par groupe: tri par (groupe, critère), premier de chaque groupe
+    criterion = -weights if representative == "most_frequent" else distance
+    order = np.lexsort((np.arange(n), criterion, groups))
+    starts = np.flatnonzero(np.r_[True, groups[order][1:] != groups[order][:-1]]) if n else order
+    keep = order[starts]
+
+    if representative == "mean":
+        colors = np.clip(np.round(lab_to_rgb(centers)), 0, 255).astype(np.uint8)
+    else:
+        colors = rgb[keep]
+
+    errors = np.sqrt(np.sum((points - rgb_to_lab(colors)[groups]) ** 2, axis=1))
+    total = float(weights.sum())
+    return {
+        "keep":         keep,
+        "colors":       colors,
+        "groups":       groups,
+        "group_counts": np.bincount(groups, weights=weights, minlength=n_groups).astype(np.int64),
+        "mean_error":   float(np.dot(errors, weights) / total) if total > 0 else 0.0,
+        "max_error":    float(errors.max()) if n else 0.0,
+    }
@@ -0,0 +1,112 @@
+# lib/palette_sort.py
+"""
+Tris de palette vectorisés: chaque mode calcule une clé par couleur puis un argsort stable
+(à clé égale, l'ordre de la palette est conservé)
+"""
+from __future__ import annotations
+
+from .lazy_import      import lazy_import
+from .color.color_math import rgb_to_lab, rgb_to_oklab, oklab_to_oklch
+
+np = lazy_import("numpy")
+
+SORT_MODES = ("hue", "brightness", "oklch", "hilbert", "frequency")
+
+# En dessous de ce chroma OKLCH, une couleur est considérée comme un gris (teinte instable)
+ACHROMATIC_CHROMA = 0.02
+
+
+def hsv_hue(rgb) -> np.ndarray:
+    """Teinte HSV dans [0, 1), même formule que colorsys.rgb_to_hsv (0 pour les gris)"""
+    rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3) / 255.0
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    maxc = rgb.max(axis=1)
+    delta = maxc - rgb.min(axis=1)
+    safe = np.where(delta > 0, delta, 1.0)
+    rc, gc, bc = (maxc - r) / safe, (maxc - g) / safe, (maxc - b) / safe
+    hue = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    return np.where(delta > 0, (hue / 6.0) % 1.0, 0.0)
+
+
+def brightness(rgb) -> np.ndarray:
+    """Luminosité perceptuelle (Rec. 601)"""
+    rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3)
+    return rgb @ np.array([0.299, 0.587, 0.114])
+
+
+def hilbert_index(coords, bits: int) -> np.ndarray:
+    """
+    Index sur la courbe de Hilbert 3D de coordonnées entières [N, 3] dans [0, 2^bits)
+
+    Algorithme de Skilling (2004), appliqué à toutes les couleurs à la fois: deux index
+    consécutifs correspondent à deux cases voisines de la grille.
+    """
+    x = np.asarray(coords, dtype=np.int64).reshape(-1, 3).T.copy()
+    top = 1 << (bits - 1)
+
+    # Coordonnées -> "transposée" de l'index de Hilbert
+    q = top
+    while q > 1:
+        p = q - 1
+        for i in range(3):
+            flip = (x[i] & q) != 0
+            x[0] = np.where(flip, x[0] ^ p, x[0])
+            swap = np.where(flip, 0, (x[0] ^ x[i]) & p)
+            x[0] ^= swap
+            x[i] ^= swap
+        q >>= 1
+
+    # Code de Gray
+    x[1] ^= x[0]
+    x[2] ^= x[1]
+    t = np.zeros(x.shape[1], dtype=np.int64)
+    q = top
+    while q > 1:
+        t = np.where((x[2] & q) != 0, t ^ (q - 1), t)
+        q >>= 1
+    x ^= t
+
+    # Entrelacement des bits: x[0] fournit le bit de poids fort de chaque triplet
+    index = np.zeros(x.shape[1], dtype=np.int64)
+    for bit in range(bits - 1, -1, -1):
+        for i in range(3):
+            index = (index << 1) | ((x[i] >> bit) & 1)
+    return index
+
+
+def sort_order(palette_rgb, mode: str = "oklch", counts=None, hue_bins: int = 12,
+               bits: int = 8) -> np.ndarray:
+    """
+    Permutation (stable) qui trie la palette selon mode
+
+    Args:
+        mode: "hue" (teinte HSV), "brightness" (luminosité), "oklch" (gris d'abord, puis
+            secteurs de teinte OKLCH, du plus clair au plus sombre dans chaque secteur),
+            "hilbert" (courbe de Hilbert dans Lab: couleurs voisines côte à côte),
+            "frequency" (les plus fréquentes d'abord, selon counts)
+        counts: occurrences de chaque couleur (mode frequency; sans counts l'ordre est gardé)
+        hue_bins: nombre de secteurs de teinte (mode oklch)
+        bits: résolution de la grille Lab par axe (mode hilbert)
+    """
+    rgb = np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3)
+    if mode == "hue":
+        return np.argsort(hsv_hue(rgb), kind="stable")
+    if mode == "brightness":
+        return np.argsort(brightness(rgb), kind="stable")
+    if mode == "oklch":
+        lch = oklab_to_oklch(rgb_to_oklab(rgb))
+        sector = np.floor(lch[:, 2] / 360.0 * hue_bins).astype(np.int64) % hue_bins
+        sector = np.where(lch[:, 1] < ACHROMATIC_CHROMA, -1, sector)
+        # lexsort: dernière clé = clé principale
+        return np.lexsort((-lch[:, 0], sector))
+    if mode == "hilbert":
+        lab = rgb_to_lab(rgb)
+        scale = (1 << bits) - 1
+        coords = np.stack([lab[:, 0] / 100.0, (lab[:, 1] + 128.0) / 256.0, (lab[:, 2] + 128.0) / 256.0], axis=1)
+        coords = np.clip(np.round(coords * scale), 0, scale).astype(np.int64)
+        return np.argsort(hilbert_index(coords, bits), kind="stable")
+    if mode == "frequency":
+        if counts is None:
+            return np.arange(len(rgb))
+        return np.argsort(-np.asarray(counts, dtype=np.float64), kind="stable")
+    raise ValueError(f"Tri inconnu: {mode}. Disponibles: {list(SORT_MODES)}")
@@ -0,0 +1,10 @@
+# lib/parallel/__init__.py
+"""
+Exécution parallèle partagée par les nodes
+Un seul pool de workers par process, démarré à la première utilisation
+"""
+
+from .worker_pool     import WorkerPool, get_worker_pool, resolve_worker_count
+from .batch_scheduler import BatchScheduler
+
+__all__ = ['WorkerPool', 'get_worker_pool', 'resolve_worker_count', 'BatchScheduler']
@@ -0,0 +1,72 @@
+# lib/parallel/batch_scheduler.py
+from __future__ import annotations
+from concurrent.futures import wait, FIRST_COMPLETED
+from typing import Callable, Iterable, List, Optional
+
+from ..lazy_import import lazy_import
+from .worker_pool import WorkerPool, get_worker_pool, resolve_worker_count
+
+np = lazy_import("numpy")
+
+
+class BatchScheduler:
+    """
+    Répartit le travail par image (batch) ou par bande de lignes (tuiles) sur le pool partagé
+
+    Le nombre de tâches en vol est borné (backpressure): on ne soumet une nouvelle
+    tâche que lorsqu'une place se libère, ce qui borne aussi la mémoire des résultats.
+    """
+
+    def __init__(self, workers: int = 0, pool: Optional[WorkerPool] = None,
+                 use_processes: bool = False, max_in_flight: int = 0):
+        self.pool          = pool if pool is not None else get_worker_pool()
+        self.workers       = min(resolve_worker_count(workers), self.pool.max_workers)
+        self.use_processes = use_processes
+        self.max_in_flight = max_in_flight if max_in_flight > 0 else self.workers * 2
+
+    def map(self, fn: Callable, items: Iterable) -> List:
+        """Applique fn à chaque élément, résultats dans l'ordre d'entrée"""
+        items = list(items)
+        if self.workers <= 1 or len(items) <= 1:
+            return [fn(item) for item in items]
+
+        executor = self.pool.executor(self.use_processes)
+        results  = [None] * len(items)
+        pending  = {}
+
+        for index, item in enumerate(items):
+            if len(pending) >= self.max_in_flight:
+                self._collect(pending, results, FIRST_COMPLETED)
+            pending[executor.submit(fn, item)] = index
+
+        while pending:
+            self._collect(pending, results, FIRST_COMPLETED)
+
+        return results
+
+    def map_batch(self, fn: Callable, batch) -> List:
+        """Applique fn à chaque image d'un batch [B, H, W, C]"""
+        return self.map(fn, [batch[i] for i in range(len(batch))])
+
+    def map_tiles(self, fn: Callable, array, min_rows: int = 64) -> List:
+        """
+        Découpe array en bandes de lignes (axe 0) et applique fn à chacune
+
+        Les bandes sont des vues (aucune copie); le nombre de bandes suit le
+        nombre de workers pour limiter le coût de coordination.
+        """
+        return self.map(fn, [array[s] for s in self.row_slices(len(array), min_rows)])
+
+    def row_slices(self, height: int, min_rows: int = 64) -> List[slice]:
+        """Calcule les bandes de lignes pour une hauteur donnée"""
+        if height <= 0:
+            return []
+        parts = max(1, min(self.workers * 2, height // max(1, min_rows)))
+        bounds = np.linspace(0, height, parts + 1).astype(int)
+        return [slice(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+    @staticmethod
+    def _collect(pending, results, return_when):
+        done, _ = wait(list(pending), return_when=return_when)
+        for future in done:
+            results[pending.pop(future)] = future.result()
@@ -0,0 +1,100 @@
+# lib/parallel/worker_pool.py
+import os
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional
+
+# Variable d'environnement pour fixer le nombre de workers (0 ou absente = auto)
+WORKERS_ENV_VAR = "PIXEL_PALETTE_WORKERS"
+
+
+def resolve_worker_count(requested: int = 0) -> int:
+    """
+    Résout le nombre de workers à utiliser
+
+    Priorité: valeur demandée (> 0) > variable d'environnement > nombre de cœurs
+    """
+    if requested and requested > 0:
+        return int(requested)
+
+    env_value = os.environ.get(WORKERS_ENV_VAR, "").strip()
+    if env_value:
+        try:
+            count = int(env_value)
+            if count > 0:
+                return count
+        except ValueError:
+            pass
+
+    return os.cpu_count() or 1
+
+
+class WorkerPool:
+    """
+    Pool de workers partagé: threads par défaut, process en option
+    Les executors ne sont créés qu'à la première demande
+    """
+
+    def __init__(self, max_workers: int = 0):
+        self.max_workers = resolve_worker_count(max_workers)
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def thread_executor(self) -> ThreadPoolExecutor:
+        """Executor de threads (NumPy libère le GIL sur les gros calculs)"""
+        if self._threads is None:
+            with self._lock:
+                if self._threads is None:
+                    self._threads = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="pixel_palette"
+                    )
+        return self._threads
+
+    def process_executor(self) -> ProcessPoolExecutor:
+        """Executor de process, pour le code Python pur qui garde le GIL"""
+        if self._processes is None:
+            with self._lock:
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._processes
+
+    def executor(self, use_processes: bool = False):
+        return self.process_executor() if use_processes else self.thread_executor()
+
+    @property
+    def is_started(self) -> bool:
+        return self._threads is not None or self._processes is not None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Arrête les executors démarrés"""
+        with self._lock:
+            if self._threads is not None:
+                self._threads.shutdown(wait=wait)
+                self._threads = None
+            if self._processes is not None:
+                self._processes.shutdown(wait=wait)
+                self._processes = None
+
+    def __str__(self):
+        return f"WorkerPool({self.max_workers} workers, démarré: {self.is_started})"
+
+    def __repr__(self):
+        return self.__str__()
+
+
+_shared_pool: Optional[WorkerPool] = None
+_shared_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """Retourne le pool partagé du process (créé à la première demande)"""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_lock:
+            if _shared_pool is None:
+                _shared_pool = WorkerPool()
+                atexit.register(_shared_pool.shutdown, False)
+    return _shared_pool
@@ -0,0 +1,57 @@
+# lib/pixel_array.py
+"""
+Utilitaires NumPy pour manipuler des pixels RGB
+Les couleurs sont empaquetées en uint32 (0x00RRGGBB) pour les comparaisons rapides
+"""
+from __future__ import annotations
+from .lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+
+def to_uint8(pixels) -> np.ndarray:
+    """Convertit des pixels flottants [0,1] (format ComfyUI) en uint8 [0,255]"""
+    pixels = np.asarray(pixels)
+    if pixels.dtype == np.uint8:
+        return pixels
+    # clip(x, 0, 1) * 255 == clip(x * 255, 0, 255); clip en place sur le seul temporaire
+    # (np.clip sur l'entrée, avec bornes Python, est plusieurs fois plus lent)
+    scaled = np.multiply(pixels, 255)
+    np.clip(scaled, 0, 255, out=scaled)
+    return scaled.astype(np.uint8)
+
+
+def pack_rgb(pixels) -> np.ndarray:
+    """Empaquette un tableau [..., 3] de uint8 en uint32 0x00RRGGBB"""
+    pixels = np.asarray(pixels)
+    if pixels.dtype != np.uint8:
+        pixels = pixels.astype(np.uint32)
+    # Décalages et OU en place: un seul tableau uint32 alloué
+    packed = pixels[..., 0].astype(np.uint32)
+    packed <<= 8
+    packed |= pixels[..., 1]
+    packed <<= 8
+    packed |= pixels[..., 2]
+    return packed if packed.ndim else packed[()]
+
+
+def unpack_rgb(packed) -> np.ndarray:
+    """Opération inverse de pack_rgb: uint32 -> tableau [..., 3] de uint8"""
+    packed = np.asarray(packed, dtype=np.uint32)
+    out = np.empty(packed.shape + (3,), dtype=np.uint8)
+    out[..., 0] = (packed >> 16) & 0xFF
+    out[..., 1] = (packed >> 8) & 0xFF
+    out[..., 2] = packed & 0xFF
+    return out
+
+
+def ensure_rgb(pixels) -> np.ndarray:
+    """Ramène une image [H, W], [H, W, 1] ou [H, W, 4] à [H, W, 3]"""
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        return np.repeat(pixels[..., None], 3, axis=-1)
+    if pixels.shape[-1] == 3:
+        return pixels
+    if pixels.shape[-1] == 4:
+        return pixels[..., :3]
+    return np.repeat(pixels[..., :1], 3, axis=-1)
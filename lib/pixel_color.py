@@ -8,8 +8,6 @@ from pathlib     import Path
 #
 # lib/pixel_color.py
 
-from . import color  # ⚡ force l’exécution de lib/color/__init__.py et donc des registers
-from .color.color_spaces.rgb.rgb_exporter import RGBExporter
 from .color.color_space_context  import ColorSpaceContext
 from .color.color_space_registry import ColorSpaceRegistry
 
@@ -33,6 +31,7 @@ class PixelColor:
         self._exporter = None
 
     def mix_with(self, color: PixelColor, ratio: float = 0.5) -> PixelColor:
+        ColorSpaceRegistry.load_builtin_spaces()  # ⚡ les espaces s'enregistrent au premier mélange
         mixer = ColorSpaceRegistry.get_mixer_class(self.color_space)
         self.r, self.g, self.b = mixer.mix_with(self, color, ratio)
         return self
@@ -40,6 +39,7 @@ class PixelColor:
     @property
     def exporter(self):
         if self._exporter is None:
+            from .color.color_spaces.rgb.rgb_exporter import RGBExporter
             self._exporter = RGBExporter(self)  # <- self est une référence
         return self._exporter
 
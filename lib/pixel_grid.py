@@ -0,0 +1,186 @@
+# lib/pixel_grid.py
+"""
+Détection de la grille d'un faux pixel art (image agrandie, pas non entier, anti-aliasing)
+et réduction de chaque case à sa couleur majoritaire
+
+Le pas est estimé sur les profils de contours (somme des écarts entre colonnes, ou entre
+lignes, voisines): autocorrélation pour une première valeur, puis maximum de la transformée
+de Fourier du profil autour de cette valeur pour un pas non entier précis; la phase du même
+coefficient donne la position des bords de cases.
+"""
+from __future__ import annotations
+import math
+from typing import Dict, Optional, Tuple
+
+from .lazy_import import lazy_import
+from .pixel_array import pack_rgb
+
+np = lazy_import("numpy")
+
+# Pas de grille cherchés (en pixels)
+MIN_PITCH = 2.0
+MAX_PITCH = 64.0
+
+# Part de chaque côté d'une case ignorée lors du vote (pixels de bord anti-aliasés)
+DEFAULT_MARGIN = 0.15
+
+# Bits par canal des couleurs comparées lors du vote
+DEFAULT_VOTE_BITS = 5
+
+# Un pic d'autocorrélation est retenu s'il atteint cette part du plus haut (évite les multiples du pas)
+_PEAK_RATIO = 0.7
+
+
+def edge_profiles(images) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Profils de contours d'un batch [B, H, W, C] (ou d'une image [H, W, C])
+
+    Retourne (profil_x [W - 1], profil_y [H - 1]): pour chaque frontière entre deux
+    colonnes (lignes) voisines, somme des écarts absolus sur toute l'image et le batch.
+    """
+    images = np.asarray(images)
+    if images.ndim == 3:
+        images = images[None]
+    luma = images[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    profile_x = np.abs(np.diff(luma, axis=2)).sum(axis=(0, 1))
+    profile_y = np.abs(np.diff(luma, axis=1)).sum(axis=(0, 2))
+    return profile_x, profile_y
+
+
+def _autocorrelation_pitch(profile, min_pitch: float, max_pitch: float) -> Optional[int]:
+    """Premier pic d'autocorrélation assez haut (pas entier approché), None sans périodicité"""
+    signal = profile - profile.mean()
+    n = len(signal)
+    spectrum = np.fft.rfft(signal, 2 * n)
+    correlation = np.fft.irfft(spectrum * np.conj(spectrum))[:n]
+    if correlation[0] <= 0:
+        return None
+    correlation /= correlation[0]
+
+    low, high = max(1, int(math.floor(min_pitch))), min(n - 2, int(math.ceil(max_pitch)))
+    if high <= low:
+        return None
+    lags = np.arange(low, high + 1)
+    values = correlation[lags]
+    peaks = (values > correlation[lags - 1]) & (values >= correlation[lags + 1]) & (values > 0)
+    if not peaks.any():
+        return None
+    best = values[peaks].max()
+    return int(lags[peaks & (values >= _PEAK_RATIO * best)][0])
+
+
+def _fourier(profile, pitches) -> np.ndarray:
+    """Coefficients de Fourier du profil aux fréquences 1 / pitch (bords en x + 1)"""
+    positions = np.arange(1, len(profile) + 1, dtype=np.float64)
+    return np.exp(-2j * np.pi * positions[None, :] / np.asarray(pitches)[:, None]) @ profile
+
+
+def detect_axis(profile, min_pitch: float = MIN_PITCH, max_pitch: float = MAX_PITCH) -> Dict[str, float]:
+    """
+    Pas (non entier), phase (position du premier bord de case, dans [0, pas)) et confiance
+    (0-1: part de l'énergie des contours alignée sur la grille) le long d'un axe
+
+    Sans périodicité détectable, le pas vaut 1 (chaque pixel est une case).
+    """
+    profile = np.asarray(profile, dtype=np.float64)
+    coarse = _autocorrelation_pitch(profile, min_pitch, max_pitch) if len(profile) > 4 else None
+    total = float(profile.sum())
+    if coarse is None or total <= 0:
+        return {"pitch": 1.0, "phase": 0.0, "confidence": 0.0}
+
+    # Affinage: maximum du spectre autour du pas approché (±15 %, pas de 0,005 px), et autour
+    # de ses sous-multiples: avec un pas non entier, le pic d'autocorrélation du pas se partage
+    # entre deux décalages entiers et celui du double du pas peut l'emporter. Le spectre est
+    # quasi nul au double du pas et égal au pas et à ses harmoniques: on garde le plus grand
+    # candidat proche du maximum.
+    candidates = []
+    for divisor in range(1, 5):
+        center = coarse / divisor
+        if center * 1.15 < min_pitch:
+            break
+        pitches = np.arange(max(min_pitch, center * 0.85), center * 1.15, 0.005)
+        coefficients = _fourier(profile, pitches)
+        best = int(np.argmax(np.abs(coefficients)))
+        candidates.append((float(pitches[best]), coefficients[best]))
+    strongest = max(abs(coefficient) for _, coefficient in candidates)
+    pitch, coefficient = next(c for c in candidates if abs(c[1]) >= 0.8 * strongest)
+    phase = float((-np.angle(coefficient) * pitch / (2 * np.pi)) % pitch)
+    return {"pitch": pitch, "phase": phase, "confidence": float(abs(coefficient) / total)}
+
+
+def detect_grid(images, min_pitch: float = MIN_PITCH, max_pitch: float = MAX_PITCH) -> Dict[str, float]:
+    """Grille d'un batch [B, H, W, C]: pitch_x, phase_x, pitch_y, phase_y, confidence"""
+    profile_x, profile_y = edge_profiles(images)
+    axis_x = detect_axis(profile_x, min_pitch, max_pitch)
+    axis_y = detect_axis(profile_y, min_pitch, max_pitch)
+    return {"pitch_x": axis_x["pitch"], "phase_x": axis_x["phase"],
+            "pitch_y": axis_y["pitch"], "phase_y": axis_y["phase"],
+            "confidence": min(axis_x["confidence"], axis_y["confidence"])}
+
+
+def cell_indices(length: int, pitch: float, phase: float,
+                 margin: float = DEFAULT_MARGIN) -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Case de chaque pixel d'un axe (-1 hors des cases gardées), nombre de cases, et
+    position de chaque pixel dans sa case (0 au bord, 1 au centre; négative dans la marge).
+    Une case est gardée si son centre est dans l'image.
+    """
+    position = (np.arange(length) + 0.5 - phase) / pitch
+    raw = np.floor(position).astype(np.int64)
+    first = math.ceil(-phase / pitch - 0.5)
+    last = math.floor((length - phase) / pitch - 0.5)
+    count = max(0, last - first + 1)
+    index = np.where((raw >= first) & (raw <= last), raw - first, -1)
+    centrality = 1.0 - np.abs(2.0 * (position - raw) - 1.0)
+    return index, count, np.where(centrality >= 2.0 * margin, centrality, -1.0)
+
+
+def block_mode(images, grid: Dict[str, float], margin: float = DEFAULT_MARGIN,
+               bits: int = DEFAULT_VOTE_BITS) -> np.ndarray:
+    """
+    Réduit un batch [B, H, W, 3] uint8 à une couleur par case de grille: [B, lignes, colonnes, 3]
+
+    Chaque case prend la couleur la plus fréquente parmi ses pixels intérieurs, comptée
+    sur des couleurs réduites à bits bits par canal (le bruit de compression ne disperse
+    pas les votes) et pondérée par la proximité du centre de la case (départage les cases
+    dont tous les pixels diffèrent); le résultat est la moyenne des pixels de la couleur
+    gagnante (bits=8: vote exact). Toutes les cases du batch sont traitées ensemble, par un seul np.unique
+    sur les clés (case, couleur). Une case sans pixel intérieur vote avec tous ses pixels.
+    """
+    images = np.asarray(images)
+    if images.ndim == 3:
+        images = images[None]
+    batch, height, width = images.shape[:3]
+    rows, n_rows, center_rows = cell_indices(height, grid["pitch_y"], grid["phase_y"], margin)
+    cols, n_cols, center_cols = cell_indices(width, grid["pitch_x"], grid["phase_x"], margin)
+    n_cells = batch * n_rows * n_cols
+    if n_cells == 0:
+        return np.zeros((batch, 0, 0, 3), dtype=np.uint8)
+
+    pixels = images[..., :3]
+    cell = (np.arange(batch)[:, None, None] * n_rows + rows[None, :, None]) * n_cols + cols[None, None, :]
+    valid = (rows[None, :, None] >= 0) & (cols[None, None, :] >= 0)
+    inner = valid & (center_rows >= 0)[None, :, None] & (center_cols >= 0)[None, None, :]
+    weight = (np.abs(center_rows)[None, :, None] + 1e-3) * (np.abs(center_cols)[None, None, :] + 1e-3)
+    weight = np.broadcast_to(weight, cell.shape)
+    keys = (cell.astype(np.uint64) << np.uint64(24)) | pack_rgb(pixels >> (8 - bits)).astype(np.uint64)
+
+    result = np.zeros((n_cells, 3), dtype=np.float64)
+    voted = np.zeros(n_cells, dtype=bool)
+    for mask in (inner, valid):
+        pending = mask & ~voted[np.maximum(cell, 0)]
+        if not pending.any():
+            continue
+        unique, inverse, counts = np.unique(keys[pending], return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        score = np.bincount(inverse, weights=weight[pending], minlength=len(unique))
+        cells = (unique >> np.uint64(24)).astype(np.int64)
+        order = np.lexsort((-score, cells))
+        winners = order[np.r_[True, cells[order][1:] != cells[order][:-1]]]
+        voters = pixels[pending].astype(np.float64)
+        for channel in range(3):
+            sums = np.bincount(inverse, weights=voters[:, channel], minlength=len(unique))
+            result[cells[winners], channel] = sums[winners] / counts[winners]
+        voted[cells[winners]] = True
+
+    return np.clip(np.round(result), 0, 255).astype(np.uint8).reshape(batch, n_rows, n_cols, 3)
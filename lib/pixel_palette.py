@@ -1,10 +1,46 @@
-
 # lib/pixel_palette.py
+from __future__ import annotations
 import re
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
 from pathlib import Path
+from .lazy_import import lazy_import
 from .pixel_color import PixelColor
+from .lut import get_lut_store, lut_offsets, palette_hash
+from .palette_dedupe import unique_colors, merge_near_duplicates, merge_names
+from .palette_sort import sort_order
+from .palette_reduce import reduce_palette
+from .tile_constraints import solve_tile_palettes
+from .palette_assignment import assign_palettes, remap_indices
+from .color_vision import simulate_rgb
+from .palette_export import TEXT_FORMATS, export_palette, export_to_bytes, save_palette, rgb_array
+
+np = lazy_import("numpy")
+
+# Encodages tentés à la lecture d'un fichier palette, du plus strict au plus permissif
+PALETTE_ENCODINGS = ('utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1')
+
+
+def read_palette_text(path) -> Optional[str]:
+    """Contenu texte d'un fichier palette, ou None s'il est illisible"""
+    for encoding in PALETTE_ENCODINGS:
+        try:
+            with open(path, 'r', encoding=encoding) as f:
+                content = f.read()
+                if content.strip():  # Pas complètement vide
+                    return content
+        except (UnicodeDecodeError, UnicodeError):
+            continue
+        except OSError:
+            continue
+    
+    # Dernier recours: lecture binaire + décodage forcé
+    try:
+        with open(path, 'rb') as f:
+            return f.read().decode('latin-1', errors='replace')
+    except OSError:
+        return None
+
 
 @dataclass
 class PixelPalette:
@@ -24,6 +60,12 @@ class PixelPalette:
         if raw_content.strip():
             self._parse_content()
     
+    @classmethod
+    def from_file(cls, path, source_filename: str = "") -> PixelPalette:
+        """Lit et parse un fichier palette (palette vide si le fichier est illisible)"""
+        content = read_palette_text(path)
+        return cls(raw_content=content or "", source_filename=source_filename or Path(path).name)
+    
     def _parse_content(self):
         """Parse le contenu selon le format détecté"""
         if not self.raw_content.strip():
@@ -169,59 +211,252 @@ class PixelPalette:
         
         return closest, closest_index
     
-    def get_unique_colors(self) -> List[PixelColor]:
-        """Retourne les couleurs uniques de la palette"""
-        seen = set()
-        unique = []
+    def get_unique_colors(self, mode: str = "first") -> List[PixelColor]:
+        """
+        Retourne les couleurs uniques de la palette
         
-        for color in self.colors:
-            rgb_key = color.rgb_tuple
-            if rgb_key not in seen:
-                seen.add(rgb_key)
-                unique.append(color)
+        Args:
+            mode: "first" (ordre de première apparition) ou "count" (les plus fréquentes d'abord)
+        """
+        if self.is_empty:
+            return []
+        first, _ = unique_colors(self.to_array(), mode)
+        return [self.colors[i] for i in first.tolist()]
+    
+    def deduplicate(self, mode: str = "first") -> PixelPalette:
+        """
+        Nouvelle palette sans doublons exacts
+        Le nombre d'occurrences de chaque couleur est gardé dans metadata['counts']
+        """
+        if self.is_empty:
+            return self.with_colors([], [])
+        first, counts = unique_colors(self.to_array(), mode, self.counts())
+        return self.with_colors([self.colors[i] for i in first.tolist()], counts.tolist())
+    
+    def merge_near_duplicates(self, tolerance: float = 2.3, metric: str = "lab",
+                              representative: str = "first", names: str = "representative") -> PixelPalette:
+        """
+        Nouvelle palette où les couleurs distantes d'au plus tolerance sont fusionnées
         
-        return unique
+        Args:
+            tolerance: ΔE76 en "lab" (2.3 ~ différence juste perceptible), distance 0-255 en "rgb"
+            metric: "lab" ou "rgb"
+            representative: "first", "most_frequent" (selon metadata['counts']) ou "mean"
+            names: "representative", "first_named" ou "join"
+        """
+        if self.is_empty:
+            return self.with_colors([], [])
+        merged = merge_near_duplicates(self.to_array(), tolerance, metric, representative, self.counts())
+        merged_names = merge_names([c.name for c in self.colors], merged['groups'], merged['keep'], names)
+        colors = [PixelColor(r, g, b, name, self.colors[k].color_space)
+                  for (r, g, b), name, k in zip(merged['colors'].tolist(), merged_names, merged['keep'].tolist())]
+        return self.with_colors(colors, merged['group_counts'].tolist())
     
-    def sort_by_hue(self) -> None:
-        """Trie les couleurs par teinte"""
-        import colorsys
+    def reduce(self, target: int, refine: int = 0, representative: str = "mean",
+               names: str = "representative") -> Tuple[PixelPalette, Dict[str, Any]]:
+        """
+        Nouvelle palette d'au plus target couleurs, et l'erreur introduite
+        
+        Les couleurs proches dans Lab sont fusionnées (pondérées par metadata['counts'],
+        voir count_usage), puis éventuellement affinées par k-means.
+        
+        Args:
+            refine: nombre maximal d'itérations k-means (0: aucune)
+            representative: "mean" (centre du groupe), "nearest" ou "most_frequent"
+                (couleurs d'origine)
+            names: "representative", "first_named" ou "join"
+        
+        Retourne (palette, rapport): mean_error / max_error en ΔE76, couleurs avant / après
+        """
+        report = {"colors_before": self.color_count, "colors_after": 0,
+                  "mean_error": 0.0, "max_error": 0.0}
+        if self.is_empty:
+            return self.with_colors([], []), report
+        reduced = reduce_palette(self.to_array(), target, self.counts(), refine, representative)
+        reduced_names = merge_names([c.name for c in self.colors], reduced['groups'], reduced['keep'], names)
+        colors = [PixelColor(r, g, b, name, self.colors[k].color_space)
+                  for (r, g, b), name, k in zip(reduced['colors'].tolist(), reduced_names, reduced['keep'].tolist())]
+        report.update(colors_after=len(colors), mean_error=reduced['mean_error'],
+                      max_error=reduced['max_error'])
+        return self.with_colors(colors, reduced['group_counts'].tolist()), report
+    
+    def constrain_tiles(self, pixels, tile_width: int = 8, tile_height: int = 8, colors: int = 4,
+                        palettes: int = 4, shared: str = "none", iterations: int = 10,
+                        store=None) -> Tuple[List[PixelPalette], Dict[str, Any]]:
+        """
+        Contraintes matérielles rétro: chaque tuile d'une image [H, W, 3] uint8 (ou d'un
+        batch [B, H, W, 3]) n'utilise que les colors couleurs d'une des palettes
+        sous-palettes, tirées de cette palette
         
-        def get_hue(color: PixelColor):
-            r, g, b = color.rgb_normalized
-            h, s, v = colorsys.rgb_to_hsv(r, g, b)
-            return h
+        Les pixels sont d'abord ramenés à la palette (index exact des couleurs de la palette,
+        même très proches entre elles, plus proche voisin Lab pour les autres), puis les
+        sous-palettes et l'affectation des tuiles sont choisies par tile_constraints.
         
-        self.colors.sort(key=get_hue)
+        Args:
+            shared: "none", "most_frequent" ou "first": couleur commune à toutes les sous-palettes
+            store: LutStore de la LUT RGB -> index (par défaut le store partagé du process)
+        
+        Retourne (sous-palettes, résultat de solve_tile_palettes avec en plus image [H, W, 3])
+        """
+        pixels = np.asarray(pixels)[..., :3]
+        result = solve_tile_palettes(self.index_pixels(pixels, "lab", store=store), self.to_array(),
+                                     tile_width, tile_height, colors, palettes, shared, iterations)
+        flat = result['subpalettes'].reshape(-1)
+        result['image'] = self.to_array()[flat][result['indexed']]
+        subpalettes = []
+        for p, members in enumerate(result['subpalettes'].tolist()):
+            palette = self.with_colors([self.colors[k] for k in members], None)
+            palette.metadata['name'] = f"{self.name}_{p}"
+            subpalettes.append(palette)
+        return subpalettes, result
+    
+    def assign_to(self, target: PixelPalette) -> Tuple[PixelPalette, Dict[str, Any]]:
+        """
+        Correspondance optimale vers target (somme des ΔE76 minimale, une couleur cible
+        distincte par couleur source quand les tailles le permettent, voir palette_assignment)
+        
+        Retourne (palette cible réordonnée: sa couleur i remplace la couleur i de cette
+        palette, rapport: mapping, distances, total, mean_error, max_error)
+        """
+        if self.is_empty or target.is_empty:
+            raise ValueError("Palette vide")
+        result = assign_palettes(self.to_array(), target.to_array())
+        mapping = result['mapping'].tolist()
+        matched = target.with_colors([target.colors[k] for k in mapping], None)
+        result.update(mean_error=float(result['distances'].mean()), max_error=float(result['distances'].max()))
+        return matched, result
+    
+    def swap_pixels(self, pixels, matched: PixelPalette, metric: str = "lab", bits: int = 6,
+                    store=None) -> np.ndarray:
+        """
+        Remplace dans des pixels [..., 3] uint8 (image ou batch entier) chaque couleur de
+        cette palette par la couleur de même index de matched (voir assign_to); les pixels
+        hors palette prennent d'abord leur plus proche couleur (LUT)
+        """
+        if matched.color_count != self.color_count:
+            raise ValueError(f"Palettes de tailles différentes: {self.color_count} et {matched.color_count}")
+        return matched.to_array()[self.index_pixels(pixels, metric, bits, store)]
+    
+    def count_usage(self, pixels, metric: str = "lab", bits: int = 6, store=None) -> PixelPalette:
+        """
+        Copie de la palette dont metadata['counts'] est le nombre de pixels [..., 3] uint8
+        associés à chaque couleur (index exact des couleurs de la palette, plus proche
+        voisin via la LUT pour les autres)
+        """
+        indices = self.index_pixels(pixels, metric, bits, store)
+        counts = np.bincount(np.asarray(indices).ravel(), minlength=self.color_count)
+        return self.with_colors(list(self.colors), counts.tolist())
+    
+    def simulate_vision(self, deficiency: str, severity: float = 1.0) -> PixelPalette:
+        """
+        Copie de la palette vue avec une déficience de la vision des couleurs (protan,
+        deutan, tritan; voir color_vision), mêmes noms et occurrences
+        """
+        simulated = simulate_rgb(self.to_array(), deficiency, severity).tolist()
+        colors = [PixelColor(r, g, b, color.name) for (r, g, b), color in zip(simulated, self.colors)]
+        return self.with_colors(colors, self.counts())
+    
+    def counts(self) -> Optional[List[int]]:
+        """Occurrences de chaque couleur (metadata['counts']), si elles correspondent aux couleurs"""
+        counts = self.metadata.get('counts')
+        return counts if counts is not None and len(counts) == len(self.colors) else None
+    
+    def with_colors(self, colors: List[PixelColor], counts: Optional[List[int]] = None) -> PixelPalette:
+        """
+        Palette issue de celle-ci (mêmes métadonnées et source), avec de nouvelles couleurs
+        et leurs occurrences (sans occurrences si counts vaut None)
+        """
+        palette = PixelPalette(source_filename=self.source_filename)
+        palette.format_type = self.format_type
+        palette.metadata = dict(self.metadata)
+        if counts is None:
+            palette.metadata.pop('counts', None)
+        else:
+            palette.metadata['counts'] = counts
+        palette.colors = colors
+        return palette
+    
+    def sort_by_hue(self) -> None:
+        """Trie les couleurs par teinte"""
+        self.sort_by("hue")
     
     def sort_by_brightness(self) -> None:
         """Trie les couleurs par luminosité"""
-        def get_brightness(color: PixelColor):
-            # Formule de luminosité perceptuelle
-            return 0.299 * color.r + 0.587 * color.g + 0.114 * color.b
+        self.sort_by("brightness")
+    
+    def sort_by(self, mode: str = "oklch", reverse: bool = False) -> None:
+        """
+        Trie les couleurs sur place (tri stable, voir palette_sort.sort_order)
         
-        self.colors.sort(key=get_brightness)
+        Args:
+            mode: "hue", "brightness", "oklch", "hilbert" ou "frequency" (selon metadata['counts'])
+            reverse: ordre inversé
+        """
+        if self.is_empty:
+            return
+        counts = self.counts()
+        order = sort_order(self.to_array(), mode, counts).tolist()
+        if reverse:
+            order.reverse()
+        self.colors = [self.colors[i] for i in order]
+        if counts is not None:
+            self.metadata['counts'] = [counts[i] for i in order]
+    
+    # === Tables de correspondance ===
+    
+    def to_array(self) -> np.ndarray:
+        """Couleurs de la palette en tableau [N, 3] uint8 (dans l'ordre des index)"""
+        return rgb_array(self.colors)
+    
+    @property
+    def content_hash(self) -> str:
+        """Hash du contenu (couleurs et ordre), clé des LUT persistantes"""
+        return palette_hash(self.to_array())
+    
+    def index_lut(self, metric: str = "rgb", bits: int = 6, store=None) -> np.ndarray:
+        """
+        LUT RGB -> index de la couleur la plus proche, partagée via le LutStore
+        
+        Args:
+            metric: "rgb" (euclidienne) ou "lab" (ΔE76)
+            bits: Résolution par canal (8 = exacte, 6 = 64³ cases)
+            store: LutStore à utiliser (par défaut le store partagé du process)
+        """
+        if self.is_empty:
+            raise ValueError("Palette vide")
+        store = store or get_lut_store()
+        return store.index_lut(self.to_array(), metric, bits)
+    
+    def map_indices(self, pixels, metric: str = "rgb", bits: int = 6, store=None) -> np.ndarray:
+        """Index de palette de chaque pixel uint8 [..., 3] via la LUT"""
+        return np.asarray(self.index_lut(metric, bits, store))[lut_offsets(pixels, bits)]
+    
+    def index_pixels(self, pixels, metric: str = "lab", bits: int = 6, store=None) -> np.ndarray:
+        """
+        Index de palette de chaque pixel uint8 [..., 3]: exact pour les couleurs de la palette
+        (même très proches entre elles), plus proche couleur via la LUT pour les autres
+        """
+        return remap_indices(pixels, self.to_array(), self.index_lut(metric, bits, store), bits)
     
     # === Export ===
     
     def to_gimp_format(self) -> str:
         """Exporte en format GIMP"""
-        lines = ["GIMP Palette"]
-        
-        if 'name' in self.metadata:
-            lines.append(f"Name: {self.metadata['name']}")
-        
-        if 'columns' in self.metadata:
-            lines.append(f"Columns: {self.metadata['columns']}")
-        
-        lines.append("#")
-        
-        for color in self.colors:
-            line = f"{color.r:3d} {color.g:3d} {color.b:3d}"
-            if color.name:
-                line += f"\t{color.name}"
-            lines.append(line)
+        return export_to_bytes(self, "gpl").decode("utf-8").rstrip("\n")
+    
+    def export(self, fp, format_type: str = "gpl", **options) -> int:
+        """
+        Écrit la palette dans un fichier ouvert, par lots (voir lib/palette_export.py)
         
-        return '\n'.join(lines)
+        Args:
+            format_type: "gpl", "hex", "rgb", "raw", "css", "json", "act", "ase"
+            options: include_header, include_names, newline, css_prefix
+        """
+        return export_palette(self, fp, format_type, **options)
+    
+    def save(self, path, format_type: Optional[str] = None, **options) -> Path:
+        """Enregistre la palette (format déduit de l'extension si non précisé)"""
+        return save_palette(self, path, format_type, **options)
     
     def to_hex_list(self) -> List[str]:
         """Exporte comme liste de couleurs hexadécimales"""
@@ -237,7 +472,7 @@ class PixelPalette:
         Formate la palette selon le type demandé
         
         Args:
-            format_type: "rgb", "hex", "raw", "gimp"
+            format_type: "rgb", "hex", "raw", "gimp", "css", "json"
             separator: Séparateur entre les couleurs
             include_header: Inclure les métadonnées en en-tête
             include_names: Inclure les noms des couleurs
@@ -245,51 +480,15 @@ class PixelPalette:
         if self.is_empty:
             return "# Palette vide"
         
-        lines = []
-        
-        # En-tête avec métadonnées
-        if include_header:
-            lines.append(f"# Palette: {self.name}")
-            lines.append(f"# Couleurs: {self.color_count}")
-            lines.append(f"# Format: {self.format_type}")
-            if self.source_filename:
-                lines.append(f"# Source: {self.source_filename}")
-            lines.append("#")
-        
-        # Formatage des couleurs
-        if format_type == "hex":
-            for color in self.colors:
-                line = color.hex
-                if include_names and color.name:
-                    line += f" # {color.name}"
-                lines.append(line)
-        
-        elif format_type == "rgb":
-            for color in self.colors:
-                line = f"rgb({color.r}, {color.g}, {color.b})"
-                if include_names and color.name:
-                    line += f" # {color.name}"
-                lines.append(line)
-        
-        elif format_type == "raw":
-            for color in self.colors:
-                line = f"{color.r} {color.g} {color.b}"
-                if include_names and color.name:
-                    line += f" {color.name}"
-                lines.append(line)
-        
-        elif format_type == "gimp":
+        if format_type == "gimp":
             return self.to_gimp_format()
         
-        else:
-            # Format par défaut : rgb
-            for color in self.colors:
-                line = f"{color.r:3d} {color.g:3d} {color.b:3d}"
-                if include_names and color.name:
-                    line += f" # {color.name}"
-                lines.append(line)
+        if format_type not in TEXT_FORMATS:
+            format_type = "rgb"  # Format par défaut : rgb
         
-        return separator.join(lines)
+        text = export_to_bytes(self, format_type, include_header=include_header,
+                               include_names=include_names, newline=separator).decode("utf-8")
+        return text[:-len(separator)] if separator and text.endswith(separator) else text
     
     # === Propriétés ===
     
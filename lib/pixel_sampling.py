@@ -0,0 +1,78 @@
+# lib/pixel_sampling.py
+"""
+Échantillonnage de pixels pour l'extraction approximative de palette
+et estimation de l'erreur commise sur l'image complète
+"""
+from __future__ import annotations
+import math
+from typing import Dict, Optional
+
+from .lazy_import import lazy_import
+from .lut.lut_builder import to_metric_space, nearest_indices
+
+np = lazy_import("numpy")
+
+
+def stratified_sample(pixels, sample_size: int, seed: Optional[int] = 0) -> np.ndarray:
+    """
+    Tire environ sample_size pixels d'une image [H, W, C], un par case d'une grille régulière
+
+    Chaque case (strate) fournit un pixel tiré au hasard: l'échantillon couvre toute
+    l'image, contrairement à un tirage uniforme qui peut ignorer de petites zones.
+    Retourne un tableau [N, C]; l'image entière si elle est plus petite que l'échantillon.
+    """
+    pixels = np.asarray(pixels)
+    height, width = pixels.shape[:2]
+    channels = pixels.shape[2] if pixels.ndim == 3 else 1
+
+    if height * width <= sample_size:
+        return pixels.reshape(-1, channels)
+
+    rows = max(1, min(height, round(math.sqrt(sample_size * height / width))))
+    cols = max(1, min(width, sample_size // rows))
+
+    y_bounds = np.linspace(0, height, rows + 1).astype(np.int64)
+    x_bounds = np.linspace(0, width, cols + 1).astype(np.int64)
+    cell_h = (y_bounds[1:] - y_bounds[:-1])[:, None]
+    cell_w = (x_bounds[1:] - x_bounds[:-1])[None, :]
+
+    rng = np.random.default_rng(seed)
+    ys = y_bounds[:-1, None] + (rng.random((rows, cols)) * cell_h).astype(np.int64)
+    xs = x_bounds[None, :-1] + (rng.random((rows, cols)) * cell_w).astype(np.int64)
+
+    return pixels[ys, xs].reshape(-1, channels)
+
+
+def estimate_palette_error(sample_rgb, palette_rgb, metric: str = "rgb",
+                           z: float = 1.96) -> Dict[str, float]:
+    """
+    Estime l'erreur de quantification de la palette à partir d'un échantillon
+
+    Retourne l'erreur moyenne (distance au plus proche voisin dans la palette) et
+    la couverture (part des pixels dont la couleur exacte est dans la palette),
+    chacune avec sa demi-largeur d'intervalle de confiance (z = 1.96 -> 95 %).
+    """
+    sample  = np.asarray(sample_rgb)[..., :3].reshape(-1, 3)
+    palette = np.asarray(palette_rgb).reshape(-1, 3)
+    n = len(sample)
+    if n == 0 or len(palette) == 0:
+        return {"samples": n, "mean_error": 0.0, "error_bound": 0.0,
+                "max_error": 0.0, "coverage": 0.0, "coverage_bound": 0.0}
+
+    sample_points  = to_metric_space(sample, metric)
+    palette_points = to_metric_space(palette, metric)
+    nearest = nearest_indices(sample_points, palette_points)
+    errors = np.sqrt(np.sum((sample_points - palette_points[nearest]) ** 2, axis=1))
+
+    mean_error = float(errors.mean())
+    std_error  = float(errors.std(ddof=1)) if n > 1 else 0.0
+    coverage   = float(np.mean(errors == 0))
+
+    return {
+        "samples":        n,
+        "mean_error":     mean_error,
+        "error_bound":    z * std_error / math.sqrt(n),
+        "max_error":      float(errors.max()),
+        "coverage":       coverage,
+        "coverage_bound": z * math.sqrt(coverage * (1 - coverage) / n),
+    }
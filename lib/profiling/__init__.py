@@ -0,0 +1,9 @@
+# lib/profiling/__init__.py
+"""
+Instrumentation des nodes: chronomètres par node et par étape, compteurs,
+capture cProfile / tracemalloc optionnelle. Silencieuse par défaut (PIXEL_PALETTE_PROFILE)
+"""
+
+from .profiler import PROFILE_ENV_VAR, PROFILE_OPTIONS, Profiler, get_profiler, parse_options, profiled
+
+__all__ = ['PROFILE_ENV_VAR', 'PROFILE_OPTIONS', 'Profiler', 'get_profiler', 'parse_options', 'profiled']
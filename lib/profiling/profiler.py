@@ -0,0 +1,298 @@
+# lib/profiling/profiler.py
+import io
+import os
+import functools
+import time
+import threading
+from collections import deque
+from contextlib  import contextmanager
+from typing      import Dict, FrozenSet, List, Optional
+
+# Options séparées par des virgules, ex: PIXEL_PALETTE_PROFILE=timing,memory
+#   timing   : chronomètres par node et par étape, compteurs
+#   memory   : pic mémoire Python par appel (tracemalloc)
+#   cprofile : profil cProfile cumulé par node
+#   log      : lignes de statut des nodes sur la sortie standard
+#   1 / all  : tout
+PROFILE_ENV_VAR = "PIXEL_PALETTE_PROFILE"
+PROFILE_OPTIONS = ("timing", "memory", "cprofile", "log")
+
+# Nombre de durées conservées par node / étape pour les percentiles
+MAX_SAMPLES = 1024
+
+
+def parse_options(value: str) -> FrozenSet[str]:
+    """Interprète la valeur de PIXEL_PALETTE_PROFILE ("", "0", "1", "all", "timing,memory"...)"""
+    names = {part.strip().lower() for part in (value or "").split(",")} - {"", "0", "off", "false"}
+    if names & {"1", "all", "on", "true"}:
+        return frozenset(PROFILE_OPTIONS)
+    # memory et cprofile n'ont de sens qu'avec les chronomètres
+    if names & {"memory", "cprofile"}:
+        names.add("timing")
+    return frozenset(names & set(PROFILE_OPTIONS))
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Percentile par rang le plus proche sur une liste triée"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(q / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[rank]
+
+
+class _Timings:
+    """Durées d'un node ou d'une étape: total exact, fenêtre bornée pour les percentiles"""
+
+    def __init__(self):
+        self.calls   = 0
+        self.total_s = 0.0
+        self.max_s   = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+        self.peak_memory = 0
+
+    def add(self, elapsed: float) -> None:
+        self.calls   += 1
+        self.total_s += elapsed
+        self.max_s    = max(self.max_s, elapsed)
+        self.samples.append(elapsed)
+
+    def summary(self) -> Dict[str, float]:
+        ordered = sorted(self.samples)
+        return {
+            "calls":   self.calls,
+            "total_s": self.total_s,
+            "mean_s":  self.total_s / self.calls if self.calls else 0.0,
+            "p50_s":   percentile(ordered, 50),
+            "p95_s":   percentile(ordered, 95),
+            "max_s":   self.max_s,
+        }
+
+
+class _NullContext:
+    """Contexte vide réutilisé quand l'instrumentation est désactivée (aucune allocation)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+class Profiler:
+    """
+    Mesures par type de node et par étape (decode, extract, render, convert...)
+
+    Désactivé, chaque appel se réduit à un test de booléen: les nodes peuvent
+    être instrumentés sans coût dans les boucles de batch.
+    """
+
+    def __init__(self, options=()):
+        self._lock   = threading.Lock()
+        self._local  = threading.local()
+        self.configure(options)
+
+    def configure(self, options) -> None:
+        """Change les options actives (voir PROFILE_OPTIONS) et remet les mesures à zéro"""
+        options = parse_options(options) if isinstance(options, str) else frozenset(options)
+        self.options  = options
+        self.timing   = "timing" in options
+        self.memory   = "memory" in options
+        self.cprofile = "cprofile" in options
+        self.verbose  = "log" in options
+        self.reset()
+
+    @property
+    def enabled(self) -> bool:
+        return self.timing
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes:    Dict[str, _Timings] = {}
+            self._stages:   Dict[str, Dict[str, _Timings]] = {}
+            self._counters: Dict[str, Dict[str, float]] = {}
+            self._profiles: Dict[str, object] = {}
+
+    # === Mesures ===
+
+    def node(self, name: str):
+        """Contexte englobant l'exécution d'un node: durée, pic mémoire, profil cProfile"""
+        if not self.timing:
+            return _NULL_CONTEXT
+        return self._measure_node(name)
+
+    def stage(self, name: str):
+        """Contexte d'une étape à l'intérieur du node en cours (ex: "decode", "render")"""
+        if not self.timing:
+            return _NULL_CONTEXT
+        return self._measure_stage(name)
+
+    def count(self, name: str, value: float = 1, node: Optional[str] = None) -> None:
+        """Incrémente un compteur du node en cours (ou du node indiqué)"""
+        if not self.timing:
+            return
+        node = node or self._current_node() or "global"
+        with self._lock:
+            counters = self._counters.setdefault(node, {})
+            counters[name] = counters.get(name, 0) + value
+
+    def log(self, node: str, message: str) -> None:
+        """Ligne de statut d'un node, affichée seulement avec l'option log"""
+        if self.verbose:
+            print(f"[{node}] {message}")
+
+    @contextmanager
+    def _measure_node(self, name: str):
+        stack = self._node_stack()
+        stack.append(name)
+        tracing = self._start_tracemalloc() if self.memory else False
+        profile = self._start_cprofile(name) if self.cprofile else None
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            peak = self._stop_tracemalloc(tracing) if self.memory else 0
+            stack.pop()
+            with self._lock:
+                timings = self._nodes.setdefault(name, _Timings())
+                timings.add(elapsed)
+                timings.peak_memory = max(timings.peak_memory, peak)
+
+    @contextmanager
+    def _measure_stage(self, name: str):
+        node = self._current_node() or "global"
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stages.setdefault(node, {}).setdefault(name, _Timings()).add(elapsed)
+
+    def _node_stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _current_node(self) -> Optional[str]:
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else None
+
+    def _start_cprofile(self, name: str):
+        import cProfile
+        with self._lock:
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+        try:
+            profile.enable()
+        except ValueError:
+            # Un autre profileur est actif (autre thread, appel imbriqué): pas de capture
+            return None
+        return profile
+
+    @staticmethod
+    def _start_tracemalloc() -> bool:
+        import tracemalloc
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        return started
+
+    @staticmethod
+    def _stop_tracemalloc(started: bool) -> int:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return 0
+        peak = tracemalloc.get_traced_memory()[1]
+        if started:
+            tracemalloc.stop()
+        return peak
+
+    # === Rapport ===
+
+    def summary(self) -> Dict[str, Dict]:
+        """
+        Agrégats par type de node: appels, latence (total, moyenne, p50, p95, max),
+        pic mémoire (octets, option memory), étapes et compteurs
+        """
+        with self._lock:
+            report = {}
+            for name in sorted(set(self._nodes) | set(self._stages) | set(self._counters)):
+                timings = self._nodes.get(name)
+                entry = timings.summary() if timings is not None else _Timings().summary()
+                entry["peak_memory_bytes"] = timings.peak_memory if timings is not None else 0
+                entry["stages"] = {stage: t.summary() for stage, t in self._stages.get(name, {}).items()}
+                entry["counters"] = dict(self._counters.get(name, {}))
+                report[name] = entry
+            return report
+
+    def format_summary(self) -> str:
+        """Rapport texte (un bloc par node), pour la console ou un node de diagnostic"""
+        if not self.enabled:
+            return f"# Instrumentation désactivée ({PROFILE_ENV_VAR}=timing pour l'activer)"
+        report = self.summary()
+        if not report:
+            return "# Aucune mesure"
+
+        lines = []
+        for name, entry in report.items():
+            lines.append(f"# {name}: {entry['calls']} appels, "
+                         f"p50 {entry['p50_s'] * 1000:.2f} ms, p95 {entry['p95_s'] * 1000:.2f} ms, "
+                         f"max {entry['max_s'] * 1000:.2f} ms")
+            if self.memory:
+                lines.append(f"  pic mémoire: {entry['peak_memory_bytes'] / (1024 * 1024):.2f} Mo")
+            for stage, stats in entry["stages"].items():
+                lines.append(f"  {stage}: {stats['calls']} x, p50 {stats['p50_s'] * 1000:.2f} ms, "
+                             f"p95 {stats['p95_s'] * 1000:.2f} ms, total {stats['total_s'] * 1000:.2f} ms")
+            for counter, value in entry["counters"].items():
+                lines.append(f"  {counter}: {value:g}")
+        return "\n".join(lines)
+
+    def profile_stats(self, name: str, limit: int = 20, sort: str = "cumulative") -> str:
+        """Fonctions les plus coûteuses d'un node (option cprofile)"""
+        import pstats
+        with self._lock:
+            profile = self._profiles.get(name)
+        if profile is None:
+            return ""
+        stream = io.StringIO()
+        try:
+            pstats.Stats(profile, stream=stream).sort_stats(sort).print_stats(limit)
+        except TypeError:
+            # profil jamais activé (aucune donnée)
+            return ""
+        return stream.getvalue()
+
+
+_shared_profiler: Optional[Profiler] = None
+_shared_lock = threading.Lock()
+
+
+def get_profiler() -> Profiler:
+    """Retourne le Profiler du process, configuré par PIXEL_PALETTE_PROFILE"""
+    global _shared_profiler
+    if _shared_profiler is None:
+        with _shared_lock:
+            if _shared_profiler is None:
+                _shared_profiler = Profiler(os.environ.get(PROFILE_ENV_VAR, ""))
+    return _shared_profiler
+
+
+def profiled(node_name: str):
+    """Décorateur de la méthode FUNCTION d'un node: chaque appel est mesuré sous node_name"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            profiler = get_profiler()
+            if not profiler.enabled:
+                return method(*args, **kwargs)
+            with profiler.node(node_name):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,162 @@
+# lib/sprite_sheet.py
+"""
+Découpage de planches de sprites et de tilesets: vue par tuiles sans copie, couleurs
+de chaque tuile et dédoublonnage des tuiles identiques (ou identiques à un miroir près)
+
+Les tuiles sont comparées par une empreinte 64 bits de leurs couleurs empaquetées
+(somme pondérée, en arithmétique modulo 2^64); les tuiles regroupées sont ensuite
+vérifiées pixel à pixel, une collision d'empreinte ne fusionne donc jamais deux tuiles
+différentes.
+"""
+from __future__ import annotations
+from typing import Dict, List, Tuple
+
+from .lazy_import   import lazy_import
+from .pixel_array   import pack_rgb, unpack_rgb
+from .pixel_color   import PixelColor
+from .pixel_palette import PixelPalette
+
+np = lazy_import("numpy")
+
+# "exact": tuiles identiques, "flips": identiques aussi à un miroir horizontal et/ou vertical près
+TILE_DEDUPE_MODES = ("flips", "exact", "none")
+
+# Miroirs d'une tuile (bits combinables), dans l'ordre des empreintes de tile_hashes
+FLIP_H = 1
+FLIP_V = 2
+
+_HASH_SEED = 0x5EED
+
+
+def tile_view(image, tile_width: int, tile_height: int, margin: int = 0, spacing: int = 0) -> np.ndarray:
+    """
+    Vue [lignes, colonnes, tile_height, tile_width, C] d'une image [H, W, C], sans copie
+
+    margin: pixels ignorés autour de la planche, spacing: pixels entre deux tuiles. Les
+    tuiles incomplètes du bord droit et du bas sont ignorées. La vue est en lecture seule.
+    """
+    image = np.asarray(image)
+    if tile_width < 1 or tile_height < 1:
+        raise ValueError(f"Taille de tuile invalide: {tile_width}x{tile_height}")
+    height, width = image.shape[:2]
+    rows = max(0, (height - 2 * margin + spacing) // (tile_height + spacing))
+    cols = max(0, (width - 2 * margin + spacing) // (tile_width + spacing))
+    origin = image[margin:, margin:] if rows and cols else image[:0, :0]
+    stride_y, stride_x = image.strides[:2]
+    return np.lib.stride_tricks.as_strided(
+        origin,
+        shape=(rows, cols, tile_height, tile_width) + image.shape[2:],
+        strides=((tile_height + spacing) * stride_y, (tile_width + spacing) * stride_x,
+                 stride_y, stride_x) + image.strides[2:],
+        writeable=False)
+
+
+def tile_colors(tiles) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Couleurs distinctes de chaque tuile d'un tableau [T, th, tw, 3] uint8, en une passe
+
+    Retourne (offsets [T + 1], couleurs [K, 3], occurrences [K]): les couleurs de la tuile
+    t sont couleurs[offsets[t]:offsets[t + 1]], dans leur ordre de première apparition.
+    """
+    tiles = np.asarray(tiles)
+    count = len(tiles)
+    packed = pack_rgb(tiles[..., :3]).reshape(count, -1)
+    keys = (np.arange(count, dtype=np.uint64)[:, None] << np.uint64(24)) | packed.astype(np.uint64)
+    unique, first, counts = np.unique(keys.ravel(), return_index=True, return_counts=True)
+    owner = (unique >> np.uint64(24)).astype(np.int64)
+    order = np.lexsort((first, owner))
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=count))]).astype(np.int64)
+    colors = unpack_rgb((unique[order] & np.uint64(0xFFFFFF)).astype(np.uint32))
+    return offsets, colors, counts[order]
+
+
+def tile_palettes(tiles, prefix: str = "tile") -> List[PixelPalette]:
+    """Une palette par tuile [T, th, tw, 3] (ordre de première apparition, metadata['counts'])"""
+    offsets, colors, counts = tile_colors(tiles)
+    rgb, counts = colors.tolist(), counts.tolist()
+    palettes = []
+    for t in range(len(offsets) - 1):
+        start, stop = int(offsets[t]), int(offsets[t + 1])
+        palette = PixelPalette()
+        palette.format_type = "tile"
+        palette.metadata['name'] = f"{prefix}_{t}"
+        palette.metadata['counts'] = counts[start:stop]
+        palette.colors = [PixelColor(r, g, b) for r, g, b in rgb[start:stop]]
+        palettes.append(palette)
+    return palettes
+
+
+def tile_hashes(tiles) -> np.ndarray:
+    """
+    Empreintes 64 bits [T, 4] des tuiles [T, th, tw, 3] et de leurs miroirs: colonne f pour
+    le miroir f (0: aucun, FLIP_H, FLIP_V, FLIP_H | FLIP_V)
+    """
+    tiles = np.asarray(tiles)
+    packed = pack_rgb(tiles[..., :3]).astype(np.uint64)
+    height, width = packed.shape[1:3]
+    # Poids impairs tirés une fois pour toutes: le miroir d'une tuile revient à miroiter les poids
+    weights = np.random.default_rng(_HASH_SEED).integers(0, 2 ** 63, size=(height, width), dtype=np.uint64)
+    weights = (weights << np.uint64(1)) | np.uint64(1)
+    variants = (weights, weights[:, ::-1], weights[::-1, :], weights[::-1, ::-1])
+    with np.errstate(over="ignore"):
+        return np.stack([(packed * w).sum(axis=(1, 2), dtype=np.uint64) for w in variants], axis=1)
+
+
+def flip_tiles(tiles, flips) -> np.ndarray:
+    """Copie des tuiles [T, th, tw, C] où la tuile i est retournée selon flips[i] (bits FLIP_H/FLIP_V)"""
+    tiles = np.array(tiles)
+    flips = np.broadcast_to(np.asarray(flips), len(tiles))
+    for flag, axis in ((FLIP_H, 2), (FLIP_V, 1)):
+        selected = (flips & flag) != 0
+        tiles[selected] = np.flip(tiles[selected], axis=axis)
+    return tiles
+
+
+def dedupe_tiles(tiles, mode: str = "flips") -> Dict[str, np.ndarray]:
+    """
+    Dédoublonne des tuiles [T, th, tw, 3] uint8
+
+    Retourne un dictionnaire:
+        unique: index (dans tiles) du représentant de chaque tuile distincte, par ordre
+                de première apparition
+        index:  [T] numéro de la tuile distincte de chaque tuile
+        flips:  [T] miroir (bits FLIP_H/FLIP_V) à appliquer au représentant pour obtenir la tuile
+    """
+    if mode not in TILE_DEDUPE_MODES:
+        raise ValueError(f"Mode inconnu: {mode}. Disponibles: {list(TILE_DEDUPE_MODES)}")
+    tiles = np.asarray(tiles)
+    count = len(tiles)
+    if mode == "none" or count == 0:
+        return {"unique": np.arange(count), "index": np.arange(count), "flips": np.zeros(count, dtype=np.int64)}
+
+    hashes = tile_hashes(tiles)
+    if mode == "flips":
+        # Forme canonique: le miroir de plus petite empreinte
+        orientation = np.argmin(hashes, axis=1)
+        keys = hashes[np.arange(count), orientation]
+    else:
+        orientation = np.zeros(count, dtype=np.int64)
+        keys = hashes[:, 0]
+    _, first, group = np.unique(keys, return_index=True, return_inverse=True)
+    group = group.ravel()
+    representative = first[group]
+    # t = canon^-1(canon_r(r)): les miroirs sont leurs propres inverses et commutent
+    flips = orientation ^ orientation[representative]
+
+    # Vérification pixel à pixel: une collision d'empreinte devient une tuile distincte de plus
+    mismatch = ~(flip_tiles(tiles[representative], flips) == tiles).reshape(count, -1).all(axis=1)
+    representative[mismatch] = np.flatnonzero(mismatch)
+    flips[mismatch] = 0
+
+    unique, index = np.unique(representative, return_inverse=True)
+    return {"unique": unique, "index": index.ravel(), "flips": flips.astype(np.int64)}
+
+
+def tile_map_text(index, flips, columns: int) -> str:
+    """
+    Carte des tuiles en CSV, une ligne de texte par ligne de tuiles; un miroir est noté
+    en suffixe (h: horizontal, v: vertical, hv: les deux)
+    """
+    suffixes = np.array(["", "h", "v", "hv"])
+    cells = np.char.add(np.asarray(index).astype(str), suffixes[np.asarray(flips)])
+    return "\n".join(",".join(row) for row in cells.reshape(-1, columns).tolist())
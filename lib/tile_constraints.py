@@ -0,0 +1,178 @@
+# lib/tile_constraints.py
+"""
+Contraintes de palettes des consoles rétro: chaque tuile (8x8, 16x16...) n'utilise que
+les couleurs d'une sous-palette, choisie parmi P sous-palettes de K couleurs tirées
+d'une palette maître
+
+L'erreur d'une tuile ne dépend que de son histogramme sur la palette maître:
+    erreur(t, S) = somme_m H[t, m] * d(m, S)      d(m, S) = min_{s dans S} ΔE76²(m, s)
+Toutes les tuiles sont donc évaluées sur toutes les sous-palettes par un seul produit
+matriciel H @ d, et l'erreur d'un groupe de tuiles est celle de leur histogramme cumulé.
+Le solveur alterne, comme un k-means sur les ensembles de couleurs des tuiles:
+    1. affectation de chaque tuile à sa meilleure sous-palette
+    2. ré-ajustement de chaque sous-palette sur l'histogramme cumulé de ses tuiles
+       (K-médoïdes pondéré: ajout glouton puis échanges)
+Les sous-palettes initiales sont ajustées une à une sur la tuile la plus mal servie.
+"""
+from __future__ import annotations
+from typing import Dict
+
+from .lazy_import       import lazy_import
+from .color.color_math  import rgb_to_lab
+
+np = lazy_import("numpy")
+
+# Couleur commune à toutes les sous-palettes (ex: couleur de fond de la NES)
+SHARED_MODES = ("none", "most_frequent", "first")
+
+# tile: (largeur, hauteur) d'une zone partageant une sous-palette
+# colors: couleurs par sous-palette (commune comprise), palettes: nombre de sous-palettes
+HARDWARE_PRESETS = {
+    "nes": {"tile": (16, 16), "colors": 4,  "palettes": 4, "shared": "most_frequent"},
+    "gbc": {"tile": (8, 8),   "colors": 4,  "palettes": 8, "shared": "none"},
+    "sms": {"tile": (8, 8),   "colors": 16, "palettes": 2, "shared": "none"},
+}
+
+DEFAULT_ITERATIONS = 10
+
+# Passes d'échanges au plus lors de l'ajustement d'une sous-palette
+_SWAP_PASSES = 10
+
+
+def tile_ids(shape, tile_width: int, tile_height: int):
+    """
+    Numéro de tuile de chaque pixel d'une image [H, W] ou d'un batch [B, H, W] (tuiles
+    partielles au bord, numérotées image par image) et forme de la grille ([B,] lignes, colonnes)
+    """
+    batch, (height, width) = (shape[0] if len(shape) == 3 else None), shape[-2:]
+    rows, cols = -(-height // tile_height), -(-width // tile_width)
+    ids = (np.arange(height) // tile_height)[:, None] * cols + (np.arange(width) // tile_width)[None, :]
+    if batch is None:
+        return ids, (rows, cols)
+    return np.arange(batch)[:, None, None] * (rows * cols) + ids, (batch, rows, cols)
+
+
+def tile_histograms(indices, tile_width: int, tile_height: int, n_colors: int):
+    """
+    Histogrammes [T, n_colors] des index de palette [[B,] H, W] de chaque tuile, en un bincount
+
+    Retourne (histogrammes, numéro de tuile de chaque pixel, forme de la grille de tuiles)
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    ids, shape = tile_ids(indices.shape, tile_width, tile_height)
+    count = int(np.prod(shape))
+    histograms = np.bincount((ids * n_colors + indices).ravel(), minlength=count * n_colors)
+    return histograms.reshape(count, n_colors).astype(np.float64), ids, shape
+
+
+def fit_subpalette(weights, distances, size: int, fixed=()) -> np.ndarray:
+    """
+    size couleurs (index dans la palette maître) minimisant somme_m weights[m] * d(m, S)
+
+    fixed: couleurs imposées (comprises dans size). Ajout glouton de la couleur qui réduit
+    le plus l'erreur, puis des passes d'échanges (chaque couleur libre est remplacée par la
+    meilleure candidate si l'erreur baisse) jusqu'à stabilité.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    n = len(weights)
+    size = min(size, n)
+    chosen = [int(c) for c in fixed][:size]
+    current = distances[:, chosen].min(axis=1) if chosen else np.full(n, np.inf)
+
+    def best_candidate(base):
+        costs = weights @ np.minimum(base[:, None], distances)
+        costs[chosen] = np.inf
+        return int(np.argmin(costs)), float(costs.min())
+
+    while len(chosen) < size:
+        # Premier choix (base infinie): le médoïde pondéré
+        base = current if np.isfinite(current).all() else np.full(n, distances.max() + 1.0)
+        candidate, _ = best_candidate(base)
+        chosen.append(candidate)
+        current = np.minimum(current, distances[:, candidate])
+
+    for _ in range(_SWAP_PASSES):
+        improved = False
+        for position in range(len(fixed), size):
+            others = chosen[:position] + chosen[position + 1:]
+            base = distances[:, others].min(axis=1) if others else np.full(n, distances.max() + 1.0)
+            candidate, cost = best_candidate(base)
+            if cost < weights @ np.minimum(base, distances[:, chosen[position]]) - 1e-9:
+                chosen[position] = candidate
+                improved = True
+        if not improved:
+            break
+    return np.asarray(chosen, dtype=np.int64)
+
+
+def _subpalette_distances(subpalettes, distances) -> np.ndarray:
+    """d(m, S_p) pour chaque sous-palette: [n_colors, P]"""
+    return distances[:, subpalettes].min(axis=2)
+
+
+def solve_tile_palettes(indices, palette_rgb, tile_width: int = 8, tile_height: int = 8,
+                        colors: int = 4, palettes: int = 4, shared: str = "none",
+                        iterations: int = DEFAULT_ITERATIONS) -> Dict[str, np.ndarray]:
+    """
+    Choisit palettes sous-palettes de colors couleurs de palette_rgb [M, 3] et affecte
+    chaque tuile de l'image indices [H, W] (index dans palette_rgb) à l'une d'elles; un
+    batch [B, H, W] partage les mêmes sous-palettes
+
+    Retourne un dictionnaire:
+        subpalettes: [P, K] index dans palette_rgb
+        assignment:  [[B,] lignes, colonnes] sous-palette de chaque tuile
+        indexed:     [[B,] H, W] index de chaque pixel dans les sous-palettes à plat (p * K + k)
+        error:       erreur totale (somme des ΔE76² des pixels), mean_error: ΔE76 moyen
+    """
+    if shared not in SHARED_MODES:
+        raise ValueError(f"Couleur commune inconnue: {shared}. Disponibles: {list(SHARED_MODES)}")
+    indices = np.asarray(indices, dtype=np.int64)
+    lab = rgb_to_lab(np.asarray(palette_rgb, dtype=np.uint8).reshape(-1, 3))
+    n_colors = len(lab)
+    distances = ((lab[:, None, :] - lab[None, :, :]) ** 2).sum(axis=-1)
+    histograms, ids, shape = tile_histograms(indices, tile_width, tile_height, n_colors)
+    total = histograms.sum(axis=0)
+    colors = min(colors, n_colors)
+    fixed = {"none": (), "most_frequent": (int(np.argmax(total)),), "first": (0,)}[shared]
+    if colors <= len(fixed):
+        fixed = fixed[:colors]
+
+    # Initialisation: chaque nouvelle sous-palette sert la tuile la plus mal servie
+    subpalettes = [fit_subpalette(total, distances, colors, fixed)]
+    while len(subpalettes) < palettes:
+        errors = (histograms @ _subpalette_distances(np.stack(subpalettes), distances)).min(axis=1)
+        subpalettes.append(fit_subpalette(histograms[int(np.argmax(errors))], distances, colors, fixed))
+    subpalettes = np.stack(subpalettes)
+
+    assignment = None
+    for _ in range(max(1, iterations)):
+        errors = histograms @ _subpalette_distances(subpalettes, distances)
+        new_assignment = np.argmin(errors, axis=1)
+        if assignment is not None and (new_assignment == assignment).all():
+            break
+        assignment = new_assignment
+        served = errors[np.arange(len(errors)), assignment]
+        for p in range(len(subpalettes)):
+            members = assignment == p
+            if members.any():
+                subpalettes[p] = fit_subpalette(histograms[members].sum(axis=0), distances, colors, fixed)
+            else:
+                # Sous-palette inutilisée: réservée à la tuile la plus mal servie
+                worst = int(np.argmax(served))
+                subpalettes[p] = fit_subpalette(histograms[worst], distances, colors, fixed)
+                served[worst] = 0.0
+    errors = histograms @ _subpalette_distances(subpalettes, distances)
+    assignment = np.argmin(errors, axis=1)
+
+    # Couleur de chaque index maître dans chaque sous-palette: [P, M]
+    slots = np.argmin(distances[:, subpalettes], axis=2).T
+    tile_palette = assignment[ids]
+    indexed = tile_palette * colors + slots[tile_palette, indices]
+    pixel_errors = distances[indices, subpalettes.reshape(-1)[indexed]]
+    return {
+        "subpalettes": subpalettes,
+        "assignment":  assignment.reshape(shape),
+        "indexed":     indexed,
+        "error":       float(pixel_errors.sum()),
+        "mean_error":  float(np.sqrt(pixel_errors).mean()) if pixel_errors.size else 0.0,
+    }
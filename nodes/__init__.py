@@ -11,6 +11,26 @@ from .create_color_from_rgb_node   import CreateColorFromRGBNode
 from .color_formatter_node         import ColorFormatterNode
 from .color_preview_node           import ColorPreviewNode
 from .mix_colors_node              import MixColorsNode
+from .result_cache_stats_node      import ResultCacheStatsNode
+from .indexed_palette_loader_node  import IndexedPaletteLoaderNode
+from .profiling_report_node        import ProfilingReportNode
+from .save_palette_node            import SavePaletteNode
+from .palette_dedupe_node          import PaletteDedupeNode
+from .palette_sort_node            import PaletteSortNode
+from .palette_reduce_node          import PaletteReduceNode
+from .palette_library_search_node  import PaletteLibrarySearchNode
+from .palette_rank_node            import PaletteRankNode
+from .pixel_grid_downscale_node    import PixelGridDownscaleNode
+from .sprite_sheet_slice_node      import SpriteSheetSliceNode
+from .retro_tile_palettes_node     import RetroTilePalettesNode
+from .palette_swap_node            import PaletteSwapNode
+from .palette_animation_node       import PaletteAnimationNode
+from .palette_map_node             import PaletteMapNode
+from .color_vision_node            import ColorVisionSimulationNode
+from .palette_contrast_node        import PaletteContrastNode
+from .off_palette_check_node       import OffPaletteCheckNode
+from .palette_lut_export_node      import PaletteLutExportNode
+from .color_lut_apply_node          import ColorLutApplyNode
 
 __all__ = [
     'GimpPaletteLoaderNode',
@@ -20,4 +40,24 @@ __all__ = [
     "ColorFormatterNode",
     "ColorPreviewNode",
     "MixColorsNode",
+    "ResultCacheStatsNode",
+    "IndexedPaletteLoaderNode",
+    "ProfilingReportNode",
+    "SavePaletteNode",
+    "PaletteDedupeNode",
+    "PaletteSortNode",
+    "PaletteReduceNode",
+    "PaletteLibrarySearchNode",
+    "PaletteRankNode",
+    "PixelGridDownscaleNode",
+    "SpriteSheetSliceNode",
+    "RetroTilePalettesNode",
+    "PaletteSwapNode",
+    "PaletteAnimationNode",
+    "PaletteMapNode",
+    "ColorVisionSimulationNode",
+    "PaletteContrastNode",
+    "OffPaletteCheckNode",
+    "PaletteLutExportNode",
+    "ColorLutApplyNode",
 ]
@@ -1,5 +1,6 @@
 # nodes/color_formatter_node.py
 from ..lib.pixel_palette import PixelColor
+from ..lib.profiling     import get_profiler, profiled
 
 class ColorFormatterNode:
     """
@@ -50,6 +51,7 @@ class ColorFormatterNode:
     FUNCTION = "format_color"
     CATEGORY = "pixel_art/output"
     
+    @profiled("ColorFormatter")
     def format_color(self, color, format_type="hex", alpha_value=1.0, alpha_int=255, 
                     css_var_name="color", gimp_index=-1):
         """
@@ -99,8 +101,8 @@ class ColorFormatterNode:
             
             # Log de succès
             color_name = color.name if color.name else "Sans nom"
-            print(f"[ColorFormatter] ✓ Couleur formatée: '{color_name}' "
-                  f"({color.r}, {color.g}, {color.b}) -> {format_type}: {result}")
+            get_profiler().log("ColorFormatter", f"✓ Couleur formatée: '{color_name}' "
+                               f"({color.r}, {color.g}, {color.b}) -> {format_type}: {result}")
             
             return (result,)
             
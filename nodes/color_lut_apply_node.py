@@ -0,0 +1,112 @@
+# nodes/color_lut_apply_node.py
+import os
+import folder_paths
+from ..lib.color_lut   import LUT_EXTENSIONS, INTERPOLATIONS, load_color_lut, apply_color_lut
+from ..lib.lazy_import import lazy_import
+from ..lib.profiling   import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class ColorLutApplyNode:
+    """
+    Nœud ComfyUI pour appliquer une LUT 3D (.cube ou Hald CLUT PNG) à une image ou un
+    batch, par interpolation trilinéaire ou tétraédrique
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        """Configuration des entrées du nœud"""
+        input_dir = folder_paths.get_input_directory()
+
+        try:
+            files = [f for f in os.listdir(input_dir)
+                     if f.lower().endswith(LUT_EXTENSIONS)
+                     and os.path.isfile(os.path.join(input_dir, f))]
+        except (OSError, FileNotFoundError):
+            files = []
+
+        if not files:
+            files = ["Aucun fichier LUT - Utilisez le bouton de chargement"]
+
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "lut_file": (sorted(files), {
+                    "image_upload": True,
+                    "accept": ".cube,image/png",
+                    "tooltip": "LUT 3D: fichier .cube ou Hald CLUT PNG"
+                }),
+                "interpolation": (list(INTERPOLATIONS), {
+                    "default": "tetrahedral",
+                    "tooltip": "tetrahedral: 4 sommets (moteurs de rendu), trilinear: 8 sommets, nearest: point de grille"
+                }),
+            },
+            "optional": {
+                "strength": ("FLOAT", {
+                    "default": 1.0,
+                    "min": 0.0,
+                    "max": 1.0,
+                    "step": 0.05,
+                    "tooltip": "Mélange entre l'image d'origine (0) et l'image transformée (1)"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "STRING")
+    RETURN_NAMES = ("image", "info")
+    FUNCTION = "apply_lut"
+    CATEGORY = "pixel_art/image"
+
+    @classmethod
+    def IS_CHANGED(cls, lut_file, **kwargs):
+        """Détection des changements pour le cache ComfyUI (date de modification de la LUT)"""
+        try:
+            lut_path = folder_paths.get_annotated_filepath(lut_file)
+            if lut_path and os.path.exists(lut_path):
+                return os.path.getmtime(lut_path)
+        except (OSError, TypeError):
+            pass
+        return float("NaN")
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, lut_file, **kwargs):
+        """Validation des entrées"""
+        if not lut_file or not isinstance(lut_file, str):
+            return "Le fichier LUT est requis"
+
+        if "Aucun fichier" in lut_file:
+            return True  # Cas spécial autorisé
+
+        if not lut_file.lower().endswith(LUT_EXTENSIONS):
+            return f"Format non supporté. Extensions autorisées: {', '.join(LUT_EXTENSIONS)}"
+
+        return True
+
+    @profiled("ColorLutApply")
+    def apply_lut(self, image, lut_file, interpolation="tetrahedral", strength=1.0):
+        """Retourne l'image transformée par la LUT et un résumé de la LUT"""
+        if "Aucun fichier" in lut_file:
+            print("[ColorLutApply] ✗ Erreur: Aucun fichier LUT sélectionné")
+            return (image, "# Erreur: Aucun fichier LUT sélectionné")
+
+        profiler = get_profiler()
+        try:
+            with profiler.stage("parse"):
+                lut = load_color_lut(folder_paths.get_annotated_filepath(lut_file))
+            with profiler.stage("decode"):
+                pixels = image.cpu().numpy()[..., :3]
+            with profiler.stage("render"):
+                result = apply_color_lut(pixels, lut, interpolation)
+                if strength < 1.0:
+                    result = pixels + (result - pixels) * np.float32(strength)
+            profiler.count("pixels", pixels[..., 0].size)
+
+            info = (f"{lut.title or os.path.basename(lut_file)}: {lut.size}³ points, "
+                    f"domaine {lut.domain_min} -> {lut.domain_max}, {interpolation}")
+            profiler.log("ColorLutApply", f"✓ {info} sur {pixels[..., 0].size} pixels")
+            return (torch.from_numpy(np.ascontiguousarray(result, dtype=np.float32)), info)
+
+        except Exception as e:
+            print(f"[ColorLutApply] ✗ Erreur: {e}")
+            return (image, f"# Erreur: {e}")
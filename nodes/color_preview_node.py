@@ -1,9 +1,16 @@
 
 # nodes/color_preview_node.py
-import torch
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont
 from ..lib.pixel_palette import PixelColor
+from ..lib.cache         import get_result_cache, make_key
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+# Dépendances lourdes chargées à la première exécution du node (démarrage de ComfyUI plus rapide)
+torch     = lazy_import("torch")
+np        = lazy_import("numpy")
+Image     = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
 
 class ColorPreviewNode:
     """
@@ -55,6 +62,7 @@ class ColorPreviewNode:
     FUNCTION = "create_color_preview"
     CATEGORY = "pixel_art/output"
     
+    @profiled("ColorPreview")
     def create_color_preview(self, color, width=256, height=256, show_text=True, 
                            text_format="hex", text_color="auto", text_size=24,
                            text_position="center", background_color="transparent"):
@@ -68,76 +76,91 @@ class ColorPreviewNode:
             error_img = np.full((height, width, 3), [255, 0, 0], dtype=np.uint8)
             return (torch.from_numpy(error_img).float() / 255.0,)
         
+        profiler = get_profiler()
+        cache = get_result_cache()
+        cache_key = make_key("ColorPreview", f"{color.hex}|{color.name}",
+                             width=width, height=height, show_text=show_text,
+                             text_format=text_format, text_color=text_color, text_size=text_size,
+                             text_position=text_position, background_color=background_color)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            profiler.count("cache_hits")
+            return cached
+        
         try:
             # Création de l'image PIL
-            if background_color.lower() == "transparent":
-                img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-            else:
-                # Parse background color (hex ou rgb)
-                bg_color = self._parse_color(background_color)
-                img = Image.new('RGB', (width, height), bg_color)
+            with profiler.stage("render"):
+                if background_color.lower() == "transparent":
+                    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+                else:
+                    # Parse background color (hex ou rgb)
+                    bg_color = self._parse_color(background_color)
+                    img = Image.new('RGB', (width, height), bg_color)
             
-            draw = ImageDraw.Draw(img)
+                draw = ImageDraw.Draw(img)
             
-            # Couleur principale (rectangle de fond)
-            main_color = (color.r, color.g, color.b)
-            draw.rectangle([(0, 0), (width, height)], fill=main_color)
+                # Couleur principale (rectangle de fond)
+                main_color = (color.r, color.g, color.b)
+                draw.rectangle([(0, 0), (width, height)], fill=main_color)
             
-            # Affichage du texte si demandé
-            if show_text:
-                # Format du texte selon le type demandé
-                text = self._get_formatted_text(color, text_format)
+                # Affichage du texte si demandé
+                if show_text:
+                    # Format du texte selon le type demandé
+                    text = self._get_formatted_text(color, text_format)
                 
-                # Couleur du texte
-                if text_color == "auto":
-                    # Auto: noir sur couleur claire, blanc sur couleur sombre
-                    luminance = (0.299 * color.r + 0.587 * color.g + 0.114 * color.b) / 255
-                    text_rgb = (0, 0, 0) if luminance > 0.5 else (255, 255, 255)
-                elif text_color == "white":
-                    text_rgb = (255, 255, 255)
-                else:  # black
-                    text_rgb = (0, 0, 0)
+                    # Couleur du texte
+                    if text_color == "auto":
+                        # Auto: noir sur couleur claire, blanc sur couleur sombre
+                        luminance = (0.299 * color.r + 0.587 * color.g + 0.114 * color.b) / 255
+                        text_rgb = (0, 0, 0) if luminance > 0.5 else (255, 255, 255)
+                    elif text_color == "white":
+                        text_rgb = (255, 255, 255)
+                    else:  # black
+                        text_rgb = (0, 0, 0)
                 
-                # Police (utilise police par défaut PIL)
-                try:
-                    font = ImageFont.truetype("arial.ttf", text_size)
-                except:
-                    font = ImageFont.load_default()
+                    # Police (utilise police par défaut PIL)
+                    try:
+                        font = ImageFont.truetype("arial.ttf", text_size)
+                    except:
+                        font = ImageFont.load_default()
                 
-                # Position du texte
-                bbox = draw.textbbox((0, 0), text, font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
+                    # Position du texte
+                    bbox = draw.textbbox((0, 0), text, font=font)
+                    text_width = bbox[2] - bbox[0]
+                    text_height = bbox[3] - bbox[1]
                 
-                if text_position == "center":
-                    x = (width - text_width) // 2
-                    y = (height - text_height) // 2
-                elif text_position == "top":
-                    x = (width - text_width) // 2
-                    y = 10
-                else:  # bottom
-                    x = (width - text_width) // 2
-                    y = height - text_height - 10
+                    if text_position == "center":
+                        x = (width - text_width) // 2
+                        y = (height - text_height) // 2
+                    elif text_position == "top":
+                        x = (width - text_width) // 2
+                        y = 10
+                    else:  # bottom
+                        x = (width - text_width) // 2
+                        y = height - text_height - 10
                 
-                # Dessiner le texte
-                draw.text((x, y), text, fill=text_rgb, font=font)
+                    # Dessiner le texte
+                    draw.text((x, y), text, fill=text_rgb, font=font)
             
             # Conversion vers format ComfyUI
-            if img.mode == 'RGBA':
-                # Convertir RGBA vers RGB avec fond blanc
-                bg = Image.new('RGB', img.size, (255, 255, 255))
-                img = Image.alpha_composite(bg.convert('RGBA'), img).convert('RGB')
-            
-            # Conversion PIL -> numpy -> torch
-            img_array = np.array(img).astype(np.float32) / 255.0
-            img_tensor = torch.from_numpy(img_array)[None,]  # Add batch dimension
+            with profiler.stage("convert"):
+                if img.mode == 'RGBA':
+                    # Convertir RGBA vers RGB avec fond blanc
+                    bg = Image.new('RGB', img.size, (255, 255, 255))
+                    img = Image.alpha_composite(bg.convert('RGBA'), img).convert('RGB')
+                
+                # Conversion PIL -> numpy -> torch
+                img_array = np.array(img).astype(np.float32) / 255.0
+                img_tensor = torch.from_numpy(img_array)[None,]  # Add batch dimension
             
             # Log de succès
             color_name = color.name if color.name else "Sans nom"
-            print(f"[ColorPreview] ✓ Image créée: '{color_name}' "
-                  f"({color.r}, {color.g}, {color.b}) -> {width}x{height}")
+            profiler.log("ColorPreview", f"✓ Image créée: '{color_name}' "
+                         f"({color.r}, {color.g}, {color.b}) -> {width}x{height}")
             
-            return (img_tensor,)
+            result = (img_tensor,)
+            cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             print(f"[ColorPreview] ✗ Erreur: {e}")
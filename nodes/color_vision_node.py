@@ -0,0 +1,102 @@
+# nodes/color_vision_node.py
+from ..lib.pixel_palette import PixelPalette
+from ..lib.pixel_array   import to_uint8, ensure_rgb
+from ..lib.color_vision  import DEFICIENCIES, simulate_pixels, confusable_pairs
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class ColorVisionSimulationNode:
+    """
+    Nœud de simulation des déficiences de la vision des couleurs (Machado 2009): image
+    ou batch et/ou palette vus en protan, deutan ou tritan, avec les paires de couleurs
+    de la palette qui deviennent indiscernables
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "deficiency": (list(DEFICIENCIES), {
+                    "default": "deutan",
+                    "tooltip": "protan: rouge, deutan: vert, tritan: bleu"
+                }),
+                "severity": ("FLOAT", {
+                    "default": 1.0,
+                    "min": 0.0,
+                    "max": 1.0,
+                    "step": 0.1,
+                    "tooltip": "0: vision normale, 1: dichromatie (protanopie, deutéranopie, tritanopie)"
+                }),
+            },
+            "optional": {
+                "image": ("IMAGE",),
+                "palette": ("PIXEL_PALETTE",),
+                "threshold": ("FLOAT", {
+                    "default": 5.0,
+                    "min": 0.5,
+                    "max": 50.0,
+                    "step": 0.5,
+                    "tooltip": "ΔE76 en dessous duquel deux couleurs sont jugées indiscernables"
+                }),
+                "bits": ("INT", {
+                    "default": 7,
+                    "min": 5,
+                    "max": 8,
+                    "step": 1,
+                    "tooltip": "Résolution de la LUT 3D des images (8: exacte, 48 Mo)"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "PIXEL_PALETTE", "STRING")
+    RETURN_NAMES = ("image", "palette", "report")
+    FUNCTION = "simulate"
+    CATEGORY = "pixel_art/palette"
+
+    @profiled("ColorVisionSimulation")
+    def simulate(self, deficiency, severity, image=None, palette=None, threshold=5.0, bits=7):
+        """
+        Retourne l'image simulée (une indexation dans la LUT 3D en cache), la palette
+        simulée et le rapport des paires confondues
+        """
+        has_palette = isinstance(palette, PixelPalette) and not palette.is_empty
+        if image is None and not has_palette:
+            print("[ColorVisionSimulation] ✗ Erreur: Ni image ni palette")
+            return (image, palette, "# Erreur: Ni image ni palette")
+
+        profiler = get_profiler()
+        try:
+            title = f"{deficiency} {severity:.0%}"
+            lines = []
+            simulated_image = image
+            if image is not None:
+                with profiler.stage("decode"):
+                    pixels = ensure_rgb(to_uint8(image.cpu().numpy()))
+                with profiler.stage("render"):
+                    simulated = simulate_pixels(pixels, deficiency, severity, bits)
+                    simulated_image = torch.from_numpy(simulated.astype(np.float32) / 255.0)
+                profiler.count("pixels", pixels[..., 0].size)
+                lines.append(f"# {title}: {pixels.shape[0]} image(s) {pixels.shape[2]}x{pixels.shape[1]}")
+
+            simulated_palette = palette
+            if has_palette:
+                with profiler.stage("extract"):
+                    simulated_palette = palette.simulate_vision(deficiency, severity)
+                    result = confusable_pairs(palette.to_array(), deficiency, severity, threshold)
+                pairs = result['pairs'].tolist()
+                lines.append(f"# {title}: {len(pairs)} paire(s) confondue(s) sur {palette.color_count} "
+                             f"couleurs (ΔE76 < {threshold:g})")
+                for (i, j), before, after in zip(pairs, result['original'].tolist(), result['simulated'].tolist()):
+                    lines.append(f"{i} {palette.colors[i].hex} ~ {j} {palette.colors[j].hex}: "
+                                 f"ΔE76 {before:.1f} -> {after:.1f}")
+
+            report = "\n".join(lines)
+            profiler.log("ColorVisionSimulation", "✓ " + "; ".join(line[2:] for line in lines if line.startswith("# ")))
+            return (simulated_image, simulated_palette, report)
+
+        except Exception as e:
+            print(f"[ColorVisionSimulation] ✗ Erreur: {e}")
+            return (image, palette, f"# Erreur: {e}")
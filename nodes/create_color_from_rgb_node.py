@@ -1,5 +1,6 @@
 # nodes/create_color_from_rgb_node.py
 from ..lib.pixel_palette import PixelColor
+from ..lib.profiling     import profiled
 
 class CreateColorFromRGBNode:
     """
@@ -45,6 +46,7 @@ class CreateColorFromRGBNode:
     FUNCTION = "create_color_from_rgb"
     CATEGORY = "pixel_art/colors"
     
+    @profiled("CreateColorFromRGB")
     def create_color_from_rgb(self, red, green, blue, color_name=""):
         """
         Crée une couleur depuis des valeurs RGB
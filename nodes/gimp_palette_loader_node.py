@@ -1,7 +1,8 @@
 # nodes/gimp_palette_loader_node.py
 import os
 import folder_paths
-from ..lib.pixel_palette import PixelPalette
+from ..lib.pixel_palette import PixelPalette, read_palette_text
+from ..lib.profiling     import get_profiler, profiled
 
 class GimpPaletteLoaderNode:
     """
@@ -66,14 +67,17 @@ class GimpPaletteLoaderNode:
         
         return True
     
+    @profiled("GimpPaletteLoader")
     def load_palette(self, palette_file):
         """
         Charge un fichier palette et retourne un objet PixelPalette
         Interface simple: lecture fichier -> création objet
         """
+        profiler = get_profiler()
+        
         # Cas d'erreur ou absence de fichier
         if not palette_file or "Aucun fichier" in palette_file:
-            print("[GimpPaletteLoader] Aucun fichier sélectionné")
+            profiler.log("GimpPaletteLoader", "Aucun fichier sélectionné")
             return (PixelPalette(raw_content="", source_filename=""),)
         
         try:
@@ -85,18 +89,21 @@ class GimpPaletteLoaderNode:
                 return (PixelPalette(raw_content="", source_filename=palette_file),)
             
             # Lecture du contenu
-            content = self._read_file_safe(palette_path)
+            with profiler.stage("decode"):
+                content = self._read_file_safe(palette_path)
             
             if content is None:
                 print(f"[GimpPaletteLoader] Impossible de lire le fichier: {palette_file}")
                 return (PixelPalette(raw_content="", source_filename=palette_file),)
             
             # Création de l'objet palette (parse automatique)
-            palette = PixelPalette(raw_content=content, source_filename=palette_file)
+            with profiler.stage("parse"):
+                palette = PixelPalette(raw_content=content, source_filename=palette_file)
+            profiler.count("colors", palette.color_count)
             
             # Log de succès
-            print(f"[GimpPaletteLoader] ✓ Palette chargée: '{palette.name}' "
-                  f"({palette.color_count} couleurs, format: {palette.format_type})")
+            profiler.log("GimpPaletteLoader", f"✓ Palette chargée: '{palette.name}' "
+                         f"({palette.color_count} couleurs, format: {palette.format_type})")
             
             return (palette,)
             
@@ -112,29 +119,6 @@ class GimpPaletteLoaderNode:
     def _read_file_safe(self, file_path: str) -> str:
         """
         Lecture sécurisée avec gestion des encodages
-        Déléguée à une méthode simple car la logique métier est dans PixelPalette
+        Déléguée à read_palette_text (partagée avec la bibliothèque de palettes)
         """
-        # Liste d'encodages à tenter, du plus strict au plus permissif
-        encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
-        
-        for encoding in encodings:
-            try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
-                    if content.strip():  # Pas complètement vide
-                        return content
-            except (UnicodeDecodeError, UnicodeError):
-                continue
-            except OSError as e:
-                print(f"[GimpPaletteLoader] Erreur I/O avec {encoding}: {e}")
-                continue
-        
-        # Dernier recours: lecture binaire + décodage forcé
-        try:
-            with open(file_path, 'rb') as f:
-                raw_bytes = f.read()
-                return raw_bytes.decode('latin-1', errors='replace')
-        except Exception as e:
-            print(f"[GimpPaletteLoader] Échec lecture binaire: {e}")
-        
-        return None
+        return read_palette_text(file_path)
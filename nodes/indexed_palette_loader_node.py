@@ -0,0 +1,143 @@
+# nodes/indexed_palette_loader_node.py
+import os
+import folder_paths
+from ..lib.pixel_palette    import PixelPalette
+from ..lib.file_paths       import resolve_inside
+from ..lib.embedded_palette import (SUPPORTED_EXTENSIONS, read_embedded_palette,
+                                    read_embedded_palettes, list_indexed_images)
+from ..lib.profiling        import get_profiler, profiled
+
+class IndexedPaletteLoaderNode:
+    """
+    Nœud ComfyUI pour lire la palette embarquée d'images indexées (PNG, GIF, BMP)
+    Seule la table de couleurs est lue: ordre des index et couleurs exactes conservés
+    Mode "folder": toutes les images d'un sous-dossier de input, lues en parallèle
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        """Configuration des entrées du nœud"""
+        input_dir = folder_paths.get_input_directory()
+        files = list_indexed_images(input_dir)
+
+        if not files:
+            files = ["Aucune image indexée - Utilisez le bouton de chargement"]
+
+        return {
+            "required": {
+                "image_file": (files, {
+                    "image_upload": True,
+                    "tooltip": "Image indexée (.png, .gif, .bmp) du dossier input"
+                }),
+                "mode": (["single", "folder"], {
+                    "default": "single",
+                    "tooltip": "single: le fichier choisi, folder: toutes les images du dossier"
+                }),
+            },
+            "optional": {
+                "folder": ("STRING", {
+                    "default": "",
+                    "tooltip": "Sous-dossier de input pour le mode folder (vide = input)"
+                }),
+                "workers": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 64,
+                    "step": 1,
+                    "tooltip": "Nombre de workers (0 = auto, voir PIXEL_PALETTE_WORKERS)"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("PIXEL_PALETTE", "STRING")
+    RETURN_NAMES = ("palettes", "report")
+    OUTPUT_IS_LIST = (True, False)
+    FUNCTION = "load_palettes"
+    CATEGORY = "pixel_art/io"
+
+    @classmethod
+    def IS_CHANGED(cls, image_file, mode="single", folder="", **kwargs):
+        """Détection des changements pour le cache ComfyUI (date de modification)"""
+        try:
+            if mode == "folder":
+                directory = resolve_inside(folder_paths.get_input_directory(), folder)
+                return sum(os.path.getmtime(os.path.join(directory, f))
+                           for f in list_indexed_images(directory))
+            image_path = folder_paths.get_annotated_filepath(image_file)
+            if image_path and os.path.exists(image_path):
+                return os.path.getmtime(image_path)
+        except (OSError, TypeError, ValueError):
+            pass
+        return float("NaN")
+
+    @classmethod
+    def VALIDATE_INPUTS(cls, image_file, **kwargs):
+        """Validation des entrées"""
+        if not image_file or not isinstance(image_file, str):
+            return "Le fichier image est requis"
+
+        if "Aucune image" in image_file:
+            return True  # Cas spécial autorisé
+
+        if not image_file.lower().endswith(SUPPORTED_EXTENSIONS):
+            return f"Format non supporté. Extensions autorisées: {', '.join(SUPPORTED_EXTENSIONS)}"
+
+        return True
+
+    @profiled("IndexedPaletteLoader")
+    def load_palettes(self, image_file, mode="single", folder="", workers=0):
+        """
+        Lit la ou les palettes embarquées et retourne une liste de PixelPalette
+        """
+        if mode == "folder":
+            return self._load_folder(folder, workers)
+
+        if not image_file or "Aucune image" in image_file:
+            get_profiler().log("IndexedPaletteLoader", "Aucun fichier sélectionné")
+            return ([PixelPalette()], "# Aucun fichier")
+
+        try:
+            image_path = folder_paths.get_annotated_filepath(image_file)
+            with get_profiler().stage("decode"):
+                palette = read_embedded_palette(image_path)
+
+            get_profiler().log("IndexedPaletteLoader", f"✓ Palette lue: '{palette.name}' "
+                               f"({palette.color_count} couleurs, format: {palette.format_type})")
+
+            return ([palette], f"{image_file}: {palette.color_count} couleurs")
+
+        except Exception as e:
+            # En cas d'erreur, toujours retourner un objet valide
+            print(f"[IndexedPaletteLoader] ✗ Erreur: {e}")
+            return ([PixelPalette(source_filename=image_file)], f"# Erreur: {e}")
+
+    def _load_folder(self, folder, workers):
+        """Mode bulk: toutes les images du dossier, lues en parallèle"""
+        try:
+            directory = resolve_inside(folder_paths.get_input_directory(), folder)
+        except ValueError as e:
+            print(f"[IndexedPaletteLoader] ✗ Erreur: {e}")
+            return ([PixelPalette()], f"# Erreur: {e}")
+        files = list_indexed_images(directory)
+
+        if not files:
+            print(f"[IndexedPaletteLoader] Aucune image indexée dans: {directory}")
+            return ([PixelPalette()], f"# Aucune image indexée dans {directory}")
+
+        profiler = get_profiler()
+        with profiler.stage("decode"):
+            results = read_embedded_palettes([os.path.join(directory, f) for f in files], workers)
+        profiler.count("files", len(files))
+
+        palettes = []
+        report = []
+        for file_name, palette in zip(files, results):
+            if palette is None:
+                report.append(f"{file_name}: ignoré (pas de palette)")
+                continue
+            palettes.append(palette)
+            report.append(f"{file_name}: {palette.color_count} couleurs")
+
+        profiler.log("IndexedPaletteLoader", f"✓ {len(palettes)}/{len(files)} palettes lues dans '{directory}'")
+
+        return (palettes or [PixelPalette()], "\n".join(report))
@@ -1,6 +1,7 @@
 
 # nodes/mix_colors_node.py
 from ..lib.pixel_palette import PixelColor
+from ..lib.profiling     import profiled
 
 class MixColorsNode:
     """
@@ -36,6 +37,7 @@ class MixColorsNode:
     FUNCTION     = "mix_colors"
     CATEGORY     = "pixel_art/colors"
 
+    @profiled("MixColors")
     def mix_colors(self, color_a: PixelColor, color_b: PixelColor, ratio: float = 0.5, color_space: str = "rgb"):
         """
         Mélange deux PixelColor en fonction d’un ratio et d’un espace colorimétrique choisi
@@ -0,0 +1,100 @@
+# nodes/off_palette_check_node.py
+from ..lib.pixel_palette import PixelPalette
+from ..lib.pixel_array   import to_uint8, ensure_rgb
+from ..lib.palette_check import MEMBERSHIP_METHODS, check_pixels
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class OffPaletteCheckNode:
+    """
+    Nœud de contrôle des images verrouillées sur une palette: masque des pixels hors
+    palette, nombre de pixels par couleur fautive et couleur de palette suggérée
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE", {
+                    "tooltip": "Image ou batch à contrôler"
+                }),
+                "palette": ("PIXEL_PALETTE", {
+                    "tooltip": "Palette officielle"
+                }),
+            },
+            "optional": {
+                "suggest": ("BOOLEAN", {
+                    "default": True,
+                    "tooltip": "Propose la couleur de palette la plus proche de chaque couleur fautive"
+                }),
+                "metric": (["lab", "rgb"], {
+                    "default": "lab",
+                    "tooltip": "Distance des suggestions (lab: ΔE76)"
+                }),
+                "max_colors": ("INT", {
+                    "default": 50,
+                    "min": 0,
+                    "max": 10000,
+                    "step": 1,
+                    "tooltip": "Nombre maximal de couleurs fautives listées (les plus fréquentes)"
+                }),
+                "method": (list(MEMBERSHIP_METHODS), {
+                    "default": "auto",
+                    "tooltip": "Test d'appartenance: table de bits 2^24 ou recherche dichotomique"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "STRING", "INT")
+    RETURN_NAMES = ("mask", "report", "off_palette_pixels")
+    FUNCTION = "check"
+    CATEGORY = "pixel_art/palette"
+
+    @profiled("OffPaletteCheck")
+    def check(self, image, palette, suggest=True, metric="lab", max_colors=50, method="auto"):
+        """
+        Retourne le masque (blanc: pixel hors palette), le rapport et le nombre total de
+        pixels hors palette du batch
+        """
+        if not isinstance(palette, PixelPalette) or palette.is_empty:
+            print("[OffPaletteCheck] ✗ Erreur: Palette vide ou invalide")
+            return (image, "# Erreur: Palette vide ou invalide", 0)
+
+        profiler = get_profiler()
+        try:
+            with profiler.stage("decode"):
+                pixels = ensure_rgb(to_uint8(image.cpu().numpy()))
+            with profiler.stage("extract"):
+                result = check_pixels(pixels, palette.to_array(), method, suggest, metric, limit=max_colors)
+            with profiler.stage("render"):
+                mask = np.broadcast_to(result['off_palette'][..., None], pixels.shape).astype(np.float32)
+                mask_tensor = torch.from_numpy(mask)
+            profiler.count("pixels", pixels[..., 0].size)
+
+            total = int(result['counts'].sum())
+            color_count = len(result['colors'])
+            colors, counts = result['colors'][:max_colors].tolist(), result['counts'][:max_colors].tolist()
+            lines = [f"# {total} pixel(s) hors palette sur {pixels[..., 0].size} "
+                     f"({total / max(1, pixels[..., 0].size):.3%}), {color_count} couleur(s)"]
+            if 'per_frame' in result and len(pixels) > 1:
+                lines.append("# par image: " + ", ".join(str(n) for n in result['per_frame'].tolist()))
+            hexes = palette.to_hex_list()
+            for k, ((r, g, b), count) in enumerate(zip(colors, counts)):
+                line = f"#{r:02x}{g:02x}{b:02x}: {count} px"
+                if 'nearest' in result:
+                    index = int(result['nearest'][k])
+                    unit = "ΔE76" if metric == "lab" else "RGB"
+                    line += f" -> {index} {hexes[index]} ({unit} {float(result['distance'][k]):.1f})"
+                lines.append(line)
+            if color_count > max_colors:
+                lines.append(f"# ... {color_count - max_colors} autre(s) couleur(s)")
+
+            profiler.log("OffPaletteCheck", f"✓ {lines[0].lstrip('# ')}")
+            return (mask_tensor, "\n".join(lines), total)
+
+        except Exception as e:
+            print(f"[OffPaletteCheck] ✗ Erreur: {e}")
+            return (image, f"# Erreur: {e}", 0)
@@ -0,0 +1,91 @@
+# nodes/palette_animation_node.py
+from ..lib.pixel_palette     import PixelPalette
+from ..lib.pixel_array       import to_uint8, ensure_rgb
+from ..lib.palette_animation import parse_cycles, palette_stack, render_frames
+from ..lib.lazy_import       import lazy_import
+from ..lib.profiling         import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class PaletteAnimationNode:
+    """
+    Nœud d'animation par palette: une image indexée et sa palette donnent un batch
+    d'images par cycles de couleurs et/ou fondu vers une palette cible
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE", {
+                    "tooltip": "Image indexée (couleurs de la palette; la première du batch)"
+                }),
+                "palette": ("PIXEL_PALETTE",),
+                "frames": ("INT", {
+                    "default": 16,
+                    "min": 1,
+                    "max": 1024,
+                    "step": 1,
+                    "display": "number"
+                }),
+                "cycles": ("STRING", {
+                    "default": "",
+                    "multiline": True,
+                    "tooltip": "Plages d'index qui tournent: début-fin[:vitesse], ex: 4-7, 10-15:-0.5"
+                }),
+            },
+            "optional": {
+                "target_palette": ("PIXEL_PALETTE", {
+                    "tooltip": "Fondu vers cette palette (même index; sinon correspondance optimale)"
+                }),
+                "color_space": (["rgb", "hsv"], {
+                    "default": "rgb",
+                    "tooltip": "Mixer utilisé pour le fondu"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("IMAGE", "STRING")
+    RETURN_NAMES = ("frames", "report")
+    FUNCTION = "animate"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("PaletteAnimation")
+    def animate(self, image, palette, frames, cycles, target_palette=None, color_space="rgb"):
+        """
+        Retourne le batch [frames, H, W, 3]: une pile de palettes, puis une seule indexation
+        """
+        if not isinstance(palette, PixelPalette) or palette.is_empty:
+            print("[PaletteAnimation] ✗ Erreur: Palette vide ou invalide")
+            return (image, "# Erreur: Palette vide ou invalide")
+        
+        profiler = get_profiler()
+        try:
+            ranges = parse_cycles(cycles)
+            with profiler.stage("decode"):
+                pixels = ensure_rgb(to_uint8(image[0].cpu().numpy()))
+                indices = palette.index_pixels(pixels)
+            
+            target_rgb = None
+            if isinstance(target_palette, PixelPalette) and not target_palette.is_empty:
+                if target_palette.color_count == palette.color_count:
+                    target_rgb = target_palette.to_array()
+                else:
+                    target_rgb = palette.assign_to(target_palette)[0].to_array()
+            
+            with profiler.stage("render"):
+                stack = palette_stack(palette.to_array(), frames, ranges, target_rgb, color_space)
+                # Pile en flottants: l'indexation produit directement le tensor de sortie
+                frames_array = render_frames(indices, stack.astype(np.float32) / 255.0)
+                frames_tensor = torch.from_numpy(frames_array)
+            profiler.count("frames", len(stack))
+            
+            report = (f"{len(stack)} images {pixels.shape[1]}x{pixels.shape[0]}, "
+                      f"{len(ranges)} cycle(s), fondu: {'oui (' + color_space + ')' if target_rgb is not None else 'non'}")
+            profiler.log("PaletteAnimation", f"✓ {report}")
+            return (frames_tensor, report)
+            
+        except Exception as e:
+            print(f"[PaletteAnimation] ✗ Erreur: {e}")
+            return (image, f"# Erreur: {e}")
@@ -0,0 +1,111 @@
+# nodes/palette_contrast_node.py
+from ..lib.pixel_palette    import PixelPalette
+from ..lib.palette_contrast import HEATMAP_METRICS, WCAG_AA, analyze_pairs, heatmap_image
+from ..lib.lazy_import      import lazy_import
+from ..lib.profiling        import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class PaletteContrastNode:
+    """
+    Nœud d'audit de lisibilité d'une palette: contraste WCAG et ΔE76 de toutes les
+    paires, plus proche voisine de chaque couleur et carte de chaleur des paires
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "palette": ("PIXEL_PALETTE",),
+                "min_contrast": ("FLOAT", {
+                    "default": WCAG_AA,
+                    "min": 1.0,
+                    "max": 21.0,
+                    "step": 0.1,
+                    "tooltip": "Contraste WCAG minimal (4.5: texte AA, 3: grand texte AA, 7: AAA)"
+                }),
+                "min_delta_e": ("FLOAT", {
+                    "default": 5.0,
+                    "min": 0.5,
+                    "max": 50.0,
+                    "step": 0.5,
+                    "tooltip": "ΔE76 en dessous duquel deux couleurs sont jugées trop proches"
+                }),
+            },
+            "optional": {
+                "heatmap": (list(HEATMAP_METRICS), {
+                    "default": "delta_e",
+                    "tooltip": "Valeur affichée par la carte de chaleur (rouge: sous le seuil)"
+                }),
+                "heatmap_size": ("INT", {
+                    "default": 512,
+                    "min": 16,
+                    "max": 4096,
+                    "step": 16,
+                    "tooltip": "Côté de la carte (au-delà, les paires sont regroupées: pire valeur)"
+                }),
+                "max_pairs": ("INT", {
+                    "default": 50,
+                    "min": 0,
+                    "max": 10000,
+                    "step": 1,
+                    "tooltip": "Nombre maximal de paires listées par critère"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "STRING", "STRING")
+    RETURN_NAMES = ("heatmap", "failing_pairs", "nearest")
+    FUNCTION = "analyze"
+    CATEGORY = "pixel_art/palette"
+
+    @profiled("PaletteContrast")
+    def analyze(self, palette, min_contrast, min_delta_e, heatmap="delta_e", heatmap_size=512, max_pairs=50):
+        """
+        Retourne la carte de chaleur, le résumé des paires sous les seuils et, par couleur,
+        sa plus proche voisine et sa couleur de meilleur contraste (CSV)
+        """
+        if not isinstance(palette, PixelPalette) or palette.color_count < 2:
+            print("[PaletteContrast] ✗ Erreur: Palette vide ou d'une seule couleur")
+            # Image d'erreur rouge
+            error_img = np.full((1, 16, 16, 3), [255, 0, 0], dtype=np.uint8)
+            return (torch.from_numpy(error_img).float() / 255.0, "# Erreur: Palette vide ou d'une seule couleur", "")
+
+        profiler = get_profiler()
+        try:
+            with profiler.stage("extract"):
+                result = analyze_pairs(palette.to_array(), min_contrast, min_delta_e, max_pairs,
+                                       heatmap, heatmap_size)
+            count = palette.color_count
+            profiler.count("pairs", count * (count - 1) // 2)
+
+            with profiler.stage("render"):
+                threshold = min_contrast if heatmap == "contrast" else min_delta_e
+                cell = max(1, heatmap_size // len(result['heatmap']))
+                image = heatmap_image(result['heatmap'], heatmap, threshold, cell)
+                heatmap_tensor = torch.from_numpy(image.astype(np.float32)[None] / 255.0)
+
+            hexes = palette.to_hex_list()
+            lines = [f"# {count} couleurs, {count * (count - 1) // 2} paires",
+                     f"# ΔE76 < {min_delta_e:g}: {result['close_count']} paire(s)"]
+            for (i, j), value in zip(result['close_pairs'].tolist(), result['close_delta_e'].tolist()):
+                lines.append(f"{i} {hexes[i]} ~ {j} {hexes[j]}: ΔE76 {value:.2f}")
+            lines.append(f"# contraste < {min_contrast:g}: {result['low_contrast_count']} paire(s)")
+            for (i, j), value in zip(result['low_contrast_pairs'].tolist(), result['low_contrast'].tolist()):
+                lines.append(f"{i} {hexes[i]} / {j} {hexes[j]}: {value:.2f}:1")
+
+            nearest = ["index,hex,nearest,nearest_hex,delta_e,best_contrast,best_contrast_hex,contrast"]
+            for i, (k, distance, partner, ratio) in enumerate(zip(
+                    result['nearest'].tolist(), result['nearest_delta_e'].tolist(),
+                    result['best_partner'].tolist(), result['best_contrast'].tolist())):
+                nearest.append(f"{i},{hexes[i]},{k},{hexes[k]},{distance:.2f},{partner},{hexes[partner]},{ratio:.2f}")
+
+            profiler.log("PaletteContrast", f"✓ {count} couleurs, {result['close_count']} paire(s) proches, "
+                                            f"{result['low_contrast_count']} sous le contraste")
+            return (heatmap_tensor, "\n".join(lines), "\n".join(nearest))
+
+        except Exception as e:
+            print(f"[PaletteContrast] ✗ Erreur: {e}")
+            error_img = np.full((1, 16, 16, 3), [255, 0, 0], dtype=np.uint8)
+            return (torch.from_numpy(error_img).float() / 255.0, f"# Erreur: {e}", "")
@@ -0,0 +1,72 @@
+# nodes/palette_dedupe_node.py
+from ..lib.pixel_palette  import PixelPalette
+from ..lib.palette_dedupe import DEDUPE_MODES, REPRESENTATIVES, NAME_MODES
+from ..lib.profiling      import get_profiler, profiled
+
+class PaletteDedupeNode:
+    """
+    Nœud de nettoyage de palette: doublons exacts, puis quasi-doublons à une tolérance près
+    Toute la logique est dans PixelPalette (deduplicate, merge_near_duplicates)
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "palette": ("PIXEL_PALETTE",),
+                "mode": (["exact", "near"], {
+                    "default": "exact",
+                    "tooltip": "near: fusionne aussi les couleurs distantes d'au plus tolerance"
+                }),
+            },
+            "optional": {
+                "order": (list(DEDUPE_MODES), {
+                    "default": "first",
+                    "tooltip": "first: ordre de la palette, count: les plus fréquentes d'abord"
+                }),
+                "tolerance": ("FLOAT", {
+                    "default": 2.3,
+                    "min": 0.0,
+                    "max": 100.0,
+                    "step": 0.1,
+                    "tooltip": "ΔE76 (lab) ou distance 0-255 (rgb); 2.3 ~ différence juste perceptible"
+                }),
+                "metric": (["lab", "rgb"], {"default": "lab"}),
+                "representative": (list(REPRESENTATIVES), {"default": "first"}),
+                "names": (list(NAME_MODES), {"default": "representative"}),
+            }
+        }
+    
+    RETURN_TYPES = ("PIXEL_PALETTE", "STRING")
+    RETURN_NAMES = ("palette", "report")
+    FUNCTION = "dedupe_palette"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("PaletteDedupe")
+    def dedupe_palette(self, palette, mode="exact", order="first", tolerance=2.3, metric="lab",
+                       representative="first", names="representative"):
+        """
+        Retourne la palette nettoyée et un résumé (couleurs avant / après)
+        """
+        if not isinstance(palette, PixelPalette):
+            print("[PaletteDedupe] ✗ Erreur: Objet palette invalide")
+            return (PixelPalette(), "# Erreur: Objet palette invalide")
+        
+        try:
+            result = palette.deduplicate(order)
+            report = [f"exact: {palette.color_count} -> {result.color_count} couleurs"]
+            
+            if mode == "near":
+                result = result.merge_near_duplicates(tolerance, metric, representative, names)
+                if order == "count":
+                    result = result.deduplicate("count")
+                report.append(f"near ({metric} <= {tolerance:g}): -> {result.color_count} couleurs")
+            
+            get_profiler().log("PaletteDedupe", f"✓ Palette nettoyée: '{palette.name}' "
+                               f"({palette.color_count} -> {result.color_count} couleurs)")
+            
+            return (result, "\n".join(report))
+            
+        except Exception as e:
+            print(f"[PaletteDedupe] ✗ Erreur: {e}")
+            return (palette, f"# Erreur: {e}")
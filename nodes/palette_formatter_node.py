@@ -1,6 +1,7 @@
 
 # nodes/palette_formatter_node.py
 from ..lib import PixelPalette
+from ..lib.profiling import get_profiler, profiled
 
 class PaletteFormatterNode:
     """
@@ -28,6 +29,7 @@ class PaletteFormatterNode:
     FUNCTION = "format_palette"
     CATEGORY = "pixel_art/output"
     
+    @profiled("PaletteFormatter")
     def format_palette(self, palette, format_type="rgb", separator="\n", 
                       include_header=True, include_names=True):
         """
@@ -49,8 +51,8 @@ class PaletteFormatterNode:
             )
             
             # Log de succès
-            print(f"[PaletteFormatter] ✓ Palette formatée: '{palette.name}' "
-                  f"({palette.color_count} couleurs, format: {format_type})")
+            get_profiler().log("PaletteFormatter", f"✓ Palette formatée: '{palette.name}' "
+                               f"({palette.color_count} couleurs, format: {format_type})")
             
             return (formatted_output,)
             
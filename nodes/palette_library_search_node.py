@@ -0,0 +1,99 @@
+# nodes/palette_library_search_node.py
+import os
+import folder_paths
+from ..lib.pixel_palette   import PixelPalette
+from ..lib.file_paths      import resolve_inside
+from ..lib.pixel_array     import to_uint8, ensure_rgb
+from ..lib.palette_library import SIMILARITY_METRICS, PaletteLibrary, default_index_path, image_query
+from ..lib.profiling       import get_profiler, profiled
+
+class PaletteLibrarySearchNode:
+    """
+    Recherche dans un répertoire de palettes: les plus proches d'une palette ou d'une image,
+    ou celles qui contiennent une couleur à ΔE près
+    L'index du répertoire est gardé dans le cache utilisateur et reconstruit si un fichier change
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "directory": ("STRING", {
+                    "default": "palettes",
+                    "tooltip": "Répertoire des palettes (relatif au dossier input de ComfyUI)"
+                }),
+                "query": (["palette", "image", "color"], {"default": "palette"}),
+                "top_k": ("INT", {
+                    "default": 10,
+                    "min": 1,
+                    "max": 1000,
+                    "step": 1,
+                    "display": "number"
+                }),
+            },
+            "optional": {
+                "palette": ("PIXEL_PALETTE",),
+                "image": ("IMAGE",),
+                "color": ("PIXEL_COLOR",),
+                "metric": (list(SIMILARITY_METRICS), {
+                    "default": "chamfer",
+                    "tooltip": "chamfer: écart moyen, hausdorff: pire écart, emd: signatures (le plus rapide)"
+                }),
+                "tolerance": ("FLOAT", {
+                    "default": 2.3,
+                    "min": 0.0,
+                    "max": 100.0,
+                    "step": 0.1,
+                    "tooltip": "Requête color: ΔE76 maximal entre la couleur et la palette"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("PIXEL_PALETTE", "STRING")
+    RETURN_NAMES = ("best_palette", "results")
+    FUNCTION = "search_library"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("PaletteLibrarySearch")
+    def search_library(self, directory, query="palette", top_k=10, palette=None, image=None,
+                       color=None, metric="chamfer", tolerance=2.3):
+        """
+        Retourne la meilleure palette et le classement (une ligne par palette)
+        """
+        profiler = get_profiler()
+        try:
+            directory = resolve_inside(folder_paths.get_input_directory(), directory)
+            if not os.path.isdir(directory):
+                print(f"[PaletteLibrarySearch] ✗ Répertoire introuvable: {directory}")
+                return (PixelPalette(), f"# Erreur: répertoire introuvable: {directory}")
+            
+            with profiler.stage("parse"):
+                library = PaletteLibrary.from_directory(directory, index_path=default_index_path(directory))
+            profiler.count("palettes", len(library))
+            
+            if query == "color":
+                if color is None:
+                    return (PixelPalette(), "# Erreur: entrée color manquante")
+                results = library.contains([color.rgb_tuple], tolerance, top_k)
+            elif query == "image":
+                if image is None:
+                    return (PixelPalette(), "# Erreur: entrée image manquante")
+                with profiler.stage("decode"):
+                    pixels = ensure_rgb(to_uint8(image[0].cpu().numpy()))
+                colors, weights = image_query(pixels)
+                results = library.search(colors, top_k, metric, weights)
+            else:
+                if not isinstance(palette, PixelPalette) or palette.is_empty:
+                    return (PixelPalette(), "# Erreur: palette manquante ou vide")
+                results = library.search(palette.to_array(), top_k, metric, palette.counts())
+            
+            if not results:
+                return (PixelPalette(), "# Aucune palette trouvée")
+            
+            profiler.log("PaletteLibrarySearch", f"✓ {len(results)} palettes trouvées "
+                         f"parmi {len(library)} (meilleure: '{library.names[results[0][0]]}')")
+            return (library.palette(results[0][0]), library.describe(results))
+            
+        except Exception as e:
+            print(f"[PaletteLibrarySearch] ✗ Erreur: {e}")
+            return (PixelPalette(), f"# Erreur: {e}")
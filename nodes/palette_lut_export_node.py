@@ -0,0 +1,87 @@
+# nodes/palette_lut_export_node.py
+import folder_paths
+from ..lib.pixel_palette import PixelPalette
+from ..lib.file_paths    import next_numbered_path
+from ..lib.color_lut     import LUT_FORMATS, CUBE_SIZES, HALD_LEVELS, palette_lut, hald_size, save_color_lut
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class PaletteLutExportNode:
+    """
+    Nœud ComfyUI pour cuire la projection sur une palette (plus proche couleur, sans
+    tramage) dans une LUT 3D .cube ou une Hald CLUT PNG, appliquées ensuite sur GPU par
+    d'autres logiciels
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "palette": ("PIXEL_PALETTE",),
+                "filename_prefix": ("STRING", {"default": "palette_lut"}),
+                "format_type": (list(LUT_FORMATS), {"default": "cube"}),
+            },
+            "optional": {
+                "cube_size": ([str(size) for size in CUBE_SIZES], {
+                    "default": "33",
+                    "tooltip": "Points par axe du .cube"
+                }),
+                "hald_level": ("INT", {
+                    "default": 8,
+                    "min": HALD_LEVELS[0],
+                    "max": HALD_LEVELS[-1],
+                    "step": 1,
+                    "tooltip": "Niveau de la Hald CLUT: niveau² points par axe (8: 64³, image 512x512)"
+                }),
+                "metric": (["lab", "rgb"], {
+                    "default": "lab",
+                    "tooltip": "Distance de la couleur la plus proche (lab: ΔE76)"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("STRING", "IMAGE")
+    RETURN_NAMES = ("file_path", "preview")
+    FUNCTION = "export_lut"
+    OUTPUT_NODE = True
+    CATEGORY = "pixel_art/io"
+
+    @profiled("PaletteLutExport")
+    def export_lut(self, palette, filename_prefix="palette_lut", format_type="cube", cube_size="33",
+                   hald_level=8, metric="lab"):
+        """
+        Enregistre la LUT sous <sortie>/<prefix>_<compteur>.<cube|png>; l'aperçu montre la
+        grille en tranches de bleu côte à côte
+        """
+        if not isinstance(palette, PixelPalette) or palette.is_empty:
+            print("[PaletteLutExport] ✗ Erreur: Palette vide ou invalide")
+            error_img = np.full((1, 16, 16, 3), [255, 0, 0], dtype=np.uint8)
+            return ("", torch.from_numpy(error_img).float() / 255.0)
+
+        profiler = get_profiler()
+        try:
+            size = int(cube_size) if format_type == "cube" else hald_size(hald_level)
+            with profiler.stage("render"):
+                table = palette_lut(palette.to_array(), size, metric)
+            profiler.count("lattice_points", len(table))
+
+            path = next_numbered_path(folder_paths.get_output_directory(), filename_prefix.strip() or "palette_lut",
+                                      ".cube" if format_type == "cube" else ".png")
+            with profiler.stage("write"):
+                save_color_lut(table, path, format_type, size, title=palette.name)
+
+            # Tranche b: image [vert, rouge]; tranches côte à côte
+            slices = table.reshape(size, size, size, 3).transpose(1, 0, 2, 3).reshape(size, size * size, 3)
+            preview = torch.from_numpy(slices.astype(np.float32)[None] / 255.0)
+
+            profiler.log("PaletteLutExport", f"✓ LUT {size}³ ({format_type}, {metric}) de "
+                                             f"'{palette.name}' ({palette.color_count} couleurs) -> {path}")
+            return (str(path), preview)
+
+        except Exception as e:
+            print(f"[PaletteLutExport] ✗ Erreur: {e}")
+            error_img = np.full((1, 16, 16, 3), [255, 0, 0], dtype=np.uint8)
+            return ("", torch.from_numpy(error_img).float() / 255.0)
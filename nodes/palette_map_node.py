@@ -0,0 +1,120 @@
+# nodes/palette_map_node.py
+from ..lib.pixel_palette import PixelPalette
+from ..lib.pixel_array   import to_uint8, ensure_rgb
+from ..lib.frame_remap   import DITHER_MODES, DEFAULT_BLOCK, IncrementalRemapper
+from ..lib.cache         import fingerprint, get_result_cache, make_key
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class PaletteMapNode:
+    """
+    Nœud de projection sur une palette, avec tramage ordonné: un batch est traité comme
+    une séquence (vidéo, animation), seuls les blocs modifiés d'une image à l'autre sont
+    recalculés en mode incrémental
+    """
+
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE", {
+                    "tooltip": "Image ou séquence d'images (batch, dans l'ordre)"
+                }),
+                "palette": ("PIXEL_PALETTE",),
+                "dither": (list(DITHER_MODES), {
+                    "default": "none",
+                    "tooltip": "Tramage ordonné (matrice de Bayer 2x2, 4x4 ou 8x8)"
+                }),
+                "dither_strength": ("FLOAT", {
+                    "default": 32.0,
+                    "min": 0.0,
+                    "max": 255.0,
+                    "step": 1.0,
+                    "tooltip": "Amplitude du tramage (niveaux RGB)"
+                }),
+                "metric": (["lab", "rgb"], {
+                    "default": "lab",
+                    "tooltip": "Distance de la couleur la plus proche (lab: ΔE76)"
+                }),
+            },
+            "optional": {
+                "incremental": ("BOOLEAN", {
+                    "default": True,
+                    "tooltip": "Ne recalcule que les blocs modifiés depuis l'image précédente"
+                }),
+                "block": ("INT", {
+                    "default": DEFAULT_BLOCK,
+                    "min": 1,
+                    "max": 256,
+                    "step": 1,
+                    "tooltip": "Taille des blocs comparés (pixels)"
+                }),
+                "tolerance": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 255,
+                    "step": 1,
+                    "tooltip": "Écart par canal ignoré (bruit vidéo): supprime le scintillement du tramage"
+                }),
+            }
+        }
+
+    RETURN_TYPES = ("IMAGE", "STRING")
+    RETURN_NAMES = ("image", "report")
+    FUNCTION = "map_frames"
+    CATEGORY = "pixel_art/palette"
+
+    @profiled("PaletteMap")
+    def map_frames(self, image, palette, dither, dither_strength, metric,
+                   incremental=True, block=DEFAULT_BLOCK, tolerance=0):
+        """
+        Retourne le batch projeté sur la palette et le rapport de la séquence
+        (part recalculée, temps, accélération par rapport au calcul complet)
+        """
+        if not isinstance(palette, PixelPalette) or palette.is_empty:
+            print("[PaletteMap] ✗ Erreur: Palette vide ou invalide")
+            return (image, "# Erreur: Palette vide ou invalide")
+
+        cache = get_result_cache()
+        profiler = get_profiler()
+        try:
+            # Résultat déjà calculé pour ces images, cette palette et ces paramètres
+            cache_key = make_key("PaletteMap", fingerprint(image), palette=palette.content_hash,
+                                 dither=dither, dither_strength=dither_strength, metric=metric,
+                                 incremental=incremental, block=block, tolerance=tolerance)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                profiler.count("cache_hits")
+                return cached
+
+            with profiler.stage("decode"):
+                frames = ensure_rgb(to_uint8(image.cpu().numpy()))
+                bits = 6
+                lut = palette.index_lut(metric, bits)
+                colors = palette.to_array().astype(np.float32) / 255.0
+
+            remapper = IncrementalRemapper(palette.to_array(), lut, bits, dither, dither_strength, block, tolerance)
+            output = np.empty(frames.shape, dtype=np.float32)
+            with profiler.stage("render"):
+                for f, frame in enumerate(frames):
+                    if not incremental:
+                        remapper.reset()
+                    output[f] = colors[remapper.remap(frame)]
+            profiler.count("frames", len(frames))
+
+            stats = remapper.report()
+            report = (f"{stats['frames']} image(s) {frames.shape[2]}x{frames.shape[1]}, "
+                      f"tramage: {dither}, recalculé: {stats['recomputed_ratio']:.1%}, "
+                      f"{stats['seconds'] * 1000:.1f} ms (complet estimé: {stats['full_seconds'] * 1000:.1f} ms, "
+                      f"x{stats['speedup']:.2f})")
+            profiler.log("PaletteMap", f"✓ {report}")
+            result = (torch.from_numpy(output), report)
+            cache.put(cache_key, result)
+            return result
+
+        except Exception as e:
+            print(f"[PaletteMap] ✗ Erreur: {e}")
+            return (image, f"# Erreur: {e}")
@@ -0,0 +1,97 @@
+# nodes/palette_rank_node.py
+import folder_paths
+from ..lib.pixel_palette   import PixelPalette
+from ..lib.file_paths      import resolve_inside
+from ..lib.pixel_array     import to_uint8, ensure_rgb
+from ..lib.palette_library import PaletteLibrary, default_index_path
+from ..lib.palette_ranking import RANKING_METRICS, ranking_sample, rank_palettes
+from ..lib.profiling       import get_profiler, profiled
+
+class PaletteRankNode:
+    """
+    Classe des palettes candidates selon l'erreur de quantification d'une image
+    Candidates: les palettes connectées (une liste est acceptée) et celles d'un répertoire
+    """
+    
+    INPUT_IS_LIST = True
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "metric": (list(RANKING_METRICS), {
+                    "default": "delta_e",
+                    "tooltip": "delta_e: ΔE76 moyen (plus bas = meilleur), psnr: en dB (plus haut = meilleur)"
+                }),
+                "top_k": ("INT", {
+                    "default": 10,
+                    "min": 1,
+                    "max": 1000,
+                    "step": 1,
+                    "display": "number"
+                }),
+            },
+            "optional": {
+                "palettes": ("PIXEL_PALETTE",),
+                "directory": ("STRING", {
+                    "default": "",
+                    "tooltip": "Répertoire de palettes candidates (relatif au dossier input de ComfyUI)"
+                }),
+                "sample_size": ("INT", {
+                    "default": 65536,
+                    "min": 1024,
+                    "max": 1048576,
+                    "step": 1024,
+                    "tooltip": "Pixels de l'échantillon partagé par toutes les palettes"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("PIXEL_PALETTE", "STRING")
+    RETURN_NAMES = ("best_palette", "ranking")
+    FUNCTION = "rank_palettes"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("PaletteRank")
+    def rank_palettes(self, image, metric, top_k, palettes=None, directory=None, sample_size=None):
+        """
+        Retourne la meilleure palette et les top_k premières avec leur score
+        (INPUT_IS_LIST: chaque entrée arrive sous forme de liste)
+        """
+        metric      = metric[0]
+        top_k       = top_k[0]
+        directory   = directory[0] if directory else ""
+        sample_size = sample_size[0] if sample_size else 65536
+        candidates  = [p for p in (palettes or []) if isinstance(p, PixelPalette) and not p.is_empty]
+        
+        profiler = get_profiler()
+        try:
+            libraries = [PaletteLibrary.from_palettes(candidates)]
+            if directory.strip():
+                directory = resolve_inside(folder_paths.get_input_directory(), directory)
+                with profiler.stage("parse"):
+                    libraries.append(PaletteLibrary.from_directory(directory, index_path=default_index_path(directory)))
+            library = PaletteLibrary.concatenate(libraries)
+            if len(library) == 0:
+                return (PixelPalette(), "# Erreur: aucune palette candidate")
+            profiler.count("palettes", len(library))
+            
+            with profiler.stage("decode"):
+                sample = ranking_sample(ensure_rgb(to_uint8(image[0][0].cpu().numpy())), sample_size)
+            
+            ranking = rank_palettes(library, sample, metric, keep=top_k)
+            unit = "dB" if metric == "psnr" else "ΔE"
+            lines = [f"{rank}. {library.names[entry['index']]}: {entry['score']:.2f} {unit}"
+                     + ("" if entry['pixels'] == len(sample) else f" (écartée après {entry['pixels']} pixels)")
+                     for rank, entry in enumerate(ranking[:top_k], 1)]
+            
+            best = ranking[0]['index']
+            profiler.log("PaletteRank", f"✓ {len(library)} palettes classées, meilleure: "
+                         f"'{library.names[best]}' ({ranking[0]['score']:.2f} {unit})")
+            best_palette = candidates[best] if best < len(candidates) else library.palette(best)
+            return (best_palette, "\n".join(lines))
+            
+        except Exception as e:
+            print(f"[PaletteRank] ✗ Erreur: {e}")
+            return (PixelPalette(), f"# Erreur: {e}")
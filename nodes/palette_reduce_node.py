@@ -0,0 +1,82 @@
+# nodes/palette_reduce_node.py
+from ..lib.pixel_palette  import PixelPalette
+from ..lib.pixel_array    import to_uint8, ensure_rgb
+from ..lib.palette_reduce import REDUCE_REPRESENTATIVES
+from ..lib.palette_dedupe import NAME_MODES
+from ..lib.profiling      import get_profiler, profiled
+
+class PaletteReduceNode:
+    """
+    Nœud de réduction de palette à N couleurs (fusion dans Lab, k-means optionnel)
+    Avec une image, chaque couleur pèse le nombre de pixels qui l'utilisent
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "palette": ("PIXEL_PALETTE",),
+                "colors": ("INT", {
+                    "default": 16,
+                    "min": 1,
+                    "max": 256,
+                    "step": 1,
+                    "display": "number"
+                }),
+            },
+            "optional": {
+                "image": ("IMAGE", {
+                    "tooltip": "Pondère chaque couleur par son nombre de pixels dans l'image"
+                }),
+                "refine": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 50,
+                    "step": 1,
+                    "tooltip": "Itérations k-means après la fusion (0: aucune)"
+                }),
+                "representative": (list(REDUCE_REPRESENTATIVES), {
+                    "default": "mean",
+                    "tooltip": "mean: centre du groupe, nearest / most_frequent: couleur d'origine"
+                }),
+                "names": (list(NAME_MODES), {"default": "representative"}),
+            }
+        }
+    
+    RETURN_TYPES = ("PIXEL_PALETTE", "STRING")
+    RETURN_NAMES = ("palette", "report")
+    FUNCTION = "reduce_palette"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("PaletteReduce")
+    def reduce_palette(self, palette, colors=16, image=None, refine=0, representative="mean",
+                       names="representative"):
+        """
+        Retourne la palette réduite et l'erreur introduite (ΔE76 moyen et maximal)
+        """
+        if not isinstance(palette, PixelPalette):
+            print("[PaletteReduce] ✗ Erreur: Objet palette invalide")
+            return (PixelPalette(), "# Erreur: Objet palette invalide")
+        
+        profiler = get_profiler()
+        try:
+            source = palette
+            if image is not None and not palette.is_empty:
+                with profiler.stage("decode"):
+                    pixels = ensure_rgb(to_uint8(image.cpu().numpy()))
+                profiler.count("pixels", pixels.size // 3)
+                source = palette.count_usage(pixels)
+            
+            result, stats = source.reduce(colors, refine, representative, names)
+            report = (f"{stats['colors_before']} -> {stats['colors_after']} couleurs\n"
+                      f"ΔE76 moyen: {stats['mean_error']:.2f}"
+                      f"{' (pondéré par les pixels)' if image is not None else ''}\n"
+                      f"ΔE76 max: {stats['max_error']:.2f}")
+            
+            profiler.log("PaletteReduce", f"✓ Palette réduite: '{palette.name}' "
+                         f"({stats['colors_before']} -> {stats['colors_after']} couleurs)")
+            return (result, report)
+            
+        except Exception as e:
+            print(f"[PaletteReduce] ✗ Erreur: {e}")
+            return (palette, f"# Erreur: {e}")
@@ -0,0 +1,91 @@
+# nodes/palette_sort_node.py
+from ..lib.pixel_palette import PixelPalette
+from ..lib.palette_sort  import SORT_MODES
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+from .pixel_palette_extractor_node import PixelPaletteExtractorNode
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class PaletteSortNode:
+    """
+    Nœud de tri de palette: retourne la palette triée et son aperçu
+    (même rendu que PixelPaletteExtractor)
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "palette": ("PIXEL_PALETTE",),
+                "mode": (list(SORT_MODES), {
+                    "default": "oklch",
+                    "tooltip": "oklch: gris puis teintes, hilbert: couleurs voisines côte à côte, "
+                               "frequency: les plus fréquentes d'abord"
+                }),
+                "reverse": ("BOOLEAN", {"default": False}),
+            },
+            "optional": {
+                "palette_width": ("INT", {
+                    "default": 16,
+                    "min": 1,
+                    "max": 32,
+                    "step": 1,
+                    "display": "number"
+                }),
+                "color_size": ("INT", {
+                    "default": 32,
+                    "min": 8,
+                    "max": 128,
+                    "step": 4,
+                    "display": "number"
+                }),
+                "show_indices": ("BOOLEAN", {"default": False}),
+                "font_size": ("INT", {
+                    "default": 10,
+                    "min": 6,
+                    "max": 24,
+                    "step": 1,
+                    "display": "number"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("PIXEL_PALETTE", "IMAGE")
+    RETURN_NAMES = ("palette", "image")
+    FUNCTION = "sort_palette"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("PaletteSort")
+    def sort_palette(self, palette, mode="oklch", reverse=False, palette_width=16, color_size=32,
+                     show_indices=False, font_size=10):
+        """
+        Trie une copie de la palette (l'entrée n'est pas modifiée) et en dessine l'aperçu
+        """
+        if not isinstance(palette, PixelPalette):
+            print("[PaletteSort] ✗ Erreur: Objet palette invalide")
+            palette = PixelPalette()
+        
+        profiler = get_profiler()
+        try:
+            result = palette.with_colors(list(palette.colors), palette.counts())
+            result.sort_by(mode, reverse)
+            
+            with profiler.stage("render"):
+                colors = [(c.r, c.g, c.b, i) for i, c in enumerate(result.colors)]
+                image = PixelPaletteExtractorNode().create_palette_image(
+                    colors, palette_width, color_size, show_indices, font_size)
+            
+            with profiler.stage("convert"):
+                image_tensor = torch.from_numpy(np.array(image).astype(np.float32) / 255.0).unsqueeze(0)
+            
+            profiler.log("PaletteSort", f"✓ Palette triée ({mode}): '{palette.name}' "
+                         f"({result.color_count} couleurs)")
+            return (result, image_tensor)
+            
+        except Exception as e:
+            print(f"[PaletteSort] ✗ Erreur: {e}")
+            error_image = np.zeros((1, color_size, color_size, 3), dtype=np.float32)
+            error_image[..., 0] = 1.0
+            return (palette, torch.from_numpy(error_image))
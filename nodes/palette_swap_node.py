@@ -0,0 +1,71 @@
+# nodes/palette_swap_node.py
+from ..lib.pixel_palette import PixelPalette
+from ..lib.pixel_array   import to_uint8, ensure_rgb
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class PaletteSwapNode:
+    """
+    Nœud d'échange de palette: chaque couleur source reçoit une couleur cible distincte
+    (somme des ΔE minimale), appliquée à tout le batch par table d'index
+    Toute la logique est dans PixelPalette (assign_to, swap_pixels)
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "source_palette": ("PIXEL_PALETTE",),
+                "target_palette": ("PIXEL_PALETTE",),
+            },
+            "optional": {
+                "metric": (["lab", "rgb"], {
+                    "default": "lab",
+                    "tooltip": "Distance des pixels hors palette source vers leur couleur la plus proche"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("IMAGE", "PIXEL_PALETTE", "STRING")
+    RETURN_NAMES = ("image", "matched_palette", "mapping")
+    FUNCTION = "swap_palette"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("PaletteSwap")
+    def swap_palette(self, image, source_palette, target_palette, metric="lab"):
+        """
+        Retourne le batch recoloré, la palette cible dans l'ordre de la source et la correspondance
+        """
+        if not isinstance(source_palette, PixelPalette) or not isinstance(target_palette, PixelPalette):
+            print("[PaletteSwap] ✗ Erreur: Objet palette invalide")
+            return (image, PixelPalette(), "# Erreur: Objet palette invalide")
+        
+        profiler = get_profiler()
+        try:
+            with profiler.stage("extract"):
+                matched, result = source_palette.assign_to(target_palette)
+            
+            with profiler.stage("decode"):
+                pixels = ensure_rgb(to_uint8(image.cpu().numpy()))
+            profiler.count("pixels", pixels.size // 3)
+            
+            with profiler.stage("render"):
+                swapped = source_palette.swap_pixels(pixels, matched, metric)
+                image_tensor = torch.from_numpy(swapped.astype(np.float32) / 255.0)
+            
+            lines = [f"{i}: {source.hex} -> {target.hex} (ΔE {distance:.2f})"
+                     for i, (source, target, distance)
+                     in enumerate(zip(source_palette.colors, matched.colors, result['distances'].tolist()))]
+            lines.append(f"# total ΔE: {result['total']:.2f}, moyen: {result['mean_error']:.2f}, "
+                         f"max: {result['max_error']:.2f}")
+            profiler.log("PaletteSwap", f"✓ {source_palette.color_count} -> {target_palette.color_count} "
+                         f"couleurs, ΔE moyen {result['mean_error']:.2f}")
+            return (image_tensor, matched, "\n".join(lines))
+            
+        except Exception as e:
+            print(f"[PaletteSwap] ✗ Erreur: {e}")
+            return (image, PixelPalette(), f"# Erreur: {e}")
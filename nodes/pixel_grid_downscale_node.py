@@ -0,0 +1,102 @@
+# nodes/pixel_grid_downscale_node.py
+from ..lib.pixel_palette import PixelPalette
+from ..lib.pixel_array   import to_uint8, ensure_rgb
+from ..lib.pixel_grid    import DEFAULT_MARGIN, DEFAULT_VOTE_BITS, detect_grid, block_mode
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class PixelGridDownscaleNode:
+    """
+    Nœud de nettoyage de faux pixel art: détecte la grille (pas non entier et décalage),
+    puis réduit chaque case à sa couleur majoritaire, éventuellement ramenée à une palette
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE",),
+            },
+            "optional": {
+                "palette": ("PIXEL_PALETTE", {
+                    "tooltip": "Ramène chaque case à la couleur la plus proche de la palette"
+                }),
+                "pitch": ("FLOAT", {
+                    "default": 0.0,
+                    "min": 0.0,
+                    "max": 64.0,
+                    "step": 0.01,
+                    "tooltip": "Taille d'une case en pixels (0: détection automatique)"
+                }),
+                "margin": ("FLOAT", {
+                    "default": DEFAULT_MARGIN,
+                    "min": 0.0,
+                    "max": 0.45,
+                    "step": 0.05,
+                    "tooltip": "Part du bord de chaque case ignorée lors du vote (anti-aliasing)"
+                }),
+                "vote_bits": ("INT", {
+                    "default": DEFAULT_VOTE_BITS,
+                    "min": 3,
+                    "max": 8,
+                    "step": 1,
+                    "tooltip": "Bits par canal des couleurs comparées (8: vote exact, moins: tolère le bruit)"
+                }),
+                "upscale": ("INT", {
+                    "default": 1,
+                    "min": 1,
+                    "max": 32,
+                    "step": 1,
+                    "tooltip": "Agrandissement entier du résultat (plus proche voisin)"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("IMAGE", "STRING")
+    RETURN_NAMES = ("image", "grid")
+    FUNCTION = "downscale"
+    CATEGORY = "pixel_art/image"
+    
+    @profiled("PixelGridDownscale")
+    def downscale(self, image, palette=None, pitch=0.0, margin=DEFAULT_MARGIN,
+                  vote_bits=DEFAULT_VOTE_BITS, upscale=1):
+        """
+        Retourne le batch réduit (une même grille pour tout le batch) et la grille détectée
+        """
+        profiler = get_profiler()
+        try:
+            with profiler.stage("decode"):
+                pixels = ensure_rgb(to_uint8(image.cpu().numpy()))
+            profiler.count("pixels", pixels.size // 3)
+            
+            with profiler.stage("extract"):
+                grid = detect_grid(pixels)
+                if pitch > 0:
+                    # Pas imposé: on garde la phase détectée, ramenée au nouveau pas
+                    grid.update(pitch_x=pitch, pitch_y=pitch,
+                                phase_x=grid["phase_x"] % pitch, phase_y=grid["phase_y"] % pitch)
+                result = block_mode(pixels, grid, margin, vote_bits)
+            
+            if isinstance(palette, PixelPalette) and not palette.is_empty:
+                with profiler.stage("convert"):
+                    result = palette.to_array()[palette.index_pixels(result, "lab")]
+            
+            with profiler.stage("render"):
+                if upscale > 1:
+                    result = np.repeat(np.repeat(result, upscale, axis=1), upscale, axis=2)
+                image_tensor = torch.from_numpy(result.astype(np.float32) / 255.0)
+            
+            report = (f"pas: {grid['pitch_x']:.3f} x {grid['pitch_y']:.3f} px, "
+                      f"décalage: {grid['phase_x']:.2f}, {grid['phase_y']:.2f} px\n"
+                      f"cases: {result.shape[2] // upscale} x {result.shape[1] // upscale}, "
+                      f"confiance: {grid['confidence']:.2f}")
+            profiler.log("PixelGridDownscale", f"✓ Grille {grid['pitch_x']:.2f} x {grid['pitch_y']:.2f} px "
+                         f"-> {result.shape[2] // upscale} x {result.shape[1] // upscale}")
+            return (image_tensor, report)
+            
+        except Exception as e:
+            print(f"[PixelGridDownscale] ✗ Erreur: {e}")
+            return (image, f"# Erreur: {e}")
@@ -1,7 +1,17 @@
-import torch
-import numpy as np
-from PIL import Image, ImageDraw, ImageFont
 import os
+from ..lib.pixel_array    import to_uint8, pack_rgb, unpack_rgb
+from ..lib.pixel_sampling import stratified_sample, estimate_palette_error
+from ..lib.parallel       import BatchScheduler
+from ..lib.cache          import fingerprint, get_result_cache, make_key
+from ..lib.lazy_import    import lazy_import
+from ..lib.profiling      import get_profiler, profiled
+
+# Dépendances lourdes chargées à la première exécution du node (démarrage de ComfyUI plus rapide)
+torch     = lazy_import("torch")
+np        = lazy_import("numpy")
+Image     = lazy_import("PIL.Image")
+ImageDraw = lazy_import("PIL.ImageDraw")
+ImageFont = lazy_import("PIL.ImageFont")
 
 class PixelPaletteExtractorNode:
     """
@@ -36,15 +46,37 @@ class PixelPaletteExtractorNode:
                     "step": 1,
                     "display": "number"
                 })
+            },
+            "optional": {
+                "workers": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 64,
+                    "step": 1,
+                    "tooltip": "Nombre de workers (0 = auto, voir PIXEL_PALETTE_WORKERS)"
+                }),
+                "mode": (["exact", "approximate"], {
+                    "default": "exact",
+                    "tooltip": "approximate: extraction sur un échantillon stratifié de pixels"
+                }),
+                "sample_size": ("INT", {
+                    "default": 65536,
+                    "min": 1024,
+                    "max": 4194304,
+                    "step": 1024,
+                    "tooltip": "Taille de l'échantillon (mode approximate); image plus petite = passe exacte"
+                }),
             }
         }
     
-    RETURN_TYPES = ("IMAGE",)
-    RETURN_NAMES = ("palette_image",)
+    RETURN_TYPES = ("IMAGE", "STRING")
+    RETURN_NAMES = ("palette_image", "report")
     FUNCTION = "extract_palette"
     CATEGORY = "image/color"
     
-    def extract_palette(self, image, palette_width, color_size, show_indices, font_size):
+    @profiled("PixelPaletteExtractor")
+    def extract_palette(self, image, palette_width, color_size, show_indices, font_size, workers=0,
+                        mode="exact", sample_size=65536):
         """
         Extrait la palette de couleurs de l'image et génère une image de palette
         
@@ -54,9 +86,25 @@ class PixelPaletteExtractorNode:
             color_size: Taille de chaque carré de couleur en pixels
             show_indices: Afficher les index des couleurs
             font_size: Taille de la police pour les index
+            workers: Nombre de workers du pool partagé (0 = auto)
+            mode: "exact" (tous les pixels) ou "approximate" (échantillon stratifié)
+            sample_size: Nombre de pixels échantillonnés en mode approximate
         """
+        scheduler = BatchScheduler(workers=workers)
+        cache = get_result_cache()
+        profiler = get_profiler()
         
         try:
+            # Résultat déjà calculé pour ces pixels et ces paramètres
+            cache_key = make_key("PixelPaletteExtractor", fingerprint(image),
+                                 palette_width=palette_width, color_size=color_size,
+                                 show_indices=show_indices, font_size=font_size,
+                                 mode=mode, sample_size=sample_size)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                profiler.count("cache_hits")
+                return cached
+            
             # Convertir le tensor ComfyUI en PIL Image
             # ComfyUI utilise le format [batch, height, width, channels] avec valeurs 0-1
             if len(image.shape) == 4:
@@ -64,37 +112,56 @@ class PixelPaletteExtractorNode:
             else:
                 img_tensor = image
                 
-            # Convertir de [0,1] à [0,255]
-            img_np = (img_tensor.cpu().numpy() * 255).astype(np.uint8)
+            img_float = img_tensor.cpu().numpy()
+            height, width = img_float.shape[:2]
+            approximate = mode == "approximate" and height * width > 2 * sample_size
+            profiler.count("pixels", height * width)
             
-            # Créer l'image PIL en RGB
-            if len(img_np.shape) == 3 and img_np.shape[2] == 3:
-                img_pil = Image.fromarray(img_np, 'RGB')
-            elif len(img_np.shape) == 3 and img_np.shape[2] == 4:
-                img_pil = Image.fromarray(img_np, 'RGBA').convert('RGB')
-            else:
-                # Fallback pour les images en niveaux de gris
-                if len(img_np.shape) == 2:
-                    img_pil = Image.fromarray(img_np, 'L').convert('RGB')
+            with profiler.stage("decode"):
+                if approximate:
+                    # Échantillon stratifié, converti seul en [0,255] (une ligne de pixels)
+                    img_np = to_uint8(stratified_sample(img_float, sample_size))[None, ...]
+                    if img_np.shape[-1] == 1:
+                        img_np = img_np[..., 0]
                 else:
-                    img_pil = Image.fromarray(img_np[:,:,0], 'L').convert('RGB')
+                    # Convertir de [0,1] à [0,255], par bandes de lignes
+                    img_np = np.concatenate(scheduler.map_tiles(to_uint8, img_float), axis=0)
+                
+                # Créer l'image PIL en RGB
+                if len(img_np.shape) == 3 and img_np.shape[2] == 3:
+                    img_pil = Image.fromarray(img_np, 'RGB')
+                elif len(img_np.shape) == 3 and img_np.shape[2] == 4:
+                    img_pil = Image.fromarray(img_np, 'RGBA').convert('RGB')
+                else:
+                    # Fallback pour les images en niveaux de gris
+                    if len(img_np.shape) == 2:
+                        img_pil = Image.fromarray(img_np, 'L').convert('RGB')
+                    else:
+                        img_pil = Image.fromarray(img_np[:,:,0], 'L').convert('RGB')
             
             # Extraire les couleurs uniques
-            colors = self.extract_unique_colors(img_pil)
+            with profiler.stage("extract"):
+                colors = self.extract_unique_colors(img_pil, scheduler)
+            profiler.count("colors", len(colors))
             
             # Créer l'image de palette
-            palette_img = self.create_palette_image(colors, palette_width, color_size, show_indices, font_size)
+            with profiler.stage("render"):
+                palette_img = self.create_palette_image(colors, palette_width, color_size, show_indices,
+                                                        font_size, scheduler)
             
             # Convertir l'image PIL en tensor ComfyUI
-            palette_array = np.array(palette_img).astype(np.float32) / 255.0
-            
-            # S'assurer que le tensor a la bonne forme [batch, height, width, channels]
-            if len(palette_array.shape) == 3:
-                palette_tensor = torch.from_numpy(palette_array).unsqueeze(0)
-            else:
-                palette_tensor = torch.from_numpy(palette_array)
+            with profiler.stage("convert"):
+                palette_array = np.array(palette_img).astype(np.float32) / 255.0
+                
+                # S'assurer que le tensor a la bonne forme [batch, height, width, channels]
+                if len(palette_array.shape) == 3:
+                    palette_tensor = torch.from_numpy(palette_array).unsqueeze(0)
+                else:
+                    palette_tensor = torch.from_numpy(palette_array)
             
-            return (palette_tensor,)
+            result = (palette_tensor, self._build_report(img_pil, colors, approximate, height * width))
+            cache.put(cache_key, result)
+            return result
             
         except Exception as e:
             print(f"Erreur dans PixelPaletteExtractor: {e}")
@@ -102,10 +169,26 @@ class PixelPaletteExtractorNode:
             error_img = Image.new('RGB', (color_size, color_size), (255, 0, 0))
             error_array = np.array(error_img).astype(np.float32) / 255.0
             error_tensor = torch.from_numpy(error_array).unsqueeze(0)
-            return (error_tensor,)
+            return (error_tensor, f"# Erreur: {e}")
+    
+    def _build_report(self, img_pil, colors, approximate, pixel_count):
+        """Résumé de l'extraction; en mode approximatif, erreur estimée sur l'échantillon"""
+        if not approximate:
+            return f"exact: {len(colors)} couleurs sur {pixel_count} pixels"
+        
+        sample = np.array(img_pil).reshape(-1, 3)
+        palette_rgb = np.array([(r, g, b) for r, g, b, _ in colors], dtype=np.uint8)
+        estimate = estimate_palette_error(sample, palette_rgb)
+        return "\n".join([
+            f"approximate: {len(colors)} couleurs, {estimate['samples']}/{pixel_count} pixels échantillonnés",
+            f"erreur moyenne (RGB): {estimate['mean_error']:.2f} ± {estimate['error_bound']:.2f} (IC 95 %)",
+            f"erreur max (échantillon): {estimate['max_error']:.2f}",
+            f"couverture exacte: {estimate['coverage']:.1%} ± {estimate['coverage_bound']:.1%}",
+        ])
     
-    def extract_unique_colors(self, img_pil):
+    def extract_unique_colors(self, img_pil, scheduler=None):
         """Extrait les couleurs uniques de l'image"""
+        scheduler = scheduler or BatchScheduler(workers=1)
         colors = []
         
         try:
@@ -116,7 +199,7 @@ class PixelPaletteExtractorNode:
             if palette_data is not None:
                 # Extraire les couleurs uniques utilisées
                 img_array = np.array(img_palette)
-                unique_indices = np.unique(img_array)
+                unique_indices = self._used_indices(img_array, scheduler)
                 
                 for idx in unique_indices:
                     if idx * 3 + 2 < len(palette_data):
@@ -135,7 +218,7 @@ class PixelPaletteExtractorNode:
                 
                 if palette_data is not None:
                     img_array = np.array(img_quantized)
-                    unique_indices = np.unique(img_array)
+                    unique_indices = self._used_indices(img_array, scheduler)
                     
                     for idx in unique_indices:
                         if idx * 3 + 2 < len(palette_data):
@@ -149,17 +232,25 @@ class PixelPaletteExtractorNode:
             except:
                 # Méthode 3: Extraire les couleurs directement (fallback)
                 img_array = np.array(img_pil)
-                # Reshaper et obtenir les couleurs uniques
-                pixels = img_array.reshape(-1, 3)
-                unique_colors = np.unique(pixels, axis=0)
+                # Couleurs uniques par bande sur les pixels empaquetés, puis fusion
+                # (l'ordre uint32 0xRRGGBB est l'ordre lexicographique de np.unique(axis=0))
+                packed_parts = scheduler.map_tiles(lambda band: np.unique(pack_rgb(band)), img_array)
+                unique_colors = unpack_rgb(np.unique(np.concatenate(packed_parts)))
                 
                 for i, color in enumerate(unique_colors):
                     colors.append((int(color[0]), int(color[1]), int(color[2]), i))
         
         return colors
     
-    def create_palette_image(self, colors, palette_width, color_size, show_indices, font_size):
+    def _used_indices(self, img_array, scheduler):
+        """Index de palette utilisés: histogramme par bande, sommé ensuite"""
+        counts = scheduler.map_tiles(lambda band: np.bincount(band.ravel(), minlength=256), img_array)
+        return np.flatnonzero(np.sum(counts, axis=0))
+    
+    def create_palette_image(self, colors, palette_width, color_size, show_indices, font_size,
+                             scheduler=None):
         """Crée l'image de palette"""
+        scheduler = scheduler or BatchScheduler(workers=1)
         num_colors = len(colors)
         
         if num_colors == 0:
@@ -168,54 +259,54 @@ class PixelPaletteExtractorNode:
         
         palette_height = (num_colors + palette_width - 1) // palette_width
         
-        # Taille de l'image finale
-        img_width = palette_width * color_size
-        img_height = palette_height * color_size
+        # Grille des couleurs (fond blanc pour les cases vides), une ligne par rangée de cases
+        grid = np.full((palette_height * palette_width, 3), 255, dtype=np.uint8)
+        grid[:num_colors] = np.array([(r, g, b) for r, g, b, _ in colors], dtype=np.uint8)
+        grid = grid.reshape(palette_height, palette_width, 3)
+        
+        # Agrandissement des cases par bandes de rangées sur le pool de workers
+        def render_rows(rows):
+            return np.repeat(np.repeat(rows, color_size, axis=0), color_size, axis=1)
+        
+        bands = scheduler.map_tiles(render_rows, grid, min_rows=max(1, 256 // color_size))
+        palette_img = Image.fromarray(np.concatenate(bands, axis=0), 'RGB')
+        
+        if not show_indices:
+            return palette_img
         
-        # Créer l'image de palette
-        palette_img = Image.new('RGB', (img_width, img_height), (255, 255, 255))
         draw = ImageDraw.Draw(palette_img)
         
         # Charger une police si possible
-        font = None
-        if show_indices:
-            try:
-                font = ImageFont.load_default()
-            except:
-                font = None
+        try:
+            font = ImageFont.load_default()
+        except:
+            return palette_img
         
-        # Dessiner chaque couleur
-        for i, (r, g, b, idx) in enumerate(colors):
+        # Dessiner l'index de chaque couleur
+        for i, (_, _, _, idx) in enumerate(colors):
             row = i // palette_width
             col = i % palette_width
             
             x1 = col * color_size
             y1 = row * color_size
-            x2 = x1 + color_size
-            y2 = y1 + color_size
             
-            # Dessiner le carré de couleur
-            draw.rectangle([x1, y1, x2-1, y2-1], fill=(r, g, b))
+            text = str(idx)
             
-            # Ajouter l'index si demandé
-            if show_indices and font is not None:
-                text = str(idx)
-                
-                # Position du texte (centré approximativement)
-                text_x = x1 + 4
-                text_y = y1 + 4
-                
-                # Fond blanc pour le texte
-                try:
-                    bbox = draw.textbbox((text_x, text_y), text, font=font)
-                    draw.rectangle([bbox[0]-1, bbox[1]-1, bbox[2]+1, bbox[3]+1], 
-                                 fill=(255, 255, 255))
-                except:
-                    # Fallback si textbbox n'est pas disponible
-                    draw.rectangle([text_x-1, text_y-1, text_x+20, text_y+12], 
-                                 fill=(255, 255, 255))
-                
-                # Dessiner le texte en noir
-                draw.text((text_x, text_y), text, fill=(0, 0, 0), font=font)
+            # Position du texte (centré approximativement)
+            text_x = x1 + 4
+            text_y = y1 + 4
+            
+            # Fond blanc pour le texte
+            try:
+                bbox = draw.textbbox((text_x, text_y), text, font=font)
+                draw.rectangle([bbox[0]-1, bbox[1]-1, bbox[2]+1, bbox[3]+1], 
+                             fill=(255, 255, 255))
+            except:
+                # Fallback si textbbox n'est pas disponible
+                draw.rectangle([text_x-1, text_y-1, text_x+20, text_y+12], 
+                             fill=(255, 255, 255))
+            
+            # Dessiner le texte en noir
+            draw.text((text_x, text_y), text, fill=(0, 0, 0), font=font)
         
         return palette_img
@@ -0,0 +1,50 @@
+# nodes/profiling_report_node.py
+from ..lib.profiling import get_profiler
+
+class ProfilingReportNode:
+    """
+    Nœud de diagnostic: latences (p50/p95), étapes, compteurs et pic mémoire par type de node
+    Mesures actives seulement avec PIXEL_PALETTE_PROFILE (ex: timing,memory)
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {},
+            "optional": {
+                "cprofile_node": ("STRING", {
+                    "default": "",
+                    "tooltip": "Node dont afficher le profil cProfile (option cprofile), ex: PixelPaletteExtractor"
+                }),
+                "reset": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Remettre les mesures à zéro après lecture"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("report",)
+    FUNCTION = "get_report"
+    CATEGORY = "pixel_art/debug"
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """Toujours ré-exécuté: les mesures changent à chaque exécution"""
+        return float("NaN")
+    
+    def get_report(self, cprofile_node="", reset=False):
+        """
+        Retourne le rapport d'instrumentation sous forme de texte
+        """
+        profiler = get_profiler()
+        text = profiler.format_summary()
+        
+        if cprofile_node.strip():
+            stats = profiler.profile_stats(cprofile_node.strip())
+            text += "\n\n" + (stats or f"# Pas de profil cProfile pour {cprofile_node.strip()}")
+        
+        if reset:
+            profiler.reset()
+        
+        return (text,)
@@ -0,0 +1,56 @@
+
+# nodes/result_cache_stats_node.py
+from ..lib.cache import get_result_cache
+
+class ResultCacheStatsNode:
+    """
+    Nœud de diagnostic: statistiques du cache de résultats partagé
+    (hits, misses, octets occupés)
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {},
+            "optional": {
+                "clear_cache": ("BOOLEAN", {
+                    "default": False,
+                    "tooltip": "Vider le cache après lecture des statistiques"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING", "INT", "INT", "INT")
+    RETURN_NAMES = ("stats_text", "hits", "misses", "bytes_held")
+    FUNCTION = "get_stats"
+    CATEGORY = "pixel_art/debug"
+    
+    @classmethod
+    def IS_CHANGED(cls, **kwargs):
+        """Toujours ré-exécuté: les statistiques changent à chaque exécution"""
+        return float("NaN")
+    
+    def get_stats(self, clear_cache=False):
+        """
+        Retourne les statistiques du cache sous forme de texte et de valeurs
+        """
+        cache = get_result_cache()
+        stats = cache.stats()
+        
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0.0
+        
+        text = "\n".join([
+            "# Cache de résultats",
+            f"hits: {stats['hits']}",
+            f"misses: {stats['misses']}",
+            f"hit_rate: {hit_rate:.1%}",
+            f"entries: {stats['entries']}",
+            f"bytes_held: {stats['bytes_held']} / {stats['max_bytes']}",
+            f"evictions: {stats['evictions']}",
+        ])
+        
+        if clear_cache:
+            cache.clear()
+        
+        return (text, stats["hits"], stats["misses"], stats["bytes_held"])
@@ -0,0 +1,137 @@
+# nodes/retro_tile_palettes_node.py
+from ..lib.pixel_palette    import PixelPalette
+from ..lib.pixel_array      import to_uint8, ensure_rgb, pack_rgb, unpack_rgb
+from ..lib.tile_constraints import SHARED_MODES, HARDWARE_PRESETS, DEFAULT_ITERATIONS
+from ..lib.lazy_import      import lazy_import
+from ..lib.profiling        import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class RetroTilePalettesNode:
+    """
+    Nœud de contraintes matérielles rétro (NES, Game Boy Color, Master System...):
+    chaque tuile n'utilise que les couleurs d'une sous-palette parmi quelques-unes
+    Toute la logique est dans PixelPalette.constrain_tiles
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "preset": (["custom"] + list(HARDWARE_PRESETS), {
+                    "default": "nes",
+                    "tooltip": "Contraintes d'une console (custom: réglages ci-dessous)"
+                }),
+            },
+            "optional": {
+                "palette": ("PIXEL_PALETTE", {
+                    "tooltip": "Palette maître (ex: palette NES); à défaut, couleurs de l'image réduites à max_colors"
+                }),
+                "tile_width": ("INT", {"default": 8, "min": 1, "max": 256, "step": 1, "display": "number"}),
+                "tile_height": ("INT", {"default": 8, "min": 1, "max": 256, "step": 1, "display": "number"}),
+                "colors": ("INT", {
+                    "default": 4,
+                    "min": 1,
+                    "max": 256,
+                    "step": 1,
+                    "tooltip": "Couleurs par sous-palette (couleur commune comprise)"
+                }),
+                "palettes": ("INT", {
+                    "default": 4,
+                    "min": 1,
+                    "max": 64,
+                    "step": 1,
+                    "tooltip": "Nombre de sous-palettes"
+                }),
+                "shared": (list(SHARED_MODES), {
+                    "default": "none",
+                    "tooltip": "Couleur présente dans toutes les sous-palettes (fond)"
+                }),
+                "iterations": ("INT", {
+                    "default": DEFAULT_ITERATIONS,
+                    "min": 1,
+                    "max": 100,
+                    "step": 1,
+                }),
+                "max_colors": ("INT", {
+                    "default": 64,
+                    "min": 2,
+                    "max": 256,
+                    "step": 1,
+                    "tooltip": "Taille de la palette maître tirée de l'image (sans palette connectée)"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("IMAGE", "PIXEL_PALETTE", "PIXEL_PALETTE", "STRING", "STRING")
+    RETURN_NAMES = ("image", "palette", "sub_palettes", "attributes", "report")
+    OUTPUT_IS_LIST = (False, False, True, False, False)
+    FUNCTION = "constrain"
+    CATEGORY = "pixel_art/palette"
+    
+    @profiled("RetroTilePalettes")
+    def constrain(self, image, preset="nes", palette=None, tile_width=8, tile_height=8, colors=4,
+                  palettes=4, shared="none", iterations=DEFAULT_ITERATIONS, max_colors=64):
+        """
+        Retourne l'image contrainte, la palette indexée (sous-palettes à plat: index p * colors + k),
+        les sous-palettes, la sous-palette de chaque tuile (CSV) et l'erreur totale
+        """
+        if preset in HARDWARE_PRESETS:
+            settings = HARDWARE_PRESETS[preset]
+            (tile_width, tile_height), colors = settings["tile"], settings["colors"]
+            palettes, shared = settings["palettes"], settings["shared"]
+        
+        profiler = get_profiler()
+        try:
+            with profiler.stage("decode"):
+                pixels = ensure_rgb(to_uint8(image.cpu().numpy()))
+            profiler.count("pixels", pixels.size // 3)
+            
+            with profiler.stage("extract"):
+                master = palette if isinstance(palette, PixelPalette) and not palette.is_empty \
+                    else self._image_palette(pixels, max_colors)
+                subpalettes, result = master.constrain_tiles(pixels, tile_width, tile_height, colors,
+                                                             palettes, shared, iterations)
+            
+            with profiler.stage("render"):
+                flat = master.with_colors([c for p in subpalettes for c in p.colors])
+                flat.metadata['name'] = f"{master.name}_{preset}"
+                assignment = result['assignment'].reshape(-1, result['assignment'].shape[-1])
+                attributes = "\n".join(",".join(map(str, row)) for row in assignment.tolist())
+                image_tensor = torch.from_numpy(result['image'].astype(np.float32) / 255.0)
+            
+            report = (f"{len(subpalettes)} sous-palettes de {colors} couleurs, tuiles {tile_width}x{tile_height}, "
+                      f"palette maître: {master.color_count} couleurs\n"
+                      f"erreur totale: {result['error']:.0f} (somme des ΔE²), ΔE moyen: {result['mean_error']:.2f}")
+            profiler.log("RetroTilePalettes", f"✓ {len(subpalettes)} x {colors} couleurs, "
+                         f"ΔE moyen {result['mean_error']:.2f}")
+            return (image_tensor, flat, subpalettes, attributes, report)
+            
+        except Exception as e:
+            print(f"[RetroTilePalettes] ✗ Erreur: {e}")
+            return (image, PixelPalette(), [PixelPalette()], "", f"# Erreur: {e}")
+    
+    @staticmethod
+    def _image_palette(pixels, max_colors):
+        """
+        Palette maître tirée de l'image: couleurs distinctes (avec occurrences), réduites à
+        max_colors; au-delà de 4096 couleurs (photo, dégradés), moyennes de cases de 16 niveaux
+        par canal pour que la réduction reste rapide
+        """
+        pixels = pixels.reshape(-1, 3)
+        packed, inverse, counts = np.unique(pack_rgb(pixels), return_inverse=True, return_counts=True)
+        rgb = unpack_rgb(packed)
+        if len(packed) > 4096:
+            _, inverse, counts = np.unique(pack_rgb(pixels >> 4), return_inverse=True, return_counts=True)
+            inverse = inverse.ravel()
+            rgb = np.stack([np.bincount(inverse, weights=pixels[:, c]) / counts for c in range(3)], axis=1)
+            rgb = np.round(rgb).astype(np.uint8)
+        palette = PixelPalette(source_filename="image")
+        for r, g, b in rgb.tolist():
+            palette.add_color(r, g, b)
+        palette.metadata['counts'] = counts.tolist()
+        if palette.color_count > max_colors:
+            palette, _ = palette.reduce(max_colors, representative="nearest")
+        return palette
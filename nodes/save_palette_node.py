@@ -0,0 +1,61 @@
+# nodes/save_palette_node.py
+import folder_paths
+from ..lib.pixel_palette  import PixelPalette
+from ..lib.palette_export import EXPORT_FORMATS, FORMAT_EXTENSIONS
+from ..lib.file_paths     import next_numbered_path
+from ..lib.profiling      import get_profiler, profiled
+
+class SavePaletteNode:
+    """
+    Nœud ComfyUI pour enregistrer une palette dans le dossier de sortie
+    Écriture en flux via PixelPalette.save (GPL, hex, rgb, raw, CSS, JSON, ACT, ASE)
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "palette": ("PIXEL_PALETTE",),
+                "filename_prefix": ("STRING", {"default": "palette"}),
+                "format_type": (list(EXPORT_FORMATS), {"default": "gpl"}),
+            },
+            "optional": {
+                "include_header": ("BOOLEAN", {
+                    "default": True,
+                    "tooltip": "En-tête de commentaires (formats hex, rgb, raw, css)"
+                }),
+                "include_names": ("BOOLEAN", {"default": True}),
+            }
+        }
+    
+    RETURN_TYPES = ("STRING",)
+    RETURN_NAMES = ("file_path",)
+    FUNCTION = "save_palette"
+    OUTPUT_NODE = True
+    CATEGORY = "pixel_art/io"
+    
+    @profiled("SavePalette")
+    def save_palette(self, palette, filename_prefix="palette", format_type="gpl",
+                     include_header=True, include_names=True):
+        """
+        Enregistre la palette sous <sortie>/<prefix>_<compteur>.<extension>
+        """
+        if not isinstance(palette, PixelPalette):
+            print("[SavePalette] ✗ Erreur: Objet palette invalide")
+            return ("",)
+        
+        try:
+            extension = next(ext for ext, fmt in FORMAT_EXTENSIONS.items() if fmt == format_type)
+            path = next_numbered_path(folder_paths.get_output_directory(),
+                                      filename_prefix.strip() or "palette", extension)
+            with get_profiler().stage("write"):
+                palette.save(path, format_type, include_header=include_header, include_names=include_names)
+            
+            get_profiler().log("SavePalette", f"✓ Palette enregistrée: '{palette.name}' "
+                               f"({palette.color_count} couleurs) -> {path}")
+            
+            return (str(path),)
+            
+        except Exception as e:
+            print(f"[SavePalette] ✗ Erreur: {e}")
+            return ("",)
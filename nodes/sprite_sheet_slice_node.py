@@ -0,0 +1,102 @@
+# nodes/sprite_sheet_slice_node.py
+from ..lib.pixel_palette import PixelPalette
+from ..lib.pixel_array   import to_uint8, ensure_rgb
+from ..lib.sprite_sheet  import TILE_DEDUPE_MODES, tile_view, tile_palettes, dedupe_tiles, tile_map_text
+from ..lib.lazy_import   import lazy_import
+from ..lib.profiling     import get_profiler, profiled
+
+torch = lazy_import("torch")
+np    = lazy_import("numpy")
+
+class SpriteSheetSliceNode:
+    """
+    Nœud de découpage d'une planche de sprites ou d'un tileset en tuiles de taille fixe
+    Sorties: tuiles distinctes (batch), une palette par tuile distincte et carte des tuiles
+    """
+    
+    @classmethod
+    def INPUT_TYPES(cls):
+        return {
+            "required": {
+                "image": ("IMAGE",),
+                "tile_width": ("INT", {
+                    "default": 16,
+                    "min": 1,
+                    "max": 1024,
+                    "step": 1,
+                    "display": "number"
+                }),
+                "tile_height": ("INT", {
+                    "default": 16,
+                    "min": 1,
+                    "max": 1024,
+                    "step": 1,
+                    "display": "number"
+                }),
+            },
+            "optional": {
+                "margin": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 256,
+                    "step": 1,
+                    "tooltip": "Pixels ignorés autour de la planche"
+                }),
+                "spacing": ("INT", {
+                    "default": 0,
+                    "min": 0,
+                    "max": 256,
+                    "step": 1,
+                    "tooltip": "Pixels entre deux tuiles"
+                }),
+                "dedupe": (list(TILE_DEDUPE_MODES), {
+                    "default": "flips",
+                    "tooltip": "flips: tuiles identiques à un miroir près, exact: identiques, none: toutes les tuiles"
+                }),
+            }
+        }
+    
+    RETURN_TYPES = ("IMAGE", "PIXEL_PALETTE", "STRING", "STRING")
+    RETURN_NAMES = ("tiles", "palettes", "tile_map", "report")
+    OUTPUT_IS_LIST = (False, True, False, False)
+    FUNCTION = "slice_sheet"
+    CATEGORY = "pixel_art/image"
+    
+    @profiled("SpriteSheetSlice")
+    def slice_sheet(self, image, tile_width, tile_height, margin=0, spacing=0, dedupe="flips"):
+        """
+        Découpe chaque image du batch; les tuiles de tout le batch sont dédoublonnées ensemble
+        """
+        profiler = get_profiler()
+        try:
+            with profiler.stage("decode"):
+                frames = ensure_rgb(to_uint8(image.cpu().numpy()))
+                if frames.ndim == 3:
+                    frames = frames[None]
+            
+            with profiler.stage("extract"):
+                views = [tile_view(frame, tile_width, tile_height, margin, spacing) for frame in frames]
+                rows, cols = views[0].shape[:2]
+                if rows * cols == 0:
+                    raise ValueError(f"Image trop petite pour des tuiles de {tile_width}x{tile_height}")
+                tiles = np.concatenate([view.reshape(-1, tile_height, tile_width, 3) for view in views])
+                result = dedupe_tiles(tiles, dedupe)
+                unique = tiles[result["unique"]]
+                palettes = tile_palettes(unique)
+            profiler.count("tiles", len(tiles))
+            
+            with profiler.stage("render"):
+                frame_maps = np.split(np.arange(len(tiles)), len(frames))
+                tile_map = "\n\n".join(tile_map_text(result["index"][m], result["flips"][m], cols)
+                                       for m in frame_maps)
+                tiles_tensor = torch.from_numpy(unique.astype(np.float32) / 255.0)
+            
+            report = (f"{len(frames)} image(s), {rows} x {cols} tuiles de {tile_width}x{tile_height}\n"
+                      f"{len(tiles)} tuiles, {len(unique)} distinctes (dédoublonnage: {dedupe})\n"
+                      f"couleurs par tuile: {min(len(p) for p in palettes)} à {max(len(p) for p in palettes)}")
+            profiler.log("SpriteSheetSlice", f"✓ {len(tiles)} tuiles -> {len(unique)} distinctes")
+            return (tiles_tensor, palettes, tile_map, report)
+            
+        except Exception as e:
+            print(f"[SpriteSheetSlice] ✗ Erreur: {e}")
+            return (image, [PixelPalette()], "", f"# Erreur: {e}")
@@ -0,0 +1,37 @@
+# spec/cache/fingerprint_spec.py
+from mamba import description, context, it
+from expects import expect, equal
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+import numpy as np
+from lib.cache import fingerprint
+
+
+with description('fingerprint'):
+    with context('sur des images identiques'):
+        with it('est identique pour deux buffers distincts de même contenu'):
+            image = np.random.RandomState(1).rand(1, 32, 32, 3).astype(np.float32)
+            expect(fingerprint(image)).to(equal(fingerprint(image.copy())))
+
+        with it('ignore les écarts invisibles après conversion uint8'):
+            image = np.full((1, 8, 8, 3), 0.5, dtype=np.float32)
+            expect(fingerprint(image)).to(equal(fingerprint(image + 1e-5)))
+
+    with context('sur des images différentes'):
+        with it('change quand un seul pixel change'):
+            image = np.zeros((1, 64, 64, 3), dtype=np.float32)
+            other = image.copy()
+            other[0, 33, 17, 1] = 1.0
+            expect(fingerprint(image) == fingerprint(other)).to(equal(False))
+
+        with it('change quand le buffer est modifié en place'):
+            image = np.zeros((512, 512, 3), dtype=np.float32)
+            before = fingerprint(image)
+            image[1, 1, 0] = 0.5
+            expect(fingerprint(image) == before).to(equal(False))
+
+        with it('change avec la forme'):
+            image = np.zeros((1, 4, 8, 3), dtype=np.float32)
+            expect(fingerprint(image) == fingerprint(image.reshape(1, 8, 4, 3))).to(equal(False))
@@ -0,0 +1,64 @@
+# spec/cache/result_cache_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_none, be_false, be_true
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+import numpy as np
+from lib.cache import ResultCache, make_key, estimate_nbytes
+
+
+with description('ResultCache'):
+    with context('#get / #put'):
+        with it('compte les hits et les misses'):
+            cache = ResultCache(max_bytes=1024)
+            expect(cache.get('a')).to(be_none)
+            cache.put('a', 1, nbytes=10)
+            expect(cache.get('a')).to(equal(1))
+
+            stats = cache.stats()
+            expect(stats['hits']).to(equal(1))
+            expect(stats['misses']).to(equal(1))
+            expect(stats['bytes_held']).to(equal(10))
+
+        with it('évince les entrées les moins récentes au-delà du budget'):
+            cache = ResultCache(max_bytes=100)
+            cache.put('a', 'A', nbytes=40)
+            cache.put('b', 'B', nbytes=40)
+            cache.get('a')
+            cache.put('c', 'C', nbytes=40)
+
+            expect('a' in cache).to(be_true)
+            expect('b' in cache).to(be_false)
+            expect(cache.stats()['bytes_held']).to(equal(80))
+            expect(cache.stats()['evictions']).to(equal(1))
+
+        with it('refuse un résultat plus gros que le budget'):
+            cache = ResultCache(max_bytes=10)
+            expect(cache.put('big', np.zeros(100, dtype=np.uint8))).to(be_false)
+            expect(len(cache)).to(equal(0))
+
+        with it('remplace une entrée existante sans compter deux fois sa taille'):
+            cache = ResultCache(max_bytes=100)
+            cache.put('a', 'A', nbytes=30)
+            cache.put('a', 'A2', nbytes=50)
+            expect(cache.stats()['bytes_held']).to(equal(50))
+
+    with context('#get_or_compute'):
+        with it('ne calcule qu\'une fois'):
+            cache = ResultCache(max_bytes=1024)
+            calls = []
+            compute = lambda: calls.append(1) or len(calls)
+            expect(cache.get_or_compute('k', compute)).to(equal(1))
+            expect(cache.get_or_compute('k', compute)).to(equal(1))
+            expect(len(calls)).to(equal(1))
+
+    with context('make_key'):
+        with it('ne dépend pas de l\'ordre des paramètres'):
+            expect(make_key('Node', 'abc', a=1, b=2)).to(equal(make_key('Node', 'abc', b=2, a=1)))
+
+    with context('estimate_nbytes'):
+        with it('somme la taille des arrays d\'un tuple de sortie'):
+            value = (np.zeros(1000, dtype=np.uint8),)
+            expect(estimate_nbytes(value) >= 1000).to(be_true)
@@ -0,0 +1,51 @@
+# spec/color/color_math_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_below
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+import numpy as np
+from lib.color.color_math import rgb_to_lab, srgb_to_linear, linear_to_srgb, delta_e76, lab_to_rgb, rgb_to_oklab, oklab_to_oklch
+
+
+with description('color_math'):
+    with context('#rgb_to_lab'):
+        with it('convertit le blanc en L=100'):
+            lab = rgb_to_lab([255, 255, 255])
+            expect(float(abs(lab[0] - 100))).to(be_below(0.01))
+            expect(float(abs(lab[1]) + abs(lab[2]))).to(be_below(0.01))
+
+        with it('convertit le rouge pur'):
+            lab = rgb_to_lab(np.array([[255, 0, 0]], dtype=np.uint8))[0]
+            expect(float(np.max(np.abs(lab - [53.24, 80.09, 67.20])))).to(be_below(0.05))
+
+    with context('#lab_to_rgb'):
+        with it('inverse rgb_to_lab'):
+            rgb = np.random.default_rng(0).integers(0, 256, (1000, 3))
+            expect(float(np.max(np.abs(lab_to_rgb(rgb_to_lab(rgb)) - rgb)))).to(be_below(0.001))
+
+    with context('#linear_to_srgb'):
+        with it('inverse srgb_to_linear'):
+            values = np.arange(256)
+            expect(np.allclose(linear_to_srgb(srgb_to_linear(values)), values)).to(equal(True))
+
+    with context('#delta_e76'):
+        with it('est nul entre une couleur et elle-même'):
+            lab = rgb_to_lab([12, 34, 56])
+            expect(float(delta_e76(lab, lab))).to(equal(0.0))
+
+    with context('#rgb_to_oklab'):
+        with it('convertit le blanc en L=1 sans chroma'):
+            lab = rgb_to_oklab([255, 255, 255])
+            expect(float(np.max(np.abs(lab - [1.0, 0.0, 0.0])))).to(be_below(0.001))
+
+        with it('convertit le rouge pur'):
+            lab = rgb_to_oklab(np.array([[255, 0, 0]], dtype=np.uint8))[0]
+            expect(float(np.max(np.abs(lab - [0.62796, 0.22486, 0.12585])))).to(be_below(0.001))
+
+    with context('#oklab_to_oklch'):
+        with it('donne la teinte en degrés'):
+            lch = oklab_to_oklch(rgb_to_oklab([255, 0, 0]))
+            expect(float(abs(lch[2] - 29.23))).to(be_below(0.05))
+            expect(float(abs(lch[1] - 0.2577))).to(be_below(0.001))
@@ -48,5 +48,12 @@ with description('PixelColor') as self:
             expect(color_a.g).to(equal(128))
             expect(color_a.b).to(equal(0))
 
+    with context('mix_arrays'):
+        with it('mix every color for every ratio like mix_with'):
+            mixed = RGBMixer.mix_arrays([[255, 0, 0], [0, 0, 0]], [[0, 255, 0], [255, 255, 255]], [0.0, 0.5, 1.0])
+            expect(mixed.shape).to(equal((3, 2, 3)))
+            expect(mixed[1].tolist()).to(equal([[128, 128, 0], [128, 128, 128]]))
+            expect(mixed[2].tolist()).to(equal([[0, 255, 0], [255, 255, 255]]))
+
     with context('with default color space'):
         print("TODO: test with 2nd color_space like hsl")
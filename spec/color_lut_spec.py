@@ -0,0 +1,134 @@
+# spec/color_lut_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, be_true, raise_error
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from PIL import Image
+from lib.color_lut import (lattice_colors, palette_lut, hald_size, hald_image, cube_text, save_color_lut,
+                           ColorLut, parse_cube, load_color_lut, apply_color_lut)
+
+
+PALETTE = np.array([[0, 0, 0], [255, 255, 255], [255, 0, 0], [0, 0, 255]], dtype=np.uint8)
+
+
+with description('color_lut'):
+    with before.each:
+        self.directory = tempfile.mkdtemp()
+
+    with after.each:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    with context('lattice_colors'):
+        with it('range les points rouge le plus rapide, bleu le plus lent'):
+            points = lattice_colors(2)
+            expect(points.tolist()[:3]).to(equal([[0, 0, 0], [255, 0, 0], [0, 255, 0]]))
+            expect(points[4].tolist()).to(equal([0, 0, 255]))
+            expect(len(lattice_colors(17))).to(equal(17 ** 3))
+
+    with context('palette_lut'):
+        with it('projette chaque point de la grille sur la couleur la plus proche'):
+            table = palette_lut(PALETTE, 17, "rgb")
+            expect(table.shape).to(equal((17 ** 3, 3)))
+            expect(table[0].tolist()).to(equal([0, 0, 0]))
+            expect(table[-1].tolist()).to(equal([255, 255, 255]))
+            expect(table[16].tolist()).to(equal([255, 0, 0]))
+            colors = {tuple(c) for c in table.tolist()}
+            expect(colors <= {tuple(c) for c in PALETTE.tolist()}).to(be_true)
+
+        with it('refuse une palette vide ou une métrique inconnue'):
+            expect(lambda: palette_lut(np.zeros((0, 3)), 17)).to(raise_error(ValueError))
+            expect(lambda: palette_lut(PALETTE, 17, "hsv")).to(raise_error(ValueError))
+
+    with context('cube_text'):
+        with it('écrit l\'en-tête et un point par ligne'):
+            lines = cube_text(palette_lut(PALETTE, 2, "rgb"), 2, "test").splitlines()
+            expect(lines[:4]).to(equal(['TITLE "test"', 'LUT_3D_SIZE 2', 'DOMAIN_MIN 0.0 0.0 0.0',
+                                        'DOMAIN_MAX 1.0 1.0 1.0']))
+            expect(len(lines)).to(equal(4 + 8))
+            expect(lines[5]).to(equal('1.000000 0.000000 0.000000'))
+
+    with context('Hald CLUT'):
+        with it('range une grille de niveau² points par axe dans une image niveau³ x niveau³'):
+            expect(hald_size(8)).to(equal(64))
+            table = palette_lut(PALETTE, hald_size(2), "rgb")
+            image = hald_image(table, 2)
+            expect(image.shape).to(equal((8, 8, 3)))
+            expect(image[0, 1].tolist()).to(equal(table[1].tolist()))
+            expect(image[1, 0].tolist()).to(equal(table[8].tolist()))
+
+        with it('refuse un niveau hors limites'):
+            expect(lambda: hald_size(20)).to(raise_error(ValueError))
+
+    with context('save_color_lut'):
+        with it('enregistre un .cube et une Hald CLUT PNG'):
+            cube = save_color_lut(palette_lut(PALETTE, 17), os.path.join(self.directory, "a.cube"), "cube", 17)
+            expect(cube.read_text().count("\n")).to(equal(3 + 17 ** 3))
+            table = palette_lut(PALETTE, 16)
+            png = save_color_lut(table, os.path.join(self.directory, "a.png"), "hald", 16)
+            expect(np.asarray(Image.open(png)).reshape(-1, 3).tolist()).to(equal(table.tolist()))
+            expect(sorted(os.listdir(self.directory))).to(equal(["a.cube", "a.png"]))
+
+        with it('refuse une taille qui n\'est pas un carré en Hald CLUT'):
+            path = os.path.join(self.directory, "b.png")
+            expect(lambda: save_color_lut(palette_lut(PALETTE, 17), path, "hald", 17)).to(raise_error(ValueError))
+            expect(os.listdir(self.directory)).to(equal([]))
+
+    with context('parse_cube'):
+        with it('relit un .cube écrit par cube_text'):
+            table = palette_lut(PALETTE, 5, "rgb")
+            lut = parse_cube("# commentaire\n" + cube_text(table, 5, "test"))
+            expect((lut.size, lut.title)).to(equal((5, "test")))
+            expect(bool(np.allclose(lut.table * 255.0, table, atol=1e-3))).to(be_true)
+
+        with it('lit le domaine et refuse les LUT 1D ou incomplètes'):
+            lut = parse_cube("LUT_3D_SIZE 2\nDOMAIN_MAX 2 2 2\n" + "0 0 0\n" * 8)
+            expect(lut.domain_max).to(equal((2.0, 2.0, 2.0)))
+            expect(lambda: parse_cube("LUT_1D_SIZE 2\n0 0 0\n1 1 1\n")).to(raise_error(ValueError))
+            expect(lambda: parse_cube("LUT_3D_SIZE 2\n" + "0 0 0\n" * 7)).to(raise_error(ValueError))
+
+    with context('load_color_lut'):
+        with it('met en cache par chemin et date de modification'):
+            path = os.path.join(self.directory, "a.cube")
+            save_color_lut(palette_lut(PALETTE, 5), path, "cube", 5)
+            first = load_color_lut(path)
+            expect(load_color_lut(path) is first).to(be_true)
+            save_color_lut(palette_lut(PALETTE[:2], 5), path, "cube", 5)
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10 ** 9))
+            expect(load_color_lut(path) is first).to(equal(False))
+
+        with it('relit une Hald CLUT PNG'):
+            path = os.path.join(self.directory, "a.png")
+            table = palette_lut(PALETTE, 16)
+            save_color_lut(table, path, "hald", 16)
+            lut = load_color_lut(path)
+            expect(lut.size).to(equal(16))
+            expect(bool(np.array_equal(np.rint(lut.table * 255.0), table))).to(be_true)
+
+    with context('apply_color_lut'):
+        with before.each:
+            self.identity = ColorLut(lattice_colors(9).astype(np.float32) / 255.0, 9)
+            self.pixels = np.random.default_rng(0).integers(0, 256, (2, 12, 10, 3), dtype=np.uint8)
+
+        with it('reproduit l\'image avec une LUT identité (trilinéaire et tétraédrique)'):
+            for interpolation in ("trilinear", "tetrahedral"):
+                result = apply_color_lut(self.pixels, self.identity, interpolation)
+                expect(result.shape).to(equal(self.pixels.shape))
+                expect(bool(np.allclose(result * 255.0, self.pixels, atol=1e-3))).to(be_true)
+
+        with it('retombe exactement sur les points de la grille'):
+            lut = ColorLut(np.random.default_rng(1).random((27, 3), dtype=np.float32), 3)
+            points = (lattice_colors(3) / 255.0).reshape(3, 9, 3)
+            for interpolation in ("trilinear", "tetrahedral", "nearest"):
+                result = apply_color_lut(points, lut, interpolation).reshape(-1, 3)
+                expect(bool(np.allclose(result, lut.table, atol=1e-6))).to(be_true)
+
+        with it('donne le même résultat par petites tranches de lignes'):
+            lut = ColorLut(np.random.default_rng(2).random((125, 3), dtype=np.float32), 5)
+            whole = apply_color_lut(self.pixels, lut, "tetrahedral")
+            chunked = apply_color_lut(self.pixels, lut, "tetrahedral", chunk_pixels=7)
+            expect(bool(np.array_equal(whole, chunked))).to(be_true)
@@ -0,0 +1,85 @@
+# spec/color_vision_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, be_true, be_below, raise_error
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.lut import LutStore, grid_colors
+from lib.pixel_color import PixelColor
+from lib.pixel_palette import PixelPalette
+from lib.palette_assignment import delta_e_matrix
+from lib.color_vision import cvd_matrix, simulate_rgb, build_cvd_lut, cvd_lut, simulate_pixels, confusable_pairs
+
+
+with description('color_vision'):
+    with before.each:
+        self.store = LutStore(tempfile.mkdtemp())
+
+    with after.each:
+        shutil.rmtree(self.store.directory, ignore_errors=True)
+
+    with context('cvd_matrix'):
+        with it('vaut l\'identité à sévérité nulle et interpole entre les tables'):
+            expect(np.allclose(cvd_matrix("protan", 0.0), np.eye(3))).to(be_true)
+            middle = cvd_matrix("deutan", 0.55)
+            expect(np.allclose(middle, (cvd_matrix("deutan", 0.5) + cvd_matrix("deutan", 0.6)) / 2)).to(be_true)
+
+        with it('conserve les gris (lignes de somme 1)'):
+            for deficiency in ("protan", "deutan", "tritan"):
+                expect(float(np.abs(cvd_matrix(deficiency, 1.0).sum(axis=1) - 1).max())).to(be_below(1e-5))
+
+        with it('refuse une déficience inconnue'):
+            expect(lambda: cvd_matrix("achromat")).to(raise_error(ValueError))
+
+    with context('simulate_rgb'):
+        with it('rapproche rouge et vert en protan et deutan, pas en tritan'):
+            red_green = np.array([[220, 40, 40], [40, 160, 40]], dtype=np.uint8)
+            for deficiency, confused in (("protan", True), ("deutan", True), ("tritan", False)):
+                simulated = simulate_rgb(red_green, deficiency)
+                expect(bool(delta_e_matrix(simulated, simulated)[0, 1] < 60)).to(equal(confused))
+
+        with it('laisse le blanc et le noir inchangés'):
+            expect(simulate_rgb([[255, 255, 255], [0, 0, 0]], "tritan").tolist()).to(
+                equal([[255, 255, 255], [0, 0, 0]]))
+
+    with context('simulate_pixels'):
+        with it('approche le calcul exact via la LUT 3D mise en cache'):
+            pixels = np.random.default_rng(0).integers(0, 256, size=(2, 16, 16, 3), dtype=np.uint8)
+            simulated = simulate_pixels(pixels, "deutan", 1.0, 7, self.store)
+            expect(simulated.shape).to(equal(pixels.shape))
+            error = np.abs(simulated.astype(int) - simulate_rgb(pixels, "deutan"))
+            expect(float(error.mean())).to(be_below(1.0))
+            expect(self.store.path_for("cvd_deutan_100_7").exists()).to(be_true)
+
+        with it('contient la simulation du centre de chaque case'):
+            lut = cvd_lut("protan", 0.5, 4, self.store)
+            expect(lut.shape).to(equal((1 << 12, 3)))
+            expect(lut.tolist()).to(equal(simulate_rgb(grid_colors(4), "protan", 0.5).tolist()))
+
+        with it('construit la LUT par tranches sans changer le résultat'):
+            lut = build_cvd_lut("tritan", 0.8, 6)
+            expect(bool(np.array_equal(lut, simulate_rgb(grid_colors(6), "tritan", 0.8)))).to(be_true)
+
+    with context('confusable_pairs'):
+        with it('liste les paires devenues indiscernables, les plus confondues en premier'):
+            palette = [[200, 40, 40], [40, 140, 40], [40, 40, 200], [128, 128, 0]]
+            result = confusable_pairs(palette, "deutan", 1.0, 15.0)
+            expect(result['pairs'].tolist()).to(equal([[0, 1], [0, 3]]))
+            expect(bool((np.diff(result['simulated']) >= 0).all())).to(be_true)
+            expect(bool((result['original'] >= 15.0).all())).to(be_true)
+
+        with it('ignore les paires déjà proches'):
+            result = confusable_pairs([[100, 100, 100], [101, 100, 100]], "protan", 1.0, 5.0)
+            expect(len(result['pairs'])).to(equal(0))
+
+    with context('PixelPalette.simulate_vision'):
+        with it('simule les couleurs en gardant les noms'):
+            palette = PixelPalette()
+            palette.colors = [PixelColor(255, 0, 0, "rouge"), PixelColor(0, 0, 255, "bleu")]
+            simulated = palette.simulate_vision("protan")
+            expect([c.name for c in simulated.colors]).to(equal(["rouge", "bleu"]))
+            expect(simulated.to_array().tolist()).to(equal(simulate_rgb(palette.to_array(), "protan").tolist()))
@@ -0,0 +1,80 @@
+# spec/embedded_palette_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, raise_error, be_none
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from PIL import Image
+from lib.embedded_palette import read_embedded_palette, read_embedded_palettes, list_indexed_images
+
+
+COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (12, 34, 56)]
+
+
+def indexed_image(colors=COLORS):
+    image = Image.fromarray(np.arange(16, dtype=np.uint8).reshape(4, 4) % len(colors), 'P')
+    image.putpalette([c for color in colors for c in color])
+    return image
+
+
+with description('embedded_palette') as self:
+    with before.each:
+        self.directory = tempfile.mkdtemp(prefix="embedded_palette_spec_")
+
+    with after.each:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    with context('#read_embedded_palette'):
+        with it('lit le chunk PLTE d\'un PNG dans l\'ordre des index'):
+            path = os.path.join(self.directory, 'sprite.png')
+            indexed_image().save(path)
+            palette = read_embedded_palette(path)
+
+            expect(palette.format_type).to(equal('png'))
+            expect(palette.to_rgb_tuples()[:4]).to(equal(COLORS))
+            expect(palette.name).to(equal('sprite'))
+
+        with it('lit l\'index transparent d\'un PNG (tRNS)'):
+            path = os.path.join(self.directory, 'sprite.png')
+            indexed_image().save(path, transparency=2)
+            expect(read_embedded_palette(path).metadata['transparent_index']).to(equal(2))
+
+        with it('lit la table globale et la transparence d\'un GIF'):
+            path = os.path.join(self.directory, 'sprite.gif')
+            indexed_image().save(path, transparency=1)
+            palette = read_embedded_palette(path)
+
+            expect(palette.format_type).to(equal('gif'))
+            expect(palette.to_rgb_tuples()[:4]).to(equal(COLORS))
+            expect(palette.metadata['transparent_index']).to(equal(1))
+
+        with it('lit la table de couleurs d\'un BMP 8 bits'):
+            path = os.path.join(self.directory, 'sprite.bmp')
+            indexed_image().save(path)
+            palette = read_embedded_palette(path)
+
+            expect(palette.format_type).to(equal('bmp'))
+            expect(palette.to_rgb_tuples()[:4]).to(equal(COLORS))
+
+        with it('refuse un PNG non indexé'):
+            path = os.path.join(self.directory, 'rgb.png')
+            Image.new('RGB', (4, 4), (1, 2, 3)).save(path)
+            expect(lambda: read_embedded_palette(path)).to(raise_error(ValueError))
+
+    with context('#read_embedded_palettes'):
+        with it('lit un dossier entier et garde l\'ordre, None pour les fichiers illisibles'):
+            for i in range(5):
+                indexed_image(COLORS[i % 4:] + COLORS[:i % 4]).save(os.path.join(self.directory, f'tile_{i}.png'))
+            with open(os.path.join(self.directory, 'broken.gif'), 'wb') as f:
+                f.write(b'GIF89a')
+
+            files = list_indexed_images(self.directory)
+            palettes = read_embedded_palettes([os.path.join(self.directory, f) for f in files], workers=3)
+
+            expect(files[0]).to(equal('broken.gif'))
+            expect(palettes[0]).to(be_none)
+            expect(palettes[2].to_rgb_tuples()[0]).to(equal(COLORS[1]))
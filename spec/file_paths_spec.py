@@ -0,0 +1,36 @@
+# spec/file_paths_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, raise_error
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.file_paths import resolve_inside, next_numbered_path
+
+
+with description('file_paths'):
+    with before.each:
+        self.directory = tempfile.mkdtemp()
+
+    with after.each:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    with context('resolve_inside'):
+        with it('résout les sous-dossiers et le dossier lui-même'):
+            expect(resolve_inside(self.directory, "a/b/../c")).to(equal(os.path.join(self.directory, "a", "c")))
+            expect(resolve_inside(self.directory, " ")).to(equal(os.path.normpath(self.directory)))
+
+        with it('refuse les chemins qui sortent du dossier'):
+            expect(lambda: resolve_inside(self.directory, "../x")).to(raise_error(ValueError))
+            expect(lambda: resolve_inside(self.directory, "/etc")).to(raise_error(ValueError))
+
+    with context('next_numbered_path'):
+        with it('prend le premier compteur libre'):
+            first = next_numbered_path(self.directory, "sub/palette", ".gpl")
+            expect(first).to(equal(os.path.join(self.directory, "sub", "palette_00001.gpl")))
+            os.makedirs(os.path.dirname(first))
+            open(first, "w").close()
+            expect(next_numbered_path(self.directory, "sub/palette", ".gpl")).to(
+                equal(os.path.join(self.directory, "sub", "palette_00002.gpl")))
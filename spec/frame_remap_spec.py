@@ -0,0 +1,107 @@
+# spec/frame_remap_spec.py
+from mamba import description, context, it, before
+from expects import expect, equal, be_true, be_above, raise_error
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.lut import build_index_lut
+from lib.frame_remap import bayer_matrix, map_pixels, IncrementalRemapper
+
+
+PALETTE = np.array([[0, 0, 0], [255, 255, 255], [255, 0, 0], [0, 0, 255]], dtype=np.uint8)
+
+
+def moving_square(frames, size=40):
+    """Fond aléatoire fixe et carré rouge qui se déplace de 3 pixels par image"""
+    background = np.random.default_rng(0).integers(0, 256, size=(size, size + 8, 3), dtype=np.uint8)
+    sequence = []
+    for f in range(frames):
+        frame = background.copy()
+        frame[3 * f:3 * f + 6, 2 * f:2 * f + 6] = (255, 0, 0)
+        sequence.append(frame)
+    return sequence
+
+
+with description('frame_remap'):
+    with before.each:
+        self.lut = build_index_lut(PALETTE, "rgb", 6)
+
+    with context('bayer_matrix'):
+        with it('donne des seuils distincts centrés dans [0, 1['):
+            matrix = bayer_matrix(4)
+            expect(matrix.shape).to(equal((4, 4)))
+            expect(sorted((matrix * 16 - 0.5).astype(int).ravel().tolist())).to(equal(list(range(16))))
+            expect((bayer_matrix(2) * 4 - 0.5).tolist()).to(equal([[0, 2], [3, 1]]))
+
+    with context('map_pixels'):
+        with it('tramage d\'un gris moyen: alternance noir et blanc'):
+            gray = np.full((4, 4, 3), 128, dtype=np.uint8)
+            indices = map_pixels(gray, PALETTE[:2], build_index_lut(PALETTE[:2], "rgb", 6), 6, "bayer2", 128.0)
+            expect(set(indices.ravel().tolist())).to(equal({0, 1}))
+            expect(int((indices == 1).sum())).to(equal(8))
+
+        with it('garde l\'index exact des couleurs de palette qui partagent une case de la LUT'):
+            palette = np.array([[0, 0, 0], [3, 3, 3], [60, 60, 60], [64, 64, 64], [255, 255, 255]], dtype=np.uint8)
+            lut = build_index_lut(palette, "lab", 6)
+            expect(map_pixels(palette[None], palette, lut, 6).tolist()).to(equal([[0, 1, 2, 3, 4]]))
+            locked = np.random.default_rng(2).integers(0, 5, size=(16, 16))
+            remapper = IncrementalRemapper(palette, lut, 6, block=4)
+            remapper.remap(palette[locked])
+            locked[5:7, 9:12] = 1
+            expect(bool((remapper.remap(palette[locked]) == locked).all())).to(be_true)
+
+        with it('refuse un tramage inconnu'):
+            expect(lambda: map_pixels(np.zeros((2, 2, 3), dtype=np.uint8), PALETTE, self.lut, 6, "floyd")).to(
+                raise_error(ValueError))
+
+    with context('IncrementalRemapper'):
+        with it('donne exactement le calcul complet, tramage compris'):
+            remapper = IncrementalRemapper(PALETTE, self.lut, 6, "bayer4", 48.0, block=8)
+            for frame in moving_square(6):
+                expect(bool((remapper.remap(frame) == map_pixels(frame, PALETTE, self.lut, 6, "bayer4", 48.0)).all())).to(be_true)
+            expect(remapper.stats["recomputed"]).to(be_above(0))
+            expect(remapper.stats["recomputed"] < remapper.stats["pixels"]).to(be_true)
+
+        with it('ne recalcule rien pour une image inchangée'):
+            frame = moving_square(1)[0]
+            remapper = IncrementalRemapper(PALETTE, self.lut, 6, "bayer4")
+            remapper.remap(frame)
+            remapper.remap(frame.copy())
+            expect(remapper.stats["recomputed"]).to(equal(frame.shape[0] * frame.shape[1]))
+
+        with it('compte les pixels des blocs du bord tronqués'):
+            frame = np.zeros((10, 10, 3), dtype=np.uint8)
+            remapper = IncrementalRemapper(PALETTE, self.lut, 6, block=8)
+            remapper.remap(frame)
+            changed = frame.copy()
+            changed[9, 9] = 255
+            remapper.remap(changed)
+            expect(remapper.stats["recomputed"] - 100).to(equal(4))
+
+        with it('garde les index sous la tolérance (pas de scintillement)'):
+            frame = moving_square(1)[0]
+            noisy = np.clip(frame.astype(int) + np.random.default_rng(1).integers(-2, 3, frame.shape), 0, 255)
+            remapper = IncrementalRemapper(PALETTE, self.lut, 6, "bayer4", 48.0, tolerance=2)
+            first = remapper.remap(frame)
+            expect(bool((remapper.remap(noisy.astype(np.uint8)) == first).all())).to(be_true)
+            expect(remapper.stats["recomputed"]).to(equal(frame.shape[0] * frame.shape[1]))
+
+        with it('recalcule tout quand la taille change'):
+            remapper = IncrementalRemapper(PALETTE, self.lut, 6)
+            remapper.remap(np.zeros((8, 8, 3), dtype=np.uint8))
+            indices = remapper.remap(np.full((4, 6, 3), 255, dtype=np.uint8))
+            expect(indices.shape).to(equal((4, 6)))
+            expect(remapper.stats["recomputed"]).to(equal(64 + 24))
+
+        with it('rapporte la part recalculée et l\'accélération'):
+            remapper = IncrementalRemapper(PALETTE, self.lut, 6, "bayer4")
+            for frame in moving_square(4):
+                remapper.remap(frame)
+            report = remapper.report()
+            expect(report["frames"]).to(equal(4))
+            expect(0 < report["recomputed_ratio"] < 1).to(be_true)
+            expect(report["full_seconds"]).to(be_above(0))
+            expect(report["speedup"]).to(be_above(0))
+            expect(remapper.report()["full_seconds"]).to(equal(report["full_seconds"]))
@@ -0,0 +1,37 @@
+# spec/lazy_import_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, be_false, contain
+import sys
+import os
+import subprocess
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.lazy_import import lazy_import
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'bench'))
+from startup_import_bench import IMPORT_SCRIPT
+
+
+with description('lazy_import'):
+
+    with context('avant le premier accès'):
+        with it('ne charge pas le module'):
+            module = lazy_import("json")
+            expect(module.is_loaded).to(be_false)
+
+    with context('au premier accès à un attribut'):
+        with it('charge le module et retourne l\'attribut'):
+            module = lazy_import("json")
+            expect(module.dumps([1, 2])).to(equal("[1, 2]"))
+            expect(module.is_loaded).to(be_true)
+
+        with it('met l\'attribut en cache sur le proxy'):
+            module = lazy_import("json")
+            module.dumps
+            expect(list(vars(module))).to(contain('dumps'))
+
+    with context('import de l\'extension'):
+        with it('ne charge ni numpy, ni torch, ni PIL'):
+            result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT],
+                                    capture_output=True, text=True, check=True)
+            expect(result.stdout.strip()).to(equal(""))
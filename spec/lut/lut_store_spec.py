@@ -0,0 +1,79 @@
+# spec/lut/lut_store_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, be_true, be_false
+import sys
+import os
+import shutil
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+import numpy as np
+from lib.lut import LutStore, build_index_lut, nearest_indices, lut_offsets, grid_colors
+from lib.pixel_palette import PixelPalette
+
+
+PALETTE = np.array([[0, 0, 0], [255, 255, 255], [255, 0, 0], [0, 0, 255]], dtype=np.uint8)
+
+
+with description('LutStore') as self:
+    with before.each:
+        self.directory = tempfile.mkdtemp(prefix="lut_spec_")
+        self.store = LutStore(self.directory, max_bytes=10 * 1024 * 1024)
+
+    with after.each:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    with context('#index_lut'):
+        with it('écrit la table sur disque et la rouvre en memmap'):
+            table = self.store.index_lut(PALETTE, "rgb", bits=4)
+            expect(isinstance(table, np.memmap)).to(be_true)
+            expect(table.dtype).to(equal(np.uint8))
+            expect(len(table)).to(equal(16 ** 3))
+            expect(len(list(os.listdir(self.directory)))).to(equal(1))
+
+        with it('ignore une table supprimée entre la liste et sa lecture'):
+            small = LutStore(self.directory, max_bytes=5000)
+            small.index_lut(PALETTE, "rgb", bits=4)
+            # Lien cassé: listé par glob, stat() échoue comme pour un fichier supprimé
+            os.symlink(os.path.join(self.directory, "absent.npy"), os.path.join(self.directory, "gone.npy"))
+            small.index_lut(PALETTE[:2], "rgb", bits=4)
+            expect(small.total_bytes() <= 5000).to(be_true)
+
+        with it('est réutilisée par un autre store sans reconstruction'):
+            self.store.index_lut(PALETTE, "lab", bits=4)
+            other = LutStore(self.directory)
+            built = []
+            table = other.get_or_build(os.listdir(self.directory)[0][:-4], lambda: built.append(1))
+            expect(built).to(equal([]))
+            expect(len(table)).to(equal(16 ** 3))
+
+        with it('donne le même résultat qu\'une recherche directe'):
+            table = self.store.index_lut(PALETTE, "rgb", bits=5)
+            grid = grid_colors(5)
+            expect(np.array_equal(table, nearest_indices(grid, PALETTE))).to(be_true)
+
+        with it('utilise des index uint16 au-delà de 256 couleurs'):
+            palette = np.random.RandomState(0).randint(0, 256, (300, 3)).astype(np.uint8)
+            expect(build_index_lut(palette, "rgb", bits=3).dtype).to(equal(np.uint16))
+
+    with context('#evict'):
+        with it('supprime les tables les plus anciennes au-delà de la taille maximale'):
+            small = LutStore(self.directory, max_bytes=5000)
+            small.index_lut(PALETTE, "rgb", bits=4)
+            small.index_lut(PALETTE[:2], "rgb", bits=4)
+            expect(small.total_bytes() <= 5000).to(be_true)
+            expect(len(list(os.listdir(self.directory)))).to(equal(1))
+
+    with context('PixelPalette#map_indices'):
+        with it('associe chaque pixel à l\'index de la couleur la plus proche'):
+            palette = PixelPalette()
+            for r, g, b in PALETTE:
+                palette.add_color(r, g, b)
+            pixels = np.array([[[10, 5, 0], [250, 240, 250]], [[200, 30, 20], [0, 10, 200]]], dtype=np.uint8)
+            indices = palette.map_indices(pixels, "rgb", bits=6, store=self.store)
+            expect(indices.tolist()).to(equal([[0, 1], [2, 3]]))
+
+        with it('dépend de l\'ordre des couleurs'):
+            a = PixelPalette("0 0 0\n255 255 255")
+            b = PixelPalette("255 255 255\n0 0 0")
+            expect(a.content_hash == b.content_hash).to(be_false)
@@ -0,0 +1,70 @@
+# spec/palette_animation_spec.py
+from mamba import description, context, it, before
+from expects import expect, equal, be_true, raise_error
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.color.color_space_registry       import ColorSpaceRegistry
+from lib.color.color_spaces.rgb.rgb_mixer import RGBMixer
+from lib.color.color_spaces.hsv.hsv_mixer import HSVMixer
+from lib.palette_animation import parse_cycles, cycle_indices, mix_stack, palette_stack, render_frames
+
+
+PALETTE = np.array([[0, 0, 0], [255, 0, 0], [0, 255, 0], [0, 0, 255]], dtype=np.uint8)
+
+
+with description('palette_animation'):
+    with before.each:
+        ColorSpaceRegistry.register('rgb', mixer_class=RGBMixer)
+        ColorSpaceRegistry.register('hsv', mixer_class=HSVMixer)
+
+    with context('parse_cycles'):
+        with it('lit les plages et leur vitesse'):
+            expect(parse_cycles("1-3, 4-7:-0.5\n# commentaire")).to(equal([(1, 3, 1.0), (4, 7, -0.5)]))
+            expect(parse_cycles("")).to(equal([]))
+
+        with it('refuse une plage invalide'):
+            expect(lambda: parse_cycles("3-1")).to(raise_error(ValueError))
+            expect(lambda: parse_cycles("abc")).to(raise_error(ValueError))
+
+    with context('cycle_indices'):
+        with it('fait tourner les index de la plage seulement'):
+            table = cycle_indices(4, 4, [(1, 3, 1.0)])
+            expect(table.tolist()).to(equal([[0, 1, 2, 3], [0, 3, 1, 2], [0, 2, 3, 1], [0, 1, 2, 3]]))
+
+        with it('accepte des vitesses fractionnaires et négatives'):
+            table = cycle_indices(3, 3, [(0, 2, -0.5)])
+            expect(table.tolist()).to(equal([[0, 1, 2], [0, 1, 2], [1, 2, 0]]))
+
+        with it('refuse une plage hors de la palette'):
+            expect(lambda: cycle_indices(4, 2, [(2, 5, 1.0)])).to(raise_error(ValueError))
+
+    with context('palette_stack'):
+        with it('fond la palette vers la cible, de la première à la dernière image'):
+            stack = palette_stack(PALETTE, 3, target_rgb=PALETTE[::-1])
+            expect(stack[0].tolist()).to(equal(PALETTE.tolist()))
+            expect(stack[2].tolist()).to(equal(PALETTE[::-1].tolist()))
+            expect(stack[1, 0].tolist()).to(equal([0, 0, 128]))
+
+        with it('passe par les mixers sans version vectorisée'):
+            stack = mix_stack(PALETTE[1:2], PALETTE[2:3], [0.5], "hsv")
+            expect(stack.tolist()).to(equal([[[255, 255, 0]]]))
+
+        with it('fond une palette cyclée en un appel, comme image par image'):
+            for color_space in ("rgb", "hsv"):
+                stack = palette_stack(PALETTE, 5, [(0, 3, 1.0)], PALETTE[::-1], color_space)
+                cycled = palette_stack(PALETTE, 5, [(0, 3, 1.0)])
+                ratios = np.arange(5) / 4
+                expected = [mix_stack(cycled[f], PALETTE[::-1], ratios[f:f + 1], color_space)[0].tolist()
+                            for f in range(5)]
+                expect(stack.tolist()).to(equal(expected))
+
+    with context('render_frames'):
+        with it('produit une image par palette en une indexation'):
+            indices = np.array([[0, 1], [2, 3]])
+            stack = palette_stack(PALETTE, 4, [(0, 3, 1.0)])
+            frames = render_frames(indices, stack)
+            expect(frames.shape).to(equal((4, 2, 2, 3)))
+            expect(bool((frames[1] == PALETTE[[[3, 0], [1, 2]]]).all())).to(be_true)
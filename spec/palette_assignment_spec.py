@@ -0,0 +1,104 @@
+# spec/palette_assignment_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, be_true, be_below, raise_error
+import itertools
+import shutil
+import tempfile
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.palette_assignment import delta_e_matrix, linear_assignment, assign_palettes, remap_indices
+from lib.lut                import LutStore
+from lib.pixel_palette      import PixelPalette
+
+
+def brute_force(cost):
+    """Coût minimal par énumération (petites matrices, lignes <= colonnes)"""
+    rows, cols = cost.shape
+    return min(sum(cost[i, p[i]] for i in range(rows)) for p in itertools.permutations(range(cols), rows))
+
+
+def palette_of(colors):
+    palette = PixelPalette()
+    for r, g, b in colors:
+        palette.add_color(r, g, b)
+    return palette
+
+
+SOURCE = palette_of([(0, 0, 0), (255, 0, 0), (0, 0, 255), (255, 255, 255)])
+TARGET = palette_of([(250, 250, 250), (10, 10, 60), (200, 30, 30), (20, 20, 20)])
+
+
+with description('palette_assignment'):
+    with context('linear_assignment'):
+        with it('trouve l optimum sur des matrices aléatoires, avec égalités'):
+            rng = np.random.default_rng(0)
+            for trial in range(60):
+                rows, cols = sorted(int(n) for n in rng.integers(1, 6, 2))
+                cost = rng.random((rows, cols))
+                if trial % 2:
+                    cost = np.round(cost * 3)
+                r, c = linear_assignment(cost)
+                expect(len(set(c.tolist()))).to(equal(rows))
+                expect(abs(cost[r, c].sum() - brute_force(cost))).to(be_below(1e-9))
+
+        with it('bat l affectation gloutonne'):
+            # Glouton: la ligne 0 prend la colonne 0 (coût 1), la ligne 1 paie 10
+            cost = np.array([[1.0, 2.0], [1.5, 10.0]])
+            rows, cols = linear_assignment(cost)
+            expect(cols.tolist()).to(equal([1, 0]))
+
+        with it('accepte plus de lignes que de colonnes'):
+            cost = np.array([[5.0], [1.0], [3.0]])
+            rows, cols = linear_assignment(cost)
+            expect(rows.tolist()).to(equal([1]))
+            expect(cols.tolist()).to(equal([0]))
+
+        with it('refuse les coûts non finis'):
+            expect(lambda: linear_assignment(np.array([[np.inf]]))).to(raise_error(ValueError))
+
+    with context('assign_palettes'):
+        with it('retrouve une permutation'):
+            rgb = np.random.default_rng(1).integers(0, 256, size=(256, 3)).astype(np.uint8)
+            order = np.random.default_rng(2).permutation(256)
+            result = assign_palettes(rgb, rgb[order])
+            expect(bool((order[result['mapping']] == np.arange(256)).all())).to(be_true)
+            expect(result['total']).to(be_below(1e-9))
+
+        with it('donne une cible à chaque source quand la source est plus grande'):
+            result = assign_palettes([(0, 0, 0), (10, 10, 10), (255, 255, 255)], [(5, 5, 5), (250, 250, 250)])
+            expect(result['mapping'].tolist()).to(equal([0, 0, 1]))
+
+        with it('calcule la matrice des ΔE'):
+            expect(abs(delta_e_matrix([(0, 0, 0)], [(255, 255, 255)])[0, 0] - 100.0)).to(be_below(1e-3))
+
+    with context('remap_indices'):
+        with it('retrouve exactement les couleurs de la palette, même très proches'):
+            palette = np.array([[10, 10, 10], [11, 10, 10], [200, 0, 0]], dtype=np.uint8)
+            pixels = palette[[[1, 0], [2, 1]]]
+            expect(remap_indices(pixels, palette).tolist()).to(equal([[1, 0], [2, 1]]))
+            expect(remap_indices(np.array([[1, 2, 3]], dtype=np.uint8), palette).tolist()).to(equal([-1]))
+
+    with context('PixelPalette'):
+        with before.each:
+            self.directory = tempfile.mkdtemp(prefix="assignment_spec_")
+            self.store = LutStore(self.directory)
+
+        with after.each:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+        with it('réordonne la palette cible et recolore un batch'):
+            matched, report = SOURCE.assign_to(TARGET)
+            expect(matched.to_hex_list()).to(equal(["#141414", "#c81e1e", "#0a0a3c", "#fafafa"]))
+            batch = np.stack([SOURCE.to_array()[None], SOURCE.to_array()[None, ::-1]])
+            swapped = SOURCE.swap_pixels(batch, matched, store=self.store)
+            expect(swapped.shape).to(equal((2, 1, 4, 3)))
+            expect(bool((swapped[0, 0] == matched.to_array()).all())).to(be_true)
+            expect(bool((swapped[1, 0] == matched.to_array()[::-1]).all())).to(be_true)
+
+        with it('ramène les pixels hors palette à leur couleur la plus proche'):
+            matched, _ = SOURCE.assign_to(TARGET)
+            swapped = SOURCE.swap_pixels(np.array([[250, 5, 5]], dtype=np.uint8), matched, store=self.store)
+            expect(swapped.tolist()).to(equal([[200, 30, 30]]))
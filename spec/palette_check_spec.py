@@ -0,0 +1,67 @@
+# spec/palette_check_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, raise_error
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.pixel_array import pack_rgb
+from lib.palette_check import palette_membership, check_pixels
+
+
+PALETTE = np.array([[0, 0, 0], [255, 255, 255], [200, 30, 30]], dtype=np.uint8)
+
+
+def locked_image(seed=0, shape=(40, 50)):
+    """Image n'utilisant que les couleurs de PALETTE"""
+    return PALETTE[np.random.default_rng(seed).integers(0, len(PALETTE), size=shape)]
+
+
+with description('palette_check'):
+    with context('palette_membership'):
+        with it('donne le même masque par table de bits et par recherche dichotomique'):
+            image = locked_image()
+            image[::7, ::3] = (1, 2, 3)
+            packed = pack_rgb(image)
+            bitmap = palette_membership(packed, PALETTE, "bitmap")
+            searched = palette_membership(packed, PALETTE, "searchsorted")
+            expect(bitmap.tolist()).to(equal(searched.tolist()))
+            expect(int((~bitmap).sum())).to(equal(int((packed == 0x010203).sum())))
+
+        with it('refuse une méthode inconnue'):
+            expect(lambda: palette_membership(np.zeros(2, dtype=np.uint32), PALETTE, "hash")).to(
+                raise_error(ValueError))
+
+    with context('check_pixels'):
+        with it('ne signale rien sur une image verrouillée'):
+            result = check_pixels(locked_image(), PALETTE)
+            expect(bool(result['off_palette'].any())).to(equal(False))
+            expect(len(result['colors'])).to(equal(0))
+
+        with it('compte les couleurs fautives, de la plus fréquente à la moins fréquente'):
+            image = locked_image()
+            image[0, :5] = (201, 30, 30)
+            image[1, :2] = (250, 250, 250)
+            result = check_pixels(image, PALETTE)
+            expect(result['colors'].tolist()).to(equal([[201, 30, 30], [250, 250, 250]]))
+            expect(result['counts'].tolist()).to(equal([5, 2]))
+            expect(result['nearest'].tolist()).to(equal([2, 1]))
+            expect(bool(result['distance'][0] < 1.0)).to(be_true)
+
+        with it('ne cherche les suggestions que pour les limit couleurs les plus fréquentes'):
+            image = locked_image()
+            image[0, :5] = (201, 30, 30)
+            image[1, :2] = (250, 250, 250)
+            result = check_pixels(image, PALETTE, limit=1)
+            expect(len(result['colors'])).to(equal(2))
+            expect(result['nearest'].tolist()).to(equal([2]))
+            expect(len(result['distance'])).to(equal(1))
+
+        with it('traite un batch entier avec un compte par image'):
+            batch = np.stack([locked_image(1), locked_image(2)])
+            batch[1, 3, 4] = (9, 9, 9)
+            result = check_pixels(batch, PALETTE, suggest=False)
+            expect(result['off_palette'].shape).to(equal((2, 40, 50)))
+            expect(result['per_frame'].tolist()).to(equal([0, 1]))
+            expect('nearest' in result).to(equal(False))
@@ -0,0 +1,80 @@
+# spec/palette_contrast_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, be_none, raise_error
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+import lib.palette_contrast as palette_contrast
+from lib.palette_contrast import relative_luminance, contrast_matrix, analyze_pairs, heatmap_image
+from lib.palette_assignment import delta_e_matrix
+
+
+def brute_force(palette):
+    """Référence: matrices complètes"""
+    distances = delta_e_matrix(palette, palette)
+    np.fill_diagonal(distances, np.inf)
+    contrast = contrast_matrix(palette, palette)
+    first, second = np.triu_indices(len(palette), k=1)
+    return distances, contrast, first, second
+
+
+with description('palette_contrast'):
+    with context('contraste WCAG'):
+        with it('vaut 21 entre noir et blanc et 1 entre deux couleurs identiques'):
+            matrix = contrast_matrix([[0, 0, 0], [255, 255, 255]], [[255, 255, 255], [0, 0, 0]])
+            expect(np.round(matrix, 6).tolist()).to(equal([[21.0, 1.0], [1.0, 21.0]]))
+
+        with it('pondère les canaux par leur luminance'):
+            luminance = relative_luminance(np.array([[255, 0, 0], [0, 255, 0], [0, 0, 255]], dtype=np.uint8))
+            expect(np.round(luminance, 4).tolist()).to(equal([0.2126, 0.7152, 0.0722]))
+
+    with context('analyze_pairs'):
+        with it('donne les mêmes résultats que les matrices complètes, par petits blocs'):
+            palette = np.random.default_rng(0).integers(0, 256, size=(150, 3), dtype=np.uint8)
+            saved = palette_contrast._BLOCK_ELEMENTS
+            palette_contrast._BLOCK_ELEMENTS = 1000
+            try:
+                result = analyze_pairs(palette, 4.5, 10.0, limit=20, heatmap_size=32)
+            finally:
+                palette_contrast._BLOCK_ELEMENTS = saved
+            distances, contrast, first, second = brute_force(palette)
+
+            expect(result['nearest'].tolist()).to(equal(np.argmin(distances, axis=1).tolist()))
+            expect(bool(np.allclose(result['nearest_delta_e'], distances.min(axis=1), atol=1e-2))).to(be_true)
+            expect(result['close_count']).to(equal(int((distances[first, second] < 10.0).sum())))
+            expect(result['low_contrast_count']).to(equal(int((contrast[first, second] < 4.5).sum())))
+            smallest = np.sort(distances[first, second])[:len(result['close_delta_e'])]
+            expect(bool(np.allclose(result['close_delta_e'], smallest, atol=1e-2))).to(be_true)
+            expect(result['heatmap'].shape).to(equal((32, 32)))
+
+        with it('trouve la couleur de meilleur contraste'):
+            result = analyze_pairs([[0, 0, 0], [255, 255, 255], [128, 128, 128]], heatmap=None)
+            expect(result['best_partner'].tolist()).to(equal([1, 0, 0]))
+            expect(round(float(result['best_contrast'][0]), 3)).to(equal(21.0))
+            expect(result['heatmap']).to(be_none)
+
+        with it('limite et trie les paires listées'):
+            palette = [[10, 10, 10], [12, 10, 10], [10, 14, 10], [200, 200, 200]]
+            result = analyze_pairs(palette, 1.5, 5.0, limit=2)
+            expect(result['close_count']).to(equal(3))
+            expect(len(result['close_pairs'])).to(equal(2))
+            expect(bool(np.all(np.diff(result['close_delta_e']) >= 0))).to(be_true)
+            expect(result['close_pairs'][0].tolist()).to(equal([0, 1]))
+
+        with it('laisse la diagonale vide sur une carte non réduite'):
+            result = analyze_pairs([[0, 0, 0], [255, 255, 255], [255, 0, 0]])
+            expect(bool(np.isnan(np.diag(result['heatmap'])).all())).to(be_true)
+            expect(bool(np.isfinite(result['heatmap'][0, 1]))).to(be_true)
+
+        with it('refuse une palette d\'une seule couleur'):
+            expect(lambda: analyze_pairs([[0, 0, 0]])).to(raise_error(ValueError))
+
+    with context('heatmap_image'):
+        with it('colore sous le seuil en rouge et les cases vides en noir'):
+            image = heatmap_image(np.array([[np.nan, 0.0], [100.0, np.nan]]), "delta_e", 5.0, cell=2)
+            expect(image.shape).to(equal((4, 4, 3)))
+            expect(image[0, 0].tolist()).to(equal([0, 0, 0]))
+            expect(image[0, 2].tolist()).to(equal([160, 0, 0]))
+            expect(image[2, 0].tolist()).to(equal([0, 160, 80]))
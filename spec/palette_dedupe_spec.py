@@ -0,0 +1,79 @@
+# spec/palette_dedupe_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, have_len
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.palette_dedupe import unique_colors, near_pairs, merge_near_duplicates, merge_names
+from lib.pixel_palette  import PixelPalette
+
+
+COLORS = np.array([[10, 10, 10], [200, 0, 0], [12, 10, 10], [10, 10, 10], [201, 1, 0], [50, 50, 50]],
+                  dtype=np.uint8)
+GPL = "GIMP Palette\n10 10 10 a\n200 0 0 b\n12 10 10 c\n10 10 10 d\n201 1 0\n50 50 50 f\n"
+
+
+with description('palette_dedupe'):
+    with context('unique_colors'):
+        with it('garde l\'ordre de première apparition'):
+            first, counts = unique_colors(COLORS)
+            expect(first.tolist()).to(equal([0, 1, 2, 4, 5]))
+            expect(counts.tolist()).to(equal([2, 1, 1, 1, 1]))
+
+        with it('trie par fréquence en mode count, de façon stable'):
+            first, counts = unique_colors(COLORS[[5, 1, 0, 0]], mode="count")
+            expect(first.tolist()).to(equal([2, 0, 1]))
+            expect(counts.tolist()).to(equal([2, 1, 1]))
+
+    with context('near_pairs'):
+        with it('trouve les mêmes couples qu\'une comparaison de toutes les paires'):
+            points = np.random.default_rng(0).random((500, 3)) * 100
+            i, j = near_pairs(points, 6.0)
+            found = set(zip(np.minimum(i, j).tolist(), np.maximum(i, j).tolist()))
+
+            distances = np.sqrt(((points[:, None] - points[None]) ** 2).sum(-1))
+            expected = set(zip(*[a.tolist() for a in np.nonzero(np.triu(distances <= 6.0, 1))]))
+            expect(found).to(equal(expected))
+
+    with context('merge_near_duplicates'):
+        with it('garde la première couleur de chaque groupe'):
+            merged = merge_near_duplicates(COLORS, 3, metric="rgb")
+            expect(merged['keep'].tolist()).to(equal([0, 1, 5]))
+            expect(merged['groups'].tolist()).to(equal([0, 1, 0, 0, 1, 2]))
+            expect(merged['group_counts'].tolist()).to(equal([3, 2, 1]))
+
+        with it('garde la couleur la plus fréquente'):
+            merged = merge_near_duplicates(COLORS, 3, metric="rgb", representative="most_frequent",
+                                           counts=[1, 1, 5, 1, 1, 1])
+            expect(merged['colors'][0].tolist()).to(equal([12, 10, 10]))
+
+        with it('calcule la moyenne pondérée du groupe'):
+            merged = merge_near_duplicates(COLORS, 3, metric="rgb", representative="mean")
+            expect(merged['colors'][0].tolist()).to(equal([11, 10, 10]))
+
+        with it('ne fusionne pas tout un dégradé de proche en proche'):
+            ramp = np.array([[v, v, v] for v in range(0, 40, 2)], dtype=np.uint8)
+            merged = merge_near_duplicates(ramp, 3.5, metric="rgb")
+            distances = np.abs(ramp[:, 0].astype(int) - merged['colors'][merged['groups'], 0].astype(int))
+            expect(bool(np.all(distances * np.sqrt(3) <= 3.5))).to(be_true)
+
+    with context('merge_names'):
+        with it('joint les noms distincts du groupe'):
+            names = merge_names(["a", "b", "c", "", "e", "f"], [0, 1, 0, 0, 1, 2], [0, 1, 5], "join")
+            expect(names).to(equal(["a / c", "b / e", "f"]))
+
+    with context('PixelPalette'):
+        with it('dédoublonne et garde les occurrences'):
+            palette = PixelPalette(GPL).deduplicate()
+            expect(palette.color_count).to(equal(5))
+            expect(palette.metadata['counts']).to(equal([2, 1, 1, 1, 1]))
+
+        with it('fusionne les quasi-doublons en cumulant les occurrences'):
+            palette = PixelPalette(GPL).deduplicate().merge_near_duplicates(3, "rgb", names="join")
+            expect([c.name for c in palette]).to(equal(["a / c", "b", "f"]))
+            expect(palette.metadata['counts']).to(equal([3, 2, 1]))
+
+        with it('get_unique_colors retourne les premières occurrences'):
+            expect(PixelPalette(GPL).get_unique_colors()).to(have_len(5))
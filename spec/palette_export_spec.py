@@ -0,0 +1,79 @@
+# spec/palette_export_spec.py
+from mamba import description, context, it
+from expects import expect, equal, contain, raise_error, start_with, have_len
+import sys
+import os
+import io
+import json
+import struct
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from lib.pixel_palette  import PixelPalette
+from lib.palette_export import export_to_bytes, hex_codes, css_name, save_palette, format_for_path
+
+
+GPL = "GIMP Palette\nName: Test\nColumns: 2\n#\n255   0   0\tRed\n  0 128 255\n"
+
+
+with description('palette_export'):
+    with context('hex_codes'):
+        with it('formate les couleurs via la table hexadécimale'):
+            expect(hex_codes([[255, 0, 16], [0, 0, 0]])).to(equal(["#ff0010", "#000000"]))
+
+    with context('formats texte'):
+        with it('relit à l\'identique une palette GPL exportée'):
+            palette = PixelPalette(GPL, "test.gpl")
+            reloaded = PixelPalette(export_to_bytes(palette, "gpl").decode(), "copy.gpl")
+            expect(reloaded.to_rgb_tuples()).to(equal(palette.to_rgb_tuples()))
+            expect([c.name for c in reloaded]).to(equal(["Red", ""]))
+
+        with it('produit les mêmes lignes par lots que d\'un seul bloc'):
+            palette = PixelPalette(GPL, "test.gpl")
+            expect(export_to_bytes(palette, "rgb", batch_size=1)).to(equal(export_to_bytes(palette, "rgb")))
+
+        with it('exporte les couleurs en variables CSS'):
+            palette = PixelPalette(GPL, "test.gpl")
+            css = export_to_bytes(palette, "css", include_header=False).decode()
+            expect(css).to(equal(":root {\n  --color-red: #ff0000;\n  --color-1: #0080ff;\n}\n"))
+
+        with it('exporte un JSON valide'):
+            palette = PixelPalette(GPL, "test.gpl")
+            data = json.loads(export_to_bytes(palette, "json"))
+            expect(data['count']).to(equal(2))
+            expect(data['colors'][1]['rgb']).to(equal([0, 128, 255]))
+
+        with it('écrit dans un fichier texte'):
+            palette = PixelPalette(GPL, "test.gpl")
+            buffer = io.StringIO()
+            palette.export(buffer, "hex", include_header=False, include_names=False)
+            expect(buffer.getvalue()).to(equal("#ff0000\n#0080ff\n"))
+
+    with context('formats binaires'):
+        with it('écrit une table ACT de 772 octets'):
+            data = export_to_bytes(PixelPalette(GPL, "test.gpl"), "act")
+            expect(data).to(have_len(772))
+            expect(data[:3]).to(equal(b"\xff\x00\x00"))
+            expect(struct.unpack(">HH", data[-4:])).to(equal((2, 0xFFFF)))
+
+        with it('écrit un fichier ASE avec un bloc par couleur'):
+            data = export_to_bytes(PixelPalette(GPL, "test.gpl"), "ase")
+            expect(data).to(start_with(b"ASEF"))
+            expect(struct.unpack(">HHI", data[4:12])).to(equal((1, 0, 2)))
+
+        with it('refuse un fichier texte pour un format binaire'):
+            palette = PixelPalette(GPL, "test.gpl")
+            expect(lambda: palette.export(io.StringIO(), "ase")).to(raise_error(ValueError))
+
+    with context('save_palette'):
+        with it('déduit le format de l\'extension'):
+            expect(format_for_path("out/palette.css")).to(equal("css"))
+            with tempfile.TemporaryDirectory() as directory:
+                path = save_palette(PixelPalette(GPL, "test.gpl"), os.path.join(directory, "p.hex"))
+                with open(path) as f:
+                    expect(f.read()).to(contain("#0080ff"))
+
+    with context('css_name'):
+        with it('normalise le nom de la couleur'):
+            expect(css_name("Dark Blue!", 3)).to(equal("color-dark-blue"))
+            expect(css_name("", 3, "pal")).to(equal("pal-3"))
@@ -0,0 +1,104 @@
+# spec/palette_library_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, be_true, be_below
+import shutil
+import tempfile
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.palette_library   import PaletteLibrary, lab_signature, image_query
+from lib.color.color_math  import rgb_to_lab
+from lib.pixel_palette     import PixelPalette
+
+
+PALETTES = {
+    "rouges.gpl": "GIMP Palette\nName: Rouges\n255 0 0 rouge\n200 0 0\n120 0 0\n",
+    "bleus.gpl":  "GIMP Palette\nName: Bleus\n0 0 255 bleu\n0 0 200\n0 0 120\n",
+    "mixte.hex":  "ff0000\n00ff00\n0000ff\nffffff\n",
+    "vide.gpl":   "GIMP Palette\nName: Vide\n",
+}
+
+
+def write_library(directory):
+    for filename, content in PALETTES.items():
+        with open(os.path.join(directory, filename), "w") as f:
+            f.write(content)
+
+
+def chamfer(a, b):
+    la, lb = rgb_to_lab(a), rgb_to_lab(b)
+    d = np.sqrt(((la[:, None] - lb[None]) ** 2).sum(-1))
+    return (d.min(axis=1).mean() + d.min(axis=0).mean()) / 2
+
+
+with description('PaletteLibrary') as self:
+    with before.each:
+        self.directory = tempfile.mkdtemp(prefix="library_spec_")
+        write_library(self.directory)
+        self.library = PaletteLibrary.from_directory(self.directory, workers=1)
+
+    with after.each:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    with context('#from_directory'):
+        with it('charge les palettes non vides dans l\'ordre des fichiers'):
+            expect(self.library.names).to(equal(["Bleus", "mixte", "Rouges"]))
+            expect(self.library.offsets.tolist()).to(equal([0, 3, 7, 10]))
+
+        with it('réutilise l\'index sauvegardé tant que les fichiers ne changent pas'):
+            index_path = os.path.join(self.directory, "index", "library.npz")
+            PaletteLibrary.from_directory(self.directory, index_path=index_path, workers=1)
+            stamp = os.path.getmtime(index_path)
+            time.sleep(0.01)
+            PaletteLibrary.from_directory(self.directory, index_path=index_path, workers=1)
+            expect(os.path.getmtime(index_path)).to(equal(stamp))
+
+            with open(os.path.join(self.directory, "verts.gpl"), "w") as f:
+                f.write("GIMP Palette\n0 255 0\n")
+            library = PaletteLibrary.from_directory(self.directory, index_path=index_path, workers=1)
+            expect(len(library)).to(equal(4))
+
+    with context('#save / #load'):
+        with it('restitue les palettes à l\'identique'):
+            path = self.library.save(os.path.join(self.directory, "library.npz"))
+            loaded = PaletteLibrary.load(path)
+            expect(loaded.names).to(equal(self.library.names))
+            restored = loaded.palette(2)
+            expect(restored.to_rgb_tuples()).to(equal([(255, 0, 0), (200, 0, 0), (120, 0, 0)]))
+            expect(restored.colors[0].name).to(equal("rouge"))
+
+    with context('#search'):
+        with it('calcule la distance de Chamfer de chaque palette'):
+            query = np.array([[250, 0, 0], [0, 250, 0]], dtype=np.uint8)
+            distances = self.library.distances(query, "chamfer")
+            for i in range(len(self.library)):
+                palette = self.library.rgb[self.library.offsets[i]:self.library.offsets[i + 1]]
+                expect(abs(float(distances[i]) - chamfer(query, palette))).to(be_below(0.01))
+
+        with it('classe les palettes de la plus proche à la plus lointaine'):
+            query = np.array([[230, 0, 0], [150, 0, 0]], dtype=np.uint8)
+            for metric in ("chamfer", "hausdorff", "emd"):
+                results = self.library.search(query, k=2, metric=metric)
+                expect(results[0][0]).to(equal(2))
+
+        with it('retrouve une palette à partir d\'une image'):
+            pixels = np.zeros((16, 16, 3), dtype=np.uint8)
+            pixels[:, :8] = [0, 0, 200]
+            pixels[:, 8:] = [0, 0, 120]
+            colors, weights = image_query(pixels)
+            expect(int(weights.sum())).to(equal(256))
+            expect(self.library.search(colors, k=1, weights=weights)[0][0]).to(equal(0))
+
+    with context('#contains'):
+        with it('trouve les palettes qui contiennent une couleur à ΔE près'):
+            results = self.library.contains([[254, 0, 0]], tolerance=2.0)
+            expect([i for i, _ in results]).to(equal([1, 2]))
+            expect(self.library.contains([[0, 255, 0], [255, 255, 255]], tolerance=1.0)[0][0]).to(equal(1))
+
+    with context('lab_signature'):
+        with it('est un histogramme cumulé qui finit à 1 sur chaque axe'):
+            signature = lab_signature(rgb_to_lab(np.array([[10, 20, 30], [200, 100, 50]])))
+            expect(signature[:, -1].tolist()).to(equal([1.0, 1.0, 1.0]))
@@ -0,0 +1,57 @@
+# spec/palette_ranking_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, be_below
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.palette_library import PaletteLibrary
+from lib.palette_ranking import ranking_sample, quantization_scores, rank_palettes
+from lib.pixel_palette   import PixelPalette
+
+
+def palette_of(colors):
+    palette = PixelPalette()
+    for r, g, b in colors:
+        palette.add_color(r, g, b)
+    return palette
+
+
+IMAGE = np.zeros((32, 32, 3), dtype=np.uint8)
+IMAGE[:16] = [255, 0, 0]
+IMAGE[16:] = [0, 0, 255]
+
+EXACT = palette_of([(255, 0, 0), (0, 0, 255)])
+CLOSE = palette_of([(250, 0, 0), (0, 0, 250)])
+GRAYS = palette_of([(0, 0, 0), (128, 128, 128), (255, 255, 255)])
+
+
+with description('palette_ranking'):
+    with context('quantization_scores'):
+        with it('mesure le ΔE moyen et le PSNR après projection'):
+            library = PaletteLibrary.from_palettes([EXACT, CLOSE])
+            sample = ranking_sample(IMAGE)
+            delta_e = quantization_scores(library, sample, "delta_e")
+            expect(float(delta_e[0])).to(be_below(1e-3))
+            psnr = quantization_scores(library, sample, "psnr")
+            expect(bool(np.isinf(psnr[0]))).to(be_true)
+            expect(abs(float(psnr[1]) - 10 * np.log10(255 ** 2 * 3 / 25))).to(be_below(1e-6))
+
+    with context('rank_palettes'):
+        with it('classe la palette exacte en premier'):
+            library = PaletteLibrary.from_palettes([GRAYS, CLOSE, EXACT])
+            ranking = rank_palettes(library, ranking_sample(IMAGE), "delta_e")
+            expect([entry['index'] for entry in ranking]).to(equal([2, 1, 0]))
+
+        with it('trouve la même meilleure palette par élimination que par mesure complète'):
+            rng = np.random.default_rng(0)
+            palettes = [palette_of(rng.integers(0, 256, (16, 3)).tolist()) for _ in range(200)]
+            library = PaletteLibrary.from_palettes(palettes)
+            sample = ranking_sample(rng.integers(0, 256, (64, 64, 3)).astype(np.uint8))
+            full = quantization_scores(library, sample, "delta_e")
+            ranking = rank_palettes(library, sample, "delta_e", keep=3, initial_sample=256)
+            expect(ranking[0]['index']).to(equal(int(np.argmin(full))))
+            expect(ranking[0]['pixels']).to(equal(len(sample)))
+            expect(len(ranking)).to(equal(200))
+            expect(ranking[-1]['pixels']).to(equal(256))
@@ -0,0 +1,96 @@
+# spec/palette_reduce_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, be_true, be_below
+import shutil
+import tempfile
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+import lib.palette_reduce as palette_reduce
+from lib.palette_reduce import knn_graph, agglomerate, reduce_palette
+from lib.lut            import LutStore
+from lib.pixel_palette  import PixelPalette
+
+
+# Trois amas bien séparés de 4 couleurs chacun
+CLUSTERS = np.array([[250, 10, 10], [0, 0, 200], [245, 5, 12], [20, 200, 20], [0, 5, 210],
+                     [255, 0, 0], [25, 205, 15], [10, 0, 190], [252, 8, 4], [15, 195, 25],
+                     [5, 10, 205], [22, 210, 22]], dtype=np.uint8)
+GPL = "GIMP Palette\n250 10 10 rouge\n0 0 200 bleu\n245 5 12\n20 200 20 vert\n"
+
+
+with description('palette_reduce'):
+    with context('knn_graph'):
+        with it('ne trouve par la grille que des voisins parmi les plus proches'):
+            points = np.random.default_rng(0).random((2000, 3)) * 100
+            exact = knn_graph(points, 6)
+            original = palette_reduce._BRUTE_FORCE_MAX
+            palette_reduce._BRUTE_FORCE_MAX = 10
+            try:
+                by_grid = knn_graph(points, 6)
+            finally:
+                palette_reduce._BRUTE_FORCE_MAX = original
+            expect(bool(np.all(by_grid[:, 0] >= 0))).to(be_true)
+            subsets = [set(row) - {-1} <= set(full) for row, full in zip(by_grid.tolist(), exact.tolist())]
+            expect(all(subsets)).to(be_true)
+
+    with context('agglomerate'):
+        with it('retrouve des amas séparés'):
+            roots = agglomerate(CLUSTERS.astype(float), 3)
+            _, groups = np.unique(roots, return_inverse=True)
+            expect(groups.tolist()).to(equal([0, 2, 0, 1, 2, 0, 1, 2, 0, 1, 2, 1]))
+
+        with it('garde tous les points quand target dépasse leur nombre'):
+            expect(agglomerate(CLUSTERS.astype(float), 20).tolist()).to(equal(list(range(12))))
+
+    with context('reduce_palette'):
+        with it('numérote les groupes dans l\'ordre de la palette et rapporte l\'erreur'):
+            reduced = reduce_palette(CLUSTERS, 3)
+            expect(reduced['groups'].tolist()).to(equal([0, 1, 0, 2, 1, 0, 2, 1, 0, 2, 1, 2]))
+            expect(reduced['group_counts'].tolist()).to(equal([4, 4, 4]))
+            expect(reduced['max_error']).to(be_below(10.0))
+
+        with it('n\'introduit aucune erreur sans fusion'):
+            reduced = reduce_palette(CLUSTERS, 12, representative="nearest")
+            expect(reduced['colors'].tolist()).to(equal(CLUSTERS.tolist()))
+            expect(reduced['mean_error']).to(equal(0.0))
+
+        with it('rapproche le centre des couleurs les plus utilisées'):
+            counts = np.ones(12)
+            counts[5] = 1000
+            reduced = reduce_palette(CLUSTERS, 3, counts=counts)
+            expect(int(np.abs(reduced['colors'][0].astype(int) - [255, 0, 0]).max())).to(be_below(2))
+            reduced = reduce_palette(CLUSTERS, 3, counts=counts, representative="most_frequent")
+            expect(reduced['keep'][0]).to(equal(5))
+
+        with it('ne dégrade pas l\'erreur avec l\'affinage k-means'):
+            rgb = np.random.default_rng(1).integers(0, 256, (300, 3))
+            merged = reduce_palette(rgb, 16)
+            refined = reduce_palette(rgb, 16, refine=10)
+            expect(refined['mean_error']).to(be_below(merged['mean_error'] + 1e-9))
+
+    with context('PixelPalette.reduce'):
+        with before.each:
+            self.directory = tempfile.mkdtemp(prefix="reduce_spec_")
+            self.store = LutStore(self.directory)
+
+        with after.each:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+        with it('fusionne les couleurs et garde les noms'):
+            palette, report = PixelPalette(GPL).reduce(3, representative="nearest")
+            expect([c.name for c in palette.colors]).to(equal(["rouge", "bleu", "vert"]))
+            expect(report['colors_after']).to(equal(3))
+            expect(palette.metadata['counts']).to(equal([2, 1, 1]))
+
+        with it('compte les pixels de chaque couleur'):
+            pixels = np.array([[[250, 10, 10], [0, 0, 200], [0, 0, 201]]], dtype=np.uint8)
+            palette = PixelPalette(GPL).count_usage(pixels, store=self.store)
+            expect(palette.metadata['counts']).to(equal([1, 2, 0, 0]))
+
+        with it('compte à part les couleurs de la palette qui partagent une case de la LUT'):
+            pixels = np.array([[[0, 0, 0], [3, 3, 3], [3, 3, 3]]], dtype=np.uint8)
+            palette = PixelPalette("0 0 0\n3 3 3\n255 255 255\n").count_usage(pixels, store=self.store)
+            expect(palette.metadata['counts']).to(equal([1, 2, 0]))
@@ -0,0 +1,64 @@
+# spec/palette_sort_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true
+import colorsys
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.palette_sort  import hsv_hue, hilbert_index, sort_order
+from lib.pixel_palette import PixelPalette
+
+
+GPL = "GIMP Palette\n0 0 255 bleu\n255 0 0 rouge\n128 128 128 gris\n0 255 0 vert\n255 0 0 rouge2\n"
+
+
+with description('palette_sort'):
+    with context('hsv_hue'):
+        with it('donne la même teinte que colorsys'):
+            rgb = np.random.default_rng(0).integers(0, 256, (2000, 3))
+            expected = [colorsys.rgb_to_hsv(*(c / 255.0))[0] for c in rgb]
+            expect(bool(np.allclose(hsv_hue(rgb), expected))).to(be_true)
+
+    with context('hilbert_index'):
+        with it('parcourt toute la grille par cases voisines'):
+            grid = np.stack(np.meshgrid(*[np.arange(4)] * 3, indexing='ij'), -1).reshape(-1, 3)
+            index = hilbert_index(grid, 2)
+            expect(sorted(index.tolist())).to(equal(list(range(64))))
+            path = grid[np.argsort(index)]
+            expect(np.abs(np.diff(path, axis=0)).sum(axis=1).tolist()).to(equal([1] * 63))
+
+    with context('sort_order'):
+        with it('est stable à clé égale'):
+            rgb = np.array([[255, 0, 0], [0, 0, 255], [255, 0, 0]], dtype=np.uint8)
+            expect(sort_order(rgb, "brightness").tolist()).to(equal([1, 0, 2]))
+
+        with it('place les gris avant les couleurs en mode oklch'):
+            rgb = np.array([[255, 0, 0], [128, 128, 128], [0, 0, 255], [255, 255, 255]], dtype=np.uint8)
+            expect(sort_order(rgb, "oklch").tolist()).to(equal([3, 1, 0, 2]))
+
+        with it('trie par fréquence décroissante'):
+            rgb = np.zeros((3, 3), dtype=np.uint8)
+            expect(sort_order(rgb, "frequency", counts=[1, 5, 2]).tolist()).to(equal([1, 2, 0]))
+            expect(sort_order(rgb, "frequency").tolist()).to(equal([0, 1, 2]))
+
+    with context('PixelPalette.sort_by'):
+        with it('trie par teinte comme avant'):
+            palette = PixelPalette(GPL)
+            palette.sort_by_hue()
+            expect([c.name for c in palette.colors]).to(equal(["rouge", "gris", "rouge2", "vert", "bleu"]))
+
+        with it('réordonne aussi les occurrences'):
+            palette = PixelPalette(GPL).deduplicate()
+            palette.sort_by("frequency")
+            expect([c.name for c in palette.colors][0]).to(equal("rouge"))
+            expect(palette.metadata['counts']).to(equal([2, 1, 1, 1]))
+
+        with it('trie une copie sans toucher l\'original (with_colors, counts)'):
+            palette = PixelPalette(GPL).deduplicate()
+            copy = palette.with_colors(list(palette.colors), palette.counts())
+            copy.sort_by("frequency", reverse=True)
+            expect(copy.counts()).to(equal([1, 1, 1, 2]))
+            expect(palette.counts()).to(equal([1, 2, 1, 1]))
+            expect(palette.with_colors(palette.colors[:2]).counts()).to(equal(None))
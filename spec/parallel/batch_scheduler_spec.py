@@ -0,0 +1,70 @@
+# spec/parallel/batch_scheduler_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, raise_error, be_true
+import sys
+import os
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+import numpy as np
+from lib.parallel import WorkerPool, BatchScheduler, resolve_worker_count
+from lib.parallel.worker_pool import WORKERS_ENV_VAR
+
+
+with description('BatchScheduler') as self:
+    with before.each:
+        self.pool = WorkerPool(max_workers=4)
+
+    with after.each:
+        self.pool.shutdown()
+
+    with context('#map'):
+        with it('conserve l\'ordre des résultats'):
+            scheduler = BatchScheduler(workers=4, pool=self.pool)
+            expect(scheduler.map(lambda x: x * x, range(20))).to(equal([x * x for x in range(20)]))
+
+        with it('exécute en ligne avec un seul worker sans démarrer le pool'):
+            scheduler = BatchScheduler(workers=1, pool=self.pool)
+            expect(scheduler.map(lambda x: x + 1, [1, 2])).to(equal([2, 3]))
+            expect(self.pool.is_started).to(equal(False))
+
+        with it('borne le nombre de tâches en vol'):
+            lock = threading.Lock()
+            state = {'running': 0, 'peak': 0}
+
+            def task(x):
+                with lock:
+                    state['running'] += 1
+                    state['peak'] = max(state['peak'], state['running'])
+                threading.Event().wait(0.005)
+                with lock:
+                    state['running'] -= 1
+                return x
+
+            scheduler = BatchScheduler(workers=4, pool=self.pool, max_in_flight=2)
+            scheduler.map(task, range(12))
+            expect(state['peak'] <= 2).to(be_true)
+
+        with it('propage les erreurs des workers'):
+            def fail(x):
+                raise ValueError("boom")
+
+            scheduler = BatchScheduler(workers=2, pool=self.pool)
+            expect(lambda: scheduler.map(fail, [1, 2, 3])).to(raise_error(ValueError, "boom"))
+
+    with context('#map_tiles'):
+        with it('couvre toutes les lignes dans l\'ordre'):
+            scheduler = BatchScheduler(workers=4, pool=self.pool)
+            image = np.arange(300 * 2).reshape(300, 2)
+            bands = scheduler.map_tiles(lambda band: band.copy(), image, min_rows=16)
+            expect(len(bands) > 1).to(be_true)
+            expect(np.array_equal(np.concatenate(bands), image)).to(be_true)
+
+    with context('resolve_worker_count'):
+        with it('donne la priorité à la valeur demandée puis à la variable d\'environnement'):
+            os.environ[WORKERS_ENV_VAR] = "3"
+            try:
+                expect(resolve_worker_count(5)).to(equal(5))
+                expect(resolve_worker_count(0)).to(equal(3))
+            finally:
+                del os.environ[WORKERS_ENV_VAR]
@@ -0,0 +1,41 @@
+# spec/pixel_array_spec.py
+from mamba import description, context, it
+from expects import expect, equal
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.pixel_array import to_uint8, pack_rgb, unpack_rgb, ensure_rgb
+
+
+with description('pixel_array'):
+    with context('#pack_rgb / #unpack_rgb'):
+        with it('empaquette en 0x00RRGGBB'):
+            pixels = np.array([[255, 128, 0], [1, 2, 3]], dtype=np.uint8)
+            expect(pack_rgb(pixels).tolist()).to(equal([0xFF8000, 0x010203]))
+
+        with it('accepte d\'autres types entiers'):
+            pixels = np.array([[255, 128, 0], [1, 2, 3]], dtype=np.int64)
+            expect(pack_rgb(pixels).tolist()).to(equal([0xFF8000, 0x010203]))
+            expect(int(pack_rgb(np.array([1, 2, 3], dtype=np.uint8)))).to(equal(0x010203))
+
+        with it('fait un aller-retour sans perte'):
+            pixels = np.random.RandomState(0).randint(0, 256, (8, 5, 3)).astype(np.uint8)
+            expect(np.array_equal(unpack_rgb(pack_rgb(pixels)), pixels)).to(equal(True))
+
+    with context('#to_uint8'):
+        with it('convertit et borne les flottants ComfyUI'):
+            pixels = np.array([0.0, 0.5, 1.0, 1.5, -0.2], dtype=np.float32)
+            expect(to_uint8(pixels).tolist()).to(equal([0, 127, 255, 255, 0]))
+
+        with it('retrouve les valeurs uint8 d\'origine'):
+            values = np.arange(256, dtype=np.uint8)
+            expect(to_uint8(values.astype(np.float32) / 255.0).tolist()).to(equal(values.tolist()))
+
+    with context('#ensure_rgb'):
+        with it('retire le canal alpha'):
+            expect(ensure_rgb(np.zeros((2, 2, 4), dtype=np.uint8)).shape).to(equal((2, 2, 3)))
+
+        with it('duplique les niveaux de gris'):
+            expect(ensure_rgb(np.zeros((2, 2), dtype=np.uint8)).shape).to(equal((2, 2, 3)))
@@ -0,0 +1,74 @@
+# spec/pixel_grid_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, be_below, be_above
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.pixel_grid import edge_profiles, detect_axis, detect_grid, cell_indices, block_mode
+
+
+def upscale(cells, pitch, phase, size):
+    """Agrandit cells [lignes, colonnes, 3] au pas non entier pitch, grille décalée de phase"""
+    position = np.floor((np.arange(size) + 0.5 - phase) / pitch).astype(int) + 1
+    position = np.clip(position, 0, cells.shape[0] - 1)
+    return cells[position[:, None], position[None, :]]
+
+
+RNG = np.random.default_rng(3)
+CELLS = RNG.integers(0, 8, size=(24, 24, 1)) * np.array([32, 16, 8]) + np.array([0, 64, 128])
+CELLS = CELLS.astype(np.uint8)
+
+
+with description('pixel_grid'):
+    with context('detect_axis'):
+        with it('retrouve un pas non entier et sa phase'):
+            image = upscale(CELLS, 7.6, 3.0, 160)
+            profile_x, _ = edge_profiles(image)
+            axis = detect_axis(profile_x)
+            expect(abs(axis["pitch"] - 7.6)).to(be_below(0.05))
+            expect(abs(axis["phase"] - 3.0)).to(be_below(0.5))
+            expect(axis["confidence"]).to(be_above(0.5))
+
+        with it('renvoie un pas de 1 sans périodicité'):
+            axis = detect_axis(np.zeros(50))
+            expect(axis["pitch"]).to(equal(1.0))
+            expect(axis["confidence"]).to(equal(0.0))
+
+    with context('cell_indices'):
+        with it('garde les cases dont le centre est dans l image'):
+            index, count, centrality = cell_indices(10, 4.0, 1.0, margin=0.0)
+            # Bords en 1, 5, 9: cases [-3, 1) (centre -1, écartée), [1, 5), [5, 9), [9, 13) (centre 11, écartée)
+            expect(count).to(equal(2))
+            expect(index.tolist()).to(equal([-1, 0, 0, 0, 0, 1, 1, 1, 1, -1]))
+            expect(bool((centrality[1:9] > 0).all())).to(be_true)
+
+        with it('marque la marge des cases'):
+            _, _, centrality = cell_indices(8, 8.0, 0.0, margin=0.25)
+            expect(bool(centrality[0] < 0 and centrality[7] < 0)).to(be_true)
+            expect(bool((centrality[2:6] > 0).all())).to(be_true)
+
+    with context('block_mode'):
+        with it('retrouve les cases d une image agrandie'):
+            image = upscale(CELLS, 7.6, 3.0, 160)
+            grid = detect_grid(image)
+            cells = block_mode(image, grid, bits=8)[0]
+            expect(cells.shape[:2]).to(equal((21, 21)))
+            expect(float((cells == CELLS[1:22, 1:22]).all(axis=-1).mean())).to(be_above(0.99))
+
+        with it('ignore les pixels de bord et le bruit'):
+            image = upscale(CELLS, 8.0, 0.0, 192).astype(np.int16)
+            image[::8] = 255
+            image += RNG.integers(-2, 3, size=image.shape)
+            image = np.clip(image, 0, 255).astype(np.uint8)
+            grid = {"pitch_x": 8.0, "phase_x": 0.0, "pitch_y": 8.0, "phase_y": 0.0}
+            cells = block_mode(image, grid).astype(int)
+            expect(int(np.abs(cells[0, :23, :23] - CELLS.astype(int)[1:, 1:]).max())).to(be_below(3))
+
+        with it('traite un batch avec une même grille'):
+            batch = np.stack([upscale(CELLS, 6.0, 0.0, 96), upscale(255 - CELLS, 6.0, 0.0, 96)])
+            grid = detect_grid(batch)
+            cells = block_mode(batch, grid, bits=8)
+            expect(cells.shape).to(equal((2, 16, 16, 3)))
+            expect(bool((cells[1] == 255 - cells[0]).all())).to(be_true)
@@ -0,0 +1,48 @@
+# spec/pixel_sampling_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, be_below
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.pixel_sampling import stratified_sample, estimate_palette_error
+
+
+with description('pixel_sampling'):
+    with context('#stratified_sample'):
+        with it('tire environ sample_size pixels répartis sur toute l\'image'):
+            image = np.zeros((400, 600, 3), dtype=np.uint8)
+            image[:, :, 0] = np.arange(400)[:, None] * 255 // 399
+            sample = stratified_sample(image, 1000)
+
+            expect(abs(len(sample) - 1000) <= 50).to(be_true)
+            # Toutes les bandes horizontales sont représentées
+            expect(len(np.unique(sample[:, 0] // 32))).to(equal(8))
+
+        with it('retourne toute l\'image quand elle est plus petite que l\'échantillon'):
+            image = np.ones((10, 10, 3), dtype=np.uint8)
+            expect(stratified_sample(image, 1000).shape).to(equal((100, 3)))
+
+        with it('est reproductible avec la même graine'):
+            image = np.random.RandomState(0).randint(0, 256, (200, 200, 3)).astype(np.uint8)
+            expect(np.array_equal(stratified_sample(image, 500, seed=3),
+                                  stratified_sample(image, 500, seed=3))).to(be_true)
+
+    with context('#estimate_palette_error'):
+        with it('donne une erreur nulle et une couverture totale pour une palette exacte'):
+            sample = np.array([[0, 0, 0], [255, 255, 255]] * 50, dtype=np.uint8)
+            estimate = estimate_palette_error(sample, np.array([[0, 0, 0], [255, 255, 255]]))
+
+            expect(estimate['mean_error']).to(equal(0.0))
+            expect(estimate['coverage']).to(equal(1.0))
+
+        with it('encadre l\'erreur réelle de l\'image complète'):
+            rng = np.random.default_rng(1)
+            image = rng.integers(0, 256, (300, 300, 3)).astype(np.uint8)
+            palette = rng.integers(0, 256, (16, 3)).astype(np.uint8)
+
+            full = estimate_palette_error(image.reshape(-1, 3), palette)
+            approx = estimate_palette_error(stratified_sample(image, 4000), palette)
+            margin = abs(approx['mean_error'] - full['mean_error'])
+            expect(margin).to(be_below(2 * approx['error_bound'] + 1e-9))
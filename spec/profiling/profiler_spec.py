@@ -0,0 +1,83 @@
+# spec/profiling/profiler_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, be_false, be_above, contain, have_key
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+from lib.profiling import Profiler, parse_options, profiled
+
+
+with description('Profiler'):
+    with context('parse_options'):
+        with it('est silencieux par défaut'):
+            expect(parse_options("")).to(equal(frozenset()))
+            expect(parse_options("0")).to(equal(frozenset()))
+
+        with it('active tout avec 1'):
+            expect(parse_options("1")).to(equal(frozenset({"timing", "memory", "cprofile", "log"})))
+
+        with it('active les chronomètres avec memory'):
+            expect(parse_options("memory")).to(equal(frozenset({"timing", "memory"})))
+
+    with context('désactivé'):
+        with it('n\'enregistre rien'):
+            profiler = Profiler("")
+            with profiler.node("Node"):
+                with profiler.stage("render"):
+                    profiler.count("colors", 3)
+            expect(profiler.enabled).to(be_false)
+            expect(profiler.summary()).to(equal({}))
+
+    with context('#node / #stage / #count'):
+        with it('agrège les durées, étapes et compteurs par node'):
+            profiler = Profiler("timing")
+            for _ in range(3):
+                with profiler.node("Extractor"):
+                    with profiler.stage("extract"):
+                        profiler.count("colors", 4)
+
+            entry = profiler.summary()["Extractor"]
+            expect(entry['calls']).to(equal(3))
+            expect(entry['p95_s'] >= entry['p50_s']).to(be_true)
+            expect(entry['stages']['extract']['calls']).to(equal(3))
+            expect(entry['counters']['colors']).to(equal(12))
+
+        with it('mesure le pic mémoire avec l\'option memory'):
+            profiler = Profiler("memory")
+            with profiler.node("Alloc"):
+                data = bytearray(2 * 1024 * 1024)
+            expect(profiler.summary()["Alloc"]['peak_memory_bytes']).to(be_above(2 * 1024 * 1024 - 1))
+
+        with it('remet les mesures à zéro'):
+            profiler = Profiler("timing")
+            with profiler.node("Node"):
+                pass
+            profiler.reset()
+            expect(profiler.summary()).to(equal({}))
+
+    with context('#format_summary'):
+        with it('indique comment activer l\'instrumentation'):
+            expect(Profiler("").format_summary()).to(contain("PIXEL_PALETTE_PROFILE"))
+
+        with it('affiche p50 et p95 par node'):
+            profiler = Profiler("timing")
+            with profiler.node("Formatter"):
+                pass
+            expect(profiler.format_summary()).to(contain("# Formatter: 1 appels"))
+
+    with context('#profile_stats'):
+        with it('retourne le profil cProfile du node'):
+            profiler = Profiler("cprofile")
+            with profiler.node("Sorter"):
+                sorted(range(1000), key=lambda x: -x)
+            expect(profiler.profile_stats("Sorter")).to(contain("function calls"))
+
+    with context('profiled'):
+        with it('retourne le résultat de la méthode décorée'):
+            class Node:
+                @profiled("Node")
+                def run(self, value):
+                    return (value * 2,)
+
+            expect(Node().run(21)).to(equal((42,)))
@@ -0,0 +1,77 @@
+# spec/sprite_sheet_spec.py
+from mamba import description, context, it
+from expects import expect, equal, be_true, be_false
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.sprite_sheet import (FLIP_H, FLIP_V, tile_view, tile_colors, tile_palettes, flip_tiles,
+                              dedupe_tiles, tile_map_text)
+
+
+RNG = np.random.default_rng(5)
+BASE = (RNG.integers(0, 4, size=(4, 8, 8, 1)) * np.array([60, 40, 20])).astype(np.uint8)
+
+
+def sheet(tiles, columns, margin=0, spacing=0):
+    """Planche de tuiles 8x8, fond noir"""
+    rows = -(-len(tiles) // columns)
+    image = np.zeros((2 * margin + rows * 8 + (rows - 1) * spacing,
+                      2 * margin + columns * 8 + (columns - 1) * spacing, 3), dtype=np.uint8)
+    for i, tile in enumerate(tiles):
+        r, c = divmod(i, columns)
+        y, x = margin + r * (8 + spacing), margin + c * (8 + spacing)
+        image[y:y + 8, x:x + 8] = tile
+    return image
+
+
+with description('sprite_sheet'):
+    with context('tile_view'):
+        with it('découpe sans copie en tenant compte de la marge et de l espacement'):
+            image = sheet(list(BASE), 2, margin=1, spacing=2)
+            view = tile_view(image, 8, 8, margin=1, spacing=2)
+            expect(view.shape).to(equal((2, 2, 8, 8, 3)))
+            expect(bool(np.shares_memory(view, image))).to(be_true)
+            expect(bool((view[1, 0] == BASE[2]).all())).to(be_true)
+            expect(bool(view.flags.writeable)).to(be_false)
+
+        with it('ignore les tuiles incomplètes'):
+            expect(tile_view(np.zeros((20, 30, 3), np.uint8), 8, 8).shape[:2]).to(equal((2, 3)))
+
+    with context('tile_colors'):
+        with it('retourne les couleurs de chaque tuile par ordre d apparition avec leurs occurrences'):
+            tiles = np.zeros((2, 2, 2, 3), dtype=np.uint8)
+            tiles[0, 0, 0] = [9, 9, 9]
+            tiles[1] = [5, 5, 5]
+            offsets, colors, counts = tile_colors(tiles)
+            expect(offsets.tolist()).to(equal([0, 2, 3]))
+            expect(colors.tolist()).to(equal([[9, 9, 9], [0, 0, 0], [5, 5, 5]]))
+            expect(counts.tolist()).to(equal([1, 3, 4]))
+
+        with it('construit une palette par tuile'):
+            palettes = tile_palettes(BASE[:2])
+            expect(len(palettes)).to(equal(2))
+            expect(sum(palettes[0].metadata['counts'])).to(equal(64))
+            expect(palettes[1].name).to(equal("tile_1"))
+
+    with context('dedupe_tiles'):
+        with it('regroupe les tuiles identiques et miroirs'):
+            tiles = np.stack([BASE[0], BASE[1], BASE[0][:, ::-1], BASE[1][::-1, ::-1], BASE[0]])
+            result = dedupe_tiles(tiles, "flips")
+            expect(result["unique"].tolist()).to(equal([0, 1]))
+            expect(result["index"].tolist()).to(equal([0, 1, 0, 1, 0]))
+            expect(result["flips"].tolist()).to(equal([0, 0, FLIP_H, FLIP_H | FLIP_V, 0]))
+            rebuilt = flip_tiles(tiles[result["unique"]][result["index"]], result["flips"])
+            expect(bool((rebuilt == tiles).all())).to(be_true)
+
+        with it('ne regroupe pas les miroirs en mode exact'):
+            tiles = np.stack([BASE[0], BASE[0][::-1], BASE[0]])
+            result = dedupe_tiles(tiles, "exact")
+            expect(result["index"].tolist()).to(equal([0, 1, 0]))
+            expect(dedupe_tiles(tiles, "flips")["index"].tolist()).to(equal([0, 0, 0]))
+
+    with context('tile_map_text'):
+        with it('écrit une ligne par ligne de tuiles avec les miroirs en suffixe'):
+            text = tile_map_text([0, 1, 0, 2], [0, 0, FLIP_H, FLIP_H | FLIP_V], 2)
+            expect(text).to(equal("0,1\n0h,2hv"))
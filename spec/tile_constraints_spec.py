@@ -0,0 +1,95 @@
+# spec/tile_constraints_spec.py
+from mamba import description, context, it, before, after
+from expects import expect, equal, be_true, be_below, contain
+import shutil
+import tempfile
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import numpy as np
+from lib.tile_constraints import tile_histograms, fit_subpalette, solve_tile_palettes
+from lib.lut              import LutStore
+from lib.pixel_palette    import PixelPalette
+
+
+RNG = np.random.default_rng(1)
+MASTER = RNG.integers(0, 256, size=(16, 3)).astype(np.uint8)
+GROUPS = RNG.integers(0, 4, size=(6, 6))
+
+# Chaque tuile 8x8 n'utilise que les 4 couleurs d'un groupe (index 4g à 4g + 3)
+INDICES = np.repeat(np.repeat(GROUPS * 4, 8, axis=0), 8, axis=1) + RNG.integers(0, 4, size=(48, 48))
+
+
+def tiles_respect(result, tile, colors):
+    """Chaque tuile de indexed ne référence que sa sous-palette"""
+    palette_of_pixel = result['indexed'] // colors
+    expected = np.repeat(np.repeat(result['assignment'], tile, axis=0), tile, axis=1)
+    return bool((palette_of_pixel == expected[:palette_of_pixel.shape[0], :palette_of_pixel.shape[1]]).all())
+
+
+with description('tile_constraints'):
+    with context('tile_histograms'):
+        with it('compte les couleurs de chaque tuile, tuiles partielles comprises'):
+            indices = np.zeros((3, 5), dtype=np.int64)
+            indices[:, 4] = 1
+            histograms, ids, shape = tile_histograms(indices, 2, 2, 2)
+            expect(shape).to(equal((2, 3)))
+            expect(histograms.tolist()).to(equal([[4, 0], [4, 0], [0, 2], [2, 0], [2, 0], [0, 1]]))
+            expect(int(ids[2, 4])).to(equal(5))
+
+    with context('fit_subpalette'):
+        with it('choisit les couleurs utilisées et garde les couleurs imposées'):
+            lab_like = np.array([0.0, 1.0, 10.0, 11.0, 50.0])
+            distances = (lab_like[:, None] - lab_like[None, :]) ** 2
+            weights = np.array([5, 0, 5, 0, 0.0])
+            expect(sorted(fit_subpalette(weights, distances, 2).tolist())).to(equal([0, 2]))
+            chosen = fit_subpalette(weights, distances, 2, fixed=(4,))
+            expect(chosen.tolist()[0]).to(equal(4))
+            expect(len(chosen)).to(equal(2))
+
+    with context('solve_tile_palettes'):
+        with it('retrouve des sous-palettes exactes quand elles existent'):
+            result = solve_tile_palettes(INDICES, MASTER, 8, 8, colors=4, palettes=4)
+            expect(result['error']).to(be_below(1e-9))
+            expect(sorted(map(sorted, result['subpalettes'].tolist()))).to(
+                equal([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]]))
+            expect(tiles_respect(result, 8, 4)).to(be_true)
+
+        with it('respecte les contraintes avec trop peu de sous-palettes'):
+            result = solve_tile_palettes(INDICES, MASTER, 8, 8, colors=3, palettes=2, shared="most_frequent")
+            expect(result['subpalettes'].shape).to(equal((2, 3)))
+            expect(tiles_respect(result, 8, 3)).to(be_true)
+            shared = result['subpalettes'][0, 0]
+            expect(result['subpalettes'][1].tolist()).to(contain(shared))
+
+        with it('partage les sous-palettes entre les images d un batch'):
+            batch = np.stack([INDICES, INDICES[::-1]])
+            result = solve_tile_palettes(batch, MASTER, 8, 8, colors=4, palettes=4)
+            expect(result['assignment'].shape).to(equal((2, 6, 6)))
+            expect(result['error']).to(be_below(1e-9))
+
+    with context('PixelPalette.constrain_tiles'):
+        with before.each:
+            self.directory = tempfile.mkdtemp(prefix="tile_constraints_spec_")
+            self.store = LutStore(self.directory)
+
+        with after.each:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+        with it('retourne une image aux couleurs des sous-palettes et les sous-palettes'):
+            palette = PixelPalette()
+            for r, g, b in MASTER.tolist():
+                palette.add_color(r, g, b)
+            subpalettes, result = palette.constrain_tiles(MASTER[INDICES], 8, 8, 4, 4, store=self.store)
+            expect(len(subpalettes)).to(equal(4))
+            expect(bool((result['image'] == MASTER[INDICES]).all())).to(be_true)
+
+        with it('garde distinctes les couleurs maîtres très proches'):
+            palette = PixelPalette()
+            for r, g, b in [(0, 0, 0), (2, 2, 2), (200, 40, 40), (255, 255, 255)]:
+                palette.add_color(r, g, b)
+            pixels = palette.to_array()[np.tile([[0, 1], [2, 3]], (4, 4))]
+            subpalettes, result = palette.constrain_tiles(pixels, 8, 8, 4, 1, store=self.store)
+            expect(bool((result['image'] == pixels).all())).to(be_true)
+            expect(result['error']).to(be_below(1e-9))